@@ -0,0 +1,87 @@
+"""
+Disk size and load time of the stored Document AI results and LLM input
+for one report: indented JSON files against compact document packs
+
+Usage: python -m backend.benchmarks.artifact_format_benchmark [tradelines]
+"""
+import sys
+import time
+import asyncio
+import logging
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+from backend.benchmarks.synthetic_reports import generate_report_pdf
+from backend.services.document_ai_service import DocumentAIService
+from backend.services.job_store import SQLiteJobStore
+from backend.services.storage_service import StorageService
+from backend.utils.document_pack import DEFAULT_COMPRESSION, DEFAULT_SERIALIZER
+
+def build_artifacts(ai_result):
+    """The two dicts DocumentProcessorService.store_ai_results writes"""
+    tables = [{
+        'table_id': table.table_id, 'headers': table.headers, 'rows': table.rows,
+        'confidence': table.confidence, 'page_number': table.page_number,
+        'row_count': len(table.rows), 'column_count': len(table.headers), 'bounding_box': table.bounding_box
+    } for table in ai_result.tables]
+    text_content = {
+        'raw_text': ai_result.raw_text,
+        'text_blocks': [{
+            'content': block.content, 'page_number': block.page_number, 'confidence': block.confidence,
+            'word_count': len(block.content.split()), 'bounding_box': block.bounding_box
+        } for block in ai_result.text_blocks],
+        'total_confidence': ai_result.confidence_score,
+        'page_count': ai_result.total_pages
+    }
+    ai_results = {
+        'job_id': 'job-1', 'document_type': ai_result.document_type.value,
+        'processing_time': ai_result.processing_time, 'confidence_score': ai_result.confidence_score,
+        'tables': tables, 'text_content': text_content, 'metadata': ai_result.metadata,
+        'processed_at': datetime.now().isoformat()
+    }
+    llm_input = {
+        'tables': tables, 'text': text_content['raw_text'], 'text_blocks': text_content['text_blocks'],
+        'document_type': ai_result.document_type.value, 'confidence_score': ai_result.confidence_score,
+        'metadata': ai_result.metadata
+    }
+    return ai_results, llm_input
+
+def best_ms(fn, repeat: int = 20) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start_time)
+    return best * 1000
+
+def run(num_tradelines: int = 600):
+    logging.getLogger("backend").setLevel(logging.WARNING)
+    pdf, _ = generate_report_pdf(num_tradelines)
+    ai_result = asyncio.run(DocumentAIService().process_document(pdf, "report.pdf"))
+    print(f"{num_tradelines} tradelines, {ai_result.total_pages} pages, {len(ai_result.tables)} tables, "
+          f"{len(ai_result.raw_text) / 1024:.0f} KB of text; compact = {DEFAULT_SERIALIZER} + {DEFAULT_COMPRESSION}\n")
+    print(f"{'format':<8} | {'ai_results KB':>13} {'llm_input KB':>12} | "
+          f"{'load results ms':>15} {'load input ms':>13} {'status ms':>9}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for storage_format in ("json", "compact"):
+            storage = StorageService(str(Path(tmp) / storage_format), job_store=SQLiteJobStore(":memory:"),
+                                     storage_format=storage_format)
+            ai_results, llm_input = build_artifacts(ai_result)
+            storage._write_artifact("ai_results", "job-1", ai_results, ("text_content", "raw_text"))
+            storage._write_artifact("llm_input", "job-1", llm_input, ("text",))
+            assert storage._read_artifact("ai_results", "job-1") == ai_results
+            assert storage._read_artifact("llm_input", "job-1") == llm_input
+
+            sizes = [sum(path.stat().st_size for path in storage._artifact_paths(kind, "job-1") if path.exists())
+                     for kind in ("ai_results", "llm_input")]
+            # Synchronous halves of the storage calls, so only decoding is timed
+            load_results = best_ms(lambda: storage._read_artifact("ai_results", "job-1"))
+            load_input = best_ms(lambda: storage._read_artifact("llm_input", "job-1"))
+            status = best_ms(lambda: storage._read_ai_results_summary("job-1"))
+            print(f"{storage_format:<8} | {sizes[0] / 1024:>13.1f} {sizes[1] / 1024:>12.1f} | "
+                  f"{load_results:>15.2f} {load_input:>13.2f} {status:>9.3f}")
+
+if __name__ == "__main__":
+    run(*(int(arg) for arg in sys.argv[1:2]))
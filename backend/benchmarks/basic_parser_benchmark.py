@@ -0,0 +1,303 @@
+"""
+Compare the original per-pattern basic parser with the registry-backed parser,
+and show creditor lookup throughput as the registry grows
+
+Usage: python -m backend.benchmarks.basic_parser_benchmark
+"""
+import re
+import time
+import random
+import logging
+from typing import List, Dict, Any
+
+from backend.utils.basic_parser import parse_tradelines_basic
+from backend.utils.creditor_registry import CreditorEntry, CreditorRegistry, get_creditor_registry
+from backend.benchmarks.synthetic_reports import generate_report
+
+def legacy_parse_tradelines_basic(text: str) -> List[Dict[str, Any]]:
+    """The original parser: ~70 uncompiled creditor regexes tried per line"""
+    try:
+        tradelines = []
+        lines = text.split('\n')
+        
+        # Comprehensive creditor patterns
+        creditor_patterns = [
+            # Major Banks
+            r'(CHASE|Chase|chase|JP MORGAN|JPMorgan|JPMORGAN)',
+            r'(CAPITAL ONE|Capital One|capital one|CAP ONE|CAPONE)',
+            r'(CITIBANK|Citibank|citibank|CITI|Citi|citi)',
+            r'(BANK OF AMERICA|Bank of America|BOA|B OF A)',
+            r'(WELLS FARGO|Wells Fargo|WELLS|Wells)',
+            r'(DISCOVER|Discover|discover)',
+            r'(AMERICAN EXPRESS|American Express|AMEX|AmEx|amex)',
+            r'(SYNCHRONY|Synchrony|synchrony)',
+            r'(CREDIT ONE|Credit One|credit one)',
+            r'(US BANK|US Bank|U\.S\. Bank|USBANK)',
+            r'(PNC|PNC Bank|pnc)',
+            r'(TD BANK|TD Bank|td bank)',
+            r'(REGIONS|Regions|regions)',
+            r'(ALLY|Ally|ally)',
+            r'(MARCUS|Marcus|marcus)',
+            r'(BARCLAYS|Barclays|barclays)',
+            r'(HSBC|hsbc)',
+            
+            # Credit Cards
+            r'(MASTERCARD|MasterCard|mastercard)',
+            r'(VISA|Visa|visa)',
+            r'(STORE CARD|Store Card|store card)',
+            
+            # Store Cards
+            r'(AMAZON|Amazon|amazon)',
+            r'(TARGET|Target|target)',
+            r'(HOME DEPOT|Home Depot|HOMEDEPOT)',
+            r'(LOWES|Lowe\'s|LOWE\'S|lowes)',
+            r'(WALMART|Walmart|walmart)',
+            r'(COSTCO|Costco|costco)',
+            r'(NORDSTROM|Nordstrom|nordstrom)',
+            r'(MACY\'S|Macy\'s|macys)',
+            r'(KOHL\'S|Kohl\'s|kohls)',
+            r'(BEST BUY|Best Buy|bestbuy)',
+            r'(APPLE|Apple|apple)',
+            
+            # Auto Loans
+            r'(FORD CREDIT|Ford Credit|ford credit)',
+            r'(HONDA FINANCIAL|Honda Financial|honda financial)',
+            r'(TOYOTA FINANCIAL|Toyota Financial|toyota financial)',
+            r'(NISSAN MOTOR|Nissan Motor|nissan motor)',
+            r'(GM FINANCIAL|GM Financial|gm financial)',
+            r'(CHRYSLER CAPITAL|Chrysler Capital|chrysler capital)',
+            r'(ALLY AUTO|Ally Auto|ally auto)',
+            r'(SANTANDER|Santander|santander)',
+            
+            # Student Loans
+            r'(NAVIENT|Navient|navient)',
+            r'(GREAT LAKES|Great Lakes|great lakes)',
+            r'(NELNET|Nelnet|nelnet)',
+            r'(FEDLOAN|FedLoan|fedloan)',
+            r'(MOHELA|MOHELA|mohela)',
+            r'(DEPT OF EDUCATION|Department of Education|dept of education)',
+            r'(STUDENT LOAN|Student Loan|student loan)',
+            
+            # Mortgage
+            r'(QUICKEN LOANS|Quicken Loans|quicken loans)',
+            r'(ROCKET MORTGAGE|Rocket Mortgage|rocket mortgage)',
+            r'(FREEDOM MORTGAGE|Freedom Mortgage|freedom mortgage)',
+            r'(PENNYMAC|PennyMac|pennymac)',
+            r'(CALIBER HOME|Caliber Home|caliber home)',
+            r'(MORTGAGE|Mortgage|mortgage)',
+            
+            # Credit Unions
+            r'(NAVY FEDERAL|Navy Federal|navy federal)',
+            r'(USAA|usaa)',
+            r'(PENTAGON FCU|Pentagon FCU|pentagon fcu)',
+            r'(CREDIT UNION|Credit Union|credit union)',
+            
+            # Other Financial
+            r'(PAYPAL|PayPal|paypal)',
+            r'(AFFIRM|Affirm|affirm)',
+            r'(KLARNA|Klarna|klarna)',
+            r'(AFTERPAY|Afterpay|afterpay)',
+            r'(UPLIFT|Uplift|uplift)',
+            r'(LENDING CLUB|Lending Club|lending club)',
+            r'(PROSPER|Prosper|prosper)',
+            r'(SOFI|SoFi|sofi)',
+            r'(AVANT|Avant|avant)',
+            r'(ONEMAIN|OneMain|onemain)',
+            r'(SPRINGLEAF|Springleaf|springleaf)',
+            r'(PERSONAL LOAN|Personal Loan|personal loan)'
+        ]
+        
+        current_tradeline = {}
+        
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            
+            # Look for creditor names
+            for pattern in creditor_patterns:
+                if re.search(pattern, line, re.IGNORECASE):
+                    # Save previous tradeline if it exists
+                    if current_tradeline and current_tradeline.get("creditor_name"):
+                        tradelines.append(current_tradeline)
+                    
+                    # Extract creditor name
+                    creditor_match = re.search(pattern, line, re.IGNORECASE)
+                    creditor_name = creditor_match.group(0) if creditor_match else "Unknown"
+                    
+                    # Determine account type based on creditor
+                    account_type = "Credit Card"  # default
+                    if any(loan_type in creditor_name.upper() for loan_type in ["AUTO", "FORD", "HONDA", "TOYOTA", "NISSAN", "GM", "CHRYSLER", "ALLY AUTO", "SANTANDER"]):
+                        account_type = "Auto Loan"
+                    elif any(loan_type in creditor_name.upper() for loan_type in ["STUDENT", "NAVIENT", "GREAT LAKES", "NELNET", "FEDLOAN", "MOHELA", "DEPT OF EDUCATION"]):
+                        account_type = "Student Loan"
+                    elif any(loan_type in creditor_name.upper() for loan_type in ["MORTGAGE", "QUICKEN", "ROCKET", "FREEDOM", "PENNYMAC", "CALIBER"]):
+                        account_type = "Mortgage"
+                    elif any(loan_type in creditor_name.upper() for loan_type in ["PERSONAL", "LENDING", "PROSPER", "SOFI", "AVANT", "ONEMAIN", "SPRINGLEAF"]):
+                        account_type = "Personal Loan"
+                    
+                    current_tradeline = {
+                        "creditor_name": creditor_name,
+                        "account_type": account_type,
+                        "account_status": "Open",
+                        "credit_bureau": "Unknown", 
+                        "is_negative": False,
+                        "account_balance": "",
+                        "credit_limit": "",
+                        "monthly_payment": "",
+                        "account_number": "",
+                        "date_opened": "",
+                        "dispute_count": 0
+                    }
+                    break
+            
+            # Enhance data extraction for current tradeline
+            if current_tradeline:
+                # Look for account numbers (various formats)
+                account_patterns = [
+                    r'\*{4,}\d{4}',  # ****1234
+                    r'x{4,}\d{4}',   # xxxx1234
+                    r'\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}',  # Full card numbers
+                    r'Account\s*#?\s*:?\s*(\d+)',  # Account #: 123456
+                    r'Acct\s*#?\s*:?\s*(\d+)'     # Acct #: 123456
+                ]
+                
+                for pattern in account_patterns:
+                    account_match = re.search(pattern, line, re.IGNORECASE)
+                    if account_match:
+                        current_tradeline["account_number"] = account_match.group(0)
+                        break
+                
+                # Look for dollar amounts with better context
+                dollar_matches = re.findall(r'\$[\d,]+\.?\d*', line)
+                balance_keywords = ['balance', 'amount', 'owed', 'debt']
+                limit_keywords = ['limit', 'credit limit', 'maximum']
+                payment_keywords = ['payment', 'monthly', 'minimum']
+                
+                for amount in dollar_matches:
+                    line_lower = line.lower()
+                    
+                    # Check context for balance
+                    if any(kw in line_lower for kw in balance_keywords) and not current_tradeline["account_balance"]:
+                        current_tradeline["account_balance"] = amount
+                    # Check context for credit limit
+                    elif any(kw in line_lower for kw in limit_keywords) and not current_tradeline["credit_limit"]:
+                        current_tradeline["credit_limit"] = amount
+                    # Check context for payment
+                    elif any(kw in line_lower for kw in payment_keywords) and not current_tradeline["monthly_payment"]:
+                        current_tradeline["monthly_payment"] = amount
+                    # Default assignment if no context
+                    elif not current_tradeline["account_balance"]:
+                        current_tradeline["account_balance"] = amount
+                    elif not current_tradeline["credit_limit"]:
+                        current_tradeline["credit_limit"] = amount
+                
+                # Look for dates
+                date_patterns = [
+                    r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}',  # MM/DD/YYYY or MM-DD-YYYY
+                    r'\d{2,4}[/-]\d{1,2}[/-]\d{1,2}',  # YYYY/MM/DD or YYYY-MM-DD
+                    r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{1,2},?\s+\d{4}',  # Month DD, YYYY
+                    r'\d{1,2}\s+(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{4}'  # DD Month YYYY
+                ]
+                
+                for pattern in date_patterns:
+                    date_match = re.search(pattern, line, re.IGNORECASE)
+                    if date_match and not current_tradeline["date_opened"]:
+                        current_tradeline["date_opened"] = date_match.group(0)
+                        break
+                
+                # Look for status indicators
+                status_patterns = {
+                    'Current': r'current|open|active|good standing',
+                    'Closed': r'closed|terminated|paid off|satisfied',
+                    'Late': r'late|delinquent|past due|30 days|60 days|90 days',
+                    'Charged Off': r'charged off|charge off|written off',
+                    'Collection': r'collection|collections|assigned'
+                }
+                
+                for status, pattern in status_patterns.items():
+                    if re.search(pattern, line, re.IGNORECASE):
+                        current_tradeline["account_status"] = status
+                        # Mark as negative if it's a bad status
+                        if status in ['Late', 'Charged Off', 'Collection']:
+                            current_tradeline["is_negative"] = True
+                        break
+                
+                # Look for credit bureau mentions
+                bureau_patterns = {
+                    'Experian': r'experian|exp\b',
+                    'Equifax': r'equifax|eqf\b',
+                    'TransUnion': r'transunion|trans union|tru\b'
+                }
+                
+                for bureau, pattern in bureau_patterns.items():
+                    if re.search(pattern, line, re.IGNORECASE):
+                        current_tradeline["credit_bureau"] = bureau
+                        break
+        
+        # Add the last tradeline if it exists
+        if current_tradeline and current_tradeline.get("creditor_name"):
+            tradelines.append(current_tradeline)
+        
+        return tradelines
+        
+    except Exception:
+        return []
+
+def lines_per_second(parse, text: str, repeat: int) -> float:
+    """Best-of-N throughput so one noisy run does not skew the comparison"""
+    line_count = text.count("\n") + 1
+    best = float("inf")
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        parse(text)
+        best = min(best, time.perf_counter() - start_time)
+    return line_count / best
+
+def run(sizes=(30, 120, 480), repeat: int = 5):
+    # The parser logs at INFO on every call
+    logging.getLogger("backend.utils.basic_parser").setLevel(logging.WARNING)
+
+    print(f"{'tradelines':>10} {'lines':>7} | {'legacy lines/s':>15} {'compiled lines/s':>17} {'speedup':>8} | same output")
+    for size in sizes:
+        text, _ = generate_report(num_tradelines=size)
+        same = legacy_parse_tradelines_basic(text) == parse_tradelines_basic(text)
+        legacy = lines_per_second(legacy_parse_tradelines_basic, text, repeat)
+        compiled = lines_per_second(parse_tradelines_basic, text, repeat)
+        print(f"{size:>10} {text.count(chr(10)) + 1:>7} | {legacy:>15,.0f} {compiled:>17,.0f} "
+              f"{compiled / legacy:>7.1f}x | {same}")
+
+def synthetic_creditors(count: int, seed: int = 11) -> List[CreditorEntry]:
+    """Made-up creditor names built from syllables, to pad the registry"""
+    rng = random.Random(seed)
+    syllables = ["AR", "BEL", "COR", "DEN", "EX", "FAR", "GRA", "HOL", "IN", "JEN", "KAR", "LUM",
+                 "MER", "NOR", "OAK", "PAR", "QUIN", "ROS", "SUN", "TRE", "UL", "VAN", "WEST", "ZEN"]
+    suffixes = ["BANK", "FINANCIAL", "LENDING", "CREDIT", "CAPITAL", "FCU", "AUTO FINANCE"]
+    entries = []
+    for i in range(count):
+        name = "".join(rng.choice(syllables) for _ in range(rng.randint(2, 3)))
+        entries.append(CreditorEntry(canonical_name=f"{name} {rng.choice(suffixes)} {i}", aliases=[f"{name}{i} {rng.choice(suffixes)}"]))
+    return entries
+
+def registry_scaling(sizes=(0, 1000, 5000, 20000), repeat: int = 3):
+    """Creditor lookup throughput as the registry grows"""
+    text, _ = generate_report(num_tradelines=480)
+    lines = [line.strip() for line in text.split("\n")]
+    builtin = get_creditor_registry().entries
+
+    print(f"\n{'registry size':>13} | {'find_in_text lines/s':>20}")
+    for extra in sizes:
+        registry = CreditorRegistry(
+            [CreditorEntry(e.canonical_name, e.aliases, e.account_type) for e in builtin] + synthetic_creditors(extra)
+        )
+        best = float("inf")
+        for _ in range(repeat):
+            start_time = time.perf_counter()
+            for line in lines:
+                registry.find_in_text(line)
+            best = min(best, time.perf_counter() - start_time)
+        print(f"{len(registry):>13} | {len(lines) / best:>20,.0f}")
+
+if __name__ == "__main__":
+    run()
+    registry_scaling()
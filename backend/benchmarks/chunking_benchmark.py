@@ -0,0 +1,57 @@
+"""
+Compare the fixed-window Gemini splitter with the structure-aware ReportChunker
+
+Usage: python -m backend.benchmarks.chunking_benchmark
+"""
+import time
+from typing import List
+
+from backend.utils.llm_helpers import TokenCounter
+from backend.utils.report_chunker import ReportChunker
+from backend.benchmarks.synthetic_reports import generate_report
+
+def fixed_window_chunks(text: str, chunk_size: int = 15000, overlap: int = 500) -> List[str]:
+    """The original GeminiProcessor splitter: fixed offsets with overlap"""
+    return [text[i:i + chunk_size] for i in range(0, len(text), chunk_size - overlap)]
+
+def count_split_tradelines(chunks: List[str], blocks: List[str]) -> int:
+    """Tradelines whose first and last lines never land in the same chunk"""
+    split = 0
+    for block in blocks:
+        lines = block.split("\n")
+        # The account line is unique per tradeline; pair it with the block's last line
+        if not any(lines[1] in chunk and lines[-1] in chunk for chunk in chunks):
+            split += 1
+    return split
+
+def count_duplicated_tradelines(chunks: List[str], blocks: List[str]) -> int:
+    """Tradelines sent to the model more than once because of chunk overlap"""
+    return sum(1 for block in blocks if sum(block.split("\n")[1] in chunk for chunk in chunks) > 1)
+
+def run(sizes=(30, 60, 120, 240, 480)):
+    token_counter = TokenCounter()
+    chunker = ReportChunker(token_counter=token_counter)
+    tokenizer = "tiktoken" if token_counter.encoding is not None else "estimate (chars/4)"
+    print(f"Token counts via {tokenizer}\n")
+    print(f"{'tradelines':>10} {'chars':>8} | {'fixed chunks':>12} {'tokens':>7} {'split':>5} {'dup':>4} | "
+          f"{'struct chunks':>13} {'tokens':>7} {'split':>5} {'dup':>4} {'ms':>6}")
+
+    for size in sizes:
+        text, blocks = generate_report(num_tradelines=size)
+
+        fixed = fixed_window_chunks(text)
+        fixed_tokens = sum(token_counter.count_tokens(chunk) for chunk in fixed)
+
+        start = time.perf_counter()
+        structured = chunker.chunk(text)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        structured_texts = [chunk.text for chunk in structured]
+        structured_tokens = sum(chunk.tokens for chunk in structured)
+
+        print(f"{size:>10} {len(text):>8} | {len(fixed):>12} {fixed_tokens:>7} "
+              f"{count_split_tradelines(fixed, blocks):>5} {count_duplicated_tradelines(fixed, blocks):>4} | "
+              f"{len(structured):>13} {structured_tokens:>7} {count_split_tradelines(structured_texts, blocks):>5} "
+              f"{count_duplicated_tradelines(structured_texts, blocks):>4} {elapsed_ms:>6.1f}")
+
+if __name__ == "__main__":
+    run()
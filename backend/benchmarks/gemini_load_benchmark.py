@@ -0,0 +1,70 @@
+"""
+Offline Gemini load test: many concurrent reports against the fake backend,
+comparing the old thread-per-call pattern with the shared async client
+
+Usage: python -m backend.benchmarks.gemini_load_benchmark
+"""
+import time
+import asyncio
+import logging
+
+from backend.config.worker_config import WorkerPoolConfig
+from backend.services.gemini_client import AsyncGeminiClient, FakeGeminiBackend
+from backend.services.worker_pools import WorkerPools, WorkerPoolSaturatedError
+from backend.utils.report_chunker import ReportChunker
+from backend.benchmarks.synthetic_reports import generate_report
+
+def report_prompts(num_tradelines: int = 120):
+    text, _ = generate_report(num_tradelines=num_tradelines)
+    return [f"Extract tradelines.\nText to analyze:\n{chunk.text}" for chunk in ReportChunker().chunk(text)]
+
+async def threaded_load(prompts, reports: int, latency: float):
+    """Old pattern: each call parks an io-pool thread for the full model latency"""
+    backend = FakeGeminiBackend(latency_seconds=0)
+    pools = WorkerPools(WorkerPoolConfig(cpu_pool_kind="thread"))
+
+    def blocking_generate(prompt: str) -> str:
+        time.sleep(latency)
+        return backend.respond(prompt)
+
+    async def one_report():
+        try:
+            await asyncio.gather(*(pools.run_io(blocking_generate, prompt) for prompt in prompts))
+            return True
+        except WorkerPoolSaturatedError:
+            return False
+
+    try:
+        results = await asyncio.gather(*(one_report() for _ in range(reports)))
+    finally:
+        pools.shutdown(wait=False)
+    return sum(results), pools.io.max_workers
+
+async def async_load(prompts, reports: int, latency: float, max_in_flight: int):
+    """New pattern: awaits the async call, bounded by the client semaphore"""
+    client = AsyncGeminiClient(FakeGeminiBackend(latency_seconds=latency), max_in_flight=max_in_flight)
+    await asyncio.gather(*(
+        asyncio.gather(*(client.generate(prompt) for prompt in prompts)) for _ in range(reports)
+    ))
+    return reports, client.get_metrics()["max_in_flight_seen"]
+
+def run(report_counts=(1, 10, 40), latency: float = 0.5, max_in_flight: int = 64):
+    logging.getLogger("backend").setLevel(logging.WARNING)
+    prompts = report_prompts()
+    print(f"{len(prompts)} Gemini calls per report, {latency * 1000:.0f} ms simulated latency\n")
+    print(f"{'reports':>7} | {'threaded s':>10} {'done':>5} {'threads':>7} | {'async s':>8} {'done':>5} {'in flight':>9}")
+
+    for reports in report_counts:
+        start = time.perf_counter()
+        threaded_done, threads = asyncio.run(threaded_load(prompts, reports, latency))
+        threaded_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        async_done, in_flight = asyncio.run(async_load(prompts, reports, latency, max_in_flight))
+        async_seconds = time.perf_counter() - start
+
+        print(f"{reports:>7} | {threaded_seconds:>10.2f} {threaded_done:>5} {threads:>7} | "
+              f"{async_seconds:>8.2f} {async_done:>5} {in_flight:>9}")
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,95 @@
+"""
+Job queue end to end on one machine: worker processes sharing one SQLite
+queue file, with a simulated job that waits like a Document AI call
+
+Reports throughput per number of worker processes, then kills one worker
+with SIGKILL mid-job to show its jobs are redelivered once their visibility
+timeout runs out and that every job still completes (delivery is at least
+once: a job the killed worker finished but never acked runs again).
+
+Usage: python -m backend.benchmarks.job_queue_benchmark [jobs] [job_ms]
+"""
+import os
+import sys
+import time
+import signal
+import asyncio
+import sqlite3
+import tempfile
+import multiprocessing
+from pathlib import Path
+
+from backend.config.worker_config import JobWorkerConfig
+from backend.services.job_queue import SQLiteJobQueue
+from backend.services.job_worker import JobWorker
+
+def worker_process(queue_path: str, results_path: str, job_ms: int, concurrency: int, visibility_timeout: float) -> None:
+    """One worker: the handler records the job in a results table after waiting job_ms"""
+    results = sqlite3.connect(results_path, isolation_level=None, timeout=30, check_same_thread=False)
+    results.execute("PRAGMA journal_mode = WAL")
+    results.execute("PRAGMA synchronous = OFF")
+
+    async def handler(task):
+        await asyncio.sleep(job_ms / 1000)
+        results.execute("INSERT INTO results (job_id, pid) VALUES (?, ?)", (task.job_id, os.getpid()))
+
+    config = JobWorkerConfig(concurrency=concurrency, visibility_timeout_seconds=visibility_timeout,
+                             poll_interval_seconds=0.05, drain_timeout_seconds=5)
+    worker = JobWorker(SQLiteJobQueue(queue_path), handler, config)
+
+    async def serve():
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, worker.stop)
+        await worker.run()
+
+    asyncio.run(serve())
+
+def run_case(tmp: Path, name: str, jobs: int, job_ms: int, processes: int, concurrency: int,
+             visibility_timeout: float = 30.0, kill_after: float = None):
+    queue_path = str(tmp / f"{name}-queue.sqlite3")
+    results_path = str(tmp / f"{name}-results.sqlite3")
+    sqlite3.connect(results_path).execute("CREATE TABLE results (job_id TEXT, pid INTEGER)").connection.commit()
+    queue = SQLiteJobQueue(queue_path)
+    for index in range(jobs):
+        queue.enqueue(f"job-{index}")
+
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=worker_process,
+                               args=(queue_path, results_path, job_ms, concurrency, visibility_timeout))
+               for _ in range(processes)]
+    start_time = time.perf_counter()
+    for process in workers:
+        process.start()
+    if kill_after is not None:
+        time.sleep(kill_after)
+        os.kill(workers[0].pid, signal.SIGKILL)
+
+    while queue.counts()['done'] < jobs:
+        time.sleep(0.02)
+    elapsed = time.perf_counter() - start_time
+    for process in workers:
+        if process.is_alive():
+            process.terminate()
+        process.join()
+
+    rows = sqlite3.connect(results_path).execute("SELECT job_id, count(*) FROM results GROUP BY job_id").fetchall()
+    redelivered = queue._connection().execute("SELECT count(*) FROM queue_tasks WHERE attempts > 1").fetchone()[0]
+    queue.close()
+    return elapsed, len(rows), max(count for _, count in rows), redelivered
+
+def run(jobs: int = 200, job_ms: int = 100):
+    print(f"{jobs} jobs of {job_ms} ms, 4 concurrent per process\n")
+    print(f"{'case':<26} | {'s':>6} {'jobs/s':>7} | {'completed':>9} {'max runs':>8} {'redelivered':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for processes in (1, 2, 4):
+            elapsed, completed, max_runs, redelivered = run_case(Path(tmp), f"p{processes}", jobs, job_ms, processes, 4)
+            print(f"{f'{processes} process(es)':<26} | {elapsed:>6.2f} {jobs / elapsed:>7.1f} | "
+                  f"{completed:>9} {max_runs:>8} {redelivered:>11}")
+
+        elapsed, completed, max_runs, redelivered = run_case(
+            Path(tmp), "kill", jobs, job_ms, 2, 4, visibility_timeout=2.0, kill_after=1.5
+        )
+        print(f"{'2 processes, 1 SIGKILLed':<26} | {elapsed:>6.2f} {jobs / elapsed:>7.1f} | "
+              f"{completed:>9} {max_runs:>8} {redelivered:>11}")
+
+if __name__ == "__main__":
+    run(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,82 @@
+"""
+Job store benchmark: status updates per second and list-by-user latency for
+the SQLite store at a million jobs, with the JSON-file store at a smaller
+size for comparison (a million files is impractical to even create)
+
+Usage: python -m backend.benchmarks.job_store_benchmark [job_count] [json_job_count]
+"""
+import sys
+import time
+import random
+import tempfile
+import statistics
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from backend.services.job_store import JsonFileJobStore, SQLiteJobStore
+
+STATUSES = ["pending", "processing", "completed", "failed"]
+
+def synthetic_jobs(count: int, jobs_per_user: int = 100, seed: int = 11):
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    users = max(1, count // jobs_per_user)
+    for index in range(count):
+        yield {
+            'job_id': f"job-{index:08d}",
+            'user_id': f"user-{rng.randrange(users):06d}",
+            'status': rng.choice(STATUSES),
+            'filename': f"report-{index}.pdf",
+            'file_size': rng.randrange(50_000, 5_000_000),
+            'created_at': (start + timedelta(seconds=index * 7)).isoformat(),
+            'completed_at': None,
+            'error_message': None,
+            'document_ai_result': None,
+            'llm_result': None,
+            'final_tradelines': None
+        }
+
+def measure(store, count: int, updates: int, lists: int, seed: int = 5):
+    rng = random.Random(seed)
+    users = max(1, count // 100)
+
+    start = time.perf_counter()
+    for _ in range(updates):
+        store.update_status(f"job-{rng.randrange(count):08d}", rng.choice(STATUSES))
+    updates_per_second = updates / (time.perf_counter() - start)
+
+    latencies = []
+    for _ in range(lists):
+        user_id = f"user-{rng.randrange(users):06d}"
+        query_start = time.perf_counter()
+        store.list_jobs(user_id=user_id, limit=50)
+        latencies.append((time.perf_counter() - query_start) * 1000)
+    latencies.sort()
+    return updates_per_second, statistics.median(latencies), latencies[int(len(latencies) * 0.99) - 1]
+
+def report(label: str, count: int, load_seconds: float, results):
+    updates_per_second, p50, p99 = results
+    print(f"{label:<8} {count:>9} | {load_seconds:>7.1f} | {updates_per_second:>10.0f} | {p50:>9.2f} {p99:>9.2f}")
+
+def run(job_count: int = 1_000_000, json_job_count: int = 5_000):
+    print(f"{'store':<8} {'jobs':>9} | {'load s':>7} | {'updates/s':>10} | {'list p50':>9} {'list p99':>9}  (ms, 50 newest jobs of one user)")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SQLiteJobStore(str(Path(tmp) / "jobs.sqlite3"))
+        start = time.perf_counter()
+        batch = []
+        for job in synthetic_jobs(job_count):
+            batch.append(job)
+            if len(batch) == 10_000:
+                store.put_many(batch)
+                batch = []
+        store.put_many(batch)
+        report("sqlite", job_count, time.perf_counter() - start, measure(store, job_count, 20_000, 1_000))
+        store.close()
+
+        json_store = JsonFileJobStore(str(Path(tmp) / "jobs"))
+        start = time.perf_counter()
+        json_store.put_many(synthetic_jobs(json_job_count))
+        report("json", json_job_count, time.perf_counter() - start, measure(json_store, json_job_count, 2_000, 20))
+
+if __name__ == "__main__":
+    run(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,127 @@
+"""
+Local stand-in for the Supabase/PostgREST RPC endpoints used to save tradelines
+
+Implements upsert_tradeline and upsert_tradelines_bulk against an SQLite table
+with the same conflict key as the tradelines table, behind a client object
+shaped like supabase-py's (client.rpc(name, params).execute().data). Each
+execute() sleeps for a simulated network round trip, so request counts show
+up in timings the way they do against the hosted database.
+"""
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tradelines (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    creditor_name TEXT,
+    account_number TEXT CHECK (length(account_number) <= 64),
+    account_balance TEXT,
+    credit_limit TEXT,
+    monthly_payment TEXT,
+    date_opened TEXT,
+    account_type TEXT,
+    account_status TEXT,
+    credit_bureau TEXT,
+    is_negative INTEGER DEFAULT 0,
+    UNIQUE (user_id, creditor_name, account_number, account_type)
+)
+"""
+
+class LocalRPCError(Exception):
+    """Mirrors postgrest's APIError: carries a PostgREST error code"""
+
+    def __init__(self, message: str, code: Optional[str] = None):
+        super().__init__(message)
+        self.code = code
+
+@dataclass
+class LocalResponse:
+    data: Any
+
+class _RPCCall:
+    def __init__(self, client: 'LocalPostgrestClient', name: str, params: Dict[str, Any]):
+        self.client = client
+        self.name = name
+        self.params = params
+
+    def execute(self) -> LocalResponse:
+        return self.client._execute(self.name, self.params)
+
+class LocalPostgrestClient:
+    """SQLite-backed client exposing the two tradeline RPCs"""
+
+    def __init__(self, db_path: str = ":memory:", latency_seconds: float = 0.0, bulk_rpc: bool = True):
+        self.latency_seconds = latency_seconds
+        self.bulk_rpc = bulk_rpc
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute(SCHEMA)
+
+    def rpc(self, name: str, params: Dict[str, Any]) -> _RPCCall:
+        return _RPCCall(self, name, params)
+
+    def count_rows(self, user_id: Optional[str] = None) -> int:
+        with self._lock:
+            if user_id is None:
+                return self._conn.execute("SELECT count(*) FROM tradelines").fetchone()[0]
+            return self._conn.execute("SELECT count(*) FROM tradelines WHERE user_id = ?", (user_id,)).fetchone()[0]
+
+    def _execute(self, name: str, params: Dict[str, Any]) -> LocalResponse:
+        # Network round trip, outside the lock like concurrent HTTP requests
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        with self._lock:
+            self.requests += 1
+            if name == "upsert_tradeline":
+                row = {key[2:]: value for key, value in params.items() if key != "p_user_id"}
+                return LocalResponse(data=self._upsert(params["p_user_id"], row))
+            if name == "upsert_tradelines_bulk" and self.bulk_rpc:
+                return LocalResponse(data=self._upsert_bulk(params["p_user_id"], params["p_tradelines"]))
+        raise LocalRPCError(f"Could not find the function public.{name}", code="PGRST202")
+
+    def _upsert_bulk(self, user_id: str, rows: list) -> list:
+        """One transaction, one savepoint per row, like the plpgsql function"""
+        results = []
+        self._conn.execute("BEGIN")
+        for ordinal, row in enumerate(rows):
+            self._conn.execute("SAVEPOINT row_save")
+            try:
+                results.append({"ordinal": ordinal, "id": self._upsert(user_id, row), "error": None})
+                self._conn.execute("RELEASE row_save")
+            except sqlite3.Error as e:
+                self._conn.execute("ROLLBACK TO row_save")
+                self._conn.execute("RELEASE row_save")
+                results.append({"ordinal": ordinal, "id": None, "error": str(e)})
+        self._conn.execute("COMMIT")
+        return results
+
+    def _upsert(self, user_id: str, row: Dict[str, Any]) -> str:
+        values = (
+            str(uuid.uuid4()), user_id, row.get("creditor_name", ""), row.get("account_number", ""),
+            row.get("account_balance", ""), row.get("credit_limit", ""), row.get("monthly_payment", ""),
+            row.get("date_opened", ""), row.get("account_type", ""), row.get("account_status", ""),
+            row.get("credit_bureau", ""), int(bool(row.get("is_negative", False)))
+        )
+        self._conn.execute("""
+            INSERT INTO tradelines (id, user_id, creditor_name, account_number, account_balance, credit_limit,
+                                    monthly_payment, date_opened, account_type, account_status, credit_bureau, is_negative)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (user_id, creditor_name, account_number, account_type) DO UPDATE SET
+                account_balance = excluded.account_balance,
+                credit_limit = excluded.credit_limit,
+                monthly_payment = excluded.monthly_payment,
+                date_opened = excluded.date_opened,
+                account_status = excluded.account_status,
+                credit_bureau = excluded.credit_bureau,
+                is_negative = excluded.is_negative
+        """, values)
+        return self._conn.execute(
+            "SELECT id FROM tradelines WHERE user_id = ? AND creditor_name = ? AND account_number = ? AND account_type = ?",
+            (user_id, values[2], values[3], values[8])
+        ).fetchone()[0]
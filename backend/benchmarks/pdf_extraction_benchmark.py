@@ -0,0 +1,55 @@
+"""
+Pages per second of PDF text extraction: in-process serial versus page
+shards on a process pool of increasing size
+
+Usage: python -m backend.benchmarks.pdf_extraction_benchmark
+"""
+import os
+import time
+import asyncio
+import logging
+
+from backend.config.worker_config import WorkerPoolConfig
+from backend.services.pdf_extraction_service import PdfExtractionService
+from backend.services.worker_pools import WorkerPools
+from backend.utils.pdf_text import extract_pdf_text, count_pdf_pages
+from backend.benchmarks.synthetic_reports import generate_report_pdf
+
+def best_seconds(fn, repeat: int) -> float:
+    """Best-of-N wall time so one noisy run does not skew the comparison"""
+    best = float("inf")
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start_time)
+    return best
+
+def run(tradeline_counts=(180, 600), worker_counts=None, repeat: int = 3):
+    logging.getLogger("backend.services.pdf_extraction_service").setLevel(logging.WARNING)
+    cpu_count = os.cpu_count() or 1
+    worker_counts = worker_counts or sorted({1, 2, 4, cpu_count})
+    print(f"{cpu_count} CPU(s) available\n")
+    print(f"{'pages':>6} {'workers':>8} {'shards':>7} | {'pages/s':>9} {'speedup':>8}")
+
+    for count in tradeline_counts:
+        pdf, _ = generate_report_pdf(num_tradelines=count)
+        pages = count_pdf_pages(pdf)
+        serial = pages / best_seconds(lambda: extract_pdf_text(pdf), repeat)
+        print(f"{pages:>6} {'serial':>8} {1:>7} | {serial:>9,.0f} {1:>7.1f}x")
+
+        for workers in worker_counts:
+            pools = WorkerPools(WorkerPoolConfig(cpu_max_workers=workers, pdf_parallel_page_threshold=2,
+                                                 pdf_min_pages_per_shard=1))
+            extractor = PdfExtractionService(pools)
+            loop = asyncio.new_event_loop()
+            try:
+                # Spawned workers import the app on first use; keep that out of the timing
+                loop.run_until_complete(extractor.extract_pages(pdf))
+                rate = pages / best_seconds(lambda: loop.run_until_complete(extractor.extract_pages(pdf)), repeat)
+            finally:
+                loop.close()
+                pools.shutdown()
+            print(f"{pages:>6} {workers:>8} {len(extractor.plan_shards(pages)):>7} | {rate:>9,.0f} {rate / serial:>7.1f}x")
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,90 @@
+"""
+Event-loop lag while StorageService writes a 50 MB upload and a large
+Document AI result: the previous blocking implementation (open/json.dump
+inside async defs) against the current off-loop, atomic one
+
+Usage: python -m backend.benchmarks.storage_io_benchmark [upload_mb]
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+from backend.services.job_store import SQLiteJobStore
+from backend.services.storage_service import StorageService
+from backend.utils.loop_lag import EventLoopLagMonitor
+
+def ai_results_payload(pages: int = 400):
+    """Roughly the shape of a stored DocumentAIResult for a long report"""
+    line = "CHASE BANK USA   ACCOUNT ****1234   BALANCE $1,234.00   OPENED 01/2019   STATUS CURRENT\n"
+    return {
+        "text": line * 60 * pages,
+        "pages": [{"page_number": page, "text": line * 60} for page in range(1, pages + 1)],
+        "tables": [{"rows": [["CHASE", "$1,234", "Current"]] * 50} for _ in range(pages)]
+    }
+
+class LegacyStorage:
+    """The blocking StorageService methods as they were"""
+
+    def __init__(self, base_path: Path):
+        self.base_path = base_path
+        for name in ("uploads", "ai_results"):
+            (base_path / name).mkdir(parents=True, exist_ok=True)
+
+    async def store_uploaded_file(self, job_id, file_content, metadata):
+        file_path = self.base_path / "uploads" / f"{job_id}.bin"
+        with open(file_path, 'wb') as f:
+            f.write(file_content)
+        storage_metadata = {
+            "job_id": job_id,
+            "file_size": len(file_content),
+            "file_hash": hashlib.sha256(file_content).hexdigest(),
+            "stored_at": datetime.now().isoformat(),
+            **metadata
+        }
+        with open(self.base_path / "uploads" / f"{job_id}.json", 'w') as f:
+            json.dump(storage_metadata, f, indent=2)
+
+    async def store_document_ai_results(self, job_id, ai_results):
+        with open(self.base_path / "ai_results" / f"{job_id}.json", 'w') as f:
+            json.dump(ai_results, f, indent=2)
+
+async def measure(storage, upload: bytes, ai_results, rounds: int = 3):
+    monitor = EventLoopLagMonitor(interval_seconds=0.005)
+    monitor.start()
+    await asyncio.sleep(0.05)
+    monitor.reset()
+    start = time.perf_counter()
+    for round_index in range(rounds):
+        await storage.store_uploaded_file(f"job-{round_index}", upload, {"file_name": "report.pdf"})
+        await storage.store_document_ai_results(f"job-{round_index}", ai_results)
+    elapsed = time.perf_counter() - start
+    await asyncio.sleep(0.02)
+    await monitor.stop()
+    return elapsed, monitor.get_metrics()
+
+def run(upload_mb: int = 50):
+    logging.getLogger("backend").setLevel(logging.WARNING)
+    upload = os.urandom(upload_mb * 1024 * 1024)
+    ai_results = ai_results_payload()
+    ai_mb = len(json.dumps(ai_results)) / 1024 / 1024
+    print(f"{upload_mb} MB upload + {ai_mb:.0f} MB Document AI result, 3 rounds, 5 ms lag probe\n")
+    print(f"{'implementation':<16} | {'seconds':>7} | {'max lag ms':>10} {'p99 lag ms':>10} {'p50 lag ms':>10}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        implementations = [
+            ("blocking (old)", LegacyStorage(Path(tmp) / "legacy")),
+            ("off-loop atomic", StorageService(str(Path(tmp) / "new"), job_store=SQLiteJobStore(":memory:")))
+        ]
+        for label, storage in implementations:
+            elapsed, lag = asyncio.run(measure(storage, upload, ai_results))
+            print(f"{label:<16} | {elapsed:>7.2f} | {lag['max_lag_ms']:>10.1f} {lag['p99_lag_ms']:>10.1f} {lag['p50_lag_ms']:>10.1f}")
+
+if __name__ == "__main__":
+    run(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,124 @@
+"""
+Synthetic tri-bureau credit report text for offline benchmarks
+"""
+import random
+from typing import List, Tuple
+
+CREDITORS = [
+    "CAPITAL ONE", "CHASE", "DISCOVER", "AMERICAN EXPRESS", "SYNCHRONY BANK",
+    "WELLS FARGO", "NAVIENT", "TOYOTA FINANCIAL", "ROCKET MORTGAGE", "NAVY FEDERAL",
+    "CITIBANK", "BARCLAYS", "SANTANDER", "SOFI", "ONEMAIN"
+]
+STATUSES = ["Current", "Closed", "30 days late", "Charged Off", "Collection", "Pays as agreed"]
+BUREAUS = ["EXPERIAN", "EQUIFAX", "TRANSUNION"]
+
+def generate_tradeline_block(rng: random.Random, index: int) -> str:
+    """Generate one tradeline block as it appears in extracted report text"""
+    creditor = rng.choice(CREDITORS)
+    lines = [
+        creditor,
+        f"Account # ****{index:04d}",
+        f"Account Type: {rng.choice(['Revolving', 'Installment', 'Mortgage'])}",
+        f"Balance: ${rng.randint(0, 25000):,}.00",
+        f"Credit Limit: ${rng.randint(500, 30000):,}",
+        f"Monthly Payment: ${rng.randint(25, 900)}",
+        f"Date Opened: {rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}/{rng.randint(2005, 2023)}",
+        f"Status: {rng.choice(STATUSES)}",
+        f"Creditor Address: PO BOX {rng.randint(1000, 99999)}, WILMINGTON DE {rng.randint(19800, 19899)}",
+        "Responsibility: Individual",
+        "Two-Year Payment History:",
+    ]
+    for year in (2023, 2022):
+        lines.append(f"{year}  Jan Feb Mar Apr May Jun Jul Aug Sep Oct Nov Dec")
+        lines.append("      " + " ".join(rng.choice(["OK ", "OK ", "OK ", "30 "]) for _ in range(12)))
+    lines.append(f"Last Reported: {rng.randint(1, 12):02d}/2023")
+    if rng.random() < 0.3:
+        lines.append("Remarks: Account information disputed by consumer, meets FCRA requirements")
+    return "\n".join(lines)
+
+def generate_report(num_tradelines: int = 60, seed: int = 7, lines_per_page: int = 55) -> Tuple[str, List[str]]:
+    """
+    Build a report with bureau sections, page footers and tradeline blocks.
+    Returns (text, tradeline_blocks)
+    """
+    rng = random.Random(seed)
+    blocks = []
+    out_lines = ["CONSUMER CREDIT REPORT", "Name: JOHN Q SAMPLE", "Report Date: 01/15/2024", ""]
+    per_bureau = max(num_tradelines // len(BUREAUS), 1)
+    index = 0
+    for bureau in BUREAUS:
+        out_lines.append(f"{bureau} CREDIT REPORT")
+        out_lines.append("")
+        for _ in range(per_bureau):
+            index += 1
+            block = generate_tradeline_block(rng, index)
+            blocks.append(block)
+            out_lines.extend(block.split("\n"))
+            out_lines.append("")
+
+    # Insert page footers at fixed line intervals, as PDF text extraction does
+    paged = []
+    page = 1
+    for i, line in enumerate(out_lines, 1):
+        paged.append(line)
+        if i % lines_per_page == 0:
+            paged.append(f"Page {page}")
+            page += 1
+    return "\n".join(paged), blocks
+
+def build_text_pdf(pages: List[str]) -> bytes:
+    """
+    Build a minimal PDF with one page per string and one text line per line.
+    Written by hand so benchmarks and tests need no PDF authoring library.
+    """
+    def escape(line: str) -> str:
+        return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    page_count = len(pages)
+    # Object numbers: 1 catalog, 2 page tree, 3 font, then (page, content) pairs
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        2: ("<< /Type /Pages /Kids [%s] /Count %d >>" % (
+            " ".join(f"{4 + 2 * i} 0 R" for i in range(page_count)), page_count)).encode(),
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    for i, page_text in enumerate(pages):
+        page_obj, content_obj = 4 + 2 * i, 5 + 2 * i
+        ops = ["BT", "/F1 9 Tf", "11 TL", "36 756 Td"]
+        for line in page_text.split("\n"):
+            ops.append(f"({escape(line)}) Tj T*")
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1", "replace")
+        objects[page_obj] = (
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_obj} 0 R >>"
+        ).encode()
+        objects[content_obj] = b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number in sorted(objects):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, objects[number])
+    xref_offset = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    return bytes(out)
+
+def generate_report_pdf(num_tradelines: int = 60, seed: int = 7, lines_per_page: int = 55) -> Tuple[bytes, List[str]]:
+    """
+    Build a synthetic report as a text PDF, splitting pages at the page footers.
+    Returns (pdf_bytes, tradeline_blocks)
+    """
+    text, blocks = generate_report(num_tradelines, seed, lines_per_page)
+    pages, current = [], []
+    for line in text.split("\n"):
+        current.append(line)
+        if line.startswith("Page "):
+            pages.append("\n".join(current))
+            current = []
+    if current:
+        pages.append("\n".join(current))
+    return build_text_pdf(pages), blocks
@@ -0,0 +1,60 @@
+"""
+Tradeline save benchmark: one upsert_tradeline RPC per row versus batched
+upsert_tradelines_bulk calls, against the local PostgREST stand-in with a
+simulated network round trip
+
+Usage: python -m backend.benchmarks.tradeline_save_benchmark
+"""
+import time
+import asyncio
+import logging
+
+from pydantic import BaseModel # type: ignore
+
+from backend.services.tradeline_writer import TradelineBulkWriter
+from backend.benchmarks.local_postgrest import LocalPostgrestClient
+from backend.benchmarks.synthetic_reports import generate_report
+from backend.utils.basic_parser import parse_tradelines_basic
+
+class BenchmarkTradeline(BaseModel):
+    """Same fields and defaults as the API's TradelineSchema"""
+    creditor_name: str = "NULL"
+    account_balance: str = ""
+    credit_limit: str = ""
+    monthly_payment: str = ""
+    account_number: str = ""
+    date_opened: str = "xx/xx/xxxxx"
+    account_type: str = ""
+    account_status: str = ""
+    credit_bureau: str = ""
+    is_negative: bool = False
+    dispute_count: int = 0
+
+def report_tradelines(num_tradelines: int):
+    text, _ = generate_report(num_tradelines=num_tradelines)
+    return parse_tradelines_basic(text)
+
+def timed_save(tradelines, latency: float, bulk: bool, batch_size: int):
+    client = LocalPostgrestClient(latency_seconds=latency, bulk_rpc=bulk)
+    writer = TradelineBulkWriter(client, BenchmarkTradeline, batch_size=batch_size)
+    start = time.perf_counter()
+    result = asyncio.run(writer.save(tradelines, "benchmark-user"))
+    return time.perf_counter() - start, result, client.count_rows()
+
+def run(report_sizes=(60, 500), batch_sizes=(25, 100, 500), latency: float = 0.02):
+    # The per-row mode runs through the writer's fallback, which logs a warning
+    logging.getLogger("backend").setLevel(logging.ERROR)
+    print(f"{latency * 1000:.0f} ms simulated round trip per request\n")
+    print(f"{'rows':>5} | {'mode':<16} | {'requests':>8} {'seconds':>8} {'rows/s':>8} {'saved':>6} {'in db':>6}")
+
+    for size in report_sizes:
+        tradelines = report_tradelines(size)
+        modes = [("per-row rpc", False, len(tradelines))] + [(f"bulk x{b}", True, b) for b in batch_sizes]
+        for label, bulk, batch_size in modes:
+            seconds, result, rows_in_db = timed_save(tradelines, latency, bulk, batch_size)
+            print(f"{len(tradelines):>5} | {label:<16} | {result.requests:>8} {seconds:>8.3f} "
+                  f"{len(tradelines) / seconds:>8.0f} {result.saved_count:>6} {rows_in_db:>6}")
+        print()
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,99 @@
+"""
+Peak RSS of receiving one uploaded PDF, hashing it, storing it and opening
+it for the parser: the previous path (await file.read(), write, read back,
+BytesIO for PyPDF2) against the streamed spool + rename + mmap path
+
+Each case runs in a fresh process so ru_maxrss is that case's own peak.
+The upload arrives the way Starlette hands it over: an UploadFile over a
+temp file the multipart parser has already spooled to disk.
+
+Usage: python -m backend.benchmarks.upload_memory_benchmark [size_mb ...]
+"""
+import sys
+import time
+import asyncio
+import hashlib
+import resource
+import subprocess
+import tempfile
+from pathlib import Path
+
+from starlette.datastructures import UploadFile # type: ignore
+
+from backend.utils.atomic_files import atomic_write_bytes
+from backend.utils.pdf_text import count_pdf_pages
+from backend.utils.upload_stream import spool_upload
+
+FILL_CHUNK = b"0" * (1024 * 1024)
+
+def write_padded_pdf(f, size_mb: int) -> None:
+    """A one-page PDF carrying an embedded stream of size_mb MB, written without holding it in memory"""
+    offsets = []
+
+    def obj(body: bytes) -> None:
+        offsets.append(f.tell())
+        f.write(b"%d 0 obj\n" % len(offsets) + body + b"\nendobj\n")
+
+    f.write(b"%PDF-1.4\n")
+    obj(b"<< /Type /Catalog /Pages 2 0 R >>")
+    obj(b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>")
+    obj(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R >>")
+    text = b"BT /F1 12 Tf 72 720 Td (CONSUMER CREDIT REPORT) Tj ET"
+    obj(b"<< /Length %d >>\nstream\n" % len(text) + text + b"\nendstream")
+    offsets.append(f.tell())
+    f.write(b"5 0 obj\n<< /Length %d >>\nstream\n" % (size_mb * len(FILL_CHUNK)))
+    for _ in range(size_mb):
+        f.write(FILL_CHUNK)
+    f.write(b"\nendstream\nendobj\n")
+    xref_offset = f.tell()
+    f.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(offsets) + 1))
+    for offset in offsets:
+        f.write(b"%010d 00000 n \n" % offset)
+    f.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(offsets) + 1, xref_offset))
+
+async def previous_path(upload: UploadFile, storage_dir: Path) -> int:
+    content = await upload.read()
+    hashlib.sha256(content).hexdigest()
+    atomic_write_bytes(storage_dir / "job.bin", content)
+    content = (storage_dir / "job.bin").read_bytes()    # get_stored_file
+    return count_pdf_pages(content)
+
+async def streamed_path(upload: UploadFile, storage_dir: Path) -> int:
+    spooled = await spool_upload(upload, storage_dir)
+    spooled.move_to(storage_dir / "job.bin")
+    return count_pdf_pages(spooled.path)
+
+def measure(implementation: str, size_mb: int) -> None:
+    """Child process: build the spooled request file, then time and measure one upload"""
+    with tempfile.TemporaryDirectory() as tmp:
+        request_file = tempfile.TemporaryFile(dir=tmp)
+        write_padded_pdf(request_file, size_mb)
+        request_file.seek(0)
+        upload = UploadFile(file=request_file, filename="report.pdf")
+        handler = previous_path if implementation == "previous" else streamed_path
+
+        baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        start_time = time.perf_counter()
+        pages = asyncio.run(handler(upload, Path(tmp)))
+        elapsed = time.perf_counter() - start_time
+        peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        assert pages == 1
+        print(f"{(peak_kb - baseline_kb) / 1024:.1f} {elapsed:.3f}")
+
+def run(sizes_mb=(10, 50, 200)):
+    print(f"{'size MB':>7} | {'previous peak MB':>16} {'s':>6} | {'streamed peak MB':>16} {'s':>6}")
+    for size_mb in sizes_mb:
+        row = []
+        for implementation in ("previous", "streamed"):
+            output = subprocess.run(
+                [sys.executable, "-m", "backend.benchmarks.upload_memory_benchmark", "--child", implementation, str(size_mb)],
+                capture_output=True, text=True, check=True
+            ).stdout.split()
+            row.extend(float(value) for value in output)
+        print(f"{size_mb:>7} | {row[0]:>16.1f} {row[1]:>6.2f} | {row[2]:>16.1f} {row[3]:>6.2f}")
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--child"]:
+        measure(sys.argv[2], int(sys.argv[3]))
+    else:
+        run(tuple(int(arg) for arg in sys.argv[1:]) or (10, 50, 200))
@@ -0,0 +1,32 @@
+import os
+from dataclasses import dataclass
+
+@dataclass
+class PageTriageConfig:
+    """Thresholds deciding whether a page's embedded text layer is usable or the page needs OCR"""
+
+    enabled: bool = True
+
+    # Fewer non-whitespace characters than this means a scanned/image-only page
+    min_chars: int = 40
+
+    # Share of non-whitespace characters that are letters or digits
+    min_glyph_density: float = 0.5
+
+    # Share of characters that are control, private-use or replacement glyphs,
+    # or "(cid:N)" placeholders from fonts without a Unicode map
+    max_garbage_ratio: float = 0.1
+
+    @classmethod
+    def from_env(cls) -> 'PageTriageConfig':
+        """Create configuration from environment variables"""
+        return cls(
+            enabled=os.getenv("OCR_TRIAGE_ENABLED", "true").lower() == "true",
+            min_chars=int(os.getenv("OCR_TRIAGE_MIN_CHARS", "40")),
+            min_glyph_density=float(os.getenv("OCR_TRIAGE_MIN_GLYPH_DENSITY", "0.5")),
+            max_garbage_ratio=float(os.getenv("OCR_TRIAGE_MAX_GARBAGE_RATIO", "0.1"))
+        )
+
+def get_triage_config() -> PageTriageConfig:
+    """Get page triage configuration instance"""
+    return PageTriageConfig.from_env()
@@ -0,0 +1,75 @@
+import os
+from dataclasses import dataclass
+
+@dataclass
+class WorkerPoolConfig:
+    """Configuration for the blocking-work executor pools"""
+
+    # Network-bound vendor calls (Document AI, Gemini)
+    io_max_workers: int = 16
+    io_max_queue: int = 64
+
+    # CPU-bound PDF parsing
+    cpu_max_workers: int = 4
+    cpu_max_queue: int = 32
+    cpu_pool_kind: str = "process"  # "process" or "thread"
+
+    # Backpressure
+    retry_after_seconds: int = 5
+
+    # PDF text extraction: documents with at least this many pages are split
+    # into page ranges extracted in parallel on the process pool
+    pdf_parallel_page_threshold: int = 16
+    pdf_min_pages_per_shard: int = 4
+
+    @classmethod
+    def from_env(cls) -> 'WorkerPoolConfig':
+        """Create configuration from environment variables"""
+        return cls(
+            io_max_workers=int(os.getenv("WORKER_IO_POOL_SIZE", "16")),
+            io_max_queue=int(os.getenv("WORKER_IO_QUEUE_SIZE", "64")),
+            cpu_max_workers=int(os.getenv("WORKER_CPU_POOL_SIZE", str(os.cpu_count() or 4))),
+            cpu_max_queue=int(os.getenv("WORKER_CPU_QUEUE_SIZE", "32")),
+            cpu_pool_kind=os.getenv("WORKER_CPU_POOL_KIND", "process"),
+            retry_after_seconds=int(os.getenv("WORKER_RETRY_AFTER_SECONDS", "5")),
+            pdf_parallel_page_threshold=int(os.getenv("PDF_PARALLEL_PAGE_THRESHOLD", "16")),
+            pdf_min_pages_per_shard=int(os.getenv("PDF_MIN_PAGES_PER_SHARD", "4"))
+        )
+
+@dataclass
+class JobWorkerConfig:
+    """Configuration for the standalone job queue worker"""
+
+    # Jobs processed at once by one worker process
+    concurrency: int = 2
+
+    # A reserved job is hidden from other workers this long; the worker
+    # extends the lease while the job runs, so it only runs out if the
+    # worker dies or stalls
+    visibility_timeout_seconds: float = 300.0
+    poll_interval_seconds: float = 1.0
+
+    # Failed jobs are retried after base * 2**(attempt - 1), capped
+    max_attempts: int = 3
+    retry_backoff_seconds: float = 30.0
+    max_backoff_seconds: float = 600.0
+
+    # On SIGTERM, stop reserving and wait this long for running jobs
+    drain_timeout_seconds: float = 60.0
+
+    @classmethod
+    def from_env(cls) -> 'JobWorkerConfig':
+        """Create configuration from environment variables"""
+        return cls(
+            concurrency=int(os.getenv("JOB_WORKER_CONCURRENCY", "2")),
+            visibility_timeout_seconds=float(os.getenv("JOB_VISIBILITY_TIMEOUT_SECONDS", "300")),
+            poll_interval_seconds=float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "1")),
+            max_attempts=int(os.getenv("JOB_MAX_ATTEMPTS", "3")),
+            retry_backoff_seconds=float(os.getenv("JOB_RETRY_BACKOFF_SECONDS", "30")),
+            max_backoff_seconds=float(os.getenv("JOB_MAX_BACKOFF_SECONDS", "600")),
+            drain_timeout_seconds=float(os.getenv("JOB_DRAIN_TIMEOUT_SECONDS", "60"))
+        )
+
+def get_worker_config() -> WorkerPoolConfig:
+    """Get worker pool configuration instance"""
+    return WorkerPoolConfig.from_env()
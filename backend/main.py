@@ -1,950 +1,1247 @@
-"""
-PDF Credit Report Processing with Document AI + Gemini fallback
-Extracts tradelines and saves to Supabase
-Enhanced with comprehensive debugging and error handling
-"""
-import os
-import PyPDF2 # type: ignore
-import tempfile
-import logging
-import re
-import traceback
-from typing import List, Dict, Any, Optional
-
-from fastapi import FastAPI, UploadFile, File, HTTPException, Form # type: ignore
-from fastapi.middleware.cors import CORSMiddleware # type: ignore
-from pydantic import BaseModel, ValidationError # type: ignore
-
-# Document AI imports
-from google.api_core.client_options import ClientOptions # type: ignore
-from google.cloud import documentai
-
-# Gemini AI imports
-import google.generativeai as genai # type: ignore
-from google.oauth2 import service_account # type: ignore
-
-# Supabase
-from supabase import create_client, Client
-from datetime import datetime
-
-from dotenv import load_dotenv # type: ignore
-load_dotenv()
-
-# Enhanced logging setup
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-logger = logging.getLogger(__name__)
-
-# Environment variables with debugging
-PROJECT_ID = os.getenv("GOOGLE_CLOUD_PROJECT_ID")
-LOCATION = os.getenv("GOOGLE_CLOUD_LOCATION", "us")
-PROCESSOR_ID = os.getenv("DOCUMENT_AI_PROCESSOR_ID")
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-SUPABASE_URL = "https://gywohmbqohytziwsjrps.supabase.co"
-SUPABASE_ANON_KEY = os.getenv("SUPABASE_ANON_KEY")
-
-# Debug environment variables
-logger.info(f"🔧 Environment Check:")
-logger.info(f"  PROJECT_ID: {'✅ Set' if PROJECT_ID else '❌ Missing'}")
-logger.info(f"  LOCATION: {LOCATION}")
-logger.info(f"  PROCESSOR_ID: {'✅ Set' if PROCESSOR_ID else '❌ Missing'}")
-logger.info(f"  GEMINI_API_KEY: {'✅ Set' if GEMINI_API_KEY else '❌ Missing'}")
-logger.info(f"  SUPABASE_URL: {'✅ Set' if SUPABASE_URL else '❌ Missing'}")
-logger.info(f"  SUPABASE_ANON_KEY: {'✅ Set' if SUPABASE_ANON_KEY else '❌ Missing'}")
-
-# Initialize services with error handling
-try:
-    if SUPABASE_URL and SUPABASE_ANON_KEY:
-        supabase: Client = create_client(SUPABASE_URL, SUPABASE_ANON_KEY)
-        logger.info("✅ Supabase client initialized")
-    else:
-        logger.error("❌ Supabase configuration missing")
-        supabase = None
-except Exception as e:
-    logger.error(f"❌ Supabase initialization failed: {e}")
-    supabase = None
-
-try:
-    if GEMINI_API_KEY:
-        genai.configure(api_key=GEMINI_API_KEY)
-        gemini_model = genai.GenerativeModel('gemini-1.5-flash')
-        logger.info("✅ Gemini model initialized")
-    else:
-        logger.error("❌ Gemini API key missing")
-        gemini_model = None
-except Exception as e:
-    logger.error(f"❌ Gemini initialization failed: {e}")
-    gemini_model = None
-
-# Initialize Document AI client
-try:
-    if os.path.exists('./service-account.json'):
-        credentials = service_account.Credentials.from_service_account_file('./service-account.json')
-        client = documentai.DocumentProcessorServiceClient(credentials=credentials)
-        logger.info("✅ Document AI client initialized with service account")
-    else:
-        logger.warning("⚠️ Service account file not found, using default credentials")
-        client = documentai.DocumentProcessorServiceClient()
-        logger.info("✅ Document AI client initialized with default credentials")
-except Exception as e:
-    logger.error(f"❌ Document AI initialization failed: {e}")
-    client = None
-
-# Zod-like validation using Pydantic
-class TradelineSchema(BaseModel):
-    creditor_name: str = "NULL"
-    account_balance: str = ""
-    credit_limit: str = ""
-    monthly_payment: str = ""
-    account_number: str = ""
-    date_opened: str = "xx/xx/xxxxx"
-    account_type: str = ""
-    account_status: str = ""
-    credit_bureau: str = ""
-    is_negative: bool = False
-    dispute_count: int = 0
-
-app = FastAPI(title="Credit Report Processor", debug=True)
-
-# Enhanced CORS configuration
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # In production, be more specific
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-    expose_headers=["*"]
-)
-
-class SupabaseService:
-    def __init__(self):
-        self.client = supabase
-    
-    # Insert data
-    def insert_user_profile(self, user_data):
-        """Insert a new user profile"""
-        try:
-            result = self.client.table("user_profiles").insert(user_data).execute()
-            return result.data
-        except Exception as e:
-            print(f"Error inserting user profile: {e}")
-            return None
-    
-    # Select data
-    def get_user_profile(self, user_id):
-        """Get user profile by ID"""
-        try:
-            result = self.client.table("user_profiles").select("*").eq("id", user_id).execute()
-            return result.data[0] if result.data else None
-        except Exception as e:
-            print(f"Error getting user profile: {e}")
-            return None
-    
-    # Update data
-    def update_user_profile(self, user_id, updates):
-        """Update user profile"""
-        try:
-            result = self.client.table("user_profiles").update(updates).eq("id", user_id).execute()
-            return result.data
-        except Exception as e:
-            print(f"Error updating user profile: {e}")
-            return None
-    
-    # Delete data
-    def delete_user_profile(self, user_id):
-        """Delete user profile"""
-        try:
-            result = self.client.table("user_profiles").delete().eq("id", user_id).execute()
-            return result.data
-        except Exception as e:
-            print(f"Error deleting user profile: {e}")
-            return None
-
-class DocumentAIProcessor:
-    def __init__(self):
-        if not PROJECT_ID or not PROCESSOR_ID:
-            logger.error("❌ Document AI configuration incomplete")
-            return
-        
-        opts = ClientOptions(api_endpoint=f"{LOCATION}-documentai.googleapis.com")
-        self.client = documentai.DocumentProcessorServiceClient(
-            client_options=opts, 
-            credentials=credentials if 'credentials' in globals() else None
-        )
-        logger.info(f"✅ Document AI processor configured for {LOCATION}")
-    
-    def extract_text(self, pdf_path: str) -> str:
-        """Extract text from PDF using Document AI"""
-        try:
-            logger.info(f"📄 Starting Document AI text extraction from {pdf_path}")
-            
-            with open(pdf_path, "rb") as pdf_file:
-                pdf_content = pdf_file.read()
-            
-            logger.info(f"📦 PDF content size: {len(pdf_content)} bytes")
-            
-            raw_document = documentai.RawDocument(
-                content=pdf_content,
-                mime_type="application/pdf"
-            )
-            
-            name = self.client.processor_path(PROJECT_ID, LOCATION, PROCESSOR_ID)
-            logger.info(f"🔗 Using processor: {name}")
-            
-            request = documentai.ProcessRequest(name=name, raw_document=raw_document)
-            
-            logger.info("🚀 Sending request to Document AI...")
-            result = self.client.process_document(request=request)
-            
-            extracted_text = result.document.text
-            logger.info(f"✅ Document AI extracted {len(extracted_text)} characters")
-            logger.debug(f"📝 First 500 chars: {extracted_text[:500]}...")
-            
-            return extracted_text
-            
-        except Exception as e:
-            logger.error(f"❌ Document AI failed: {str(e)}")
-            logger.error(f"📍 Traceback: {traceback.format_exc()}")
-            raise
-
-class GeminiProcessor:
-    def extract_tradelines(self, text: str) -> List[Dict[str, Any]]:
-        """Extract tradelines using Gemini AI with chunking support"""
-        try:
-            logger.info(f"🧠 Starting Gemini tradeline extraction from {len(text)} characters")
-            
-            if not gemini_model:
-                raise Exception("Gemini model not initialized")
-            
-            # If text is too long, process in chunks
-            if len(text) > 15000:
-                return self._extract_tradelines_chunked(text)
-            else:
-                return self._extract_tradelines_single(text)
-                
-        except Exception as e:
-            logger.error(f"❌ Gemini processing failed: {str(e)}")
-            logger.error(f"📍 Traceback: {traceback.format_exc()}")
-            return []
-    
-    def _extract_tradelines_single(self, text: str) -> List[Dict[str, Any]]:
-        """Extract tradelines from a single text chunk"""
-        prompt = f"""
-        Extract credit tradeline information from this credit report text. 
-        Return ONLY a JSON array of objects with these exact fields:
-        - creditor_name (string)
-        - account_balance (string, include $ if present)
-        - credit_limit (string, include $ if present) 
-        - monthly_payment (string, include $ if present)
-        - account_number (string)
-        - date_opened (string, format: MM/DD/YYYY)
-        - account_type (string: Credit Card, Mortgage, Auto Loan, etc.)
-        - account_status (string: Open, Closed, Current, etc.)
-        - credit_bureau (string: Experian, Equifax, TransUnion)
-        - is_negative (boolean: true if account has negative marks)
-
-        Text to analyze:
-        {text[:15000]}
-
-        Return only valid JSON array, no explanations:
-        """
-        
-        logger.info("🚀 Sending request to Gemini...")
-        response = gemini_model.generate_content(prompt)
-        logger.info(f"✅ Gemini response received: {len(response.text)} characters")
-        
-        # Clean up response to extract JSON
-        response_text = response.text.strip()
-        logger.debug(f"📝 Raw Gemini response: {response_text[:500]}...")
-        
-        # Remove markdown code blocks if present
-        if response_text.startswith("```"):
-            response_text = re.sub(r'^```json\s*', '', response_text)
-            response_text = re.sub(r'\s*```$', '', response_text)
-        
-        # Find JSON array
-        json_match = re.search(r'\[.*\]', response_text, re.DOTALL)
-        if json_match:
-            import json
-            tradelines = json.loads(json_match.group())
-            logger.info(f"✅ Gemini extracted {len(tradelines)} tradelines")
-            return tradelines
-        else:
-            logger.warning("⚠️ No JSON array found in Gemini response")
-            return []
-    
-    def _extract_tradelines_chunked(self, text: str) -> List[Dict[str, Any]]:
-        """Extract tradelines from text by processing in chunks"""
-        logger.info(f"📖 Processing large text in chunks: {len(text)} characters")
-        
-        chunk_size = 15000
-        overlap = 500  # Overlap to avoid cutting tradelines
-        chunks = []
-        
-        # Split text into overlapping chunks
-        for i in range(0, len(text), chunk_size - overlap):
-            chunk = text[i:i + chunk_size]
-            chunks.append(chunk)
-        
-        logger.info(f"🔄 Split into {len(chunks)} chunks")
-        
-        all_tradelines = []
-        seen_tradelines = set()  # To avoid duplicates
-        
-        for i, chunk in enumerate(chunks):
-            try:
-                logger.info(f"🔍 Processing chunk {i+1}/{len(chunks)}")
-                chunk_tradelines = self._extract_tradelines_single(chunk)
-                
-                # Deduplicate tradelines based on creditor name + account number
-                for tradeline in chunk_tradelines:
-                    identifier = f"{tradeline.get('creditor_name', '')}_{tradeline.get('account_number', '')}"
-                    if identifier not in seen_tradelines:
-                        seen_tradelines.add(identifier)
-                        all_tradelines.append(tradeline)
-                        
-            except Exception as e:
-                logger.error(f"❌ Failed to process chunk {i+1}: {str(e)}")
-                continue
-        
-        logger.info(f"✅ Total tradelines extracted from all chunks: {len(all_tradelines)}")
-        return all_tradelines
-
-def parse_tradelines_basic(text: str) -> List[Dict[str, Any]]:
-    """Basic tradeline parsing as backup"""
-    try:
-        logger.info("🔧 Using basic tradeline parsing as fallback")
-        tradelines = []
-        lines = text.split('\n')
-        
-        # Comprehensive creditor patterns
-        creditor_patterns = [
-            # Major Banks
-            r'(CHASE|Chase|chase|JP MORGAN|JPMorgan|JPMORGAN)',
-            r'(CAPITAL ONE|Capital One|capital one|CAP ONE|CAPONE)',
-            r'(CITIBANK|Citibank|citibank|CITI|Citi|citi)',
-            r'(BANK OF AMERICA|Bank of America|BOA|B OF A)',
-            r'(WELLS FARGO|Wells Fargo|WELLS|Wells)',
-            r'(DISCOVER|Discover|discover)',
-            r'(AMERICAN EXPRESS|American Express|AMEX|AmEx|amex)',
-            r'(SYNCHRONY|Synchrony|synchrony)',
-            r'(CREDIT ONE|Credit One|credit one)',
-            r'(US BANK|US Bank|U\.S\. Bank|USBANK)',
-            r'(PNC|PNC Bank|pnc)',
-            r'(TD BANK|TD Bank|td bank)',
-            r'(REGIONS|Regions|regions)',
-            r'(ALLY|Ally|ally)',
-            r'(MARCUS|Marcus|marcus)',
-            r'(BARCLAYS|Barclays|barclays)',
-            r'(HSBC|hsbc)',
-            
-            # Credit Cards
-            r'(MASTERCARD|MasterCard|mastercard)',
-            r'(VISA|Visa|visa)',
-            r'(STORE CARD|Store Card|store card)',
-            
-            # Store Cards
-            r'(AMAZON|Amazon|amazon)',
-            r'(TARGET|Target|target)',
-            r'(HOME DEPOT|Home Depot|HOMEDEPOT)',
-            r'(LOWES|Lowe\'s|LOWE\'S|lowes)',
-            r'(WALMART|Walmart|walmart)',
-            r'(COSTCO|Costco|costco)',
-            r'(NORDSTROM|Nordstrom|nordstrom)',
-            r'(MACY\'S|Macy\'s|macys)',
-            r'(KOHL\'S|Kohl\'s|kohls)',
-            r'(BEST BUY|Best Buy|bestbuy)',
-            r'(APPLE|Apple|apple)',
-            
-            # Auto Loans
-            r'(FORD CREDIT|Ford Credit|ford credit)',
-            r'(HONDA FINANCIAL|Honda Financial|honda financial)',
-            r'(TOYOTA FINANCIAL|Toyota Financial|toyota financial)',
-            r'(NISSAN MOTOR|Nissan Motor|nissan motor)',
-            r'(GM FINANCIAL|GM Financial|gm financial)',
-            r'(CHRYSLER CAPITAL|Chrysler Capital|chrysler capital)',
-            r'(ALLY AUTO|Ally Auto|ally auto)',
-            r'(SANTANDER|Santander|santander)',
-            
-            # Student Loans
-            r'(NAVIENT|Navient|navient)',
-            r'(GREAT LAKES|Great Lakes|great lakes)',
-            r'(NELNET|Nelnet|nelnet)',
-            r'(FEDLOAN|FedLoan|fedloan)',
-            r'(MOHELA|MOHELA|mohela)',
-            r'(DEPT OF EDUCATION|Department of Education|dept of education)',
-            r'(STUDENT LOAN|Student Loan|student loan)',
-            
-            # Mortgage
-            r'(QUICKEN LOANS|Quicken Loans|quicken loans)',
-            r'(ROCKET MORTGAGE|Rocket Mortgage|rocket mortgage)',
-            r'(FREEDOM MORTGAGE|Freedom Mortgage|freedom mortgage)',
-            r'(PENNYMAC|PennyMac|pennymac)',
-            r'(CALIBER HOME|Caliber Home|caliber home)',
-            r'(MORTGAGE|Mortgage|mortgage)',
-            
-            # Credit Unions
-            r'(NAVY FEDERAL|Navy Federal|navy federal)',
-            r'(USAA|usaa)',
-            r'(PENTAGON FCU|Pentagon FCU|pentagon fcu)',
-            r'(CREDIT UNION|Credit Union|credit union)',
-            
-            # Other Financial
-            r'(PAYPAL|PayPal|paypal)',
-            r'(AFFIRM|Affirm|affirm)',
-            r'(KLARNA|Klarna|klarna)',
-            r'(AFTERPAY|Afterpay|afterpay)',
-            r'(UPLIFT|Uplift|uplift)',
-            r'(LENDING CLUB|Lending Club|lending club)',
-            r'(PROSPER|Prosper|prosper)',
-            r'(SOFI|SoFi|sofi)',
-            r'(AVANT|Avant|avant)',
-            r'(ONEMAIN|OneMain|onemain)',
-            r'(SPRINGLEAF|Springleaf|springleaf)',
-            r'(PERSONAL LOAN|Personal Loan|personal loan)'
-        ]
-        
-        current_tradeline = {}
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            # Look for creditor names
-            for pattern in creditor_patterns:
-                if re.search(pattern, line, re.IGNORECASE):
-                    # Save previous tradeline if it exists
-                    if current_tradeline and current_tradeline.get("creditor_name"):
-                        tradelines.append(current_tradeline)
-                    
-                    # Extract creditor name
-                    creditor_match = re.search(pattern, line, re.IGNORECASE)
-                    creditor_name = creditor_match.group(0) if creditor_match else "Unknown"
-                    
-                    # Determine account type based on creditor
-                    account_type = "Credit Card"  # default
-                    if any(loan_type in creditor_name.upper() for loan_type in ["AUTO", "FORD", "HONDA", "TOYOTA", "NISSAN", "GM", "CHRYSLER", "ALLY AUTO", "SANTANDER"]):
-                        account_type = "Auto Loan"
-                    elif any(loan_type in creditor_name.upper() for loan_type in ["STUDENT", "NAVIENT", "GREAT LAKES", "NELNET", "FEDLOAN", "MOHELA", "DEPT OF EDUCATION"]):
-                        account_type = "Student Loan"
-                    elif any(loan_type in creditor_name.upper() for loan_type in ["MORTGAGE", "QUICKEN", "ROCKET", "FREEDOM", "PENNYMAC", "CALIBER"]):
-                        account_type = "Mortgage"
-                    elif any(loan_type in creditor_name.upper() for loan_type in ["PERSONAL", "LENDING", "PROSPER", "SOFI", "AVANT", "ONEMAIN", "SPRINGLEAF"]):
-                        account_type = "Personal Loan"
-                    
-                    current_tradeline = {
-                        "creditor_name": creditor_name,
-                        "account_type": account_type,
-                        "account_status": "Open",
-                        "credit_bureau": "Unknown", 
-                        "is_negative": False,
-                        "account_balance": "",
-                        "credit_limit": "",
-                        "monthly_payment": "",
-                        "account_number": "",
-                        "date_opened": "",
-                        "dispute_count": 0
-                    }
-                    break
-            
-            # Enhance data extraction for current tradeline
-            if current_tradeline:
-                # Look for account numbers (various formats)
-                account_patterns = [
-                    r'\*{4,}\d{4}',  # ****1234
-                    r'x{4,}\d{4}',   # xxxx1234
-                    r'\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}',  # Full card numbers
-                    r'Account\s*#?\s*:?\s*(\d+)',  # Account #: 123456
-                    r'Acct\s*#?\s*:?\s*(\d+)'     # Acct #: 123456
-                ]
-                
-                for pattern in account_patterns:
-                    account_match = re.search(pattern, line, re.IGNORECASE)
-                    if account_match:
-                        current_tradeline["account_number"] = account_match.group(0)
-                        break
-                
-                # Look for dollar amounts with better context
-                dollar_matches = re.findall(r'\$[\d,]+\.?\d*', line)
-                balance_keywords = ['balance', 'amount', 'owed', 'debt']
-                limit_keywords = ['limit', 'credit limit', 'maximum']
-                payment_keywords = ['payment', 'monthly', 'minimum']
-                
-                for amount in dollar_matches:
-                    line_lower = line.lower()
-                    
-                    # Check context for balance
-                    if any(kw in line_lower for kw in balance_keywords) and not current_tradeline["account_balance"]:
-                        current_tradeline["account_balance"] = amount
-                    # Check context for credit limit
-                    elif any(kw in line_lower for kw in limit_keywords) and not current_tradeline["credit_limit"]:
-                        current_tradeline["credit_limit"] = amount
-                    # Check context for payment
-                    elif any(kw in line_lower for kw in payment_keywords) and not current_tradeline["monthly_payment"]:
-                        current_tradeline["monthly_payment"] = amount
-                    # Default assignment if no context
-                    elif not current_tradeline["account_balance"]:
-                        current_tradeline["account_balance"] = amount
-                    elif not current_tradeline["credit_limit"]:
-                        current_tradeline["credit_limit"] = amount
-                
-                # Look for dates
-                date_patterns = [
-                    r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}',  # MM/DD/YYYY or MM-DD-YYYY
-                    r'\d{2,4}[/-]\d{1,2}[/-]\d{1,2}',  # YYYY/MM/DD or YYYY-MM-DD
-                    r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{1,2},?\s+\d{4}',  # Month DD, YYYY
-                    r'\d{1,2}\s+(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{4}'  # DD Month YYYY
-                ]
-                
-                for pattern in date_patterns:
-                    date_match = re.search(pattern, line, re.IGNORECASE)
-                    if date_match and not current_tradeline["date_opened"]:
-                        current_tradeline["date_opened"] = date_match.group(0)
-                        break
-                
-                # Look for status indicators
-                status_patterns = {
-                    'Current': r'current|open|active|good standing',
-                    'Closed': r'closed|terminated|paid off|satisfied',
-                    'Late': r'late|delinquent|past due|30 days|60 days|90 days',
-                    'Charged Off': r'charged off|charge off|written off',
-                    'Collection': r'collection|collections|assigned'
-                }
-                
-                for status, pattern in status_patterns.items():
-                    if re.search(pattern, line, re.IGNORECASE):
-                        current_tradeline["account_status"] = status
-                        # Mark as negative if it's a bad status
-                        if status in ['Late', 'Charged Off', 'Collection']:
-                            current_tradeline["is_negative"] = True
-                        break
-                
-                # Look for credit bureau mentions
-                bureau_patterns = {
-                    'Experian': r'experian|exp\b',
-                    'Equifax': r'equifax|eqf\b',
-                    'TransUnion': r'transunion|trans union|tru\b'
-                }
-                
-                for bureau, pattern in bureau_patterns.items():
-                    if re.search(pattern, line, re.IGNORECASE):
-                        current_tradeline["credit_bureau"] = bureau
-                        break
-        
-        # Add the last tradeline if it exists
-        if current_tradeline and current_tradeline.get("creditor_name"):
-            tradelines.append(current_tradeline)
-        
-        logger.info(f"✅ Basic parsing extracted {len(tradelines)} tradelines")
-        return tradelines
-        
-    except Exception as e:
-        logger.error(f"❌ Basic parsing failed: {str(e)}")
-        return []
-
-async def save_tradeline_to_supabase(tradeline: Dict[str, Any], user_id: str) -> bool:
-    """Save tradeline to Supabase using RPC function"""
-    try:
-        if not supabase:
-            logger.warning("⚠️ Supabase not initialized, skipping save")
-            return False
-            
-        logger.info(f"💾 Saving tradeline to Supabase: {tradeline.get('creditor_name', 'unknown')}")
-        
-        # Validate with Pydantic (Zod equivalent)
-        validated_tradeline = TradelineSchema(**tradeline)
-        
-        # Call Supabase RPC function
-        result = supabase.rpc('upsert_tradeline', {
-            'p_account_balance': validated_tradeline.account_balance,
-            'p_account_number': validated_tradeline.account_number,
-            'p_account_status': validated_tradeline.account_status,
-            'p_account_type': validated_tradeline.account_type,
-            'p_credit_bureau': validated_tradeline.credit_bureau,
-            'p_credit_limit': validated_tradeline.credit_limit,
-            'p_creditor_name': validated_tradeline.creditor_name,
-            'p_monthly_payment': validated_tradeline.monthly_payment,
-            'p_user_id': user_id
-        }).execute()
-        
-        if result.data:
-            logger.info(f"✅ Tradeline saved successfully: {validated_tradeline.creditor_name}")
-            return True
-        else:
-            logger.error(f"❌ Failed to save tradeline - no data returned: {result}")
-            return False
-            
-    except ValidationError as e:
-        logger.error(f"❌ Validation error for tradeline: {e}")
-        return False
-    except Exception as e:
-        logger.error(f"❌ Database error while saving tradeline: {e}")
-        logger.error(f"📍 Traceback: {traceback.format_exc()}")
-        return False
-    
-
-    # Add this endpoint to your main.py file (after the existing endpoints)
-
-@app.post("/save-tradelines")
-async def save_tradelines_endpoint(request: dict):
-    """
-    Endpoint to save tradelines to database
-    """
-    try:
-        user_id = request.get('userId')
-        tradelines = request.get('tradelines', [])
-        supabase.table('tradelines').select('*').execute()
-
-        if not user_id:
-            raise HTTPException(status_code=400, detail="User ID is required")
-        
-        if not tradelines:
-            raise HTTPException(status_code=400, detail="No tradelines provided")
-        
-        logger.info(f"💾 Saving {len(tradelines)} tradelines for user {user_id}")
-        
-        saved_count = 0
-        failed_count = 0
-        
-        if supabase:
-            # Save each tradeline to Supabase
-            for tradeline in tradelines:
-                try:
-                    success = await save_tradeline_to_supabase(tradeline, user_id)
-                    if success:
-                        saved_count += 1
-                    else:
-                        failed_count += 1
-                except Exception as e:
-                    logger.error(f"❌ Failed to save tradeline: {e}")
-                    failed_count += 1
-        else:
-            logger.warning("⚠️ Supabase not available, cannot save tradelines")
-            raise HTTPException(status_code=503, detail="Database not available")
-        
-        return {
-            "success": True,
-            "message": f"Saved {saved_count} tradelines successfully",
-            "saved_count": saved_count,
-            "failed_count": failed_count,
-            "total_tradelines": len(tradelines)
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"❌ Save endpoint failed: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to save tradelines: {str(e)}")
-
-# Also add this function to check/fix Supabase connection
-def check_supabase_connection():
-    """Check if Supabase is properly configured"""
-    global supabase
-    
-    logger.info("🔍 Checking Supabase configuration...")
-    
-    if not SUPABASE_URL:
-        logger.error("❌ SUPABASE_URL environment variable not set")
-        return False
-        
-    if not SUPABASE_ANON_KEY:
-        logger.error("❌ SUPABASE_ANON_KEY environment variable not set")
-        return False
-    
-    try:
-        # Test the connection
-        result = supabase.table('tradelines').select('id').limit(1).execute()
-        logger.info("✅ Supabase connection test successful")
-        return True
-    except Exception as e:
-        logger.error(f"❌ Supabase connection test failed: {e}")
-        return False
-
-# Update the health endpoint to include Supabase status
-@app.get("/health")
-async def health_check():
-    """Enhanced health check endpoint"""
-    supabase_available = check_supabase_connection() if supabase else False
-    
-    health_status = {
-        "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat() + "Z", # type: ignore
-        "services": {
-            "document_ai": {
-                "configured": bool(PROJECT_ID and PROCESSOR_ID and client),
-                "project_id": PROJECT_ID,
-                "location": LOCATION,
-                "processor_id": PROCESSOR_ID[:8] + "..." if PROCESSOR_ID else None
-            },
-            "gemini": {
-                "configured": bool(GEMINI_API_KEY and gemini_model),
-                "model": "gemini-1.5-flash" if gemini_model else None
-            },
-            "supabase": {
-                "configured": bool(SUPABASE_URL and SUPABASE_ANON_KEY),
-                "available": supabase_available,  # ✅ Added availability check
-                "url": SUPABASE_URL[:30] + "..." if SUPABASE_URL else None
-            }
-        },
-        "environment": {
-            "python_version": "3.x",
-            "fastapi_version": "0.x",
-        }
-    }
-    
-    logger.info("🔍 Health check requested")
-    return health_status
-
-@app.post("/debug-parsing")
-async def debug_parsing(
-    file: UploadFile = File(...),
-    method: str = Form(default="all")  # "all", "gemini", "basic"
-):
-    """Debug endpoint to test different parsing methods"""
-    try:
-        logger.info(f"🐛 Debug parsing request: method={method}")
-        
-        # Read file content
-        content = await file.read()
-        logger.info(f"📦 File size: {len(content)} bytes")
-        
-        # Extract text using PyPDF2
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-            temp_file.write(content)
-            temp_file_path = temp_file.name
-        
-        try:
-            with open(temp_file_path, 'rb') as f:
-                reader = PyPDF2.PdfReader(f)
-                text = ""
-                for page in reader.pages:
-                    text += page.extract_text()
-            
-            logger.info(f"📖 Extracted {len(text)} characters from PDF")
-            
-            results = {
-                "text_length": len(text),
-                "first_500_chars": text[:500],
-                "methods": {}
-            }
-            
-            # Test different methods
-            if method in ["all", "gemini"]:
-                try:
-                    gemini_processor = GeminiProcessor()
-                    gemini_tradelines = gemini_processor.extract_tradelines(text)
-                    results["methods"]["gemini"] = {
-                        "tradelines": gemini_tradelines,
-                        "count": len(gemini_tradelines)
-                    }
-                except Exception as e:
-                    results["methods"]["gemini"] = {
-                        "error": str(e),
-                        "count": 0
-                    }
-            
-            if method in ["all", "basic"]:
-                try:
-                    basic_tradelines = parse_tradelines_basic(text)
-                    results["methods"]["basic"] = {
-                        "tradelines": basic_tradelines,
-                        "count": len(basic_tradelines)
-                    }
-                except Exception as e:
-                    results["methods"]["basic"] = {
-                        "error": str(e),
-                        "count": 0
-                    }
-            
-            return results
-            
-        finally:
-            try:
-                os.unlink(temp_file_path)
-            except:
-                pass
-                
-    except Exception as e:
-        logger.error(f"❌ Debug parsing failed: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Debug parsing failed: {str(e)}")
-
-@app.post("/process-credit-report")
-async def process_credit_report(
-    file: UploadFile = File(...),
-    user_id: str = Form(default="default-user")
-):
-    """
-    Main endpoint: Process uploaded credit report PDF
-    FIXED: Properly handle file upload without filename attribute errors
-    """
-    temp_file_path = None
-    
-    try:
-        logger.info("🚀 ===== NEW CREDIT REPORT PROCESSING REQUEST =====")
-        
-        # ✅ FIXED: Store filename early before file operations
-        original_filename = file.filename or "unknown.pdf"
-        file_content_type = file.content_type
-        
-        logger.info(f"📄 File: {original_filename}")
-        logger.info(f"📦 Content type: {file_content_type}")
-        logger.info(f"👤 User ID: {user_id}")
-        
-        # Validate file type using stored filename
-        if not original_filename.lower().endswith('.pdf'):
-            logger.error("❌ Invalid file type")
-            raise HTTPException(status_code=400, detail="Only PDF files allowed")
-        
-        # Read file content ONCE
-        logger.info("📖 Reading file content...")
-        content = await file.read()
-        logger.info(f"📦 File size: {len(content)} bytes ({len(content)/1024/1024:.2f} MB)")
-        
-        if len(content) == 0:
-            logger.error("❌ Empty file")
-            raise HTTPException(status_code=400, detail="File is empty")
-        
-        # ✅ FIXED: Save uploaded file using content, not re-reading file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-            temp_file.write(content)  # Use already-read content
-            temp_file_path = temp_file.name
-        
-        logger.info(f"💾 Temporary file saved: {temp_file_path}")
-        
-        # Initialize processors
-        document_ai = DocumentAIProcessor()
-        gemini_processor = GeminiProcessor()
-        
-        tradelines = []
-        processing_method = "none"
-        
-        # Step 1: Try Document AI first
-        try:
-            if client and PROJECT_ID and PROCESSOR_ID:
-                logger.info("🤖 Attempting Document AI processing...")
-                processing_method = "document_ai"
-                
-                extracted_text = document_ai.extract_text(temp_file_path)
-                logger.info(f"✅ Document AI text extraction successful")
-                
-                # Try Gemini for tradeline extraction
-                if gemini_model:
-                    logger.info("🧠 Attempting Gemini tradeline extraction...")
-                    tradelines = gemini_processor.extract_tradelines(extracted_text)
-                    if tradelines:
-                        processing_method = "document_ai + gemini"
-                        logger.info(f"✅ Gemini extraction successful: {len(tradelines)} tradelines")
-                    else:
-                        logger.info("⚠️ Gemini found no tradelines, trying basic parsing...")
-                        tradelines = parse_tradelines_basic(extracted_text)
-                        processing_method = "document_ai + basic"
-                else:
-                    logger.info("⚠️ Gemini not available, using basic parsing...")
-                    tradelines = parse_tradelines_basic(extracted_text)
-                    processing_method = "document_ai + basic"
-            else:
-                logger.warning("⚠️ Document AI not properly configured")
-                raise Exception("Document AI not configured")
-                
-        except Exception as doc_ai_error:
-            logger.error(f"❌ Document AI processing failed: {str(doc_ai_error)}")
-            
-            # Fallback: Try PyPDF2 + Gemini
-            try:
-                logger.info("🔄 Trying PyPDF2 + Gemini fallback...")
-                processing_method = "pypdf2_fallback"
-                
-                with open(temp_file_path, 'rb') as file:
-                    reader = PyPDF2.PdfReader(file)
-                    text = ""
-                    for page in reader.pages:
-                        text += page.extract_text()
-                
-                logger.info(f"📖 PyPDF2 extracted {len(text)} characters")
-                
-                if gemini_model and text.strip():
-                    tradelines = gemini_processor.extract_tradelines(text)
-                    processing_method = "pypdf2 + gemini"
-                    logger.info(f"✅ PyPDF2 + Gemini successful: {len(tradelines)} tradelines")
-                
-                if not tradelines:
-                    logger.info("🔧 Using basic parsing as final fallback...")
-                    tradelines = parse_tradelines_basic(text)
-                    processing_method = "pypdf2 + basic"
-                    
-            except Exception as fallback_error:
-                logger.error(f"❌ All processing methods failed: {str(fallback_error)}")
-                logger.error(f"📍 Traceback: {traceback.format_exc()}")
-                raise HTTPException(status_code=500, detail="Could not process PDF with any method")
-        
-        logger.info(f"📊 Processing completed using: {processing_method}")
-        logger.info(f"📈 Found {len(tradelines)} tradelines")
-        
-        # Step 2: Save tradelines to Supabase (if available)
-        saved_count = 0
-        failed_count = 0
-        
-        if supabase:
-            logger.info("💾 Saving tradelines to Supabase...")
-            for i, tradeline in enumerate(tradelines):
-                logger.debug(f"💾 Saving tradeline {i+1}/{len(tradelines)}: {tradeline.get('creditor_name', 'unknown')}")
-                success = await save_tradeline_to_supabase(tradeline, user_id)
-                if success:
-                    saved_count += 1
-                else:
-                    failed_count += 1
-        else:
-            logger.warning("⚠️ Supabase not available, skipping database save")
-        
-        # Step 3: Cleanup temporary file
-        if temp_file_path and os.path.exists(temp_file_path):
-            os.unlink(temp_file_path)
-            logger.info("🗑️ Temporary file cleaned up")
-        
-        # Step 4: Return response
-        response = {
-            "success": True,
-            "message": f"Successfully processed {len(tradelines)} tradelines using {processing_method}",
-            "tradelines_found": len(tradelines),
-            "tradelines_saved": saved_count,
-            "tradelines_failed": failed_count,
-            "processing_method": processing_method,
-            "tradelines": tradelines,
-            "debug_info": {
-                "file_size_bytes": len(content),
-                "file_name": original_filename,  # ✅ Use stored filename
-                "user_id": user_id,
-                "supabase_available": supabase is not None,
-                "document_ai_available": client is not None,
-                "gemini_available": gemini_model is not None
-            }
-        }
-        
-        logger.info("✅ ===== PROCESSING COMPLETED SUCCESSFULLY =====")
-        logger.info(f"📊 Final stats: {len(tradelines)} found, {saved_count} saved, {failed_count} failed")
-        
-        return response
-        
-    except HTTPException:
-        # Re-raise HTTP exceptions
-        raise
-    except Exception as e:
-        logger.error("❌ ===== PROCESSING FAILED =====")
-        logger.error(f"💥 Error: {str(e)}")
-        logger.error(f"📍 Traceback: {traceback.format_exc()}")
-        
-        # Cleanup temp file on error
-        if temp_file_path and os.path.exists(temp_file_path):
-            try:
-                os.unlink(temp_file_path)
-                logger.info("🗑️ Temporary file cleaned up after error")
-            except Exception as cleanup_error:
-                logger.error(f"❌ Failed to cleanup temp file: {cleanup_error}")
-        
-        raise HTTPException(
-            status_code=500, 
-            detail=f"Processing failed: {str(e)}"
-        )
\ No newline at end of file
+"""
+PDF Credit Report Processing with Document AI + Gemini fallback
+Extracts tradelines and saves to Supabase
+Enhanced with comprehensive debugging and error handling
+"""
+import os
+import asyncio
+import tempfile
+import logging
+import traceback
+from dataclasses import asdict
+from typing import List, Dict, Any, Optional, Tuple, Callable, Awaitable
+
+from fastapi import FastAPI, UploadFile, File, HTTPException, Form, Query, Request # type: ignore
+from fastapi.middleware.cors import CORSMiddleware # type: ignore
+from fastapi.responses import StreamingResponse # type: ignore
+from starlette.background import BackgroundTask # type: ignore
+from pydantic import BaseModel # type: ignore
+
+# Document AI imports
+from google.cloud import documentai
+
+# Gemini AI imports
+import google.generativeai as genai # type: ignore
+from google.oauth2 import service_account # type: ignore
+
+# Supabase
+from supabase import create_client, Client
+from datetime import datetime
+
+from dotenv import load_dotenv # type: ignore
+load_dotenv()
+
+from backend.services.report_cache import ReportCache
+from backend.services.worker_pools import WorkerPools, WorkerPoolSaturatedError
+from backend.services.pdf_extraction_service import PdfExtractionService
+from backend.services.document_ai_batching import DocumentAIBatcher, DocumentAIOnlineProcessor
+from backend.services.document_ai_clients import DocumentAIClientManager
+from backend.services.gemini_client import AsyncGeminiClient, FakeGeminiBackend, GoogleGeminiBackend
+from backend.services.tradeline_writer import BulkSaveResult, TradelineBulkWriter
+from backend.config.triage_config import PageTriageConfig
+from backend.utils.basic_parser import parse_tradeline_lines
+from backend.utils.pdf_text import (
+    PdfPage, PdfSource, build_page_subset_pdf, iter_page_lines, join_pages, joined_length, read_pdf_bytes,
+    text_preview
+)
+from backend.utils.upload_stream import SpooledUpload, UploadTooLargeError, spool_upload
+from backend.utils.pdf_triage import triage_pages, summarize_triage
+from backend.utils.request_cancellation import ClientDisconnectedError, cancel_on_disconnect
+from backend.utils.json_stream import IncrementalJSONArrayParser, extract_json_value
+from backend.utils.event_stream import (
+    EventCallback, STREAM_HEADERS, choose_media_type, stream_events
+)
+from backend.utils.report_chunker import ReportChunker
+from backend.utils.loop_lag import EventLoopLagMonitor
+
+# Enhanced logging setup
+logging.basicConfig(
+    level=logging.DEBUG,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Environment variables with debugging
+PROJECT_ID = os.getenv("GOOGLE_CLOUD_PROJECT_ID")
+LOCATION = os.getenv("GOOGLE_CLOUD_LOCATION", "us")
+PROCESSOR_ID = os.getenv("DOCUMENT_AI_PROCESSOR_ID")
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+GEMINI_CHUNK_CONCURRENCY = int(os.getenv("GEMINI_CHUNK_CONCURRENCY", "4"))
+GEMINI_TIMEOUT_SECONDS = float(os.getenv("GEMINI_TIMEOUT_SECONDS", "60"))
+GEMINI_ALLOW_PARTIAL_RESULTS = os.getenv("GEMINI_ALLOW_PARTIAL_RESULTS", "true").lower() == "true"
+GEMINI_CHUNK_MAX_TOKENS = int(os.getenv("GEMINI_CHUNK_MAX_TOKENS", "4500"))
+GEMINI_CHUNK_MAX_CHARS = int(os.getenv("GEMINI_CHUNK_MAX_CHARS", "15000"))
+GEMINI_MAX_IN_FLIGHT = int(os.getenv("GEMINI_MAX_IN_FLIGHT", "8"))
+GEMINI_STREAMING = os.getenv("GEMINI_STREAMING", "true").lower() == "true"
+GEMINI_FAKE_BACKEND = os.getenv("GEMINI_FAKE_BACKEND", "false").lower() == "true"
+STREAM_HEARTBEAT_SECONDS = float(os.getenv("STREAM_HEARTBEAT_SECONDS", "15"))
+MAX_UPLOAD_MB = float(os.getenv("MAX_UPLOAD_MB", "50"))
+UPLOAD_SPOOL_DIR = os.getenv("UPLOAD_SPOOL_DIR") or tempfile.gettempdir()
+TRADELINE_SAVE_BATCH_SIZE = int(os.getenv("TRADELINE_SAVE_BATCH_SIZE", "200"))
+TRADELINE_SAVE_CONCURRENCY = int(os.getenv("TRADELINE_SAVE_CONCURRENCY", "2"))
+DOCUMENT_AI_BATCHING = os.getenv("DOCUMENT_AI_BATCHING", "true").lower() == "true"
+DOCUMENT_AI_MAX_PAGES_PER_REQUEST = int(os.getenv("DOCUMENT_AI_MAX_PAGES_PER_REQUEST", "15"))
+DOCUMENT_AI_BATCH_CONCURRENCY = int(os.getenv("DOCUMENT_AI_BATCH_CONCURRENCY", "4"))
+DOCUMENT_AI_MAX_RETRIES = int(os.getenv("DOCUMENT_AI_MAX_RETRIES", "2"))
+DOCUMENT_AI_CLIENT_POOL_SIZE = int(os.getenv("DOCUMENT_AI_CLIENT_POOL_SIZE", "2"))
+SUPABASE_URL = "https://gywohmbqohytziwsjrps.supabase.co"
+SUPABASE_ANON_KEY = os.getenv("SUPABASE_ANON_KEY")
+
+# Debug environment variables
+logger.info(f"🔧 Environment Check:")
+logger.info(f"  PROJECT_ID: {'✅ Set' if PROJECT_ID else '❌ Missing'}")
+logger.info(f"  LOCATION: {LOCATION}")
+logger.info(f"  PROCESSOR_ID: {'✅ Set' if PROCESSOR_ID else '❌ Missing'}")
+logger.info(f"  GEMINI_API_KEY: {'✅ Set' if GEMINI_API_KEY else '❌ Missing'}")
+logger.info(f"  SUPABASE_URL: {'✅ Set' if SUPABASE_URL else '❌ Missing'}")
+logger.info(f"  SUPABASE_ANON_KEY: {'✅ Set' if SUPABASE_ANON_KEY else '❌ Missing'}")
+
+# Initialize services with error handling
+try:
+    if SUPABASE_URL and SUPABASE_ANON_KEY:
+        supabase: Client = create_client(SUPABASE_URL, SUPABASE_ANON_KEY)
+        logger.info("✅ Supabase client initialized")
+    else:
+        logger.error("❌ Supabase configuration missing")
+        supabase = None
+except Exception as e:
+    logger.error(f"❌ Supabase initialization failed: {e}")
+    supabase = None
+
+try:
+    if GEMINI_API_KEY:
+        genai.configure(api_key=GEMINI_API_KEY)
+        gemini_model = genai.GenerativeModel('gemini-1.5-flash')
+        logger.info("✅ Gemini model initialized")
+    else:
+        logger.error("❌ Gemini API key missing")
+        gemini_model = None
+except Exception as e:
+    logger.error(f"❌ Gemini initialization failed: {e}")
+    gemini_model = None
+
+# One async Gemini client for all requests; the fake backend serves canned responses for offline load tests
+if GEMINI_FAKE_BACKEND:
+    gemini_backend = FakeGeminiBackend(latency_seconds=float(os.getenv("GEMINI_FAKE_LATENCY_SECONDS", "0.5")))
+    logger.warning("⚠️ Using the fake Gemini backend")
+elif gemini_model:
+    gemini_backend = GoogleGeminiBackend(gemini_model)
+else:
+    gemini_backend = None
+gemini_client = AsyncGeminiClient(
+    gemini_backend,
+    max_in_flight=GEMINI_MAX_IN_FLIGHT,
+    timeout_seconds=GEMINI_TIMEOUT_SECONDS
+) if gemini_backend else None
+
+# Initialize Document AI clients, shared by every request
+try:
+    if os.path.exists('./service-account.json'):
+        credentials = service_account.Credentials.from_service_account_file('./service-account.json')
+        logger.info("✅ Document AI credentials loaded from service account")
+    else:
+        logger.warning("⚠️ Service account file not found, using default credentials")
+        credentials = None
+    document_ai_clients = DocumentAIClientManager(
+        PROJECT_ID, LOCATION, PROCESSOR_ID,
+        credentials=credentials,
+        async_pool_size=DOCUMENT_AI_CLIENT_POOL_SIZE
+    )
+    client = document_ai_clients.get_client()
+    logger.info(f"✅ Document AI client initialized for {LOCATION}")
+except Exception as e:
+    logger.error(f"❌ Document AI initialization failed: {e}")
+    document_ai_clients = None
+    client = None
+
+# Structure-aware splitter for reports too large for one Gemini request
+report_chunker = ReportChunker(
+    max_chunk_tokens=GEMINI_CHUNK_MAX_TOKENS,
+    max_chunk_chars=GEMINI_CHUNK_MAX_CHARS
+)
+
+# Bounded executors for blocking vendor calls and PDF parsing
+worker_pools = WorkerPools.from_env()
+logger.info(f"✅ Worker pools configured: io={worker_pools.config.io_max_workers}, cpu={worker_pools.config.cpu_max_workers} ({worker_pools.config.cpu_pool_kind})")
+
+# Page-sharded PDF text extraction on the CPU pool
+pdf_extractor = PdfExtractionService(worker_pools)
+
+# Per-page decision between the embedded text layer and Document AI OCR
+triage_config = PageTriageConfig.from_env()
+
+# Content-hash cache of processed reports
+try:
+    if os.getenv("REPORT_CACHE_ENABLED", "true").lower() == "true":
+        report_cache = ReportCache.from_env()
+        logger.info("✅ Report cache initialized")
+    else:
+        logger.info("⚠️ Report cache disabled")
+        report_cache = None
+except Exception as e:
+    logger.error(f"❌ Report cache initialization failed: {e}")
+    report_cache = None
+
+# Zod-like validation using Pydantic
+class TradelineSchema(BaseModel):
+    creditor_name: str = "NULL"
+    account_balance: str = ""
+    credit_limit: str = ""
+    monthly_payment: str = ""
+    account_number: str = ""
+    date_opened: str = "xx/xx/xxxxx"
+    account_type: str = ""
+    account_status: str = ""
+    credit_bureau: str = ""
+    is_negative: bool = False
+    dispute_count: int = 0
+
+# Batched tradeline persistence: one RPC round trip per batch of validated rows
+tradeline_writer = TradelineBulkWriter(
+    supabase,
+    TradelineSchema,
+    batch_size=TRADELINE_SAVE_BATCH_SIZE,
+    max_concurrent_batches=TRADELINE_SAVE_CONCURRENCY,
+    worker_pools=worker_pools
+) if supabase else None
+
+app = FastAPI(title="Credit Report Processor", debug=True)
+
+# Enhanced CORS configuration
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],  # In production, be more specific
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+    expose_headers=["*"]
+)
+
+@app.on_event("startup")
+async def start_worker_pools():
+    """Spawn executor workers before the first request arrives"""
+    worker_pools.warm_up()
+
+@app.on_event("shutdown")
+async def shutdown_worker_pools():
+    """Stop executor pools when the server shuts down"""
+    worker_pools.shutdown(wait=False)
+
+# Reports how long synchronous work blocks the event loop
+loop_lag_monitor = EventLoopLagMonitor(interval_seconds=float(os.getenv("LOOP_LAG_INTERVAL_SECONDS", "0.1")))
+
+@app.on_event("startup")
+async def start_loop_lag_monitor():
+    loop_lag_monitor.start()
+
+@app.on_event("shutdown")
+async def stop_loop_lag_monitor():
+    await loop_lag_monitor.stop()
+
+@app.on_event("startup")
+async def start_document_ai_clients():
+    """Open the shared Document AI channels before the first request arrives"""
+    if document_ai_clients:
+        await document_ai_clients.start()
+
+@app.on_event("shutdown")
+async def close_document_ai_clients():
+    """Close the shared Document AI channels"""
+    if document_ai_clients:
+        await document_ai_clients.close()
+
+def saturated_response(error: WorkerPoolSaturatedError) -> HTTPException:
+    """Convert pool backpressure into a 503 with Retry-After"""
+    logger.warning(f"⏳ {error}")
+    return HTTPException(
+        status_code=503,
+        detail="Server is busy processing other reports, please retry shortly",
+        headers={"Retry-After": str(error.retry_after)}
+    )
+
+class SupabaseService:
+    def __init__(self):
+        self.client = supabase
+    
+    # Insert data
+    def insert_user_profile(self, user_data):
+        """Insert a new user profile"""
+        try:
+            result = self.client.table("user_profiles").insert(user_data).execute()
+            return result.data
+        except Exception as e:
+            print(f"Error inserting user profile: {e}")
+            return None
+    
+    # Select data
+    def get_user_profile(self, user_id):
+        """Get user profile by ID"""
+        try:
+            result = self.client.table("user_profiles").select("*").eq("id", user_id).execute()
+            return result.data[0] if result.data else None
+        except Exception as e:
+            print(f"Error getting user profile: {e}")
+            return None
+    
+    # Update data
+    def update_user_profile(self, user_id, updates):
+        """Update user profile"""
+        try:
+            result = self.client.table("user_profiles").update(updates).eq("id", user_id).execute()
+            return result.data
+        except Exception as e:
+            print(f"Error updating user profile: {e}")
+            return None
+    
+    # Delete data
+    def delete_user_profile(self, user_id):
+        """Delete user profile"""
+        try:
+            result = self.client.table("user_profiles").delete().eq("id", user_id).execute()
+            return result.data
+        except Exception as e:
+            print(f"Error deleting user profile: {e}")
+            return None
+
+class DocumentAIProcessor:
+    """Document AI text extraction over the process-wide shared clients"""
+    
+    def __init__(self, clients: DocumentAIClientManager):
+        self.clients = clients
+        if not clients.configured:
+            logger.error("❌ Document AI configuration incomplete")
+        self.batcher = DocumentAIBatcher(
+            DocumentAIOnlineProcessor(clients),
+            max_pages_per_request=DOCUMENT_AI_MAX_PAGES_PER_REQUEST,
+            max_concurrency=DOCUMENT_AI_BATCH_CONCURRENCY,
+            max_retries=DOCUMENT_AI_MAX_RETRIES,
+            worker_pools=worker_pools
+        )
+    
+    async def extract_text(self, pdf_content: PdfSource) -> str:
+        """Extract text from PDF using Document AI without blocking the event loop"""
+        if DOCUMENT_AI_BATCHING:
+            return (await self.batcher.process(pdf_content)).text
+        return await worker_pools.run_io(self._extract_text_sync, pdf_content)
+    
+    async def extract_page_texts(self, pdf_content: PdfSource) -> List[str]:
+        """OCR a PDF with Document AI and return the text of each page, in page order"""
+        if DOCUMENT_AI_BATCHING:
+            return (await self.batcher.process(pdf_content)).page_texts
+        return await worker_pools.run_io(self._extract_page_texts_sync, pdf_content)
+    
+    def _extract_text_sync(self, pdf_content: PdfSource) -> str:
+        """Extract text from in-memory PDF content using Document AI"""
+        return self._process_sync(pdf_content).text
+    
+    def _extract_page_texts_sync(self, pdf_content: bytes) -> List[str]:
+        """Split the Document AI text into pages using each page's layout text anchor"""
+        document = self._process_sync(pdf_content)
+        return [
+            "".join(
+                document.text[int(segment.start_index):int(segment.end_index)]
+                for segment in page.layout.text_anchor.text_segments
+            )
+            for page in document.pages
+        ]
+    
+    def _process_sync(self, pdf_content: PdfSource):
+        """Send PDF content (or a stored PDF, read here on the io pool) to Document AI and return the processed document"""
+        try:
+            logger.info("📄 Starting Document AI text extraction")
+            pdf_content = read_pdf_bytes(pdf_content)
+            logger.info(f"📦 PDF content size: {len(pdf_content)} bytes")
+            
+            raw_document = documentai.RawDocument(
+                content=pdf_content,
+                mime_type="application/pdf"
+            )
+            
+            name = self.clients.processor_name
+            logger.info(f"🔗 Using processor: {name}")
+            
+            request = documentai.ProcessRequest(name=name, raw_document=raw_document)
+            
+            logger.info("🚀 Sending request to Document AI...")
+            result = self.clients.get_client().process_document(request=request)
+            
+            extracted_text = result.document.text
+            logger.info(f"✅ Document AI extracted {len(extracted_text)} characters")
+            logger.debug(f"📝 First 500 chars: {extracted_text[:500]}...")
+            
+            return result.document
+            
+        except Exception as e:
+            logger.error(f"❌ Document AI failed: {str(e)}")
+            logger.error(f"📍 Traceback: {traceback.format_exc()}")
+            raise
+
+# One processor (and batcher) over the shared clients for all requests
+document_ai = DocumentAIProcessor(document_ai_clients) if document_ai_clients else None
+
+# Called with each tradeline as soon as it is extracted
+TradelineCallback = Callable[[Dict[str, Any]], Awaitable[None]]
+
+class PartialResultsError(Exception):
+    """Some chunks failed while GEMINI_ALLOW_PARTIAL_RESULTS is off; the request fails instead of falling back"""
+
+    def __init__(self, failed_chunks: int, total_chunks: int):
+        super().__init__(f"{failed_chunks} of {total_chunks} chunks failed and partial results are disabled")
+        self.failed_chunks = failed_chunks
+        self.total_chunks = total_chunks
+
+def partial_results_response(error: PartialResultsError) -> HTTPException:
+    """Strict mode: report the failed extraction as a 502 rather than substituting basic parsing"""
+    logger.error(f"❌ {error}")
+    return HTTPException(status_code=502, detail=f"Tradeline extraction incomplete: {error}")
+
+def tradeline_identity(tradeline: Dict[str, Any]) -> Optional[str]:
+    """Deduplication key, or None when a tradeline has neither creditor name nor account number"""
+    creditor_name = tradeline.get('creditor_name') or ''
+    account_number = tradeline.get('account_number') or ''
+    if not creditor_name and not account_number:
+        return None
+    return f"{creditor_name}_{account_number}"
+
+class GeminiProcessor:
+    def __init__(
+        self,
+        max_concurrency: int = GEMINI_CHUNK_CONCURRENCY,
+        timeout_seconds: float = GEMINI_TIMEOUT_SECONDS,
+        allow_partial: bool = GEMINI_ALLOW_PARTIAL_RESULTS,
+        client: Optional[AsyncGeminiClient] = None
+    ):
+        self.client = client or gemini_client
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout_seconds = timeout_seconds
+        self.allow_partial = allow_partial
+        self.last_chunk_stats: Dict[str, Any] = {}
+    
+    async def extract_tradelines(
+        self,
+        text: str,
+        on_tradeline: Optional[TradelineCallback] = None,
+        on_progress: Optional[EventCallback] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Extract tradelines using Gemini AI with chunking support
+        With streaming enabled, on_tradeline is awaited for each new tradeline as soon as the model emits it.
+        on_progress receives a "chunk" event as each chunk of a long report finishes.
+        """
+        return await self.extract_tradelines_from_pages([PdfPage(page_number=1, text=text)], on_tradeline, on_progress)
+    
+    async def extract_tradelines_from_pages(
+        self,
+        pages: List[PdfPage],
+        on_tradeline: Optional[TradelineCallback] = None,
+        on_progress: Optional[EventCallback] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        extract_tradelines over a report's pages; long reports are chunked
+        straight from the page lines, without joining the whole text first
+        """
+        try:
+            text_length = joined_length(pages)
+            logger.info(f"🧠 Starting Gemini tradeline extraction from {text_length} characters")
+            
+            if not self.client:
+                raise Exception("Gemini model not initialized")
+            
+            # If text is too long, process in chunks
+            if text_length > 15000:
+                return await self._extract_tradelines_chunked(pages, on_tradeline, on_progress)
+            else:
+                return await self._extract_tradelines_single(join_pages(pages), on_tradeline)
+                
+        except (WorkerPoolSaturatedError, PartialResultsError):
+            raise
+        except Exception as e:
+            logger.error(f"❌ Gemini processing failed: {str(e)}")
+            logger.error(f"📍 Traceback: {traceback.format_exc()}")
+            return []
+    
+    async def _extract_tradelines_single(self, text: str, on_tradeline: Optional[TradelineCallback] = None) -> List[Dict[str, Any]]:
+        """Extract tradelines from a single text chunk"""
+        prompt = f"""
+        Extract credit tradeline information from this credit report text. 
+        Return ONLY a JSON array of objects with these exact fields:
+        - creditor_name (string)
+        - account_balance (string, include $ if present)
+        - credit_limit (string, include $ if present) 
+        - monthly_payment (string, include $ if present)
+        - account_number (string)
+        - date_opened (string, format: MM/DD/YYYY)
+        - account_type (string: Credit Card, Mortgage, Auto Loan, etc.)
+        - account_status (string: Open, Closed, Current, etc.)
+        - credit_bureau (string: Experian, Equifax, TransUnion)
+        - is_negative (boolean: true if account has negative marks)
+
+        Text to analyze:
+        {text[:15000]}
+
+        Return only valid JSON array, no explanations:
+        """
+        
+        if GEMINI_STREAMING:
+            return await self._stream_tradelines(prompt, on_tradeline)
+        
+        logger.info("🚀 Sending request to Gemini...")
+        response_text = await self.client.generate(prompt, timeout_seconds=self.timeout_seconds)
+        logger.info(f"✅ Gemini response received: {len(response_text)} characters")
+        logger.debug(f"📝 Raw Gemini response: {response_text[:500]}...")
+        
+        # Find the JSON array, skipping markdown fences and any prose around it
+        json_text = extract_json_value(response_text, "[")
+        if json_text:
+            import json
+            tradelines = json.loads(json_text)
+            logger.info(f"✅ Gemini extracted {len(tradelines)} tradelines")
+            return tradelines
+        else:
+            logger.warning("⚠️ No JSON array found in Gemini response")
+            return []
+    
+    async def _stream_tradelines(self, prompt: str, on_tradeline: Optional[TradelineCallback]) -> List[Dict[str, Any]]:
+        """Consume the response as it streams, handing off each tradeline object once it closes"""
+        logger.info("🚀 Streaming request to Gemini...")
+        parser = IncrementalJSONArrayParser()
+        tradelines = []
+        async for chunk in self.client.stream(prompt, timeout_seconds=self.timeout_seconds):
+            for item in parser.feed(chunk):
+                if not isinstance(item, dict):
+                    continue
+                tradelines.append(item)
+                if on_tradeline:
+                    await on_tradeline(item)
+        logger.info(f"✅ Gemini streamed {len(tradelines)} tradelines")
+        return tradelines
+    
+    async def _extract_tradelines_chunked(
+        self,
+        pages: List[PdfPage],
+        on_tradeline: Optional[TradelineCallback] = None,
+        on_progress: Optional[EventCallback] = None
+    ) -> List[Dict[str, Any]]:
+        """Extract tradelines from report pages by processing in chunks"""
+        logger.info(f"📖 Processing large text in chunks: {len(pages)} pages")
+        
+        # Split on tradeline/section boundaries so no account is cut in half
+        chunks = [chunk.text for chunk in report_chunker.iter_chunks(iter_page_lines(pages))]
+        
+        logger.info(f"🔄 Split into {len(chunks)} chunks, up to {self.max_concurrency} in flight")
+        
+        start_time = datetime.now()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        # Streamed tradelines are handed off once, as the first chunk to emit them arrives
+        streamed_ids = set()
+        
+        async def emit_new(tradeline: Dict[str, Any]) -> None:
+            identifier = tradeline_identity(tradeline)
+            if identifier is None or identifier not in streamed_ids:
+                streamed_ids.add(identifier)
+                await on_tradeline(tradeline)
+        
+        # What each chunk streamed, kept for chunks whose stream fails afterwards
+        streamed_by_chunk: Dict[int, List[Dict[str, Any]]] = {}
+        completed_chunks = 0
+        
+        async def process_chunk(i: int, chunk: str) -> List[Dict[str, Any]]:
+            nonlocal completed_chunks
+            async with semaphore:
+                logger.info(f"🔍 Processing chunk {i+1}/{len(chunks)}")
+                failed = True
+                result = []
+                streamed = streamed_by_chunk[i] = []
+                
+                async def emit_streamed(tradeline: Dict[str, Any]) -> None:
+                    streamed.append(tradeline)
+                    await emit_new(tradeline)
+                
+                try:
+                    result = await self._extract_tradelines_single(chunk, emit_streamed if on_tradeline else None)
+                    failed = False
+                    return result
+                finally:
+                    completed_chunks += 1
+                    if on_progress:
+                        await on_progress("chunk", {
+                            "chunk": i + 1,
+                            "completed": completed_chunks,
+                            "total": len(chunks),
+                            "tradelines": len(result),
+                            "failed": failed
+                        })
+        
+        results = await asyncio.gather(
+            *(process_chunk(i, chunk) for i, chunk in enumerate(chunks)),
+            return_exceptions=True
+        )
+        
+        all_tradelines = []
+        seen_tradelines = set()  # To avoid duplicates
+        failed_chunks = []
+        
+        # Merge in input order so output does not depend on completion order
+        for i, result in enumerate(results):
+            if isinstance(result, WorkerPoolSaturatedError):
+                raise result
+            if isinstance(result, BaseException):
+                reason = "timed out" if isinstance(result, asyncio.TimeoutError) else str(result)
+                logger.error(f"❌ Failed to process chunk {i+1}: {reason}")
+                failed_chunks.append(i)
+                # Tradelines it streamed before failing were already handed off; keep them
+                result = streamed_by_chunk.get(i, [])
+            
+            # Deduplicate tradelines based on creditor name + account number
+            for tradeline in result:
+                identifier = tradeline_identity(tradeline)
+                if identifier is None or identifier not in seen_tradelines:
+                    seen_tradelines.add(identifier)
+                    all_tradelines.append(tradeline)
+        
+        self.last_chunk_stats = {
+            "chunks": len(chunks),
+            "failed_chunks": failed_chunks,
+            "partial": bool(failed_chunks),
+            "duration_seconds": (datetime.now() - start_time).total_seconds()
+        }
+        
+        if failed_chunks and not self.allow_partial:
+            raise PartialResultsError(len(failed_chunks), len(chunks))
+        
+        if failed_chunks:
+            logger.warning(f"⚠️ Returning partial results: {len(chunks) - len(failed_chunks)}/{len(chunks)} chunks succeeded")
+        
+        logger.info(f"✅ Total tradelines extracted from all chunks: {len(all_tradelines)}")
+        return all_tradelines
+
+    # Add this endpoint to your main.py file (after the existing endpoints)
+
+@app.post("/save-tradelines")
+async def save_tradelines_endpoint(request: dict):
+    """
+    Endpoint to save tradelines to database
+    """
+    try:
+        user_id = request.get('userId')
+        tradelines = request.get('tradelines', [])
+
+        if not user_id:
+            raise HTTPException(status_code=400, detail="User ID is required")
+        
+        if not tradelines:
+            raise HTTPException(status_code=400, detail="No tradelines provided")
+        
+        logger.info(f"💾 Saving {len(tradelines)} tradelines for user {user_id}")
+        
+        if not tradeline_writer:
+            logger.warning("⚠️ Supabase not available, cannot save tradelines")
+            raise HTTPException(status_code=503, detail="Database not available")
+        
+        # Validate every row up front, then upsert in batches
+        save_result = await tradeline_writer.save(tradelines, user_id)
+        
+        return {
+            "success": True,
+            "message": f"Saved {save_result.saved_count} tradelines successfully",
+            "saved_count": save_result.saved_count,
+            "failed_count": save_result.failed_count,
+            "total_tradelines": len(tradelines),
+            "results": [asdict(result) for result in save_result.results]
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Save endpoint failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to save tradelines: {str(e)}")
+
+# Also add this function to check/fix Supabase connection
+def check_supabase_connection():
+    """Check if Supabase is properly configured"""
+    global supabase
+    
+    logger.info("🔍 Checking Supabase configuration...")
+    
+    if not SUPABASE_URL:
+        logger.error("❌ SUPABASE_URL environment variable not set")
+        return False
+        
+    if not SUPABASE_ANON_KEY:
+        logger.error("❌ SUPABASE_ANON_KEY environment variable not set")
+        return False
+    
+    try:
+        # Test the connection
+        result = supabase.table('tradelines').select('id').limit(1).execute()
+        logger.info("✅ Supabase connection test successful")
+        return True
+    except Exception as e:
+        logger.error(f"❌ Supabase connection test failed: {e}")
+        return False
+
+# Update the health endpoint to include Supabase status
+@app.get("/health")
+async def health_check():
+    """Enhanced health check endpoint"""
+    supabase_available = check_supabase_connection() if supabase else False
+    
+    health_status = {
+        "status": "healthy",
+        "timestamp": datetime.utcnow().isoformat() + "Z", # type: ignore
+        "services": {
+            "document_ai": {
+                "configured": bool(PROJECT_ID and PROCESSOR_ID and client),
+                "project_id": PROJECT_ID,
+                "location": LOCATION,
+                "processor_id": PROCESSOR_ID[:8] + "..." if PROCESSOR_ID else None,
+                "clients": document_ai_clients.get_metrics() if document_ai_clients else None,
+                "batching": document_ai.batcher.get_stats() if document_ai else None
+            },
+            "gemini": {
+                "configured": bool(GEMINI_API_KEY and gemini_model),
+                "model": "gemini-1.5-flash" if gemini_model else None,
+                "fake_backend": GEMINI_FAKE_BACKEND,
+                "client": gemini_client.get_metrics() if gemini_client else None
+            },
+            "supabase": {
+                "configured": bool(SUPABASE_URL and SUPABASE_ANON_KEY),
+                "available": supabase_available,  # ✅ Added availability check
+                "url": SUPABASE_URL[:30] + "..." if SUPABASE_URL else None
+            },
+            "report_cache": report_cache.get_stats() if report_cache else {"enabled": False},
+            "tradeline_writer": tradeline_writer.get_stats() if tradeline_writer else None,
+            "worker_pools": worker_pools.get_metrics(),
+            "event_loop": loop_lag_monitor.get_metrics(),
+            "pdf_extraction": pdf_extractor.get_stats()
+        },
+        "environment": {
+            "python_version": "3.x",
+            "fastapi_version": "0.x",
+        }
+    }
+    
+    logger.info("🔍 Health check requested")
+    return health_status
+
+@app.post("/debug-parsing")
+async def debug_parsing(
+    request: Request,
+    file: UploadFile = File(...),
+    method: str = Form(default="all")  # "all", "gemini", "basic"
+):
+    """Debug endpoint to test different parsing methods"""
+    try:
+        logger.info(f"🐛 Debug parsing request: method={method}")
+        
+        # Read file content
+        content = await file.read()
+        logger.info(f"📦 File size: {len(content)} bytes")
+        
+        # Extract text using PyPDF2, straight from the uploaded bytes
+        pages = await pdf_extractor.extract_pages(content)
+        text_length = joined_length(pages)
+        
+        logger.info(f"📖 Extracted {text_length} characters from PDF")
+        
+        results = {
+            "text_length": text_length,
+            "first_500_chars": text_preview(pages, 500),
+            "methods": {}
+        }
+        
+        # Test different methods
+        if method in ["all", "gemini"]:
+            try:
+                gemini_processor = GeminiProcessor()
+                gemini_tradelines = await cancel_on_disconnect(request, gemini_processor.extract_tradelines_from_pages(pages))
+                results["methods"]["gemini"] = {
+                    "tradelines": gemini_tradelines,
+                    "count": len(gemini_tradelines)
+                }
+            except ClientDisconnectedError:
+                raise
+            except Exception as e:
+                results["methods"]["gemini"] = {
+                    "error": str(e),
+                    "count": 0
+                }
+        
+        if method in ["all", "basic"]:
+            try:
+                basic_tradelines = parse_tradeline_lines(iter_page_lines(pages))
+                results["methods"]["basic"] = {
+                    "tradelines": basic_tradelines,
+                    "count": len(basic_tradelines)
+                }
+            except Exception as e:
+                results["methods"]["basic"] = {
+                    "error": str(e),
+                    "count": 0
+                }
+        
+        return results
+                
+    except WorkerPoolSaturatedError as e:
+        raise saturated_response(e)
+    except ClientDisconnectedError:
+        logger.warning("🔌 Client disconnected, debug parsing cancelled")
+        raise HTTPException(status_code=499, detail="Client closed request")
+    except Exception as e:
+        logger.error(f"❌ Debug parsing failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Debug parsing failed: {str(e)}")
+
+def document_ai_configured() -> bool:
+    return bool(document_ai and client and PROJECT_ID and PROCESSOR_ID)
+
+async def extract_text_whole_document(content: PdfSource, allow_local_fallback: bool = True) -> Tuple[List[PdfPage], str]:
+    """
+    Extract the whole PDF with Document AI, falling back to PyPDF2.
+    Returns (pages, text_source); Document AI text comes back as a single page
+    """
+    if document_ai_configured():
+        try:
+            logger.info("🤖 Attempting Document AI processing...")
+            text = await document_ai.extract_text(content)
+            logger.info(f"✅ Document AI text extraction successful")
+            return [PdfPage(page_number=1, text=text)], "document_ai"
+        except WorkerPoolSaturatedError:
+            raise
+        except Exception as doc_ai_error:
+            logger.error(f"❌ Document AI processing failed: {str(doc_ai_error)}")
+    else:
+        logger.warning("⚠️ Document AI not properly configured")
+    
+    if not allow_local_fallback:
+        raise HTTPException(status_code=500, detail="Could not process PDF with any method")
+    
+    try:
+        logger.info("🔄 Trying PyPDF2 fallback...")
+        pages = await pdf_extractor.extract_pages(content)
+        logger.info(f"📖 PyPDF2 extracted {joined_length(pages)} characters from {len(pages)} pages")
+        return pages, "pypdf2"
+    except WorkerPoolSaturatedError:
+        raise
+    except Exception as fallback_error:
+        logger.error(f"❌ All processing methods failed: {str(fallback_error)}")
+        logger.error(f"📍 Traceback: {traceback.format_exc()}")
+        raise HTTPException(status_code=500, detail="Could not process PDF with any method")
+
+async def extract_text_with_triage(content: PdfSource) -> Tuple[List[PdfPage], str, Optional[Dict[str, Any]]]:
+    """
+    Read the embedded text layer locally and OCR only the pages where it is
+    missing or unusable, merging the OCR text back in page order.
+    Returns (pages, text_source, triage_summary)
+    """
+    try:
+        pages = await pdf_extractor.extract_pages(content)
+    except WorkerPoolSaturatedError:
+        raise
+    except Exception as local_error:
+        logger.error(f"❌ Local text extraction failed, sending the whole PDF to Document AI: {str(local_error)}")
+        pages, text_source = await extract_text_whole_document(content, allow_local_fallback=False)
+        return pages, text_source, None
+    
+    decisions = triage_pages(pages, triage_config)
+    triage = summarize_triage(decisions)
+    ocr_pages = triage["ocr_pages"]
+    text_source = "native_text"
+    logger.info(f"🔎 Page triage: {len(pages) - len(ocr_pages)} native, {len(ocr_pages)} need OCR")
+    
+    if ocr_pages and document_ai_configured():
+        try:
+            if len(ocr_pages) == len(pages):
+                ocr_content = content
+            else:
+                ocr_content = await worker_pools.run_cpu(build_page_subset_pdf, content, ocr_pages)
+            logger.info(f"🤖 Sending pages {ocr_pages} to Document AI OCR...")
+            ocr_texts = await document_ai.extract_page_texts(ocr_content)
+            if len(ocr_texts) != len(ocr_pages):
+                missing_pages = ocr_pages[len(ocr_texts):]
+                logger.warning(f"⚠️ Document AI returned {len(ocr_texts)} pages for {len(ocr_pages)} sent, "
+                               f"pages {missing_pages} keep their embedded text")
+                triage["ocr_missing_pages"] = missing_pages
+            for page_number, text in zip(ocr_pages, ocr_texts):
+                pages[page_number - 1] = PdfPage(page_number=page_number, text=text)
+            all_pages_ocr = len(ocr_pages) == len(pages) and len(ocr_texts) >= len(ocr_pages)
+            text_source = "document_ai" if all_pages_ocr else "native_text + document_ai"
+        except WorkerPoolSaturatedError:
+            raise
+        except Exception as doc_ai_error:
+            logger.error(f"❌ Document AI OCR failed, keeping embedded text for pages {ocr_pages}: {str(doc_ai_error)}")
+            triage["ocr_error"] = str(doc_ai_error)
+    elif ocr_pages:
+        logger.warning(f"⚠️ Document AI not configured, pages {ocr_pages} keep their embedded text")
+    
+    triage["text_source"] = text_source
+    return pages, text_source, triage
+
+async def extract_tradelines_from_pdf(
+    content: PdfSource,
+    on_tradeline: Optional[TradelineCallback] = None,
+    on_progress: Optional[EventCallback] = None
+) -> Tuple[List[Dict[str, Any]], str, List[PdfPage], Optional[Dict[str, Any]]]:
+    """
+    Run the extraction chain on an uploaded PDF (the spooled file's path, so
+    page extraction maps it instead of copying it into each worker):
+    text from the embedded layer plus Document AI OCR for image-only pages
+    (or the whole document through Document AI when triage is disabled),
+    then Gemini, falling back to basic parsing. Both read the pages line by
+    line; the report text is never joined whole for them.
+    on_tradeline is awaited once per tradeline as soon as it is available;
+    on_progress receives stage events ("text_extracted", "chunk").
+    Returns (tradelines, processing_method, pages, triage_summary)
+    """
+    triage = None
+    if triage_config.enabled:
+        pages, text_source, triage = await extract_text_with_triage(content)
+    else:
+        pages, text_source = await extract_text_whole_document(content)
+    
+    if on_progress:
+        await on_progress("text_extracted", {
+            "text_source": text_source,
+            "characters": joined_length(pages),
+            "total_pages": triage["total_pages"] if triage else None,
+            "ocr_pages": triage["ocr_pages"] if triage else None
+        })
+    
+    tradelines = []
+    processing_method = text_source
+    streamed = []
+    
+    async def emit(tradeline: Dict[str, Any]) -> None:
+        streamed.append(tradeline)
+        if on_tradeline:
+            await on_tradeline(tradeline)
+    
+    if gemini_client and any(page.text.strip() for page in pages):
+        try:
+            logger.info("🧠 Attempting Gemini tradeline extraction...")
+            processor = GeminiProcessor()
+            tradelines = await processor.extract_tradelines_from_pages(pages, emit, on_progress)
+            if tradelines and processor.last_chunk_stats.get("partial"):
+                processing_method = f"{text_source} + gemini (partial)"
+                logger.warning(f"⚠️ Gemini extraction partial: {len(tradelines)} tradelines")
+            elif tradelines:
+                processing_method = f"{text_source} + gemini"
+                logger.info(f"✅ Gemini extraction successful: {len(tradelines)} tradelines")
+            elif streamed:
+                # The stream failed part way; keep what was already handed off
+                tradelines = list(streamed)
+                processing_method = f"{text_source} + gemini (partial)"
+                logger.warning(f"⚠️ Gemini stream ended early, keeping {len(tradelines)} streamed tradelines")
+        except (WorkerPoolSaturatedError, PartialResultsError):
+            raise
+        except Exception as gemini_error:
+            logger.error(f"❌ Gemini extraction failed: {str(gemini_error)}")
+    else:
+        logger.info("⚠️ Gemini not available, using basic parsing...")
+    
+    if not tradelines:
+        logger.info("🔧 Using basic parsing as final fallback...")
+        tradelines = parse_tradeline_lines(iter_page_lines(pages))
+        processing_method = f"{text_source} + basic"
+        for tradeline in tradelines:
+            await emit(tradeline)
+    
+    return tradelines, processing_method, pages, triage
+
+def is_complete_result(processing_method: str) -> bool:
+    """Only a full Gemini extraction is cached; partial and basic-parser results are worth retrying"""
+    return processing_method.endswith(" + gemini")
+
+async def receive_pdf_upload(file: UploadFile) -> Tuple[SpooledUpload, str]:
+    """
+    Validate the upload and stream it to a spool file in 1 MB chunks, hashing
+    as it goes; the size limit is enforced mid-stream (413). The caller
+    discards the spooled file when done. Returns (upload, original_filename)
+    """
+    # ✅ FIXED: Store filename early before file operations
+    original_filename = file.filename or "unknown.pdf"
+    file_content_type = file.content_type
+    
+    logger.info(f"📄 File: {original_filename}")
+    logger.info(f"📦 Content type: {file_content_type}")
+    
+    # Validate file type using stored filename
+    if not original_filename.lower().endswith('.pdf'):
+        logger.error("❌ Invalid file type")
+        raise HTTPException(status_code=400, detail="Only PDF files allowed")
+    
+    # Copy the content ONCE, never holding more than a chunk in memory
+    logger.info("📖 Receiving file content...")
+    try:
+        upload = await spool_upload(
+            file, UPLOAD_SPOOL_DIR, max_bytes=int(MAX_UPLOAD_MB * 1024 * 1024), run=worker_pools.run_io
+        )
+    except UploadTooLargeError as e:
+        logger.error(f"❌ {e}")
+        raise HTTPException(status_code=413, detail=str(e))
+    logger.info(f"📦 File size: {upload.size} bytes ({upload.size/1024/1024:.2f} MB)")
+    
+    if upload.size == 0:
+        upload.discard()
+        logger.error("❌ Empty file")
+        raise HTTPException(status_code=400, detail="File is empty")
+    
+    return upload, original_filename
+
+async def process_report_content(
+    upload: SpooledUpload,
+    original_filename: str,
+    user_id: str,
+    request: Optional[Request] = None,
+    on_tradeline: Optional[TradelineCallback] = None,
+    on_progress: Optional[EventCallback] = None
+) -> Dict[str, Any]:
+    """
+    Extract, save and summarize one uploaded report
+    Re-uploads of an identical PDF are served from the content-hash report cache.
+    With a request, in-flight OCR/Gemini calls are cancelled if its client goes away.
+    on_tradeline is awaited once per tradeline as soon as it is available and
+    on_progress receives stage events, for the streaming endpoint.
+    """
+    # Check the report cache before doing any OCR/LLM work; the hash was computed while receiving
+    file_hash = upload.sha256
+    cached_entry = report_cache.get(file_hash) if report_cache else None
+    
+    if on_progress:
+        await on_progress("started", {
+            "file_name": original_filename,
+            "file_size_bytes": upload.size,
+            "file_hash": file_hash,
+            "cache_hit": bool(cached_entry)
+        })
+    
+    triage = None
+    already_saved = bool(cached_entry) and user_id in cached_entry.get("saved_for_users", [])
+    save_enabled = tradeline_writer is not None and not already_saved
+    save_tasks = []
+    rows_sent = []    # every row handed to the writer, in the order the save results come back
+    pending_rows = []
+    streamed_count = 0
+    first_tradeline_seconds = None
+    extraction_started = datetime.now()
+    
+    def start_save(rows: List[Dict[str, Any]]) -> None:
+        rows_sent.extend(rows)
+        save_tasks.append(asyncio.create_task(tradeline_writer.save(rows, user_id)))
+    
+    async def handle_extracted(tradeline: Dict[str, Any]) -> None:
+        # Start the database write for each full batch while the model is still generating
+        nonlocal first_tradeline_seconds, streamed_count, pending_rows
+        streamed_count += 1
+        if first_tradeline_seconds is None:
+            first_tradeline_seconds = (datetime.now() - extraction_started).total_seconds()
+            logger.info(f"⏱️ First tradeline after {first_tradeline_seconds:.2f}s")
+        if save_enabled:
+            pending_rows.append(tradeline)
+            if len(pending_rows) >= tradeline_writer.batch_size:
+                start_save(pending_rows)
+                pending_rows = []
+        if on_tradeline:
+            await on_tradeline(tradeline)
+    
+    try:
+        if cached_entry:
+            logger.info(f"⚡ Report cache hit for {file_hash[:12]}...")
+            tradelines = cached_entry["tradelines"]
+            processing_method = "cache"
+        else:
+            # Extraction reads the spooled file in place; its content is never copied into memory whole
+            extraction = extract_tradelines_from_pdf(
+                upload.path,
+                handle_extracted if GEMINI_STREAMING or on_tradeline else None,
+                on_progress
+            )
+            if request is not None:
+                extraction = cancel_on_disconnect(request, extraction)
+            tradelines, processing_method, pages, triage = await extraction
+        
+            if report_cache and tradelines and is_complete_result(processing_method):
+                report_cache.set(file_hash, join_pages(pages), tradelines, processing_method)
+        
+        if on_tradeline and not streamed_count:
+            # Cached or buffered results arrive all at once
+            for tradeline in tradelines:
+                await on_tradeline(tradeline)
+        
+        logger.info(f"📊 Processing completed using: {processing_method}")
+        logger.info(f"📈 Found {len(tradelines)} tradelines")
+        
+        # Step 2: Save tradelines to Supabase (if available)
+        saved_count = 0
+        failed_count = 0
+        failed_tradelines = []
+        
+        if on_progress and save_enabled:
+            await on_progress("saving", {"tradelines": len(tradelines)})
+        
+        if supabase and already_saved:
+            logger.info("💾 Tradelines from this report already saved for user, skipping database save")
+            saved_count = len(tradelines)
+        elif save_enabled:
+            # Streamed tradelines were saved batch by batch; send whatever is left
+            remaining = pending_rows if streamed_count else tradelines
+            if remaining:
+                start_save(remaining)
+            logger.info(f"💾 Saving {len(rows_sent)} tradelines to Supabase in {len(save_tasks)} write(s)...")
+            save_result = BulkSaveResult()
+            for result in await asyncio.gather(*save_tasks):
+                save_result.merge(result)
+            saved_count = save_result.saved_count
+            failed_count = save_result.failed_count
+            failed_tradelines = [
+                {
+                    "creditor_name": rows_sent[failure.index].get("creditor_name"),
+                    "account_number": rows_sent[failure.index].get("account_number"),
+                    "error": failure.error
+                }
+                for failure in save_result.failures
+            ]
+        
+            if report_cache and tradelines and failed_count == 0:
+                report_cache.mark_saved(file_hash, user_id)
+        else:
+            logger.warning("⚠️ Supabase not available, skipping database save")
+    finally:
+        # A failed or cancelled request (a closed stream) must not leave writes running behind it
+        for task in save_tasks:
+            task.cancel()
+        await asyncio.gather(*save_tasks, return_exceptions=True)
+    
+    # Step 3: Build the response
+    return {
+        "success": True,
+        "message": f"Successfully processed {len(tradelines)} tradelines using {processing_method}",
+        "tradelines_found": len(tradelines),
+        "tradelines_saved": saved_count,
+        "tradelines_failed": failed_count,
+        "failed_tradelines": failed_tradelines,
+        "processing_method": processing_method,
+        "tradelines": tradelines,
+        "debug_info": {
+            "file_size_bytes": upload.size,
+            "file_name": original_filename,  # ✅ Use stored filename
+            "file_hash": file_hash,
+            "user_id": user_id,
+            "cache_hit": bool(cached_entry),
+            "cached_processing_method": cached_entry.get("processing_method") if cached_entry else None,
+            "ocr_triage": triage,
+            "time_to_first_tradeline_seconds": first_tradeline_seconds,
+            "supabase_available": supabase is not None,
+            "document_ai_available": client is not None,
+            "gemini_available": gemini_client is not None
+        }
+    }
+
+@app.post("/process-credit-report")
+async def process_credit_report(
+    request: Request,
+    file: UploadFile = File(...),
+    user_id: str = Form(default="default-user")
+):
+    """
+    Main endpoint: Process uploaded credit report PDF
+    FIXED: Properly handle file upload without filename attribute errors
+    Re-uploads of an identical PDF are served from the content-hash report cache
+    """
+    try:
+        logger.info("🚀 ===== NEW CREDIT REPORT PROCESSING REQUEST =====")
+        logger.info(f"👤 User ID: {user_id}")
+        
+        upload, original_filename = await receive_pdf_upload(file)
+        try:
+            response = await process_report_content(upload, original_filename, user_id, request=request)
+        finally:
+            upload.discard()
+        tradelines = response["tradelines"]
+        saved_count = response["tradelines_saved"]
+        failed_count = response["tradelines_failed"]
+        
+        logger.info("✅ ===== PROCESSING COMPLETED SUCCESSFULLY =====")
+        logger.info(f"📊 Final stats: {len(tradelines)} found, {saved_count} saved, {failed_count} failed")
+        
+        return response
+        
+    except HTTPException:
+        # Re-raise HTTP exceptions
+        raise
+    except WorkerPoolSaturatedError as e:
+        raise saturated_response(e)
+    except PartialResultsError as e:
+        raise partial_results_response(e)
+    except ClientDisconnectedError:
+        logger.warning("🔌 Client disconnected, processing cancelled")
+        raise HTTPException(status_code=499, detail="Client closed request")
+    except Exception as e:
+        logger.error("❌ ===== PROCESSING FAILED =====")
+        logger.error(f"💥 Error: {str(e)}")
+        logger.error(f"📍 Traceback: {traceback.format_exc()}")
+        
+        raise HTTPException(
+            status_code=500, 
+            detail=f"Processing failed: {str(e)}"
+        )
+
+
+def stream_error_payload(error: BaseException) -> Dict[str, Any]:
+    """Error event body, with the status code the JSON endpoint would have returned"""
+    if isinstance(error, WorkerPoolSaturatedError):
+        http_error = saturated_response(error)
+        return {"status_code": http_error.status_code, "detail": http_error.detail, "retry_after": error.retry_after}
+    if isinstance(error, PartialResultsError):
+        error = partial_results_response(error)
+    if isinstance(error, HTTPException):
+        return {"status_code": error.status_code, "detail": error.detail}
+    logger.error(f"📍 Traceback: {''.join(traceback.format_exception(error))}")
+    return {"status_code": 500, "detail": f"Processing failed: {str(error)}"}
+
+@app.post("/process-credit-report/stream")
+async def process_credit_report_stream(
+    request: Request,
+    file: UploadFile = File(...),
+    user_id: str = Form(default="default-user"),
+    stream_format: Optional[str] = Query(default=None, alias="format")
+):
+    """
+    Streaming variant of /process-credit-report
+    Emits progress events ("started", "text_extracted", "chunk", "saving"), one
+    "tradeline" event per tradeline as soon as it is extracted, and a final
+    "summary" (the /process-credit-report response without the tradeline list)
+    or "error" event. Server-Sent Events by default; NDJSON with ?format=ndjson
+    or Accept: application/x-ndjson. Idle periods carry heartbeats, and the
+    work is cancelled if the client disconnects.
+    """
+    logger.info("🚀 ===== NEW STREAMING CREDIT REPORT REQUEST =====")
+    logger.info(f"👤 User ID: {user_id}")
+    
+    # Upload errors are still plain HTTP errors, before any bytes are streamed
+    try:
+        upload, original_filename = await receive_pdf_upload(file)
+    except WorkerPoolSaturatedError as e:
+        raise saturated_response(e)
+    media_type = choose_media_type(stream_format, request.headers.get("accept"))
+    
+    async def work(emit: EventCallback) -> Dict[str, Any]:
+        async def on_tradeline(tradeline: Dict[str, Any]) -> None:
+            await emit("tradeline", tradeline)
+        
+        try:
+            response = await process_report_content(
+                upload, original_filename, user_id, on_tradeline=on_tradeline, on_progress=emit
+            )
+        finally:
+            upload.discard()
+        logger.info(f"✅ Streamed {response['tradelines_found']} tradelines using {response['processing_method']}")
+        return {key: value for key, value in response.items() if key != "tradelines"}
+    
+    return StreamingResponse(
+        stream_events(work, media_type, STREAM_HEARTBEAT_SECONDS, on_error=stream_error_payload),
+        media_type=media_type,
+        headers=STREAM_HEADERS,
+        # Also covers a client that leaves before the stream starts
+        background=BackgroundTask(upload.discard)
+    )
@@ -0,0 +1,164 @@
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from ..config.llm_config import LLMConfig
+from ..utils.json_stream import extract_json_value
+from ..utils.llm_helpers import TokenCounter
+from .prompt_templates import PromptTemplates
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+IndexedTradeline = Tuple[int, Dict[str, Any]]
+
+# (prompt, context, operation, max_tokens) -> response text, as LLMParserService._make_llm_request
+LLMRequest = Callable[[str, Any, str, int], Awaitable[str]]
+
+class BatchTradelineNormalizer:
+    """LLM tier of tradeline normalization, several tradelines per request.
+
+    Tradelines are grouped into batches bounded by count and the token
+    budget. Each response entry is mapped back to its input by the index the
+    model echoes; tradelines a response leaves out, or whose entry cannot be
+    turned into a result, are re-asked one request each.
+    """
+
+    def __init__(
+        self,
+        config: LLMConfig,
+        request: LLMRequest,
+        token_counter: Optional[TokenCounter] = None,
+        prompt_templates: Optional[PromptTemplates] = None
+    ):
+        self.config = config
+        self.request = request
+        self.token_counter = token_counter or TokenCounter()
+        self.prompt_templates = prompt_templates or PromptTemplates()
+
+    async def normalize(
+        self,
+        items: List[IndexedTradeline],
+        context: Any,
+        create: Callable[[Dict[str, Any], Dict[str, Any]], T],
+        normalize_single: Callable[[int, Dict[str, Any], Any], Awaitable[T]]
+    ) -> Tuple[Dict[int, T], int]:
+        """
+        Normalize (index, raw tradeline) pairs in batches
+
+        Args:
+            items: Tradelines to normalize, with their input indexes
+            context: Processing context passed through to the prompts and requests
+            create: Builds a result from (normalized entry, raw tradeline); raising re-asks the item
+            normalize_single: Normalizes one (index, raw tradeline, context) with its own request
+
+        Returns:
+            Tuple of (results keyed by input index, number of LLM requests made)
+        """
+        results: Dict[int, T] = {}
+        failed: List[IndexedTradeline] = []
+        batches = self.build_batches(items, context)
+
+        for batch_number, batch in enumerate(batches):
+            normalized = await self.normalize_batch(batch_number, batch, context)
+            for idx, raw_tradeline in batch:
+                try:
+                    results[idx] = create(normalized[idx], raw_tradeline)
+                except Exception as e:
+                    logger.warning(f"Batch normalization missed tradeline {idx}: {str(e)}")
+                    failed.append((idx, raw_tradeline))
+
+        # Re-ask only the items the batch responses did not cover
+        for idx, raw_tradeline in failed:
+            results[idx] = await normalize_single(idx, raw_tradeline, context)
+
+        logger.info(
+            f"LLM-normalized {len(items)} tradelines with {len(batches)} batch requests "
+            f"and {len(failed)} individual retries"
+        )
+        return results, len(batches) + len(failed)
+
+    async def normalize_batch(
+        self,
+        batch_number: int,
+        batch: List[IndexedTradeline],
+        context: Any
+    ) -> Dict[int, Dict[str, Any]]:
+        """Normalize a batch of tradelines in one request, keyed by input index; {} if the request fails"""
+
+        prompt = self.prompt_templates.get_batch_tradeline_normalization_prompt(
+            raw_tradelines=batch,
+            context=context
+        )
+        prompt_tokens = self.token_counter.count_tokens(prompt)
+        max_tokens = min(
+            len(batch) * self.config.normalization_output_tokens_per_tradeline,
+            max(self.config.max_tokens - prompt_tokens, self.config.normalization_output_tokens_per_tradeline)
+        )
+
+        try:
+            response = await self.request(prompt, context, f"tradeline_normalization_batch_{batch_number}", max_tokens)
+            return self.parse_response(response, [idx for idx, _ in batch])
+        except Exception as e:
+            logger.error(f"Error normalizing tradeline batch {batch_number}: {str(e)}")
+            return {}
+
+    def build_batches(self, items: List[IndexedTradeline], context: Any) -> List[List[IndexedTradeline]]:
+        """Group tradelines into batches bounded by count and the token budget"""
+
+        # Fixed cost of the instructions, paid once per request
+        base_tokens = self.token_counter.count_tokens(
+            self.prompt_templates.get_batch_tradeline_normalization_prompt([], context)
+        )
+        output_tokens = self.config.normalization_output_tokens_per_tradeline
+
+        batches: List[List[IndexedTradeline]] = []
+        batch: List[IndexedTradeline] = []
+        batch_tokens = base_tokens
+
+        for idx, raw_tradeline in items:
+            # Input JSON plus the normalized entry the model will write back
+            item_tokens = self.token_counter.count_tokens(
+                json.dumps({"index": idx, "tradeline": raw_tradeline}, indent=2)
+            ) + output_tokens
+
+            if batch and (len(batch) >= self.config.max_tradelines_per_request
+                          or batch_tokens + item_tokens > self.config.max_tokens):
+                batches.append(batch)
+                batch = []
+                batch_tokens = base_tokens
+
+            batch.append((idx, raw_tradeline))
+            batch_tokens += item_tokens
+
+        if batch:
+            batches.append(batch)
+
+        return batches
+
+    @staticmethod
+    def parse_response(response: str, expected_indices: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Map batch response items back to input indices, dropping unknown or duplicate ones"""
+
+        try:
+            data = json.loads(response)
+        except json.JSONDecodeError:
+            # Skip markdown fences and prose around the object
+            json_text = extract_json_value(response, "{[")
+            if json_text is None:
+                raise
+            data = json.loads(json_text)
+
+        items = data.get("tradelines", []) if isinstance(data, dict) else data
+        expected = set(expected_indices)
+        normalized: Dict[int, Dict[str, Any]] = {}
+
+        for item in items if isinstance(items, list) else []:
+            if not isinstance(item, dict):
+                continue
+            idx = item.get("index")
+            if isinstance(idx, int) and not isinstance(idx, bool) and idx in expected and idx not in normalized:
+                normalized[idx] = {key: value for key, value in item.items() if key != "index"}
+
+        return normalized
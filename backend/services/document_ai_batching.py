@@ -0,0 +1,239 @@
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from .worker_pools import WorkerPools
+from ..utils.pdf_text import PdfSource, count_pdf_pages, iter_pdf_pages, read_pdf_bytes, split_pdf_pages
+
+try:
+    from google.api_core import exceptions as google_exceptions # type: ignore
+except ImportError:
+    google_exceptions = None
+
+logger = logging.getLogger(__name__)
+
+class TransientDocumentAIError(Exception):
+    """A failure worth retrying (timeouts, throttling, unavailable backend)"""
+
+class DocumentAIPageLimitError(ValueError):
+    """A request had more pages than the processor accepts online"""
+
+if google_exceptions is not None:
+    RETRYABLE_ERRORS: Tuple[type, ...] = (
+        TransientDocumentAIError,
+        google_exceptions.ServiceUnavailable,
+        google_exceptions.DeadlineExceeded,
+        google_exceptions.ResourceExhausted,
+        google_exceptions.InternalServerError,
+    )
+else:
+    RETRYABLE_ERRORS = (TransientDocumentAIError,)
+
+@dataclass
+class ProcessedBatch:
+    """Text of one sub-document and the (start, end) span of each of its pages in that text"""
+    text: str
+    page_spans: List[Tuple[int, int]]
+
+@dataclass
+class PageOffset:
+    """Where a page of the original PDF sits in the stitched text"""
+    page_number: int
+    start: int
+    end: int
+
+@dataclass
+class StitchedDocument:
+    """Document AI output for a whole PDF, reassembled from page-range batches"""
+    text: str
+    pages: List[PageOffset] = field(default_factory=list)
+    batch_count: int = 0
+
+    @property
+    def page_texts(self) -> List[str]:
+        return [self.text[page.start:page.end] for page in self.pages]
+
+class DocumentAIOnlineProcessor:
+    """Online processing through the shared async Document AI clients"""
+
+    def __init__(self, clients: Any):
+        # A DocumentAIClientManager; each request takes the next pooled client
+        self.clients = clients
+
+    async def process(self, pdf_content: bytes) -> ProcessedBatch:
+        from google.cloud import documentai # type: ignore
+
+        request = documentai.ProcessRequest(
+            name=self.clients.processor_name,
+            raw_document=documentai.RawDocument(content=pdf_content, mime_type="application/pdf")
+        )
+        result = await self.clients.get_async_client().process_document(request=request)
+        document = result.document
+
+        page_spans = []
+        for page in document.pages:
+            segments = page.layout.text_anchor.text_segments
+            if segments:
+                page_spans.append((int(segments[0].start_index), int(segments[-1].end_index)))
+            else:
+                page_spans.append((0, 0))
+        return ProcessedBatch(text=document.text, page_spans=page_spans)
+
+class LocalDocumentAIProcessor:
+    """
+    Offline stand-in for Document AI online processing
+
+    Reads the embedded text layer with PyPDF2 and mimics the service's page
+    limit, latency and transient failures, so batching, ordering and retries
+    can be exercised without credentials.
+    """
+
+    def __init__(self, max_pages: int = 15, latency_seconds: float = 0.0, transient_failures: int = 0):
+        self.max_pages = max_pages
+        self.latency_seconds = latency_seconds
+        self.transient_failures = transient_failures
+        self.calls: List[int] = []  # page count of each request, in arrival order
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def process(self, pdf_content: bytes) -> ProcessedBatch:
+        pages = list(iter_pdf_pages(pdf_content))
+        self.calls.append(len(pages))
+        if len(pages) > self.max_pages:
+            raise DocumentAIPageLimitError(f"Document has {len(pages)} pages, online processing allows {self.max_pages}")
+
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency_seconds)
+            if self.transient_failures > 0:
+                self.transient_failures -= 1
+                raise TransientDocumentAIError("Service unavailable")
+        finally:
+            self.in_flight -= 1
+
+        text_parts = []
+        page_spans = []
+        offset = 0
+        for page in pages:
+            page_text = page.text + "\n"
+            text_parts.append(page_text)
+            page_spans.append((offset, offset + len(page_text)))
+            offset += len(page_text)
+        return ProcessedBatch(text="".join(text_parts), page_spans=page_spans)
+
+class DocumentAIBatcher:
+    """Split a PDF into page ranges, process them concurrently and stitch the text back together.
+
+    Online Document AI requests are capped at a few pages and one large
+    request is the slowest path, so sub-documents of at most
+    max_pages_per_request pages are submitted with at most max_concurrency
+    requests in flight. Transient errors are retried with exponential
+    backoff; batches are stitched in page order whatever order they finish in.
+    """
+
+    def __init__(self, processor: Any, max_pages_per_request: int = 15, max_concurrency: int = 4,
+                 max_retries: int = 2, retry_backoff_seconds: float = 1.0,
+                 worker_pools: Optional[WorkerPools] = None):
+        self.processor = processor
+        self.max_pages_per_request = max(1, max_pages_per_request)
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max_retries
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.worker_pools = worker_pools
+        self._lock = threading.Lock()
+        self.stats = {
+            'documents': 0,
+            'requests': 0,
+            'retries': 0,
+            'failed_requests': 0
+        }
+
+    async def process(self, pdf_content: PdfSource) -> StitchedDocument:
+        """Process a PDF of any length (bytes or a stored file's path) and return the stitched text with page offsets"""
+        if self.worker_pools:
+            page_count = await self.worker_pools.run_io(count_pdf_pages, pdf_content)
+        else:
+            page_count = count_pdf_pages(pdf_content)
+
+        if page_count <= self.max_pages_per_request:
+            # A request body needs the bytes; only a short document is ever read whole
+            if self.worker_pools:
+                batches = [(1, await self.worker_pools.run_io(read_pdf_bytes, pdf_content))]
+            else:
+                batches = [(1, read_pdf_bytes(pdf_content))]
+        elif self.worker_pools:
+            batches = await self.worker_pools.run_cpu(split_pdf_pages, pdf_content, self.max_pages_per_request)
+        else:
+            batches = split_pdf_pages(pdf_content, self.max_pages_per_request)
+
+        logger.info(f"📑 Processing {page_count} pages as {len(batches)} Document AI request(s)")
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks = [
+            asyncio.ensure_future(self._process_batch(batch, first_page, semaphore))
+            for first_page, batch in batches
+        ]
+        try:
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            # One failed batch fails the document; stop the others spending quota on it
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        with self._lock:
+            self.stats['documents'] += 1
+        return self._stitch(batches, results)
+
+    async def _process_batch(self, batch: bytes, first_page: int, semaphore: asyncio.Semaphore) -> ProcessedBatch:
+        """Send one sub-document, retrying transient failures"""
+        attempt = 0
+        while True:
+            async with semaphore:
+                with self._lock:
+                    self.stats['requests'] += 1
+                try:
+                    return await self.processor.process(batch)
+                except RETRYABLE_ERRORS as e:
+                    error = e
+                except Exception:
+                    with self._lock:
+                        self.stats['failed_requests'] += 1
+                    raise
+
+            # Back off outside the semaphore so other batches can use the slot
+            if attempt >= self.max_retries:
+                with self._lock:
+                    self.stats['failed_requests'] += 1
+                logger.error(f"❌ Document AI batch starting at page {first_page} failed after {attempt + 1} attempts: {error}")
+                raise error
+            delay = self.retry_backoff_seconds * (2 ** attempt)
+            attempt += 1
+            with self._lock:
+                self.stats['retries'] += 1
+            logger.warning(f"⚠️ Document AI batch starting at page {first_page} failed ({error}), retry {attempt} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    def _stitch(self, batches: List[Tuple[int, bytes]], results: List[ProcessedBatch]) -> StitchedDocument:
+        """Concatenate batch texts in page order, shifting each page span by the text before it"""
+        text_parts = []
+        pages = []
+        offset = 0
+        for (first_page, _), result in zip(batches, results):
+            for index, (start, end) in enumerate(result.page_spans):
+                pages.append(PageOffset(page_number=first_page + index, start=offset + start, end=offset + end))
+            text_parts.append(result.text)
+            offset += len(result.text)
+        return StitchedDocument(text="".join(text_parts), pages=pages, batch_count=len(batches))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get request, retry and failure counters"""
+        with self._lock:
+            return {
+                **self.stats,
+                'max_pages_per_request': self.max_pages_per_request,
+                'max_concurrency': self.max_concurrency
+            }
@@ -0,0 +1,161 @@
+import asyncio
+import itertools
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+def _default_client_options(location: str) -> Any:
+    from google.api_core.client_options import ClientOptions # type: ignore
+    return ClientOptions(api_endpoint=f"{location}-documentai.googleapis.com")
+
+def _default_sync_factory(location: str, credentials: Any) -> Any:
+    from google.cloud import documentai # type: ignore
+    return documentai.DocumentProcessorServiceClient(
+        client_options=_default_client_options(location), credentials=credentials
+    )
+
+def _default_async_factory(location: str, credentials: Any) -> Any:
+    from google.cloud import documentai # type: ignore
+    return documentai.DocumentProcessorServiceAsyncClient(
+        client_options=_default_client_options(location), credentials=credentials
+    )
+
+class DocumentAIClientManager:
+    """Document AI clients created once per process and shared by every request.
+
+    Each client owns a gRPC channel; building one costs a credential load,
+    DNS lookup and TLS handshake. The sync client is created on first use,
+    the async clients at application startup (they bind to the running event
+    loop) and their channels are connected ahead of the first request.
+    Requests round-robin over the async pool. Time spent obtaining a client
+    is recorded per request, so cold setups show up in the metrics.
+    """
+
+    def __init__(self, project_id: Optional[str], location: str, processor_id: Optional[str],
+                 credentials: Any = None, async_pool_size: int = 1, warm_up_timeout_seconds: float = 5.0,
+                 sync_client_factory: Callable[[str, Any], Any] = _default_sync_factory,
+                 async_client_factory: Callable[[str, Any], Any] = _default_async_factory):
+        self.project_id = project_id
+        self.location = location
+        self.processor_id = processor_id
+        self.credentials = credentials
+        self.async_pool_size = max(1, async_pool_size)
+        self.warm_up_timeout_seconds = warm_up_timeout_seconds
+        self._sync_client_factory = sync_client_factory
+        self._async_client_factory = async_client_factory
+        self._sync_client: Any = None
+        self._async_clients: List[Any] = []
+        self._round_robin = itertools.count()
+        self._processor_name: Optional[str] = None
+        self._lock = threading.Lock()
+        self.metrics = {
+            'clients_created': 0,
+            'connection_setup_seconds': 0.0,
+            'requests': 0,
+            'cold_requests': 0,
+            'request_setup_seconds': 0.0
+        }
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.project_id and self.processor_id)
+
+    @property
+    def processor_name(self) -> str:
+        """Full processor resource name, built once"""
+        if self._processor_name is None:
+            self._processor_name = (
+                f"projects/{self.project_id}/locations/{self.location}/processors/{self.processor_id}"
+            )
+        return self._processor_name
+
+    def get_client(self) -> Any:
+        """Shared synchronous client"""
+        start_time = time.perf_counter()
+        cold = False
+        if self._sync_client is None:
+            with self._lock:
+                if self._sync_client is None:
+                    self._sync_client = self._create(self._sync_client_factory)
+                    cold = True
+        self._record_request(time.perf_counter() - start_time, cold)
+        return self._sync_client
+
+    def get_async_client(self) -> Any:
+        """Next async client from the pool, created here only if startup did not run"""
+        start_time = time.perf_counter()
+        cold = not self._async_clients
+        if cold:
+            self._create_async_clients()
+        client = self._async_clients[next(self._round_robin) % len(self._async_clients)]
+        self._record_request(time.perf_counter() - start_time, cold)
+        return client
+
+    async def start(self) -> None:
+        """Create the async clients and connect their channels before the first request"""
+        if not self.configured or self._async_clients:
+            return
+        self._create_async_clients()
+        start_time = time.perf_counter()
+        for client in self._async_clients:
+            channel = getattr(getattr(client, "transport", None), "grpc_channel", None)
+            if channel is None or not hasattr(channel, "channel_ready"):
+                continue
+            try:
+                await asyncio.wait_for(channel.channel_ready(), timeout=self.warm_up_timeout_seconds)
+            except Exception as e:
+                # The channel still connects on first use
+                logger.warning(f"⚠️ Document AI channel warm-up did not finish: {e}")
+        with self._lock:
+            self.metrics['connection_setup_seconds'] += time.perf_counter() - start_time
+        logger.info(f"✅ Document AI client pool ready: {len(self._async_clients)} async client(s)")
+
+    async def close(self) -> None:
+        """Close every channel; clients are recreated if used again"""
+        async_clients, self._async_clients = self._async_clients, []
+        for client in async_clients:
+            try:
+                await client.transport.close()
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to close Document AI async client: {e}")
+        sync_client, self._sync_client = self._sync_client, None
+        if sync_client is not None:
+            try:
+                sync_client.transport.close()
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to close Document AI client: {e}")
+        logger.info("🛑 Document AI clients closed")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Client counts and connection setup time, total and per request"""
+        with self._lock:
+            metrics = dict(self.metrics)
+        requests = metrics['requests']
+        metrics['avg_request_setup_ms'] = metrics['request_setup_seconds'] / requests * 1000 if requests else 0.0
+        metrics['async_clients'] = len(self._async_clients)
+        metrics['sync_client'] = self._sync_client is not None
+        return metrics
+
+    def _create_async_clients(self) -> None:
+        with self._lock:
+            if not self._async_clients:
+                self._async_clients = [
+                    self._create(self._async_client_factory) for _ in range(self.async_pool_size)
+                ]
+
+    def _create(self, factory: Callable[[str, Any], Any]) -> Any:
+        """Build one client and time it (callers hold self._lock)"""
+        start_time = time.perf_counter()
+        client = factory(self.location, self.credentials)
+        self.metrics['clients_created'] += 1
+        self.metrics['connection_setup_seconds'] += time.perf_counter() - start_time
+        return client
+
+    def _record_request(self, seconds: float, cold: bool) -> None:
+        with self._lock:
+            self.metrics['requests'] += 1
+            self.metrics['cold_requests'] += int(cold)
+            self.metrics['request_setup_seconds'] += seconds
@@ -1,311 +1,338 @@
-import asyncio
-import logging
-from typing import Dict, List, Any, Optional, Tuple
-from datetime import datetime
-from enum import Enum
-
-from ..models.tradeline_models import DocumentType, ExtractedTable, ExtractedText, DocumentAIResult
-
-logger = logging.getLogger(__name__)
-
-class DocumentAIService:
-    """Service for processing documents with AI"""
-    
-    def __init__(self, api_key: str = None, project_id: str = None):
-        self.api_key = api_key
-        self.project_id = project_id
-        self.processing_stats = {
-            'total_processed': 0,
-            'successful': 0,
-            'failed': 0
-        }
-    
-    async def process_document(self, file_content: bytes, file_name: str) -> DocumentAIResult:
-        """Process document with Document AI"""
-        try:
-            logger.info(f"Starting Document AI processing for {file_name}")
-            start_time = datetime.now()
-            
-            # Determine document type
-            doc_type = self._detect_document_type(file_name, file_content)
-            
-            # Process based on document type
-            if doc_type == DocumentType.PDF:
-                result = await self._process_pdf(file_content, file_name)
-            elif doc_type == DocumentType.IMAGE:
-                result = await self._process_image(file_content, file_name)
-            elif doc_type == DocumentType.DOCX:
-                result = await self._process_docx(file_content, file_name)
-            elif doc_type == DocumentType.TXT:
-                result = await self._process_text(file_content, file_name)
-            else:
-                raise ValueError(f"Unsupported document type: {doc_type}")
-            
-            processing_time = (datetime.now() - start_time).total_seconds()
-            result.processing_time = processing_time
-            
-            # Update statistics
-            self.processing_stats['total_processed'] += 1
-            self.processing_stats['successful'] += 1
-            
-            logger.info(f"Document AI processing completed in {processing_time:.2f}s")
-            return result
-            
-        except Exception as e:
-            self.processing_stats['failed'] += 1
-            logger.error(f"Document AI processing failed: {str(e)}")
-            raise
-
-    def _detect_document_type(self, file_name: str, content: bytes) -> DocumentType:
-        """Detect document type from filename and content"""
-        extension = file_name.lower().split('.')[-1]
-        
-        type_mapping = {
-            'pdf': DocumentType.PDF,
-            'png': DocumentType.IMAGE,
-            'jpg': DocumentType.IMAGE,
-            'jpeg': DocumentType.IMAGE,
-            'tiff': DocumentType.IMAGE,
-            'docx': DocumentType.DOCX,
-            'txt': DocumentType.TXT
-        }
-        
-        return type_mapping.get(extension, DocumentType.UNKNOWN)
-    
-    def _extract_tables_from_text(self, text: str) -> List[ExtractedTable]:
-        """Extract table-like structures from text"""
-        import re
-        
-        tables = []
-        lines = text.split('\n')
-        
-        # Look for tabular data patterns
-        current_table_rows = []
-        potential_headers = []
-        
-        for i, line in enumerate(lines):
-            line = line.strip()
-            if not line:
-                continue
-            
-            # Check if line contains multiple tab-separated or space-separated values
-            # Common patterns for credit report tables
-            if re.search(r'(Account|Company|Balance|Status|Date|Creditor|Payment|Limit)', line, re.IGNORECASE):
-                # Potential header row
-                potential_headers = re.split(r'\s{2,}|\t', line)
-                if len(potential_headers) > 2:
-                    current_table_rows = [potential_headers]
-                continue
-            
-            # Look for data rows with multiple columns
-            if '\t' in line or re.search(r'\s{3,}', line):
-                columns = re.split(r'\s{2,}|\t', line)
-                if len(columns) > 2:
-                    current_table_rows.append(columns)
-                    
-            # If we have accumulated rows and hit a different pattern, finalize table
-            elif current_table_rows and len(current_table_rows) > 1:
-                headers = current_table_rows[0] if current_table_rows else ["Column 1", "Column 2", "Column 3"]
-                rows = current_table_rows[1:] if len(current_table_rows) > 1 else []
-                
-                if rows:  # Only add if we have data rows
-                    tables.append(ExtractedTable(
-                        table_id=f"table_{len(tables) + 1}",
-                        headers=headers,
-                        rows=rows,
-                        confidence=0.75,
-                        page_number=1,
-                        bounding_box={"x": 0, "y": 0, "width": 500, "height": 100}
-                    ))
-                
-                current_table_rows = []
-        
-        # Handle any remaining table
-        if current_table_rows and len(current_table_rows) > 1:
-            headers = current_table_rows[0]
-            rows = current_table_rows[1:]
-            if rows:
-                tables.append(ExtractedTable(
-                    table_id=f"table_{len(tables) + 1}",
-                    headers=headers,
-                    rows=rows,
-                    confidence=0.75,
-                    page_number=1,
-                    bounding_box={"x": 0, "y": 0, "width": 500, "height": 100}
-                ))
-        
-        return tables
-
-    async def _process_pdf(self, content: bytes, file_name: str) -> DocumentAIResult:
-        """Process PDF document - NOW ACTUALLY PROCESSES THE PDF"""
-        try:
-            import PyPDF2
-            import io
-            import tempfile
-            import os
-            
-            # Create temporary file from bytes
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-                temp_file.write(content)
-                temp_file_path = temp_file.name
-            
-            try:
-                # Extract text using PyPDF2
-                with open(temp_file_path, 'rb') as file:
-                    reader = PyPDF2.PdfReader(file)
-                    raw_text = ""
-                    text_blocks = []
-                    
-                    for page_num, page in enumerate(reader.pages, 1):
-                        page_text = page.extract_text()
-                        raw_text += page_text + "\n"
-                        
-                        # Create text block for each page
-                        if page_text.strip():
-                            text_blocks.append(ExtractedText(
-                                content=page_text,
-                                page_number=page_num,
-                                confidence=0.85,  # Lower confidence for PyPDF2 vs real Document AI
-                                bounding_box={"x": 0, "y": 0, "width": 612, "height": 792}
-                            ))
-                
-                # Extract structured data from text
-                tables = self._extract_tables_from_text(raw_text)
-                
-                logger.info(f"✅ PDF processing completed: {len(text_blocks)} pages, {len(tables)} tables")
-                
-                return DocumentAIResult(
-                    job_id="",  # Will be set by caller
-                    document_type=DocumentType.PDF,
-                    total_pages=len(reader.pages),
-                    tables=tables,
-                    text_blocks=text_blocks,
-                    raw_text=raw_text,
-                    metadata={
-                        "file_name": file_name,
-                        "file_size": len(content),
-                        "processing_method": "pypdf2_extraction"
-                    },
-                    processing_time=0.0,
-                    confidence_score=0.85
-                )
-                
-            finally:
-                # Clean up temporary file
-                try:
-                    os.unlink(temp_file_path)
-                except:
-                    pass
-                    
-        except Exception as e:
-            logger.error(f"❌ PDF processing failed: {str(e)}")
-            # Return empty result instead of mock data
-            return DocumentAIResult(
-                job_id="",
-                document_type=DocumentType.PDF,
-                total_pages=0,
-                tables=[],
-                text_blocks=[],
-                raw_text="",
-                metadata={
-                    "file_name": file_name,
-                    "file_size": len(content),
-                    "processing_method": "failed_extraction",
-                    "error": str(e)
-                },
-                processing_time=0.0,
-                confidence_score=0.0
-            )
-
-    async def _process_image(self, content: bytes, file_name: str) -> DocumentAIResult:
-        """Process image document"""
-        await asyncio.sleep(1.5)  # Simulate processing time
-        
-        # Mock OCR results for credit report image
-        text_blocks = [
-            ExtractedText(
-                content="EXPERIAN CREDIT REPORT\nConsumer Information\nName: John Doe\nCurrent Address: 123 Main St\nCredit Score: 720",
-                page_number=1,
-                confidence=0.89,
-                bounding_box={"x": 20, "y": 30, "width": 400, "height": 300}
-            )
-        ]
-        
-        return DocumentAIResult(
-            job_id="",
-            document_type=DocumentType.IMAGE,
-            total_pages=1,
-            tables=[],
-            text_blocks=text_blocks,
-            raw_text="EXPERIAN CREDIT REPORT\nConsumer Information\nName: John Doe\nCurrent Address: 123 Main St\nCredit Score: 720",
-            metadata={
-                "file_name": file_name,
-                "file_size": len(content),
-                "processing_method": "document_ai_ocr"
-            },
-            processing_time=0.0,
-            confidence_score=0.89
-        )
-
-    async def _process_docx(self, content: bytes, file_name: str) -> DocumentAIResult:
-        """Process DOCX document"""
-        await asyncio.sleep(1)  # Simulate processing time
-        
-        # Mock document processing
-        text_blocks = [
-            ExtractedText(
-                content="Credit Report Analysis\n\nSummary\nThis document contains credit information for review...",
-                page_number=1,
-                confidence=0.99,
-                bounding_box={"x": 0, "y": 0, "width": 612, "height": 792}
-            )
-        ]
-        
-        return DocumentAIResult(
-            job_id="",
-            document_type=DocumentType.DOCX,
-            total_pages=1,
-            tables=[],
-            text_blocks=text_blocks,
-            raw_text="Credit Report Analysis\n\nSummary\nThis document contains credit information for review...",
-            metadata={
-                "file_name": file_name,
-                "file_size": len(content),
-                "processing_method": "document_ai_docx"
-            },
-            processing_time=0.0,
-            confidence_score=0.99
-        )
-
-    async def _process_text(self, content: bytes, file_name: str) -> DocumentAIResult:
-        """Process plain text document"""
-        text_content = content.decode('utf-8')
-        
-        text_blocks = [
-            ExtractedText(
-                content=text_content,
-                page_number=1,
-                confidence=1.0,
-                bounding_box=None
-            )
-        ]
-        
-        return DocumentAIResult(
-            job_id="",
-            document_type=DocumentType.TXT,
-            total_pages=1,
-            tables=[],
-            text_blocks=text_blocks,
-            raw_text=text_content,
-            metadata={
-                "file_name": file_name,
-                "file_size": len(content),
-                "processing_method": "text_direct"
-            },
-            processing_time=0.0,
-            confidence_score=1.0
-        )
-
-    def get_processing_stats(self) -> Dict[str, int]:
-        """Get current processing statistics"""
+import os
+import asyncio
+import logging
+from typing import Dict, Iterable, List, Any, Optional, Tuple
+from datetime import datetime
+from enum import Enum
+
+from ..models.tradeline_models import DocumentType, ExtractedTable, ExtractedText, DocumentAIResult
+from ..utils.pdf_text import PdfPage, PdfSource, iter_pdf_pages, pdf_source_size, read_pdf_bytes
+from .pdf_extraction_service import PdfExtractionService
+from .worker_pools import BoundedExecutor
+
+logger = logging.getLogger(__name__)
+
+class DocumentAIService:
+    """Service for processing documents with AI"""
+    
+    def __init__(self, api_key: str = None, project_id: str = None,
+                 pdf_extractor: PdfExtractionService = None, io_executor: Optional[BoundedExecutor] = None):
+        self.api_key = api_key
+        self.project_id = project_id
+        # Without an extractor, pages are streamed and extracted on the I/O pool
+        self.pdf_extractor = pdf_extractor
+        # A pool passed in belongs to the caller; close() only stops one created here
+        self._owns_io = io_executor is None
+        self.io = io_executor or BoundedExecutor(
+            "document-io",
+            max_workers=int(os.getenv("DOCUMENT_IO_WORKERS", "2")),
+            max_queue=int(os.getenv("DOCUMENT_IO_QUEUE_SIZE", "64"))
+        )
+        self.processing_stats = {
+            'total_processed': 0,
+            'successful': 0,
+            'failed': 0
+        }
+    
+    async def process_document(self, file_content: PdfSource, file_name: str) -> DocumentAIResult:
+        """Process document with Document AI
+
+        file_content may be the path of the stored upload: PDFs are then
+        memory-mapped by the extractor instead of being loaded into memory.
+        """
+        try:
+            logger.info(f"Starting Document AI processing for {file_name}")
+            start_time = datetime.now()
+            
+            # Determine document type
+            doc_type = self._detect_document_type(file_name, file_content)
+            
+            # Only the PDF path reads from a file; the other handlers take the content in memory
+            if doc_type != DocumentType.PDF:
+                file_content = read_pdf_bytes(file_content)
+            
+            # Process based on document type
+            if doc_type == DocumentType.PDF:
+                result = await self._process_pdf(file_content, file_name)
+            elif doc_type == DocumentType.IMAGE:
+                result = await self._process_image(file_content, file_name)
+            elif doc_type == DocumentType.DOCX:
+                result = await self._process_docx(file_content, file_name)
+            elif doc_type == DocumentType.TXT:
+                result = await self._process_text(file_content, file_name)
+            else:
+                raise ValueError(f"Unsupported document type: {doc_type}")
+            
+            processing_time = (datetime.now() - start_time).total_seconds()
+            result.processing_time = processing_time
+            
+            # Update statistics
+            self.processing_stats['total_processed'] += 1
+            self.processing_stats['successful'] += 1
+            
+            logger.info(f"Document AI processing completed in {processing_time:.2f}s")
+            return result
+            
+        except Exception as e:
+            self.processing_stats['failed'] += 1
+            logger.error(f"Document AI processing failed: {str(e)}")
+            raise
+
+    def _detect_document_type(self, file_name: str, content: bytes) -> DocumentType:
+        """Detect document type from filename and content"""
+        extension = file_name.lower().split('.')[-1]
+        
+        type_mapping = {
+            'pdf': DocumentType.PDF,
+            'png': DocumentType.IMAGE,
+            'jpg': DocumentType.IMAGE,
+            'jpeg': DocumentType.IMAGE,
+            'tiff': DocumentType.IMAGE,
+            'docx': DocumentType.DOCX,
+            'txt': DocumentType.TXT
+        }
+        
+        return type_mapping.get(extension, DocumentType.UNKNOWN)
+    
+    def _extract_tables_from_text(self, text: str, page_number: int = 1, first_table_index: int = 1) -> List[ExtractedTable]:
+        """Extract table-like structures from the text of one page"""
+        import re
+        
+        tables = []
+        lines = text.split('\n')
+        
+        # Look for tabular data patterns
+        current_table_rows = []
+        potential_headers = []
+        
+        for i, line in enumerate(lines):
+            line = line.strip()
+            if not line:
+                continue
+            
+            # Check if line contains multiple tab-separated or space-separated values
+            # Common patterns for credit report tables
+            if re.search(r'(Account|Company|Balance|Status|Date|Creditor|Payment|Limit)', line, re.IGNORECASE):
+                # Potential header row
+                potential_headers = re.split(r'\s{2,}|\t', line)
+                if len(potential_headers) > 2:
+                    current_table_rows = [potential_headers]
+                continue
+            
+            # Look for data rows with multiple columns
+            if '\t' in line or re.search(r'\s{3,}', line):
+                columns = re.split(r'\s{2,}|\t', line)
+                if len(columns) > 2:
+                    current_table_rows.append(columns)
+                    
+            # If we have accumulated rows and hit a different pattern, finalize table
+            elif current_table_rows and len(current_table_rows) > 1:
+                headers = current_table_rows[0] if current_table_rows else ["Column 1", "Column 2", "Column 3"]
+                rows = current_table_rows[1:] if len(current_table_rows) > 1 else []
+                
+                if rows:  # Only add if we have data rows
+                    tables.append(ExtractedTable(
+                        table_id=f"table_{first_table_index + len(tables)}",
+                        headers=headers,
+                        rows=rows,
+                        confidence=0.75,
+                        page_number=page_number,
+                        bounding_box={"x": 0, "y": 0, "width": 500, "height": 100}
+                    ))
+                
+                current_table_rows = []
+        
+        # Handle any remaining table
+        if current_table_rows and len(current_table_rows) > 1:
+            headers = current_table_rows[0]
+            rows = current_table_rows[1:]
+            if rows:
+                tables.append(ExtractedTable(
+                    table_id=f"table_{first_table_index + len(tables)}",
+                    headers=headers,
+                    rows=rows,
+                    confidence=0.75,
+                    page_number=page_number,
+                    bounding_box={"x": 0, "y": 0, "width": 500, "height": 100}
+                ))
+        
+        return tables
+
+    def _collect_pages(self, pages: Iterable[PdfPage]) -> Tuple[List[str], List[ExtractedText], List[ExtractedTable]]:
+        """Page texts, text blocks and tables of each page, consuming the pages one at a time"""
+        page_texts = []
+        text_blocks = []
+        tables = []
+        
+        for page in pages:
+            page_texts.append(page.text)
+            
+            # Create text block for each page
+            if page.text.strip():
+                text_blocks.append(ExtractedText(
+                    content=page.text,
+                    page_number=page.page_number,
+                    confidence=0.85,  # Lower confidence for PyPDF2 vs real Document AI
+                    bounding_box={"x": 0, "y": 0, "width": 612, "height": 792}
+                ))
+            
+            # Extract structured data from the page text
+            tables.extend(self._extract_tables_from_text(
+                page.text, page_number=page.page_number, first_table_index=len(tables) + 1
+            ))
+        
+        return page_texts, text_blocks, tables
+
+    def close(self) -> None:
+        """Stop the I/O pool, if it was created here"""
+        if self._owns_io:
+            self.io.shutdown(wait=True)
+
+    async def _process_pdf(self, content: PdfSource, file_name: str) -> DocumentAIResult:
+        """
+        Process PDF document page by page
+
+        Table detection runs on each page as it is extracted, so tables carry
+        their real page number. Memory still grows with the report: the result
+        keeps every page's text block and the joined raw_text.
+        """
+        try:
+            if self.pdf_extractor:
+                pages = await self.pdf_extractor.extract_pages(content)
+                page_texts, text_blocks, tables = self._collect_pages(pages)
+            else:
+                # PyPDF2 blocks while it parses, so the pages are extracted and consumed on the I/O pool
+                page_texts, text_blocks, tables = await self.io.run(self._collect_pages, iter_pdf_pages(content))
+            
+            raw_text = "".join(f"{text}\n" for text in page_texts)
+            
+            logger.info(f"✅ PDF processing completed: {len(text_blocks)} pages, {len(tables)} tables")
+            
+            return DocumentAIResult(
+                job_id="",  # Will be set by caller
+                document_type=DocumentType.PDF,
+                total_pages=len(page_texts),
+                tables=tables,
+                text_blocks=text_blocks,
+                raw_text=raw_text,
+                metadata={
+                    "file_name": file_name,
+                    "file_size": pdf_source_size(content),
+                    "processing_method": "pypdf2_extraction"
+                },
+                processing_time=0.0,
+                confidence_score=0.85
+            )
+                    
+        except Exception as e:
+            logger.error(f"❌ PDF processing failed: {str(e)}")
+            # Return empty result instead of mock data
+            return DocumentAIResult(
+                job_id="",
+                document_type=DocumentType.PDF,
+                total_pages=0,
+                tables=[],
+                text_blocks=[],
+                raw_text="",
+                metadata={
+                    "file_name": file_name,
+                    "file_size": len(content),
+                    "processing_method": "failed_extraction",
+                    "error": str(e)
+                },
+                processing_time=0.0,
+                confidence_score=0.0
+            )
+
+    async def _process_image(self, content: bytes, file_name: str) -> DocumentAIResult:
+        """Process image document"""
+        await asyncio.sleep(1.5)  # Simulate processing time
+        
+        # Mock OCR results for credit report image
+        text_blocks = [
+            ExtractedText(
+                content="EXPERIAN CREDIT REPORT\nConsumer Information\nName: John Doe\nCurrent Address: 123 Main St\nCredit Score: 720",
+                page_number=1,
+                confidence=0.89,
+                bounding_box={"x": 20, "y": 30, "width": 400, "height": 300}
+            )
+        ]
+        
+        return DocumentAIResult(
+            job_id="",
+            document_type=DocumentType.IMAGE,
+            total_pages=1,
+            tables=[],
+            text_blocks=text_blocks,
+            raw_text="EXPERIAN CREDIT REPORT\nConsumer Information\nName: John Doe\nCurrent Address: 123 Main St\nCredit Score: 720",
+            metadata={
+                "file_name": file_name,
+                "file_size": len(content),
+                "processing_method": "document_ai_ocr"
+            },
+            processing_time=0.0,
+            confidence_score=0.89
+        )
+
+    async def _process_docx(self, content: bytes, file_name: str) -> DocumentAIResult:
+        """Process DOCX document"""
+        await asyncio.sleep(1)  # Simulate processing time
+        
+        # Mock document processing
+        text_blocks = [
+            ExtractedText(
+                content="Credit Report Analysis\n\nSummary\nThis document contains credit information for review...",
+                page_number=1,
+                confidence=0.99,
+                bounding_box={"x": 0, "y": 0, "width": 612, "height": 792}
+            )
+        ]
+        
+        return DocumentAIResult(
+            job_id="",
+            document_type=DocumentType.DOCX,
+            total_pages=1,
+            tables=[],
+            text_blocks=text_blocks,
+            raw_text="Credit Report Analysis\n\nSummary\nThis document contains credit information for review...",
+            metadata={
+                "file_name": file_name,
+                "file_size": len(content),
+                "processing_method": "document_ai_docx"
+            },
+            processing_time=0.0,
+            confidence_score=0.99
+        )
+
+    async def _process_text(self, content: bytes, file_name: str) -> DocumentAIResult:
+        """Process plain text document"""
+        text_content = content.decode('utf-8')
+        
+        text_blocks = [
+            ExtractedText(
+                content=text_content,
+                page_number=1,
+                confidence=1.0,
+                bounding_box=None
+            )
+        ]
+        
+        return DocumentAIResult(
+            job_id="",
+            document_type=DocumentType.TXT,
+            total_pages=1,
+            tables=[],
+            text_blocks=text_blocks,
+            raw_text=text_content,
+            metadata={
+                "file_name": file_name,
+                "file_size": len(content),
+                "processing_method": "text_direct"
+            },
+            processing_time=0.0,
+            confidence_score=1.0
+        )
+
+    def get_processing_stats(self) -> Dict[str, int]:
+        """Get current processing statistics"""
         return self.processing_stats.copy()
\ No newline at end of file
@@ -1,181 +1,281 @@
-import logging
-from typing import Dict, List, Any, Tuple
-from datetime import datetime
-
-from backend.services.document_ai_service import DocumentAIService
-from backend.services.storage_service import StorageService
-from backend.services.job_service import JobService
-from backend.models.tradeline_models import ProcessingStatus, DocumentAIResult
-from backend.services.llm_parser_service import LLMParserService
-
-logger = logging.getLogger(__name__)
-
-class DocumentProcessorService:
-    """Main document processing orchestrator"""
-    
-    def __init__(self, storage_service: StorageService, job_service: JobService,
-                 document_ai_service: DocumentAIService = None, llm_parser: LLMParserService = None):
-        self.storage = storage_service
-        self.job_service = job_service
-        self.document_ai = document_ai_service or DocumentAIService()
-        self.llm_parser = llm_parser or LLMParserService(config=None) # config will be set by the caller
-    
-    async def document_ai_workflow(self, job_id: str) -> bool:
-        """Main workflow for Document AI processing phase"""
-        try:
-            logger.info(f"Starting Document AI workflow for job {job_id}")
-            
-            # Update job status
-            await self.job_service.update_job_status(job_id, ProcessingStatus.PROCESSING)
-            
-            # Retrieve uploaded file
-            file_content, file_metadata = await self.get_stored_file(job_id)
-            
-            # Process with Document AI
-            ai_result = await self.document_ai.process_document(
-                file_content, 
-                file_metadata.get('file_name', 'unknown')
-            )
-            ai_result.job_id = job_id
-            
-            # Extract structured data
-            tables = self.extract_tables(ai_result)
-            text_content = self.extract_text(ai_result)
-            
-            # Store intermediate results
-            await self.store_ai_results(job_id, ai_result, tables, text_content)
-            
-            # Update job status
-            await self.job_service.update_job_status(job_id, ProcessingStatus.COMPLETED)
-            
-            # Trigger LLM processing
-            await self.trigger_llm_processing(job_id)
-            
-            logger.info(f"Document AI workflow completed for job {job_id}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Document AI workflow failed for job {job_id}: {str(e)}")
-            await self.job_service.update_job_status(job_id, ProcessingStatus.FAILED)
-            await self.job_service.update_job_error(job_id, str(e))
-            return False
-    
-    async def get_stored_file(self, job_id: str) -> Tuple[bytes, Dict[str, Any]]:
-        """Retrieve uploaded file from storage"""
-        try:
-            file_data = await self.storage.get_file(job_id)
-            return file_data['content'], file_data['metadata']
-        except Exception as e:
-            logger.error(f"Failed to retrieve file for job {job_id}: {str(e)}")
-            raise
-    
-    def extract_tables(self, ai_result: DocumentAIResult) -> List[Dict[str, Any]]:
-        """Extract and format tables from AI result"""
-        formatted_tables = []
-        
-        for table in ai_result.tables:
-            formatted_table = {
-                'table_id': table.table_id,
-                'headers': table.headers,
-                'rows': table.rows,
-                'confidence': table.confidence,
-                'page_number': table.page_number,
-                'row_count': len(table.rows),
-                'column_count': len(table.headers),
-                'bounding_box': table.bounding_box
-            }
-            formatted_tables.append(formatted_table)
-        
-        logger.info(f"Extracted {len(formatted_tables)} tables")
-        return formatted_tables
-    
-    def extract_text(self, ai_result: DocumentAIResult) -> Dict[str, Any]:
-        """Extract and format text content from AI result"""
-        text_data = {
-            'raw_text': ai_result.raw_text,
-            'text_blocks': [],
-            'total_confidence': ai_result.confidence_score,
-            'page_count': ai_result.total_pages
-        }
-        
-        for block in ai_result.text_blocks:
-            text_block = {
-                'content': block.content,
-                'page_number': block.page_number,
-                'confidence': block.confidence,
-                'word_count': len(block.content.split()),
-                'bounding_box': block.bounding_box
-            }
-            text_data['text_blocks'].append(text_block)
-        
-        logger.info(f"Extracted text from {len(text_data['text_blocks'])} blocks")
-        return text_data
-    
-    async def store_ai_results(self, job_id: str, ai_result: DocumentAIResult, 
-                             tables: List[Dict], text_content: Dict) -> None:
-        """Store intermediate AI processing results"""
-        try:
-            # Prepare storage data
-            storage_data = {
-                'job_id': job_id,
-                'document_type': ai_result.document_type.value,
-                'processing_time': ai_result.processing_time,
-                'confidence_score': ai_result.confidence_score,
-                'tables': tables,
-                'text_content': text_content,
-                'metadata': ai_result.metadata,
-                'processed_at': datetime.now().isoformat()
-            }
-            
-            # Store AI results
-            await self.storage.store_document_ai_results(job_id, storage_data)
-            
-            # Store formatted data for LLM processing
-            llm_input_data = {
-                'tables': tables,
-                'text': text_content['raw_text'],
-                'text_blocks': text_content['text_blocks'],
-                'document_type': ai_result.document_type.value,
-                'confidence_score': ai_result.confidence_score,
-                'metadata': ai_result.metadata
-            }
-            
-            await self.storage.store_llm_input(job_id, llm_input_data)
-            
-            logger.info(f"Stored AI results for job {job_id}")
-            
-        except Exception as e:
-            logger.error(f"Failed to store AI results for job {job_id}: {str(e)}")
-            raise
-    
-    async def trigger_llm_processing(self, job_id: str) -> None:
-        """Trigger the next phase - LLM processing"""
-        try:
-            # Start LLM processing in background
-            await self.llm_parser.process_document_job(job_id)
-            logger.info(f"Triggered LLM processing for job {job_id}")
-            
-        except Exception as e:
-            logger.error(f"Failed to trigger LLM processing for job {job_id}: {str(e)}")
-            raise
-    
-    async def get_processing_status(self, job_id: str) -> Dict[str, Any]:
-        """Get current processing status for a job"""
-        try:
-            job_status = await self.job_service.get_job_status(job_id)
-            ai_results = await self.storage.get_document_ai_results(job_id)
-            
-            return {
-                'job_id': job_id,
-                'status': job_status.get('status'),
-                'progress': job_status.get('progress', 0),
-                'ai_processing_complete': ai_results is not None,
-                'processing_time': ai_results.get('processing_time') if ai_results else None,
-                'confidence_score': ai_results.get('confidence_score') if ai_results else None,
-                'tables_extracted': len(ai_results.get('tables', [])) if ai_results else 0,
-                'error': job_status.get('error')
-            }
-            
-        except Exception as e:
-            logger.error(f"Failed to get processing status for job {job_id}: {str(e)}")
+import logging
+from typing import Dict, List, Any, Tuple
+from datetime import datetime
+from pathlib import Path
+
+from backend.services.document_ai_service import DocumentAIService
+from backend.services.storage_service import StorageService
+from backend.services.job_service import JobService
+from backend.models.tradeline_models import ProcessingStatus, DocumentAIResult
+from backend.models.llm_models import NormalizationResult
+from backend.services.llm_parser_service import LLMParserService, ProcessingContext
+from backend.services.processing_pipeline import CheckpointedPipeline, PipelineStage, chain_hash, output_digest
+from backend.utils.document_pack import DocumentPackError
+from backend.utils.llm_helpers import ResponseValidator
+
+logger = logging.getLogger(__name__)
+
+# Part of every checkpoint key; bump it when a stage's output changes shape
+PIPELINE_VERSION = "1"
+
+def llm_input_digest(llm_input: Dict[str, Any]) -> str:
+    """Digest of stored LLM input, leaving out when it was prepared"""
+    return output_digest({key: value for key, value in llm_input.items() if key != 'prepared_at'})
+
+class DocumentProcessorService:
+    """Main document processing orchestrator"""
+    
+    def __init__(self, storage_service: StorageService, job_service: JobService,
+                 document_ai_service: DocumentAIService = None, llm_parser: LLMParserService = None):
+        self.storage = storage_service
+        self.job_service = job_service
+        self.document_ai = document_ai_service or DocumentAIService()
+        self.llm_parser = llm_parser or LLMParserService(config=None) # config will be set by the caller
+        self.pipeline = self.build_pipeline()
+    
+    def build_pipeline(self) -> CheckpointedPipeline:
+        """The processing stages, in order; each checkpoints its output in storage"""
+        return CheckpointedPipeline([
+            PipelineStage("fetch", self._fetch_stage),
+            PipelineStage("extract", self._extract_stage,
+                          encode=DocumentAIResult.to_dict, decode=DocumentAIResult.from_dict),
+            PipelineStage("store", self._store_stage, still_valid=self._stored_llm_input_matches),
+            PipelineStage("normalize", self._normalize_stage,
+                          encode=lambda result: result.model_dump(mode="json"),
+                          decode=NormalizationResult.model_validate),
+            PipelineStage("validate", self._validate_stage),
+            PipelineStage("persist", self._persist_stage)
+        ], self.storage)
+    
+    async def document_ai_workflow(self, job_id: str, force_reprocess: bool = False,
+                                   final_attempt: bool = True) -> bool:
+        """
+        Run the processing pipeline for a job: fetch, extract (Document AI),
+        store, normalize (LLM), validate, persist
+
+        Stages checkpointed by an earlier attempt on the same upload are
+        skipped, so a retry after e.g. an LLM failure resumes at normalize
+        without redoing OCR. force_reprocess drops the checkpoints first.
+        A failure marks the job FAILED only on the final attempt; before
+        that it goes back to PENDING, with the error, to wait for the retry.
+        """
+        try:
+            logger.info(f"Starting Document AI workflow for job {job_id}")
+            
+            # Update job status
+            await self.job_service.update_job_status(job_id, ProcessingStatus.PROCESSING)
+            
+            if force_reprocess:
+                await self.storage.clear_checkpoints(job_id)
+            
+            # Checkpoints are keyed by the upload's hash, so a replaced file starts over
+            _, file_metadata = await self.get_stored_file(job_id)
+            input_hash = chain_hash(PIPELINE_VERSION, file_metadata['file_hash'])
+            run = await self.pipeline.run(job_id, input_hash, initial=file_metadata)
+            
+            # Update job status
+            await self.job_service.update_job_status(job_id, ProcessingStatus.COMPLETED)
+            
+            logger.info(f"Document AI workflow completed for job {job_id} "
+                        f"(ran {run.stages_run}, reused {run.stages_skipped})")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Document AI workflow failed for job {job_id}: {str(e)}")
+            status = ProcessingStatus.FAILED if final_attempt else ProcessingStatus.PENDING
+            await self.job_service.update_job_status(job_id, status, error_message=str(e))
+            return False
+    
+    async def _fetch_stage(self, file_metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Locate the uploaded file; the parser maps it rather than loading a copy"""
+        file_path = self.storage.get_file_path(file_metadata['job_id'])
+        if not file_path.exists():
+            raise FileNotFoundError(f"Uploaded file missing for job {file_metadata['job_id']}")
+        return {
+            'job_id': file_metadata['job_id'],
+            'file_path': str(file_path),
+            'file_name': file_metadata.get('file_name', 'unknown'),
+            'file_hash': file_metadata['file_hash'],
+            'file_size': file_metadata.get('file_size')
+        }
+    
+    async def _extract_stage(self, fetched: Dict[str, Any]) -> DocumentAIResult:
+        """Process the file with Document AI"""
+        ai_result = await self.document_ai.process_document(Path(fetched['file_path']), fetched['file_name'])
+        ai_result.job_id = fetched['job_id']
+        return ai_result
+    
+    async def _store_stage(self, ai_result: DocumentAIResult) -> Dict[str, Any]:
+        """Store the AI results and the LLM input built from them"""
+        tables = self.extract_tables(ai_result)
+        text_content = self.extract_text(ai_result)
+        llm_input = await self.store_ai_results(ai_result.job_id, ai_result, tables, text_content)
+        return {
+            'job_id': ai_result.job_id,
+            'document_type': ai_result.document_type.value,
+            'table_count': len(tables),
+            'text_block_count': len(text_content['text_blocks']),
+            'llm_input_digest': llm_input_digest(llm_input)
+        }
+    
+    async def _stored_llm_input_matches(self, stored: Dict[str, Any]) -> bool:
+        """The store checkpoint only counts while the LLM input it wrote is still there, unchanged"""
+        try:
+            llm_input = await self.storage.get_llm_input(stored['job_id'])
+        except DocumentPackError:
+            return False
+        return llm_input is not None and llm_input_digest(llm_input) == stored.get('llm_input_digest')
+    
+    async def _normalize_stage(self, stored: Dict[str, Any]) -> NormalizationResult:
+        """Normalize the stored LLM input into consumer info and tradelines"""
+        job_id = stored['job_id']
+        llm_input = await self.storage.get_llm_input(job_id)
+        if llm_input is None:
+            raise FileNotFoundError(f"LLM input missing for job {job_id}")
+        context = ProcessingContext(job_id=job_id, document_type=stored['document_type'])
+        return await self.llm_parser.normalize_tradeline_data(llm_input['text'], llm_input['tables'], context)
+    
+    async def _validate_stage(self, result: NormalizationResult) -> Dict[str, Any]:
+        """Check each normalized tradeline's fields; rejected ones are kept aside with the reasons"""
+        valid, rejected = [], []
+        for index, tradeline in enumerate(result.tradelines):
+            # LLM Tradeline fields (balance, free-form account_status), not the DB record's
+            data = tradeline.model_dump(mode="json")
+            is_valid, errors = ResponseValidator.validate_tradeline_data(data)
+            if is_valid:
+                valid.append(data)
+            else:
+                rejected.append({'index': index, 'reason': "; ".join(errors), 'tradeline': data})
+        
+        if rejected:
+            logger.warning(f"{len(rejected)} of {len(result.tradelines)} tradelines failed validation "
+                           f"for job {result.job_id}")
+        return {
+            'job_id': result.job_id,
+            'tradelines': valid,
+            'rejected_tradelines': rejected,
+            'consumer_info': result.consumer_info.model_dump(mode="json"),
+            'validation_results': result.validation_results.model_dump(mode="json") if result.validation_results else None,
+            'confidence_score': result.confidence_score,
+            'processing_metadata': result.processing_metadata
+        }
+    
+    async def _persist_stage(self, validated: Dict[str, Any]) -> Dict[str, Any]:
+        """Save the final tradelines and the LLM result on the job"""
+        llm_result = {key: value for key, value in validated.items() if key not in ('job_id', 'tradelines')}
+        await self.job_service.store_job_results(validated['job_id'], llm_result, validated['tradelines'])
+        return {
+            'tradeline_count': len(validated['tradelines']),
+            'rejected_count': len(validated['rejected_tradelines'])
+        }
+    
+    async def get_stored_file(self, job_id: str) -> Tuple[Path, Dict[str, Any]]:
+        """Path and metadata of the uploaded file"""
+        try:
+            metadata = await self.storage.get_file_metadata(job_id)
+            return self.storage.get_file_path(job_id), metadata
+        except Exception as e:
+            logger.error(f"Failed to retrieve file for job {job_id}: {str(e)}")
+            raise
+    
+    def extract_tables(self, ai_result: DocumentAIResult) -> List[Dict[str, Any]]:
+        """Extract and format tables from AI result"""
+        formatted_tables = []
+        
+        for table in ai_result.tables:
+            formatted_table = {
+                'table_id': table.table_id,
+                'headers': table.headers,
+                'rows': table.rows,
+                'confidence': table.confidence,
+                'page_number': table.page_number,
+                'row_count': len(table.rows),
+                'column_count': len(table.headers),
+                'bounding_box': table.bounding_box
+            }
+            formatted_tables.append(formatted_table)
+        
+        logger.info(f"Extracted {len(formatted_tables)} tables")
+        return formatted_tables
+    
+    def extract_text(self, ai_result: DocumentAIResult) -> Dict[str, Any]:
+        """Extract and format text content from AI result"""
+        text_data = {
+            'raw_text': ai_result.raw_text,
+            'text_blocks': [],
+            'total_confidence': ai_result.confidence_score,
+            'page_count': ai_result.total_pages
+        }
+        
+        for block in ai_result.text_blocks:
+            text_block = {
+                'content': block.content,
+                'page_number': block.page_number,
+                'confidence': block.confidence,
+                'word_count': len(block.content.split()),
+                'bounding_box': block.bounding_box
+            }
+            text_data['text_blocks'].append(text_block)
+        
+        logger.info(f"Extracted text from {len(text_data['text_blocks'])} blocks")
+        return text_data
+    
+    async def store_ai_results(self, job_id: str, ai_result: DocumentAIResult, 
+                             tables: List[Dict], text_content: Dict) -> Dict[str, Any]:
+        """Store intermediate AI processing results; returns the LLM input as stored"""
+        try:
+            # Prepare storage data
+            storage_data = {
+                'job_id': job_id,
+                'document_type': ai_result.document_type.value,
+                'processing_time': ai_result.processing_time,
+                'confidence_score': ai_result.confidence_score,
+                'tables': tables,
+                'text_content': text_content,
+                'metadata': ai_result.metadata,
+                'processed_at': datetime.now().isoformat()
+            }
+            
+            # Store AI results
+            await self.storage.store_document_ai_results(job_id, storage_data)
+            
+            # Store formatted data for LLM processing
+            llm_input_data = {
+                'tables': tables,
+                'text': text_content['raw_text'],
+                'text_blocks': text_content['text_blocks'],
+                'document_type': ai_result.document_type.value,
+                'confidence_score': ai_result.confidence_score,
+                'metadata': ai_result.metadata
+            }
+            
+            await self.storage.store_llm_input(job_id, llm_input_data)
+            
+            logger.info(f"Stored AI results for job {job_id}")
+            return llm_input_data
+            
+        except Exception as e:
+            logger.error(f"Failed to store AI results for job {job_id}: {str(e)}")
+            raise
+    
+    async def get_processing_status(self, job_id: str) -> Dict[str, Any]:
+        """Get current processing status for a job"""
+        try:
+            job_status = await self.job_service.get_job_status(job_id)
+            # Summary only: compact results answer this without loading text or tables
+            ai_summary = await self.storage.get_document_ai_summary(job_id)
+            
+            return {
+                'job_id': job_id,
+                'status': job_status.get('status'),
+                'progress': job_status.get('progress', 0),
+                'ai_processing_complete': ai_summary is not None,
+                'processing_time': ai_summary.get('processing_time') if ai_summary else None,
+                'confidence_score': ai_summary.get('confidence_score') if ai_summary else None,
+                'tables_extracted': ai_summary.get('table_count', 0) if ai_summary else 0,
+                'error': job_status.get('error')
+            }
+            
+        except Exception as e:
+            logger.error(f"Failed to get processing status for job {job_id}: {str(e)}")
             raise
\ No newline at end of file
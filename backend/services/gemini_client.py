@@ -0,0 +1,242 @@
+import asyncio
+import json
+import logging
+import random
+import threading
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from ..utils.basic_parser import parse_tradelines_basic
+
+logger = logging.getLogger(__name__)
+
+class GeminiBackend:
+    """Something that turns a prompt into response text"""
+
+    async def generate(self, prompt: str, timeout_seconds: float) -> str:
+        raise NotImplementedError
+
+    async def stream(self, prompt: str, timeout_seconds: float) -> AsyncIterator[str]:
+        """Yield response text as it is generated"""
+        yield await self.generate(prompt, timeout_seconds)
+
+class GoogleGeminiBackend(GeminiBackend):
+    """Gemini through the SDK's native async call, sharing one configured model"""
+
+    def __init__(self, model: Any):
+        self.model = model
+
+    async def generate(self, prompt: str, timeout_seconds: float) -> str:
+        response = await self.model.generate_content_async(
+            prompt,
+            request_options={"timeout": timeout_seconds}
+        )
+        return response.text
+
+    async def stream(self, prompt: str, timeout_seconds: float) -> AsyncIterator[str]:
+        response = await self.model.generate_content_async(
+            prompt,
+            stream=True,
+            request_options={"timeout": timeout_seconds}
+        )
+        async for chunk in response:
+            yield chunk.text
+
+class FakeGeminiBackend(GeminiBackend):
+    """
+    Offline stand-in for Gemini used by load tests and benchmarks
+
+    Answers tradeline prompts with the basic parser's output for the text
+    after "Text to analyze:", wrapped in a markdown fence like the real
+    model, after a configurable latency. Failures can be injected.
+    """
+
+    def __init__(self, latency_seconds: float = 0.5, jitter_seconds: float = 0.0,
+                 failure_rate: float = 0.0, seed: int = 7,
+                 respond: Optional[Callable[[str], str]] = None,
+                 first_chunk_seconds: float = 0.1, stream_chunk_chars: int = 200):
+        self.latency_seconds = latency_seconds
+        self.first_chunk_seconds = first_chunk_seconds
+        self.stream_chunk_chars = stream_chunk_chars
+        self.jitter_seconds = jitter_seconds
+        self.failure_rate = failure_rate
+        self.respond = respond or self._tradeline_response
+        self._rng = random.Random(seed)
+        self.calls = 0
+        self.cancelled = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def generate(self, prompt: str, timeout_seconds: float) -> str:
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency_seconds + self._rng.uniform(0, self.jitter_seconds))
+            if self._rng.random() < self.failure_rate:
+                raise RuntimeError("503 The model is overloaded")
+            return self.respond(prompt)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+    async def stream(self, prompt: str, timeout_seconds: float) -> AsyncIterator[str]:
+        """Emit the response in fixed-size chunks spread over the latency, like token streaming"""
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(min(self.first_chunk_seconds, self.latency_seconds))
+            if self._rng.random() < self.failure_rate:
+                raise RuntimeError("503 The model is overloaded")
+            text = self.respond(prompt)
+            pieces = [text[i:i + self.stream_chunk_chars] for i in range(0, len(text), self.stream_chunk_chars)] or [""]
+            remaining = max(self.latency_seconds - self.first_chunk_seconds, 0) + self._rng.uniform(0, self.jitter_seconds)
+            for index, piece in enumerate(pieces):
+                if index:
+                    await asyncio.sleep(remaining / max(len(pieces) - 1, 1))
+                yield piece
+        except (asyncio.CancelledError, GeneratorExit):
+            self.cancelled += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+    @staticmethod
+    def _tradeline_response(prompt: str) -> str:
+        text = prompt.split("Text to analyze:", 1)[-1]
+        return "```json\n" + json.dumps(parse_tradelines_basic(text)) + "\n```"
+
+class AsyncGeminiClient:
+    """Process-wide Gemini client: bounded in-flight requests, per-call timeouts, cancellable.
+
+    Requests await the backend's async call directly instead of parking a
+    worker thread for the whole model latency. A semaphore caps requests in
+    flight across all users; time spent waiting for a slot counts against
+    the call's timeout. Cancelling the awaiting task (e.g. when the HTTP
+    client disconnects) cancels the underlying request.
+    """
+
+    def __init__(self, backend: GeminiBackend, max_in_flight: int = 8, timeout_seconds: float = 60.0):
+        self.backend = backend
+        self.max_in_flight = max(1, max_in_flight)
+        self.timeout_seconds = timeout_seconds
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.stats = {
+            'requests': 0,
+            'completed': 0,
+            'failed': 0,
+            'timeouts': 0,
+            'cancelled': 0,
+            'max_in_flight_seen': 0,
+            'total_wait_seconds': 0.0,
+            'total_latency_seconds': 0.0
+        }
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        # Created on first use so it binds to the serving event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        return self._semaphore
+
+    async def generate(self, prompt: str, timeout_seconds: Optional[float] = None) -> str:
+        """Send one prompt and return the response text"""
+        timeout = self.timeout_seconds if timeout_seconds is None else timeout_seconds
+        with self._lock:
+            self.stats['requests'] += 1
+        queued_at = time.perf_counter()
+        try:
+            return await asyncio.wait_for(self._generate(prompt, timeout, queued_at), timeout=timeout)
+        except asyncio.TimeoutError:
+            self._count('timeouts')
+            raise
+        except asyncio.CancelledError:
+            self._count('cancelled')
+            raise
+        except Exception:
+            self._count('failed')
+            raise
+
+    async def _generate(self, prompt: str, timeout: float, queued_at: float) -> str:
+        async with self.semaphore:
+            started_at = time.perf_counter()
+            with self._lock:
+                self._in_flight += 1
+                self.stats['max_in_flight_seen'] = max(self.stats['max_in_flight_seen'], self._in_flight)
+                self.stats['total_wait_seconds'] += started_at - queued_at
+            try:
+                text = await self.backend.generate(prompt, max(timeout - (started_at - queued_at), 0.001))
+            finally:
+                with self._lock:
+                    self._in_flight -= 1
+                    self.stats['total_latency_seconds'] += time.perf_counter() - started_at
+        self._count('completed')
+        return text
+
+    async def stream(self, prompt: str, timeout_seconds: Optional[float] = None) -> AsyncIterator[str]:
+        """
+        Stream one prompt's response text, holding an in-flight slot until the stream ends
+
+        The timeout bounds the whole stream, including the wait for a slot.
+        Closing the iterator early (or cancelling its consumer) ends the request.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (self.timeout_seconds if timeout_seconds is None else timeout_seconds)
+        with self._lock:
+            self.stats['requests'] += 1
+        queued_at = time.perf_counter()
+        acquired = False
+        chunks = None
+        try:
+            await asyncio.wait_for(self.semaphore.acquire(), timeout=max(deadline - loop.time(), 0))
+            acquired = True
+            started_at = time.perf_counter()
+            with self._lock:
+                self._in_flight += 1
+                self.stats['max_in_flight_seen'] = max(self.stats['max_in_flight_seen'], self._in_flight)
+                self.stats['total_wait_seconds'] += started_at - queued_at
+
+            chunks = self.backend.stream(prompt, max(deadline - loop.time(), 0.001)).__aiter__()
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), timeout=max(deadline - loop.time(), 0))
+                except StopAsyncIteration:
+                    break
+                yield chunk
+            self._count('completed')
+        except asyncio.TimeoutError:
+            self._count('timeouts')
+            raise
+        except (asyncio.CancelledError, GeneratorExit):
+            self._count('cancelled')
+            raise
+        except Exception:
+            self._count('failed')
+            raise
+        finally:
+            if chunks is not None:
+                await chunks.aclose()
+            if acquired:
+                self.semaphore.release()
+                with self._lock:
+                    self._in_flight -= 1
+                    self.stats['total_latency_seconds'] += time.perf_counter() - started_at
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get request counters, current concurrency and average latency"""
+        with self._lock:
+            metrics = dict(self.stats)
+            metrics['in_flight'] = self._in_flight
+        finished = metrics['completed'] + metrics['failed']
+        metrics['avg_latency_seconds'] = metrics['total_latency_seconds'] / finished if finished else 0.0
+        metrics['max_in_flight'] = self.max_in_flight
+        return metrics
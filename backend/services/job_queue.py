@@ -0,0 +1,452 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+import logging
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import redis # type: ignore
+except ImportError:
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+TASK_QUEUED = "queued"
+TASK_RUNNING = "running"
+TASK_DONE = "done"
+TASK_DEAD = "dead"
+
+LEASE_EXPIRED_ERROR = "visibility timeout expired"
+
+@dataclass
+class QueuedTask:
+    """A reserved task; lease_token identifies this delivery of it"""
+    task_id: str
+    job_id: str
+    attempts: int
+    max_attempts: int
+    lease_token: str
+    payload: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def exhausted(self) -> bool:
+        return self.attempts >= self.max_attempts
+
+class LeaseLostError(RuntimeError):
+    """The task's visibility timeout ran out and it was redelivered; this worker no longer owns it"""
+
+class JobQueue(ABC):
+    """Durable queue of processing jobs shared by API processes and workers.
+
+    reserve() hands a ready task to one worker and hides it for the
+    visibility timeout. The worker extend()s the lease while it works and
+    then ack()s, retry()s (failure, with a delay) or release()s it (clean
+    shutdown, the attempt does not count). A worker that dies simply stops
+    extending: the lease runs out and the next reserve() makes the task
+    ready again. Each delivery counts as an attempt; a task that has used
+    max_attempts is moved to the dead state instead of being retried.
+    Tasks that reserve() dead-letters that way never reach a handler, so
+    their job ids are kept for take_dead_lettered().
+    """
+
+    def __init__(self):
+        self._dead_lettered: List[str] = []
+        self._dead_lettered_lock = threading.Lock()
+
+    def _record_dead_lettered(self, job_ids: List[str]) -> None:
+        if job_ids:
+            with self._dead_lettered_lock:
+                self._dead_lettered.extend(job_ids)
+
+    def take_dead_lettered(self) -> List[str]:
+        """Job ids whose last lease reserve() found expired since the previous call; the caller fails those jobs"""
+        with self._dead_lettered_lock:
+            job_ids, self._dead_lettered = self._dead_lettered, []
+        return job_ids
+
+    @abstractmethod
+    def enqueue(self, job_id: str, payload: Optional[Dict[str, Any]] = None,
+                delay_seconds: float = 0.0, max_attempts: Optional[int] = None) -> str:
+        """Add a task for a job; returns the task id"""
+
+    @abstractmethod
+    def reserve(self, visibility_timeout: float) -> Optional[QueuedTask]:
+        """Lease the oldest ready task, or None if nothing is ready"""
+
+    @abstractmethod
+    def extend(self, task: QueuedTask, visibility_timeout: float) -> None:
+        """Push the lease out by visibility_timeout from now; LeaseLostError if it already ran out"""
+
+    @abstractmethod
+    def ack(self, task: QueuedTask) -> None:
+        """Mark the task done"""
+
+    @abstractmethod
+    def retry(self, task: QueuedTask, delay_seconds: float, error: str) -> bool:
+        """Make the task ready again after delay_seconds; False if it was dead-lettered instead"""
+
+    @abstractmethod
+    def release(self, task: QueuedTask) -> None:
+        """Give the task back immediately without using up an attempt"""
+
+    @abstractmethod
+    def counts(self) -> Dict[str, int]:
+        """Number of tasks per state"""
+
+    def close(self) -> None:
+        pass
+
+class SQLiteJobQueue(JobQueue):
+    """Queue in an SQLite file in WAL mode, shared by every process on one machine.
+
+    Reservations run in BEGIN IMMEDIATE transactions, so concurrent workers
+    (threads or processes) never lease the same task. Finished tasks stay
+    in the table with status "done" or "dead" and their last error.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS queue_tasks (
+            task_id TEXT PRIMARY KEY,
+            job_id TEXT NOT NULL,
+            payload TEXT NOT NULL DEFAULT '{}',
+            status TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            max_attempts INTEGER NOT NULL,
+            available_at REAL NOT NULL,
+            lease_token TEXT,
+            leased_until REAL,
+            last_error TEXT,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_queue_ready ON queue_tasks (status, available_at);
+        CREATE INDEX IF NOT EXISTS idx_queue_leases ON queue_tasks (status, leased_until);
+    """
+
+    def __init__(self, db_path: str = "storage/queue.sqlite3", max_attempts: int = 3,
+                 busy_timeout_ms: int = 5000, clock: Callable[[], float] = time.time):
+        super().__init__()
+        self.db_path = db_path
+        self.max_attempts = max(1, max_attempts)
+        self.busy_timeout_ms = busy_timeout_ms
+        self.clock = clock
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._connection().executescript(self.SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def _transaction(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        # IMMEDIATE takes the write lock up front, so two reservers cannot read the same ready row
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = fn(conn)
+            conn.execute("COMMIT")
+            return result
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def enqueue(self, job_id: str, payload: Optional[Dict[str, Any]] = None,
+                delay_seconds: float = 0.0, max_attempts: Optional[int] = None) -> str:
+        task_id = str(uuid.uuid4())
+        now = self.clock()
+        self._connection().execute(
+            """
+            INSERT INTO queue_tasks (task_id, job_id, payload, status, max_attempts, available_at, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (task_id, job_id, json.dumps(payload or {}), TASK_QUEUED, max_attempts or self.max_attempts,
+             now + delay_seconds, now, now)
+        )
+        return task_id
+
+    def reserve(self, visibility_timeout: float) -> Optional[QueuedTask]:
+        def reserve_in(conn: sqlite3.Connection) -> Tuple[Optional[QueuedTask], List[str]]:
+            now = self.clock()
+            # Leases that ran out belong to workers that died or stalled
+            dead_job_ids = [row['job_id'] for row in conn.execute(
+                "SELECT job_id FROM queue_tasks WHERE status = ? AND leased_until <= ? AND attempts >= max_attempts",
+                (TASK_RUNNING, now)
+            )]
+            conn.execute(
+                """
+                UPDATE queue_tasks
+                SET status = CASE WHEN attempts >= max_attempts THEN ? ELSE ? END,
+                    available_at = ?, lease_token = NULL, leased_until = NULL, last_error = ?, updated_at = ?
+                WHERE status = ? AND leased_until <= ?
+                """,
+                (TASK_DEAD, TASK_QUEUED, now, LEASE_EXPIRED_ERROR, now, TASK_RUNNING, now)
+            )
+            row = conn.execute(
+                "SELECT * FROM queue_tasks WHERE status = ? AND available_at <= ? ORDER BY available_at LIMIT 1",
+                (TASK_QUEUED, now)
+            ).fetchone()
+            if row is None:
+                return None, dead_job_ids
+            lease_token = uuid.uuid4().hex
+            conn.execute(
+                """
+                UPDATE queue_tasks SET status = ?, attempts = attempts + 1, lease_token = ?, leased_until = ?, updated_at = ?
+                WHERE task_id = ?
+                """,
+                (TASK_RUNNING, lease_token, now + visibility_timeout, now, row['task_id'])
+            )
+            return QueuedTask(
+                task_id=row['task_id'], job_id=row['job_id'], attempts=row['attempts'] + 1,
+                max_attempts=row['max_attempts'], lease_token=lease_token, payload=json.loads(row['payload'])
+            ), dead_job_ids
+
+        task, dead_job_ids = self._transaction(reserve_in)
+        # Recorded only once the transaction has committed
+        self._record_dead_lettered(dead_job_ids)
+        return task
+
+    def _update_leased(self, task: QueuedTask, assignments: str, params: tuple) -> None:
+        """Apply an update only while this delivery still holds the lease"""
+        now = self.clock()
+        cursor = self._connection().execute(
+            f"UPDATE queue_tasks SET {assignments}, updated_at = ? "
+            f"WHERE task_id = ? AND status = ? AND lease_token = ? AND leased_until > ?",
+            (*params, now, task.task_id, TASK_RUNNING, task.lease_token, now)
+        )
+        if cursor.rowcount != 1:
+            raise LeaseLostError(f"Lease on task {task.task_id} (job {task.job_id}) was lost")
+
+    def extend(self, task: QueuedTask, visibility_timeout: float) -> None:
+        self._update_leased(task, "leased_until = ?", (self.clock() + visibility_timeout,))
+
+    def ack(self, task: QueuedTask) -> None:
+        self._update_leased(task, "status = ?, lease_token = NULL, leased_until = NULL", (TASK_DONE,))
+
+    def retry(self, task: QueuedTask, delay_seconds: float, error: str) -> bool:
+        if task.exhausted:
+            self._update_leased(task, "status = ?, lease_token = NULL, leased_until = NULL, last_error = ?",
+                                (TASK_DEAD, error))
+            return False
+        self._update_leased(
+            task, "status = ?, available_at = ?, lease_token = NULL, leased_until = NULL, last_error = ?",
+            (TASK_QUEUED, self.clock() + delay_seconds, error)
+        )
+        return True
+
+    def release(self, task: QueuedTask) -> None:
+        self._update_leased(
+            task, "status = ?, attempts = attempts - 1, available_at = ?, lease_token = NULL, leased_until = NULL",
+            (TASK_QUEUED, self.clock())
+        )
+
+    def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """The stored row of a task (status, attempts, last_error, ...)"""
+        row = self._connection().execute("SELECT * FROM queue_tasks WHERE task_id = ?", (task_id,)).fetchone()
+        return dict(row) if row else None
+
+    def counts(self) -> Dict[str, int]:
+        counts = {TASK_QUEUED: 0, TASK_RUNNING: 0, TASK_DONE: 0, TASK_DEAD: 0}
+        for row in self._connection().execute("SELECT status, count(*) AS n FROM queue_tasks GROUP BY status"):
+            counts[row['status']] = row['n']
+        return counts
+
+    def close(self) -> None:
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+# Redis layout under a key prefix: a hash per task, a "ready" sorted set scored by
+# available_at, a "leased" sorted set scored by lease expiry and a "dead" sorted set.
+# Every state change is one Lua script, so it is atomic across API processes and workers.
+# Returns {dead-lettered job ids, task fields...}, without task fields when nothing is ready.
+_REDIS_RECLAIM_AND_RESERVE = """
+local prefix, now, lease_until, token = ARGV[1], tonumber(ARGV[2]), ARGV[3], ARGV[4]
+local dead = {}
+for _, id in ipairs(redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', now)) do
+    local key = prefix .. ':task:' .. id
+    redis.call('ZREM', KEYS[2], id)
+    redis.call('HSET', key, 'lease_token', '', 'last_error', ARGV[5])
+    if tonumber(redis.call('HGET', key, 'attempts')) >= tonumber(redis.call('HGET', key, 'max_attempts')) then
+        redis.call('HSET', key, 'status', 'dead')
+        redis.call('ZADD', KEYS[3], now, id)
+        table.insert(dead, redis.call('HGET', key, 'job_id'))
+    else
+        redis.call('HSET', key, 'status', 'queued')
+        redis.call('ZADD', KEYS[1], now, id)
+    end
+end
+local ready = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', now, 'LIMIT', 0, 1)
+if #ready == 0 then
+    return {dead}
+end
+local id = ready[1]
+local key = prefix .. ':task:' .. id
+redis.call('ZREM', KEYS[1], id)
+redis.call('ZADD', KEYS[2], lease_until, id)
+local attempts = redis.call('HINCRBY', key, 'attempts', 1)
+redis.call('HSET', key, 'status', 'running', 'lease_token', token)
+return {dead, id, redis.call('HGET', key, 'job_id'), redis.call('HGET', key, 'payload'), attempts,
+        redis.call('HGET', key, 'max_attempts')}
+"""
+
+# ARGV: prefix, task_id, token, now, action, value, error
+_REDIS_UPDATE_LEASED = """
+local prefix, id, token, now, action = ARGV[1], ARGV[2], ARGV[3], tonumber(ARGV[4]), ARGV[5]
+local key = prefix .. ':task:' .. id
+local expires = redis.call('ZSCORE', KEYS[2], id)
+if not expires or tonumber(expires) <= now or redis.call('HGET', key, 'lease_token') ~= token then
+    return 0
+end
+if action == 'extend' then
+    redis.call('ZADD', KEYS[2], ARGV[6], id)
+    return 1
+end
+redis.call('ZREM', KEYS[2], id)
+redis.call('HSET', key, 'lease_token', '')
+if action == 'ack' then
+    redis.call('DEL', key)
+    redis.call('INCR', KEYS[4])
+elseif action == 'retry' then
+    redis.call('HSET', key, 'status', 'queued', 'last_error', ARGV[7])
+    redis.call('ZADD', KEYS[1], ARGV[6], id)
+elseif action == 'dead' then
+    redis.call('HSET', key, 'status', 'dead', 'last_error', ARGV[7])
+    redis.call('ZADD', KEYS[3], now, id)
+elseif action == 'release' then
+    redis.call('HINCRBY', key, 'attempts', -1)
+    redis.call('HSET', key, 'status', 'queued')
+    redis.call('ZADD', KEYS[1], now, id)
+end
+return 1
+"""
+
+class RedisJobQueue(JobQueue):
+    """The same queue semantics on Redis, for workers spread over several machines.
+
+    Needs the redis package. Task keys are built inside the scripts, so the
+    prefix must map to a single Redis node (no cluster key hashing).
+    """
+
+    def __init__(self, client: Any, prefix: str = "jobqueue", max_attempts: int = 3,
+                 clock: Callable[[], float] = time.time):
+        super().__init__()
+        self.client = client
+        self.prefix = prefix
+        self.max_attempts = max(1, max_attempts)
+        self.clock = clock
+        self.keys = [f"{prefix}:ready", f"{prefix}:leased", f"{prefix}:dead", f"{prefix}:done_count"]
+        self._reserve = client.register_script(_REDIS_RECLAIM_AND_RESERVE)
+        self._update = client.register_script(_REDIS_UPDATE_LEASED)
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> 'RedisJobQueue':
+        if redis is None:
+            raise RuntimeError("JOB_QUEUE_BACKEND=redis needs the redis package")
+        return cls(redis.Redis.from_url(url, decode_responses=True), **kwargs)
+
+    def enqueue(self, job_id: str, payload: Optional[Dict[str, Any]] = None,
+                delay_seconds: float = 0.0, max_attempts: Optional[int] = None) -> str:
+        task_id = str(uuid.uuid4())
+        now = self.clock()
+        pipeline = self.client.pipeline(transaction=True)
+        pipeline.hset(f"{self.prefix}:task:{task_id}", mapping={
+            'job_id': job_id,
+            'payload': json.dumps(payload or {}),
+            'status': TASK_QUEUED,
+            'attempts': 0,
+            'max_attempts': max_attempts or self.max_attempts,
+            'lease_token': '',
+            'created_at': now
+        })
+        pipeline.zadd(self.keys[0], {task_id: now + delay_seconds})
+        pipeline.execute()
+        return task_id
+
+    def reserve(self, visibility_timeout: float) -> Optional[QueuedTask]:
+        now = self.clock()
+        lease_token = uuid.uuid4().hex
+        result = self._reserve(keys=self.keys[:3], args=[
+            self.prefix, now, now + visibility_timeout, lease_token, LEASE_EXPIRED_ERROR
+        ])
+        dead_job_ids, task_fields = result[0], result[1:]
+        self._record_dead_lettered(list(dead_job_ids))
+        if not task_fields:
+            return None
+        task_id, job_id, payload, attempts, max_attempts = task_fields
+        return QueuedTask(
+            task_id=task_id, job_id=job_id, attempts=int(attempts), max_attempts=int(max_attempts),
+            lease_token=lease_token, payload=json.loads(payload or '{}')
+        )
+
+    def _update_leased(self, task: QueuedTask, action: str, value: float = 0.0, error: str = "") -> None:
+        updated = self._update(keys=self.keys, args=[
+            self.prefix, task.task_id, task.lease_token, self.clock(), action, value, error
+        ])
+        if not updated:
+            raise LeaseLostError(f"Lease on task {task.task_id} (job {task.job_id}) was lost")
+
+    def extend(self, task: QueuedTask, visibility_timeout: float) -> None:
+        self._update_leased(task, 'extend', self.clock() + visibility_timeout)
+
+    def ack(self, task: QueuedTask) -> None:
+        self._update_leased(task, 'ack')
+
+    def retry(self, task: QueuedTask, delay_seconds: float, error: str) -> bool:
+        if task.exhausted:
+            self._update_leased(task, 'dead', error=error)
+            return False
+        self._update_leased(task, 'retry', self.clock() + delay_seconds, error)
+        return True
+
+    def release(self, task: QueuedTask) -> None:
+        self._update_leased(task, 'release')
+
+    def counts(self) -> Dict[str, int]:
+        return {
+            TASK_QUEUED: self.client.zcard(self.keys[0]),
+            TASK_RUNNING: self.client.zcard(self.keys[1]),
+            TASK_DONE: int(self.client.get(self.keys[3]) or 0),
+            TASK_DEAD: self.client.zcard(self.keys[2])
+        }
+
+    def close(self) -> None:
+        self.client.close()
+
+def create_job_queue(backend: str, storage_path: str = "storage", db_path: Optional[str] = None,
+                     redis_url: Optional[str] = None, max_attempts: int = 3) -> JobQueue:
+    """Build the configured backend: "sqlite" (default, one machine) or "redis" """
+    if backend == "sqlite":
+        return SQLiteJobQueue(db_path or str(Path(storage_path) / "queue.sqlite3"), max_attempts=max_attempts)
+    if backend == "redis":
+        return RedisJobQueue.from_url(redis_url or "redis://localhost:6379/0", max_attempts=max_attempts)
+    raise ValueError(f"Unknown job queue backend: {backend}")
+
+def job_queue_from_env(storage_path: str = "storage") -> JobQueue:
+    """Create the job queue from JOB_QUEUE_BACKEND, JOB_QUEUE_DB_PATH, REDIS_URL and JOB_MAX_ATTEMPTS"""
+    return create_job_queue(
+        os.getenv("JOB_QUEUE_BACKEND", "sqlite"),
+        storage_path,
+        db_path=os.getenv("JOB_QUEUE_DB_PATH"),
+        redis_url=os.getenv("REDIS_URL"),
+        max_attempts=int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    )
@@ -0,0 +1,303 @@
+import os
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Iterable
+import logging
+
+from ..utils.atomic_files import atomic_write_json
+
+logger = logging.getLogger(__name__)
+
+# Job fields stored as indexed/queryable columns; everything else (Document AI
+# output, LLM results, tradelines) is kept in one JSON payload column
+SUMMARY_FIELDS = ('job_id', 'user_id', 'status', 'filename', 'file_size',
+                  'created_at', 'completed_at', 'error_message')
+
+class JobStore(ABC):
+    """Persistence backend for processing job records.
+
+    Jobs are plain dicts keyed by ``job_id`` with ISO-8601 ``created_at``
+    strings. Listing returns the summary fields only, newest first (ties on
+    ``created_at`` broken by ``job_id``), so large result payloads are never
+    loaded just to show a job list.
+    """
+
+    @abstractmethod
+    def put(self, job: Dict[str, Any]) -> None:
+        """Insert or replace a whole job record"""
+
+    def put_many(self, jobs: Iterable[Dict[str, Any]]) -> int:
+        """Insert or replace many records; returns how many were written"""
+        count = 0
+        for job in jobs:
+            self.put(job)
+            count += 1
+        return count
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Full job record, or None"""
+
+    @abstractmethod
+    def update_status(self, job_id: str, status: str, error_message: Optional[str] = None,
+                      completed_at: Optional[str] = None) -> bool:
+        """Change a job's status (and optionally error/completion time); False if the job does not exist"""
+
+    @abstractmethod
+    def list_jobs(self, user_id: Optional[str] = None, status: Optional[str] = None,
+                  created_after: Optional[str] = None, created_before: Optional[str] = None,
+                  before_job_id: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """Job summaries matching every given filter, newest first
+
+        To page, pass the last job's created_at and job_id as created_before
+        and before_job_id; jobs sharing that timestamp are then not skipped.
+        """
+
+    @abstractmethod
+    def delete_created_before(self, cutoff: str) -> int:
+        """Delete jobs created before an ISO timestamp; returns how many were removed"""
+
+    @abstractmethod
+    def count(self) -> int:
+        """Number of stored jobs"""
+
+    def close(self) -> None:
+        pass
+
+def _summary(job: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: job.get(key) for key in SUMMARY_FIELDS}
+
+class JsonFileJobStore(JobStore):
+    """The original layout: one indented JSON file per job under ``jobs/``.
+
+    Every status change rewrites the whole file and listings scan the
+    directory, so this is meant for development and for reading data that
+    has not been migrated yet.
+    """
+
+    def __init__(self, jobs_dir: str = "storage/jobs"):
+        self.jobs_dir = Path(jobs_dir)
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _path(self, job_id: str) -> Path:
+        return self.jobs_dir / f"{job_id}.json"
+
+    def put(self, job: Dict[str, Any]) -> None:
+        atomic_write_json(self._path(job['job_id']), job)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(job_id), 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def update_status(self, job_id: str, status: str, error_message: Optional[str] = None,
+                      completed_at: Optional[str] = None) -> bool:
+        # Read-modify-write; the lock only serializes writers in this process
+        with self._lock:
+            job = self.get(job_id)
+            if job is None:
+                return False
+            job['status'] = status
+            if error_message:
+                job['error_message'] = error_message
+            if completed_at:
+                job['completed_at'] = completed_at
+            self.put(job)
+            return True
+
+    def iter_jobs(self) -> Iterable[Dict[str, Any]]:
+        """Every parseable job file (used by the SQLite migration)"""
+        for path in self.jobs_dir.glob("*.json"):
+            try:
+                with open(path, 'r') as f:
+                    yield json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable job file {path.name}: {e}")
+
+    def list_jobs(self, user_id: Optional[str] = None, status: Optional[str] = None,
+                  created_after: Optional[str] = None, created_before: Optional[str] = None,
+                  before_job_id: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        def before_cursor(job: Dict[str, Any]) -> bool:
+            created_at = job.get('created_at') or ''
+            if before_job_id is None:
+                return created_at < created_before
+            return (created_at, job['job_id']) < (created_before, before_job_id)
+
+        matches = [
+            _summary(job) for job in self.iter_jobs()
+            if (user_id is None or job.get('user_id') == user_id)
+            and (status is None or job.get('status') == status)
+            and (created_after is None or (job.get('created_at') or '') > created_after)
+            and (created_before is None or before_cursor(job))
+        ]
+        matches.sort(key=lambda job: (job['created_at'] or '', job['job_id']), reverse=True)
+        return matches[:limit]
+
+    def delete_created_before(self, cutoff: str) -> int:
+        removed = 0
+        for job in self.iter_jobs():
+            if (job.get('created_at') or '') < cutoff:
+                self._path(job['job_id']).unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def count(self) -> int:
+        return sum(1 for _ in self.jobs_dir.glob("*.json"))
+
+class SQLiteJobStore(JobStore):
+    """Jobs in an embedded SQLite database in WAL mode.
+
+    Summary fields are real columns with indexes for listing by user,
+    status and age; the remaining fields are one JSON payload column.
+    Status changes are single-row UPDATE statements, so they are atomic
+    and never rewrite the payload. WAL lets readers run alongside the
+    writer, including from other worker processes sharing the file; each
+    thread gets its own connection.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            job_id TEXT PRIMARY KEY,
+            user_id TEXT,
+            status TEXT NOT NULL,
+            filename TEXT,
+            file_size INTEGER,
+            created_at TEXT NOT NULL,
+            completed_at TEXT,
+            error_message TEXT,
+            payload TEXT NOT NULL DEFAULT '{}'
+        );
+        CREATE INDEX IF NOT EXISTS idx_jobs_user_created ON jobs (user_id, created_at);
+        CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs (status, created_at);
+        CREATE INDEX IF NOT EXISTS idx_jobs_created ON jobs (created_at);
+    """
+
+    def __init__(self, db_path: str = "storage/jobs.sqlite3", busy_timeout_ms: int = 5000):
+        self.db_path = db_path
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._connection().executescript(self.SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Autocommit: each statement is its own transaction unless BEGIN is issued
+            conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+            conn.execute("PRAGMA journal_mode = WAL")
+            # WAL + NORMAL: durable across application crashes, fsync only at checkpoints
+            conn.execute("PRAGMA synchronous = NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    @staticmethod
+    def _row_values(job: Dict[str, Any]) -> tuple:
+        payload = {key: value for key, value in job.items() if key not in SUMMARY_FIELDS}
+        return tuple(job.get(key) for key in SUMMARY_FIELDS) + (json.dumps(payload),)
+
+    _UPSERT = f"""
+        INSERT OR REPLACE INTO jobs ({', '.join(SUMMARY_FIELDS)}, payload)
+        VALUES ({', '.join('?' * (len(SUMMARY_FIELDS) + 1))})
+    """
+
+    def put(self, job: Dict[str, Any]) -> None:
+        self._connection().execute(self._UPSERT, self._row_values(job))
+
+    def put_many(self, jobs: Iterable[Dict[str, Any]]) -> int:
+        conn = self._connection()
+        rows = [self._row_values(job) for job in jobs]
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(self._UPSERT, rows)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return len(rows)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connection().execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = {key: row[key] for key in SUMMARY_FIELDS}
+        job.update(json.loads(row['payload']))
+        return job
+
+    def update_status(self, job_id: str, status: str, error_message: Optional[str] = None,
+                      completed_at: Optional[str] = None) -> bool:
+        cursor = self._connection().execute(
+            """
+            UPDATE jobs SET status = ?,
+                            error_message = COALESCE(?, error_message),
+                            completed_at = COALESCE(?, completed_at)
+            WHERE job_id = ?
+            """,
+            (status, error_message or None, completed_at, job_id)
+        )
+        return cursor.rowcount == 1
+
+    def list_jobs(self, user_id: Optional[str] = None, status: Optional[str] = None,
+                  created_after: Optional[str] = None, created_before: Optional[str] = None,
+                  before_job_id: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        clauses = []
+        params: List[Any] = []
+        for clause, value in (("user_id = ?", user_id), ("status = ?", status),
+                              ("created_at > ?", created_after)):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        if created_before is not None and before_job_id is not None:
+            # Keyset cursor on (created_at, job_id), the listing's sort order
+            clauses.append("(created_at < ? OR (created_at = ? AND job_id < ?))")
+            params.extend((created_before, created_before, before_job_id))
+        elif created_before is not None:
+            clauses.append("created_at < ?")
+            params.append(created_before)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._connection().execute(
+            f"SELECT {', '.join(SUMMARY_FIELDS)} FROM jobs {where} ORDER BY created_at DESC, job_id DESC LIMIT ?",
+            (*params, limit)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def delete_created_before(self, cutoff: str) -> int:
+        return self._connection().execute("DELETE FROM jobs WHERE created_at < ?", (cutoff,)).rowcount
+
+    def count(self) -> int:
+        return self._connection().execute("SELECT count(*) FROM jobs").fetchone()[0]
+
+    def close(self) -> None:
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+def create_job_store(backend: str, storage_path: str = "storage", db_path: Optional[str] = None) -> JobStore:
+    """Build the configured backend: "sqlite" (default) or "json" (one file per job)"""
+    if backend == "json":
+        return JsonFileJobStore(str(Path(storage_path) / "jobs"))
+    if backend == "sqlite":
+        return SQLiteJobStore(db_path or str(Path(storage_path) / "jobs.sqlite3"))
+    raise ValueError(f"Unknown job store backend: {backend}")
+
+def job_store_from_env(storage_path: str = "storage") -> JobStore:
+    """Create the job store from JOB_STORE_BACKEND and JOB_STORE_DB_PATH"""
+    return create_job_store(
+        os.getenv("JOB_STORE_BACKEND", "sqlite"),
+        storage_path,
+        os.getenv("JOB_STORE_DB_PATH")
+    )
@@ -0,0 +1,54 @@
+"""
+Import per-job JSON files into the SQLite job store
+
+Usage: python -m backend.services.job_store_migration [--jobs-dir storage/jobs] [--db storage/jobs.sqlite3]
+
+Existing records with the same job_id are replaced, so the import can be
+re-run. The JSON files are left in place; delete them once the import
+has been checked.
+"""
+import argparse
+import logging
+from typing import Dict, Iterable, Iterator, List
+
+from .job_store import JsonFileJobStore, SQLiteJobStore
+
+logger = logging.getLogger(__name__)
+
+def _batched(jobs: Iterable[Dict], batch_size: int) -> Iterator[List[Dict]]:
+    batch = []
+    for job in jobs:
+        batch.append(job)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def migrate_json_jobs(source: JsonFileJobStore, target: SQLiteJobStore, batch_size: int = 1000) -> Dict[str, int]:
+    """Copy every readable job file into the target store, one transaction per batch"""
+    imported = 0
+    valid = (job for job in source.iter_jobs() if job.get('job_id') and job.get('created_at'))
+    for batch in _batched(valid, batch_size):
+        imported += target.put_many(batch)
+    skipped = source.count() - imported
+    logger.info(f"Imported {imported} jobs into {target.db_path} ({skipped} skipped)")
+    return {'imported': imported, 'skipped': skipped, 'total': target.count()}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import JSON job files into the SQLite job store")
+    parser.add_argument("--jobs-dir", default="storage/jobs")
+    parser.add_argument("--db", default="storage/jobs.sqlite3")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    target = SQLiteJobStore(args.db)
+    try:
+        result = migrate_json_jobs(JsonFileJobStore(args.jobs_dir), target, args.batch_size)
+    finally:
+        target.close()
+    print(f"imported={result['imported']} skipped={result['skipped']} jobs_in_store={result['total']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+"""
+Standalone worker that pulls processing jobs from the job queue
+
+Run one or more worker processes next to the API:
+
+    python -m backend.services.job_worker [--concurrency N] [--processes N]
+
+Each process reserves up to JOB_WORKER_CONCURRENCY jobs at a time and runs
+DocumentProcessorService.document_ai_workflow for them. SIGTERM/SIGINT stop
+reserving new jobs and drain the running ones (see JobWorkerConfig).
+"""
+import asyncio
+import argparse
+import logging
+import multiprocessing
+import signal
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from .job_queue import LEASE_EXPIRED_ERROR, JobQueue, LeaseLostError, QueuedTask, job_queue_from_env
+from .worker_pools import BoundedExecutor, WorkerPools
+from ..config.worker_config import JobWorkerConfig
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[QueuedTask], Awaitable[Any]]
+# (job_id, error) for a job whose task the queue dead-lettered without a handler seeing it
+DeadLetterHandler = Callable[[str, str], Awaitable[Any]]
+
+class JobFailedError(RuntimeError):
+    """The handler finished without processing the job; the task is retried"""
+
+class JobWorker:
+    """Reserve tasks from a JobQueue and run a handler for each, concurrency at a time.
+
+    While a handler runs, its lease is extended every third of the
+    visibility timeout. A handler that returns acks the task; one that
+    raises retries it with exponential backoff until the queue dead-letters
+    it. If the lease is lost anyway (the worker stalled past the timeout and
+    the task went to another worker), the handler is cancelled. A task whose
+    final lease runs out is dead-lettered by reserve() with no handler to
+    fail its job, so on_dead_letter is called for it instead. stop()
+    drains: no new reservations, running handlers get drain_timeout to
+    finish, and the ones still running after that are cancelled and their
+    tasks released back to the queue.
+    """
+
+    def __init__(self, queue: JobQueue, handler: JobHandler, config: Optional[JobWorkerConfig] = None,
+                 queue_executor: Optional[BoundedExecutor] = None, on_dead_letter: Optional[DeadLetterHandler] = None):
+        self.queue = queue
+        self.handler = handler
+        self.on_dead_letter = on_dead_letter
+        self.config = config or JobWorkerConfig()
+        # Queue calls block (SQLite, Redis), so they run beside the event loop
+        self.queue_executor = queue_executor or BoundedExecutor(
+            "queue", max_workers=2, max_queue=4 * self.config.concurrency + 8, kind="thread"
+        )
+        self._stopping = asyncio.Event()
+        self._in_flight: Set[asyncio.Task] = set()
+        self.stats = {
+            'reserved': 0,
+            'completed': 0,
+            'retried': 0,
+            'dead': 0,
+            'released': 0,
+            'lease_lost': 0
+        }
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    def stop(self) -> None:
+        """Begin a graceful drain; safe to call from a signal handler on the loop, and more than once"""
+        if not self._stopping.is_set():
+            logger.info(f"Worker stopping, draining {len(self._in_flight)} running job(s)")
+        self._stopping.set()
+
+    def backoff_seconds(self, attempts: int) -> float:
+        return min(self.config.max_backoff_seconds, self.config.retry_backoff_seconds * 2 ** max(attempts - 1, 0))
+
+    async def _queue_call(self, fn: Callable[..., Any], *args) -> Any:
+        return await self.queue_executor.run(fn, *args)
+
+    async def _wait_for_stop(self, timeout: float) -> None:
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def run(self) -> None:
+        """Process tasks until stop() is called, then drain"""
+        stop_waiter = asyncio.create_task(self._stopping.wait())
+        try:
+            while not self._stopping.is_set():
+                if len(self._in_flight) >= self.config.concurrency:
+                    await asyncio.wait({stop_waiter, *self._in_flight}, return_when=asyncio.FIRST_COMPLETED)
+                    continue
+
+                task = await self._queue_call(self.queue.reserve, self.config.visibility_timeout_seconds)
+                await self._fail_dead_lettered()
+                if task is None:
+                    await self._wait_for_stop(self.config.poll_interval_seconds)
+                    continue
+
+                self.stats['reserved'] += 1
+                worker_task = asyncio.create_task(self._process(task))
+                self._in_flight.add(worker_task)
+                worker_task.add_done_callback(self._in_flight.discard)
+        finally:
+            stop_waiter.cancel()
+            await self._drain()
+
+    async def _fail_dead_lettered(self) -> None:
+        for job_id in self.queue.take_dead_lettered():
+            self.stats['dead'] += 1
+            logger.error(f"Job {job_id} gave up: its final attempt stopped extending the lease")
+            if self.on_dead_letter is None:
+                continue
+            try:
+                await self.on_dead_letter(job_id, LEASE_EXPIRED_ERROR)
+            except Exception as e:
+                logger.error(f"Could not mark dead-lettered job {job_id} as failed: {e}")
+
+    async def _drain(self) -> None:
+        if not self._in_flight:
+            return
+        running = set(self._in_flight)
+        _, pending = await asyncio.wait(running, timeout=self.config.drain_timeout_seconds)
+        for worker_task in pending:
+            worker_task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+
+    async def _process(self, task: QueuedTask) -> None:
+        work = asyncio.ensure_future(self.handler(task))
+        lease_lost = asyncio.Event()
+        heartbeat = asyncio.create_task(self._heartbeat(task, work, lease_lost))
+        try:
+            await work
+        except asyncio.CancelledError:
+            if lease_lost.is_set():
+                # Another worker owns the task now; there is nothing to settle
+                self.stats['lease_lost'] += 1
+                return
+            # Drain ran out of time: hand the task back without using up an attempt
+            if await self._settle(self.queue.release, task):
+                self.stats['released'] += 1
+            raise
+        except Exception as e:
+            logger.warning(f"Job {task.job_id} failed (attempt {task.attempts}/{task.max_attempts}): {e}")
+            delay = self.backoff_seconds(task.attempts)
+            retried = await self._settle(self.queue.retry, task, delay, f"{type(e).__name__}: {e}")
+            if retried:
+                self.stats['retried'] += 1
+                logger.info(f"Job {task.job_id} will be retried in {delay:.0f}s")
+            elif retried is False:
+                self.stats['dead'] += 1
+                logger.error(f"Job {task.job_id} gave up after {task.attempts} attempts")
+        else:
+            if await self._settle(self.queue.ack, task) is not None:
+                self.stats['completed'] += 1
+        finally:
+            heartbeat.cancel()
+
+    async def _settle(self, fn: Callable[..., Any], task: QueuedTask, *args) -> Any:
+        """Finish a delivery; returns fn's result (True when it returns nothing), or None if the lease was lost"""
+        try:
+            result = await asyncio.shield(self._queue_call(fn, task, *args))
+        except LeaseLostError:
+            self.stats['lease_lost'] += 1
+            logger.warning(f"Lease on job {task.job_id} expired before it finished; another worker has it")
+            return None
+        return True if result is None else result
+
+    async def _heartbeat(self, task: QueuedTask, work: asyncio.Future, lease_lost: asyncio.Event) -> None:
+        interval = self.config.visibility_timeout_seconds / 3
+        while True:
+            await asyncio.sleep(interval)
+            if work.done():
+                return
+            try:
+                await self._queue_call(self.queue.extend, task, self.config.visibility_timeout_seconds)
+            except LeaseLostError:
+                logger.warning(f"Lost the lease on job {task.job_id}; cancelling it here")
+                lease_lost.set()
+                work.cancel()
+                return
+            except Exception as e:
+                # A missed heartbeat is not fatal while the lease still has time left
+                logger.warning(f"Could not extend the lease on job {task.job_id}: {e}")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {**self.stats, 'in_flight': len(self._in_flight), 'queue': self.queue.counts()}
+
+def build_document_handler(worker_pools: WorkerPools, storage_service: Any) -> JobHandler:
+    """Handler that runs the Document AI workflow for the job a task names
+
+    PDF extraction runs on worker_pools and files go through storage_service
+    (a StorageService); the caller owns both, one of each per process.
+    """
+    # Imported here so the queue and worker can be used without the processing stack
+    from .document_ai_service import DocumentAIService
+    from .document_processor_service import DocumentProcessorService
+    from .job_service import JobService
+    from .pdf_extraction_service import PdfExtractionService
+
+    job_service = JobService(storage_service)
+    document_ai_service = DocumentAIService(pdf_extractor=PdfExtractionService(worker_pools))
+    processor_service = DocumentProcessorService(storage_service, job_service, document_ai_service=document_ai_service)
+
+    async def process_job(task: QueuedTask) -> None:
+        logger.info(f"Starting pipeline for job {task.job_id} (attempt {task.attempts}/{task.max_attempts})")
+        # The job is only FAILED once the queue will not retry it
+        if not await processor_service.document_ai_workflow(task.job_id, final_attempt=task.exhausted):
+            raise JobFailedError(f"Document AI workflow failed for job {task.job_id}")
+        logger.info(f"Pipeline completed for job {task.job_id}")
+
+    return process_job
+
+def build_dead_letter_handler(storage_service: Any) -> DeadLetterHandler:
+    """Handler that marks a job FAILED when the queue dead-letters its task on lease expiry"""
+    from .job_service import JobService
+    from ..models.tradeline_models import ProcessingStatus
+
+    job_service = JobService(storage_service)
+
+    async def fail_job(job_id: str, error: str) -> None:
+        await job_service.update_job_status(job_id, ProcessingStatus.FAILED, error_message=error)
+
+    return fail_job
+
+async def serve(worker: JobWorker) -> None:
+    """Run a worker until SIGTERM or SIGINT, then drain"""
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, worker.stop)
+    try:
+        await worker.run()
+    finally:
+        worker.queue_executor.shutdown(wait=False)
+        worker.queue.close()
+
+def run_worker_process(storage_path: str, concurrency: int) -> None:
+    """Entry point of one worker process"""
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(processName)s %(levelname)s %(name)s: %(message)s")
+    config = JobWorkerConfig.from_env()
+    config.concurrency = concurrency
+    from .storage_service import StorageService
+
+    storage_service = StorageService(storage_path)
+    worker_pools = WorkerPools.from_env()
+    worker_pools.warm_up()
+    try:
+        asyncio.run(storage_service.remove_stale_temp_files())
+        worker = JobWorker(job_queue_from_env(storage_path), build_document_handler(worker_pools, storage_service), config,
+                           on_dead_letter=build_dead_letter_handler(storage_service))
+        asyncio.run(serve(worker))
+    finally:
+        worker_pools.shutdown(wait=False)
+        storage_service.close()
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Process queued document jobs")
+    parser.add_argument("--storage-path", default="storage")
+    parser.add_argument("--concurrency", type=int, default=JobWorkerConfig.from_env().concurrency,
+                        help="jobs run at once per process")
+    parser.add_argument("--processes", type=int, default=1, help="worker processes to start")
+    args = parser.parse_args(argv)
+
+    if args.processes <= 1:
+        run_worker_process(args.storage_path, args.concurrency)
+        return
+
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=run_worker_process, args=(args.storage_path, args.concurrency), name=f"worker-{i}")
+        for i in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+
+    def forward(signum, frame):
+        # Each child drains on SIGTERM; the parent just waits for them
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+    for process in processes:
+        process.join()
+
+if __name__ == "__main__":
+    main()
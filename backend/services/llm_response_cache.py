@@ -0,0 +1,278 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Dict, Any, Tuple
+import logging
+
+from .worker_pools import BoundedExecutor
+
+logger = logging.getLogger(__name__)
+
+class CacheBackend(ABC):
+    """Storage interface for cached LLM responses"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        """Return (response, expires_at) or None"""
+
+    @abstractmethod
+    def set(self, key: str, response: str, expires_at: float) -> None:
+        """Store a response until expires_at"""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove one entry"""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every entry"""
+
+    @abstractmethod
+    def size(self) -> int:
+        """Number of stored entries"""
+
+class MemoryLRUBackend(CacheBackend):
+    """In-process LRU backend; contents are lost on restart"""
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, response: str, expires_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (response, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def size(self) -> int:
+        return len(self._entries)
+
+class SQLiteBackend(CacheBackend):
+    """On-disk backend shared across restarts and worker processes"""
+
+    def __init__(self, db_path: str = "storage/llm_cache.db", max_entries: int = 10000):
+        self.db_path = Path(db_path)
+        self.max_entries = max_entries
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS llm_responses (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_llm_responses_accessed ON llm_responses (accessed_at)"
+        )
+        self._conn.commit()
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, expires_at FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                self._conn.execute(
+                    "UPDATE llm_responses SET accessed_at = ? WHERE key = ?", (time.time(), key)
+                )
+                self._conn.commit()
+            return row
+
+    def set(self, key: str, response: str, expires_at: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, response, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, response, expires_at, time.time())
+            )
+            # Drop expired rows first, then least recently used ones over the cap
+            self._conn.execute("DELETE FROM llm_responses WHERE expires_at <= ?", (time.time(),))
+            overflow = self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM llm_responses WHERE key IN "
+                    "(SELECT key FROM llm_responses ORDER BY accessed_at LIMIT ?)",
+                    (overflow,)
+                )
+                self.evictions += overflow
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_responses")
+            self._conn.commit()
+
+    def size(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+
+class LLMResponseCache:
+    """Cache of LLM completions keyed by everything that determines the answer.
+
+    The key hashes the system prompt, user prompt, model name, temperature,
+    top_p and max_tokens, so a change to any of them is a miss. Responses are
+    only reused within the TTL; callers that must re-ask the model (forced
+    reprocessing) skip the lookup but still refresh the stored entry.
+    Async callers use get_async/set_async, which run the backend off the event loop.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl_seconds: int = 7 * 24 * 3600,
+                 io_executor: Optional[BoundedExecutor] = None):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        # A pool passed in belongs to the caller; close() only stops one created here
+        self._owns_io = io_executor is None
+        self.io = io_executor or BoundedExecutor(
+            "llm-cache-io",
+            max_workers=int(os.getenv("LLM_CACHE_IO_WORKERS", "2")),
+            max_queue=int(os.getenv("LLM_CACHE_IO_QUEUE_SIZE", "256"))
+        )
+        self._lock = threading.Lock()
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'expired': 0,
+            'writes': 0,
+            'bypassed': 0
+        }
+
+    @classmethod
+    def from_env(cls) -> Optional['LLMResponseCache']:
+        """Create cache from environment variables; None when disabled"""
+        backend_name = os.getenv("LLM_CACHE_BACKEND", "sqlite").lower()
+        max_entries = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+        ttl_seconds = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+
+        if backend_name == "memory":
+            backend: CacheBackend = MemoryLRUBackend(max_entries=max_entries)
+        elif backend_name == "sqlite":
+            backend = SQLiteBackend(
+                db_path=os.getenv("LLM_CACHE_PATH", "storage/llm_cache.db"),
+                max_entries=max_entries
+            )
+        else:
+            logger.info("LLM response cache disabled")
+            return None
+
+        logger.info(f"LLM response cache using {backend_name} backend")
+        return cls(backend, ttl_seconds=ttl_seconds)
+
+    @staticmethod
+    def compute_key(system_prompt: str, prompt: str, model_name: str,
+                    temperature: float, top_p: float, max_tokens: int) -> str:
+        """Hash the full request so only identical requests share an entry"""
+        payload = json.dumps(
+            [system_prompt, prompt, model_name, temperature, top_p, max_tokens],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response, or None on miss/expiry"""
+        entry = self.backend.get(key)
+        with self._lock:
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            response, expires_at = entry
+            if expires_at <= time.time():
+                self.stats['expired'] += 1
+                self.stats['misses'] += 1
+                expired = True
+            else:
+                self.stats['hits'] += 1
+                expired = False
+        if expired:
+            self.backend.delete(key)
+            return None
+        return response
+
+    def set(self, key: str, response: str) -> None:
+        """Store a response for the configured TTL"""
+        self.backend.set(key, response, time.time() + self.ttl_seconds)
+        with self._lock:
+            self.stats['writes'] += 1
+
+    async def get_async(self, key: str) -> Optional[str]:
+        """get() without blocking the event loop on backend I/O"""
+        return await self.io.run(self.get, key)
+
+    async def set_async(self, key: str, response: str) -> None:
+        """set() without blocking the event loop on backend I/O"""
+        await self.io.run(self.set, key, response)
+
+    def close(self) -> None:
+        """Stop the cache's I/O pool"""
+        if self._owns_io:
+            self.io.shutdown(wait=True)
+
+    def record_bypass(self) -> None:
+        """Count a lookup skipped because the caller forced a fresh answer"""
+        with self._lock:
+            self.stats['bypassed'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            stats = dict(self.stats)
+        lookups = stats['hits'] + stats['misses']
+        stats.update({
+            'backend': type(self.backend).__name__,
+            'entries': self.backend.size(),
+            'evictions': getattr(self.backend, 'evictions', 0),
+            'hit_rate': round(stats['hits'] / lookups, 3) if lookups else 0.0,
+            'ttl_seconds': self.ttl_seconds
+        })
+        return stats
+
+_shared_cache: Optional[LLMResponseCache] = None
+_shared_cache_loaded = False
+_shared_cache_lock = threading.Lock()
+
+def get_llm_response_cache() -> Optional[LLMResponseCache]:
+    """Get the process-wide response cache (created from env on first use)"""
+    global _shared_cache, _shared_cache_loaded
+    with _shared_cache_lock:
+        if not _shared_cache_loaded:
+            try:
+                _shared_cache = LLMResponseCache.from_env()
+            except Exception as e:
+                logger.warning(f"LLM response cache unavailable: {str(e)}")
+                _shared_cache = None
+            _shared_cache_loaded = True
+        return _shared_cache
@@ -0,0 +1,149 @@
+"""
+Staged, checkpointed pipeline runner
+
+A pipeline is an ordered list of stages; each stage takes the previous
+stage's output. After a stage succeeds its output is checkpointed under the
+job ID with the stage's input hash, which chains the pipeline input hash
+through every earlier stage's output digest. A rerun walks the stages,
+skips each one whose checkpoint matches its expected input hash, and runs
+from the first that does not, so a job that failed in a late stage resumes
+there instead of starting over. A stage that reruns and produces the same
+output as before leaves the later checkpoints valid.
+"""
+import json
+import time
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+def _identity(value: Any) -> Any:
+    return value
+
+def chain_hash(previous_hash: str, *parts: str) -> str:
+    hasher = hashlib.sha256(previous_hash.encode("utf-8"))
+    for part in parts:
+        hasher.update(b"\0")
+        hasher.update(part.encode("utf-8"))
+    return hasher.hexdigest()
+
+def output_digest(encoded_output: Any) -> str:
+    """Stable digest of a stage's encoded (checkpointable) output"""
+    canonical = json.dumps(encoded_output, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+@dataclass
+class PipelineStage:
+    """One step of the pipeline.
+
+    run takes the previous stage's output (the pipeline's initial value for
+    the first stage). encode turns the result into plain data for the
+    checkpoint (dicts, lists, strings, numbers) and decode turns it back.
+    still_valid is for stages whose real output is stored elsewhere (the
+    checkpoint holding only a reference to it): given the checkpointed
+    output, it says whether that still holds, and the stage reruns if not.
+    """
+    name: str
+    run: Callable[[Any], Awaitable[Any]]
+    encode: Callable[[Any], Any] = _identity
+    decode: Callable[[Any], Any] = _identity
+    still_valid: Optional[Callable[[Any], Awaitable[bool]]] = None
+
+@dataclass
+class PipelineRun:
+    """What a run did: its final output and which stages ran or were resumed past"""
+    output: Any
+    stages_run: List[str] = field(default_factory=list)
+    stages_skipped: List[str] = field(default_factory=list)
+    stage_timings: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def resumed_from(self) -> Optional[str]:
+        """First stage that ran, if earlier stages were restored from checkpoints"""
+        return self.stages_run[0] if self.stages_skipped and self.stages_run else None
+
+class StageFailedError(RuntimeError):
+    """A stage raised; every stage before it is checkpointed"""
+
+    def __init__(self, stage: str, cause: BaseException):
+        super().__init__(f"Stage '{stage}' failed: {cause}")
+        self.stage = stage
+        self.cause = cause
+
+class CheckpointedPipeline:
+    """Run stages in order, checkpointing each output through a checkpoint store.
+
+    The store is anything with async store_checkpoint(job_id, stage, header,
+    output), get_checkpoint_header(job_id, stage) and
+    get_checkpoint_output(job_id, stage), such as StorageService. Resuming
+    reads checkpoint headers only, plus the one output the next stage needs.
+    """
+
+    def __init__(self, stages: Sequence[PipelineStage], checkpoints: Any):
+        names = [stage.name for stage in stages]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Stage names must be unique: {names}")
+        self.stages = list(stages)
+        self.checkpoints = checkpoints
+
+    async def run(self, job_id: str, input_hash: str, initial: Any = None) -> PipelineRun:
+        result = PipelineRun(output=None)
+        expected_hash = input_hash
+        # The previous stage's output, loaded only if a stage actually needs it
+        load_previous: Callable[[], Awaitable[Any]] = self._value(initial)
+
+        for stage in self.stages:
+            header = await self.checkpoints.get_checkpoint_header(job_id, stage.name)
+            if header and header.get("input_hash") == expected_hash and await self._checkpoint_holds(job_id, stage):
+                result.stages_skipped.append(stage.name)
+                digest = header["output_digest"]
+                load_previous = self._checkpoint_loader(job_id, stage)
+            else:
+                previous = await load_previous()
+                start_time = time.perf_counter()
+                try:
+                    value = await stage.run(previous)
+                except Exception as e:
+                    raise StageFailedError(stage.name, e) from e
+                result.stage_timings[stage.name] = round(time.perf_counter() - start_time, 3)
+
+                encoded = stage.encode(value)
+                digest = output_digest(encoded)
+                await self.checkpoints.store_checkpoint(job_id, stage.name, {
+                    "stage": stage.name,
+                    "input_hash": expected_hash,
+                    "output_digest": digest,
+                    "completed_at": datetime.now().isoformat()
+                }, encoded)
+                result.stages_run.append(stage.name)
+                load_previous = self._value(value)
+            expected_hash = chain_hash(expected_hash, stage.name, digest)
+
+        if result.resumed_from:
+            logger.info(f"Job {job_id} resumed at stage '{result.resumed_from}', "
+                        f"reusing {len(result.stages_skipped)} checkpoint(s)")
+        result.output = await load_previous()
+        return result
+
+    async def _checkpoint_holds(self, job_id: str, stage: PipelineStage) -> bool:
+        if stage.still_valid is None:
+            return True
+        output = await self._checkpoint_loader(job_id, stage)()
+        if await stage.still_valid(output):
+            return True
+        logger.warning(f"Checkpoint of stage '{stage.name}' for job {job_id} no longer matches what it stored, rerunning")
+        return False
+
+    @staticmethod
+    def _value(value: Any) -> Callable[[], Awaitable[Any]]:
+        async def load():
+            return value
+        return load
+
+    def _checkpoint_loader(self, job_id: str, stage: PipelineStage) -> Callable[[], Awaitable[Any]]:
+        async def load():
+            return stage.decode(await self.checkpoints.get_checkpoint_output(job_id, stage.name))
+        return load
@@ -0,0 +1,189 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+import logging
+
+logger = logging.getLogger(__name__)
+
+class ReportCache:
+    """Content-addressed cache of processed credit reports.
+
+    Entries are keyed by the SHA-256 of the uploaded PDF bytes (the same
+    value StorageService records as ``file_hash``) and hold the extracted
+    text plus the final tradeline list. Payloads live on disk so they
+    survive restarts; an in-memory index keeps LRU order, byte sizes and
+    expiry times so lookups and evictions never scan the directory.
+    """
+
+    def __init__(self, cache_dir: str = "storage/report_cache", max_entries: int = 500,
+                 max_bytes: int = 512 * 1024 * 1024, ttl_seconds: int = 7 * 24 * 3600):
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._index: "OrderedDict[str, Dict[str, float]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expired': 0
+        }
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._load_index()
+
+    @classmethod
+    def from_env(cls) -> 'ReportCache':
+        """Create cache from environment variables"""
+        return cls(
+            cache_dir=os.getenv("REPORT_CACHE_DIR", "storage/report_cache"),
+            max_entries=int(os.getenv("REPORT_CACHE_MAX_ENTRIES", "500")),
+            max_bytes=int(os.getenv("REPORT_CACHE_MAX_BYTES", str(512 * 1024 * 1024))),
+            ttl_seconds=int(os.getenv("REPORT_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+        )
+
+    @staticmethod
+    def compute_hash(content: bytes) -> str:
+        """Hash file content the same way StorageService does"""
+        return hashlib.sha256(content).hexdigest()
+
+    def get(self, file_hash: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for a file hash, or None on miss/expiry"""
+        with self._lock:
+            meta = self._index.get(file_hash)
+            if meta is None:
+                self.stats['misses'] += 1
+                return None
+            if meta['expires_at'] <= time.time():
+                self._remove(file_hash)
+                self.stats['expired'] += 1
+                self.stats['misses'] += 1
+                return None
+            self._index.move_to_end(file_hash)
+
+        try:
+            with open(self._entry_path(file_hash), 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Dropping unreadable cache entry {file_hash[:12]}: {e}")
+            with self._lock:
+                self._remove(file_hash)
+                self.stats['misses'] += 1
+            return None
+
+        with self._lock:
+            self.stats['hits'] += 1
+        return entry
+
+    def set(self, file_hash: str, extracted_text: str, tradelines: List[Dict[str, Any]],
+            processing_method: str, saved_for_users: Optional[List[str]] = None) -> None:
+        """Store the extraction result for a file hash"""
+        now = time.time()
+        self._write({
+            'file_hash': file_hash,
+            'extracted_text': extracted_text,
+            'tradelines': tradelines,
+            'processing_method': processing_method,
+            'saved_for_users': saved_for_users or [],
+            'cached_at': now,
+            'expires_at': now + self.ttl_seconds
+        })
+
+    def mark_saved(self, file_hash: str, user_id: str) -> None:
+        """Record that a cached entry's tradelines were persisted for a user"""
+        entry = self.get(file_hash)
+        if entry is None or user_id in entry['saved_for_users']:
+            return
+        entry['saved_for_users'].append(user_id)
+        self._write(entry)
+
+    def invalidate(self, file_hash: str) -> None:
+        """Remove a single entry"""
+        with self._lock:
+            self._remove(file_hash)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            return {
+                **self.stats,
+                'entries': len(self._index),
+                'total_bytes': self._total_bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'ttl_seconds': self.ttl_seconds
+            }
+
+    def _entry_path(self, file_hash: str) -> Path:
+        return self.cache_dir / f"{file_hash}.json"
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        """Atomically write an entry to disk and account for it in the index"""
+        file_hash = entry['file_hash']
+        payload = json.dumps(entry, default=str)
+        size = len(payload.encode('utf-8'))
+        if size > self.max_bytes:
+            logger.info(f"Skipping cache for {file_hash[:12]}: entry larger than cache")
+            return
+
+        path = self._entry_path(file_hash)
+        tmp_path = path.with_suffix('.tmp')
+        try:
+            with open(tmp_path, 'w') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+            # mtime tracks creation so the TTL survives restarts and rewrites
+            os.utime(path, (entry['cached_at'], entry['cached_at']))
+        except OSError as e:
+            logger.error(f"Failed to write cache entry {file_hash[:12]}: {e}")
+            return
+
+        with self._lock:
+            if file_hash in self._index:
+                self._total_bytes -= self._index.pop(file_hash)['size']
+            self._index[file_hash] = {'size': size, 'expires_at': entry['expires_at']}
+            self._total_bytes += size
+            self._evict()
+
+    def _load_index(self) -> None:
+        """Rebuild the LRU index from disk, oldest entries first"""
+        now = time.time()
+        entries = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            expires_at = stat.st_mtime + self.ttl_seconds
+            if expires_at <= now:
+                path.unlink(missing_ok=True)
+                continue
+            entries.append((stat.st_mtime, path.stem, stat.st_size, expires_at))
+
+        for _, file_hash, size, expires_at in sorted(entries):
+            self._index[file_hash] = {'size': size, 'expires_at': expires_at}
+            self._total_bytes += size
+
+        with self._lock:
+            self._evict()
+        logger.info(f"Report cache loaded {len(self._index)} entries from {self.cache_dir}")
+
+    def _evict(self) -> None:
+        """Evict least recently used entries until within bounds (lock held)"""
+        while self._index and (len(self._index) > self.max_entries or self._total_bytes > self.max_bytes):
+            file_hash = next(iter(self._index))
+            self._remove(file_hash)
+            self.stats['evictions'] += 1
+
+    def _remove(self, file_hash: str) -> None:
+        """Remove an entry from index and disk (lock held)"""
+        meta = self._index.pop(file_hash, None)
+        if meta is not None:
+            self._total_bytes -= meta['size']
+        self._entry_path(file_hash).unlink(missing_ok=True)
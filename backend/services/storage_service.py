@@ -1,202 +1,541 @@
-import os
-import json
-import uuid
-import hashlib
-import aiofiles
-from pathlib import Path
-from typing import Optional, Dict, Any
-from datetime import datetime, timedelta
-import logging
-
-from ..models.tradeline_models import ProcessingStatus
-
-logger = logging.getLogger(__name__)
-
-class StorageService:
-    """Service for handling file and data storage operations"""
-    
-    def __init__(self, storage_path: str = "storage"):
-        self.storage_path = storage_path
-        self.base_path = Path(storage_path)
-        self.ensure_storage_directories()
-    
-    def ensure_storage_directories(self):
-        """Create necessary storage directories"""
-        directories = [
-            self.base_path / "uploads",
-            self.base_path / "ai_results",
-            self.base_path / "llm_input",
-            self.base_path / "processed",
-            self.base_path / "jobs"
-        ]
-        for directory in directories:
-            directory.mkdir(parents=True, exist_ok=True)
-    
-    async def store_uploaded_file(self, job_id: str, file_content: bytes, metadata: Dict[str, Any]) -> str:
-        """Store uploaded file with metadata"""
-        try:
-            file_path = self.base_path / "uploads" / f"{job_id}.bin"
-            metadata_path = self.base_path / "uploads" / f"{job_id}.json"
-
-            # Write file content
-            with open(file_path, 'wb') as f:
-                f.write(file_content)
-
-            storage_metadata = {
-                "job_id": job_id,
-                "file_size": len(file_content),
-                "file_hash": hashlib.sha256(file_content).hexdigest(),
-                "stored_at": datetime.now().isoformat(),
-                **metadata
-            }
-
-            with open(metadata_path, 'w') as f:
-                json.dump(storage_metadata, f, indent=2)
-
-            logger.info(f"Stored file for job {job_id}")
-            return str(file_path)
-
-        except Exception as e:
-            logger.error(f"Failed to store file for job {job_id}: {str(e)}")
-            raise
-
-    async def get_file(self, job_id: str) -> Dict[str, Any]:
-        """Retrieve uploaded file and metadata"""
-        try:
-            file_path = self.base_path / "uploads" / f"{job_id}.bin"
-            metadata_path = self.base_path / "uploads" / f"{job_id}.json"
-
-            with open(file_path, 'rb') as f:
-                content = f.read()
-
-            with open(metadata_path, 'r') as f:
-                metadata = json.load(f)
-
-            return {
-                "content": content,
-                "metadata": metadata
-            }
-
-        except FileNotFoundError:
-            logger.error(f"File not found for job {job_id}")
-            raise
-        except Exception as e:
-            logger.error(f"Failed to retrieve file for job {job_id}: {str(e)}")
-            raise
-
-    async def store_document_ai_results(self, job_id: str, ai_results: Dict[str, Any]) -> None:
-        """Store Document AI processing results"""
-        try:
-            results_path = self.base_path / "ai_results" / f"{job_id}.json"
-            with open(results_path, 'w') as f:
-                json.dump(ai_results, f, indent=2)
-            logger.info(f"Stored AI results for job {job_id}")
-        except Exception as e:
-            logger.error(f"Failed to store AI results for job {job_id}: {str(e)}")
-            raise
-
-    async def get_document_ai_results(self, job_id: str) -> Optional[Dict[str, Any]]:
-        """Retrieve Document AI processing results"""
-        try:
-            results_path = self.base_path / "ai_results" / f"{job_id}.json"
-            if not results_path.exists():
-                return None
-            with open(results_path, 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            logger.error(f"Failed to retrieve AI results for job {job_id}: {str(e)}")
-            return None
-
-    async def store_job_data(self, job_id: str, job_data: Dict[Any, Any]) -> None:
-        """Store job processing data"""
-        try:
-            job_path = self.base_path / "jobs" / f"{job_id}.json"
-            serializable_data = self._make_serializable(job_data)
-            async with aiofiles.open(job_path, 'w') as f:
-                await f.write(json.dumps(serializable_data, indent=2))
-            logger.info(f"Stored job data for {job_id}")
-        except Exception as e:
-            logger.error(f"Failed to store job data for {job_id}: {e}")
-            raise
-
-    async def get_job_data(self, job_id: str) -> Optional[Dict[Any, Any]]:
-        """Retrieve job processing data"""
-        try:
-            job_path = self.base_path / "jobs" / f"{job_id}.json"
-            if not job_path.exists():
-                return None
-            async with aiofiles.open(job_path, 'r') as f:
-                content = await f.read()
-                return json.loads(content)
-        except Exception as e:
-            logger.error(f"Failed to retrieve job data for {job_id}: {e}")
-            return None
-
-    async def update_job_status(self, job_id: str, status: ProcessingStatus, error_message: Optional[str] = None) -> None:
-        """Update job status"""
-        try:
-            job_data = await self.get_job_data(job_id)
-            if not job_data:
-                logger.warning(f"Job {job_id} not found for status update")
-                return
-
-            job_data["status"] = status.value
-            if error_message:
-                job_data["error_message"] = error_message
-            if status == ProcessingStatus.COMPLETED:
-                job_data["completed_at"] = datetime.now().isoformat()
-
-            await self.store_job_data(job_id, job_data)
-
-        except Exception as e:
-            logger.error(f"Failed to update job status for {job_id}: {e}")
-            raise
-
-    async def store_llm_input(self, job_id: str, llm_input: Dict[str, Any]) -> None:
-        """Store prepared input data for LLM processing"""
-        try:
-            input_path = self.base_path / "llm_input" / f"{job_id}.json"
-            llm_input["prepared_at"] = datetime.now().isoformat()
-            with open(input_path, 'w') as f:
-                json.dump(llm_input, f, indent=2)
-            logger.info(f"Stored LLM input for job {job_id}")
-        except Exception as e:
-            logger.error(f"Failed to store LLM input for job {job_id}: {str(e)}")
-            raise
-
-    async def cleanup_old_files(self, retention_days: int = 7) -> None:
-        """Clean up old files and job data"""
-        try:
-            cutoff_date = datetime.now() - timedelta(days=retention_days)
-
-            # Cleanup uploads
-            upload_dir = self.base_path / "uploads"
-            for file_path in upload_dir.iterdir():
-                if file_path.stat().st_mtime < cutoff_date.timestamp():
-                    file_path.unlink()
-                    logger.info(f"Cleaned up old file: {file_path}")
-
-            # Cleanup job data
-            jobs_dir = self.base_path / "jobs"
-            for file_path in jobs_dir.iterdir():
-                if file_path.stat().st_mtime < cutoff_date.timestamp():
-                    file_path.unlink()
-                    logger.info(f"Cleaned up old job data: {file_path}")
-
-        except Exception as e:
-            logger.error(f"Failed to cleanup old files: {e}")
-
-    def _make_serializable(self, obj):
-        """Convert non-serializable objects to serializable format"""
-        if isinstance(obj, dict):
-            return {k: self._make_serializable(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self._make_serializable(item) for item in obj]
-        elif isinstance(obj, datetime):
-            return obj.isoformat()
-        elif isinstance(obj, uuid.UUID):
-            return str(obj)
-        elif hasattr(obj, '__dict__'):
-            return self._make_serializable(obj.__dict__)
-        else:
-            return obj
+import os
+import uuid
+import shutil
+import hashlib
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Callable, Sequence
+from datetime import datetime, timedelta
+import logging
+
+from .job_store import JobStore, SQLiteJobStore, job_store_from_env
+from .worker_pools import BoundedExecutor
+from ..models.tradeline_models import ProcessingStatus
+from ..utils.atomic_files import (
+    atomic_write_bytes, atomic_write_json, read_bytes, read_json, remove_files_older_than, remove_stale_temp_files
+)
+from ..utils.upload_stream import SpooledUpload, spool_upload
+from ..utils.document_pack import (
+    PACK_SUFFIX, DocumentPack, DocumentPackError, pack_document, reference_text_spans, resolve_text_spans
+)
+
+logger = logging.getLogger(__name__)
+
+# "json": one indented JSON file per artifact; "compact": document packs (see utils.document_pack)
+STORAGE_FORMATS = ("json", "compact")
+
+# Section holding the one canonical copy of a document's text in a compact artifact
+TEXT_SECTION = "__text__"
+
+# Scalars up to this length are kept in a compact artifact's header instead of a section
+MAX_HEADER_STRING = 256
+
+# Directories under the storage path; atomic writes leave their temp files in these
+STORAGE_DIRECTORIES = ("uploads", "ai_results", "llm_input", "processed", "jobs", "checkpoints")
+
+# A temp file this old belongs to no write still in progress (another process may be mid-write on a newer one)
+TEMP_FILE_MAX_AGE_SECONDS = float(os.getenv("STORAGE_TEMP_MAX_AGE_SECONDS", "3600"))
+
+def _is_header_value(value: Any) -> bool:
+    if isinstance(value, str):
+        return len(value) <= MAX_HEADER_STRING
+    return value is None or isinstance(value, (bool, int, float))
+
+def _text_sha256(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def artifact_counts(artifact: Dict[str, Any]) -> Dict[str, Any]:
+    """Table and text block counts of an AI results or LLM input artifact"""
+    text_content = artifact.get('text_content')
+    if not isinstance(text_content, dict):
+        text_content = artifact
+    tables = artifact.get('tables') or []
+    return {
+        'table_count': len(tables),
+        'table_row_count': sum(len(table.get('rows') or []) for table in tables if isinstance(table, dict)),
+        'text_block_count': len(text_content.get('text_blocks') or []),
+        'page_count': text_content.get('page_count')
+    }
+
+def _text_at(artifact: Dict[str, Any], text_path: Sequence[str]) -> Optional[str]:
+    """The string at text_path (a key, or a parent key and a key), if there is one"""
+    parent_key, text_key = (None, text_path[0]) if len(text_path) == 1 else text_path
+    container = artifact if parent_key is None else artifact.get(parent_key)
+    text = container.get(text_key) if isinstance(container, dict) else None
+    return text if isinstance(text, str) else None
+
+def encode_artifact(artifact: Dict[str, Any], text_path: Sequence[str],
+                    shared_text_sha256: Optional[str] = None) -> bytes:
+    """
+    Pack an artifact dict into a document pack
+
+    Short scalar fields and the counts go in the header; every other
+    top-level value gets its own section. The text at text_path (a key, or
+    a parent key and a key) is stored once in TEXT_SECTION and the
+    text_blocks next to it keep only their span in it. If the text hashes
+    to shared_text_sha256 it is left out entirely and read back from the
+    job's Document AI result.
+    """
+    fields = {key: value for key, value in artifact.items() if _is_header_value(value)}
+    sections = {key: value for key, value in artifact.items() if key not in fields}
+    summary: Dict[str, Any] = {'fields': fields, 'counts': artifact_counts(artifact)}
+
+    parent_key, text_key = (None, text_path[0]) if len(text_path) == 1 else text_path
+    container = sections if parent_key is None else sections.get(parent_key)
+    text = container.get(text_key) if isinstance(container, dict) else None
+    if isinstance(text, str):
+        stripped = {key: value for key, value in container.items() if key != text_key}
+        if 'text_blocks' in container:
+            stripped['text_blocks'] = reference_text_spans(text, container['text_blocks'] or [])
+        if parent_key is None:
+            sections = stripped
+        else:
+            sections[parent_key] = stripped
+        summary['text_path'] = list(text_path)
+        summary['text_sha256'] = _text_sha256(text)
+        if summary['text_sha256'] == shared_text_sha256:
+            summary['text_source'] = 'ai_results'
+        else:
+            sections[TEXT_SECTION] = text
+    return pack_document(summary, sections)
+
+def decode_artifact(pack: DocumentPack, shared_text: Optional[Callable[[], str]] = None) -> Dict[str, Any]:
+    """Rebuild the dict encode_artifact was given; shared_text loads text stored elsewhere"""
+    artifact = {**pack.summary.get('fields', {}), **pack.read_sections()}
+    text_path = pack.summary.get('text_path')
+    if not text_path:
+        return artifact
+
+    text = artifact.pop(TEXT_SECTION, None)
+    if text is None:
+        if shared_text is None:
+            raise DocumentPackError(f"{pack.path.name} references text stored in another artifact")
+        text = shared_text()
+        if _text_sha256(text) != pack.summary.get('text_sha256'):
+            raise DocumentPackError(f"Shared text for {pack.path.name} has changed since it was written")
+
+    parent_key, text_key = (None, text_path[0]) if len(text_path) == 1 else text_path
+    container = artifact if parent_key is None else dict(artifact[parent_key])
+    container[text_key] = text
+    if 'text_blocks' in container:
+        container['text_blocks'] = resolve_text_spans(text, container['text_blocks'])
+    if parent_key is not None:
+        artifact[parent_key] = container
+    return artifact
+
+class StorageService:
+    """Service for handling file and data storage operations
+
+    Every file and job store operation runs on a small bounded thread pool
+    of its own, never on the event loop, and files are replaced atomically
+    (temp file + rename), so a crash cannot leave a half-written JSON file.
+
+    With storage_format "compact" (STORAGE_FORMAT env), AI results and LLM
+    input are written as compressed document packs that share one copy of
+    the document text. Either format is read back regardless of the setting.
+    """
+    
+    def __init__(self, storage_path: str = "storage", job_store: Optional[JobStore] = None,
+                 io_executor: Optional[BoundedExecutor] = None, storage_format: Optional[str] = None):
+        self.storage_path = storage_path
+        self.base_path = Path(storage_path)
+        self.storage_format = storage_format or os.getenv("STORAGE_FORMAT", "json")
+        if self.storage_format not in STORAGE_FORMATS:
+            raise ValueError(f"Unknown storage format: {self.storage_format}")
+        self.ensure_storage_directories()
+        self.job_store = job_store or job_store_from_env(storage_path)
+        # A pool passed in belongs to the caller; close() only stops one created here
+        self._owns_io = io_executor is None
+        self.io = io_executor or BoundedExecutor(
+            "storage-io",
+            max_workers=int(os.getenv("STORAGE_IO_WORKERS", "4")),
+            max_queue=int(os.getenv("STORAGE_IO_QUEUE_SIZE", "256"))
+        )
+        self._warn_unmigrated_jobs()
+    
+    async def _run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run blocking file I/O off the event loop"""
+        return await self.io.run(fn, *args, **kwargs)
+    
+    def _warn_unmigrated_jobs(self):
+        """Point at the migration tool if JSON job files exist but the SQLite store is empty"""
+        if not isinstance(self.job_store, SQLiteJobStore) or self.job_store.count():
+            return
+        if any((self.base_path / "jobs").glob("*.json")):
+            logger.warning(
+                "Job store is empty but JSON job files exist; import them with "
+                "python -m backend.services.job_store_migration"
+            )
+    
+    def ensure_storage_directories(self):
+        """Create necessary storage directories"""
+        for name in STORAGE_DIRECTORIES:
+            (self.base_path / name).mkdir(parents=True, exist_ok=True)
+    
+    def _remove_stale_temp_files(self, cutoff_timestamp: float) -> List[Path]:
+        removed = []
+        for name in STORAGE_DIRECTORIES:
+            removed.extend(remove_stale_temp_files(self.base_path / name, cutoff_timestamp))
+        return removed
+    
+    async def remove_stale_temp_files(self, max_age_seconds: float = TEMP_FILE_MAX_AGE_SECONDS) -> int:
+        """Delete temp files that interrupted atomic writes left in any storage directory; run at startup"""
+        cutoff = datetime.now().timestamp() - max_age_seconds
+        removed = await self._run(self._remove_stale_temp_files, cutoff)
+        if removed:
+            logger.info(f"Removed {len(removed)} stale temp file(s) from {self.base_path}")
+        return len(removed)
+    
+    def close(self) -> None:
+        """Stop the storage I/O pool and close the job store"""
+        if self._owns_io:
+            self.io.shutdown(wait=True)
+        self.job_store.close()
+    
+    async def store_uploaded_file(self, job_id: str, file_content: bytes, metadata: Dict[str, Any]) -> str:
+        """Store uploaded file with metadata"""
+        try:
+            file_path = self.get_file_path(job_id)
+            metadata_path = self.base_path / "uploads" / f"{job_id}.json"
+            await self._run(self._store_upload_sync, job_id, file_path, metadata_path, file_content, metadata)
+            logger.info(f"Stored file for job {job_id}")
+            return str(file_path)
+
+        except Exception as e:
+            logger.error(f"Failed to store file for job {job_id}: {str(e)}")
+            raise
+
+    @staticmethod
+    def _store_upload_sync(job_id: str, file_path: Path, metadata_path: Path,
+                           file_content: bytes, metadata: Dict[str, Any]) -> None:
+        # Hashing a large upload is CPU work too, so it runs here rather than on the loop.
+        # The metadata file is written last: if it exists, the content is complete.
+        atomic_write_bytes(file_path, file_content)
+        StorageService._write_upload_metadata(
+            job_id, metadata_path, len(file_content), hashlib.sha256(file_content).hexdigest(), metadata
+        )
+
+    @staticmethod
+    def _write_upload_metadata(job_id: str, metadata_path: Path, file_size: int, file_hash: str,
+                               metadata: Dict[str, Any]) -> None:
+        atomic_write_json(metadata_path, {
+            "job_id": job_id,
+            "file_size": file_size,
+            "file_hash": file_hash,
+            "stored_at": datetime.now().isoformat(),
+            **metadata
+        })
+
+    async def receive_upload(self, upload: Any, max_bytes: Optional[int] = None) -> SpooledUpload:
+        """
+        Stream an upload (e.g. UploadFile) into the uploads directory in chunks,
+        hashing and counting as it goes and stopping with UploadTooLargeError
+        past max_bytes. The file is not attached to a job until
+        store_spooled_upload; discard() it if the upload is rejected.
+        """
+        return await spool_upload(upload, self.base_path / "uploads", max_bytes, run=self._run)
+
+    async def store_spooled_upload(self, job_id: str, spooled: SpooledUpload, metadata: Dict[str, Any]) -> str:
+        """Attach a received upload to a job by renaming it into place; no content is copied"""
+        try:
+            file_path = self.get_file_path(job_id)
+            metadata_path = self.base_path / "uploads" / f"{job_id}.json"
+            await self._run(spooled.move_to, file_path)
+            await self._run(self._write_upload_metadata, job_id, metadata_path, spooled.size, spooled.sha256, metadata)
+            logger.info(f"Stored file for job {job_id}")
+            return str(file_path)
+        except Exception as e:
+            logger.error(f"Failed to store file for job {job_id}: {str(e)}")
+            raise
+
+    def get_file_path(self, job_id: str) -> Path:
+        """Path of a job's stored upload, for readers that map or stream it instead of loading it"""
+        return self.base_path / "uploads" / f"{job_id}.bin"
+
+    async def get_file_metadata(self, job_id: str) -> Dict[str, Any]:
+        """Metadata of a stored upload (file_size, file_hash, file_name, ...)"""
+        return await self._run(read_json, self.base_path / "uploads" / f"{job_id}.json")
+
+    async def get_file(self, job_id: str) -> Dict[str, Any]:
+        """Retrieve uploaded file and metadata"""
+        try:
+            file_path = self.get_file_path(job_id)
+            metadata_path = self.base_path / "uploads" / f"{job_id}.json"
+
+            content = await self._run(read_bytes, file_path)
+            metadata = await self._run(read_json, metadata_path)
+
+            return {
+                "content": content,
+                "metadata": metadata
+            }
+
+        except FileNotFoundError:
+            logger.error(f"File not found for job {job_id}")
+            raise
+        except Exception as e:
+            logger.error(f"Failed to retrieve file for job {job_id}: {str(e)}")
+            raise
+
+    def _artifact_paths(self, kind: str, job_id: str):
+        """(JSON path, document pack path) of an ai_results or llm_input artifact"""
+        directory = self.base_path / kind
+        return directory / f"{job_id}.json", directory / f"{job_id}{PACK_SUFFIX}"
+
+    def _write_artifact(self, kind: str, job_id: str, artifact: Dict[str, Any], text_path: Sequence[str]) -> None:
+        json_path, pack_path = self._artifact_paths(kind, job_id)
+        if kind == "ai_results":
+            text = _text_at(artifact, text_path)
+            self._unshare_llm_input_text(job_id, _text_sha256(text) if text is not None else None)
+        if self.storage_format == "compact":
+            shared_text_sha256 = self._ai_results_text_sha256(job_id) if kind == "llm_input" else None
+            atomic_write_bytes(pack_path, encode_artifact(artifact, text_path, shared_text_sha256))
+            stale_path = json_path
+        else:
+            atomic_write_json(json_path, artifact)
+            stale_path = pack_path
+        # A copy in the other format would shadow or outlive this one
+        stale_path.unlink(missing_ok=True)
+
+    def _read_artifact(self, kind: str, job_id: str) -> Dict[str, Any]:
+        json_path, pack_path = self._artifact_paths(kind, job_id)
+        if not pack_path.exists():
+            return read_json(json_path)
+        return decode_artifact(DocumentPack.open(pack_path), lambda: self._read_ai_results_text(job_id))
+
+    def _ai_results_text_sha256(self, job_id: str) -> Optional[str]:
+        """Hash of the text held by the job's compact AI results, if there are any"""
+        try:
+            pack = DocumentPack.open(self._artifact_paths("ai_results", job_id)[1])
+        except FileNotFoundError:
+            return None
+        return pack.summary.get('text_sha256') if TEXT_SECTION in pack else None
+
+    def _read_ai_results_text(self, job_id: str) -> str:
+        """The text of the job's AI results, compact or JSON, for an LLM input that shares it"""
+        json_path, pack_path = self._artifact_paths("ai_results", job_id)
+        try:
+            pack = DocumentPack.open(pack_path)
+        except FileNotFoundError:
+            pass
+        else:
+            if TEXT_SECTION in pack:
+                return pack.read_section(TEXT_SECTION)
+        try:
+            text = _text_at(read_json(json_path), ("text_content", "raw_text"))
+        except FileNotFoundError:
+            text = None
+        if text is None:
+            raise DocumentPackError(f"LLM input for job {job_id} shares text with AI results that no longer hold it")
+        return text
+
+    def _unshare_llm_input_text(self, job_id: str, new_text_sha256: Optional[str]) -> None:
+        """Before the AI results change their text, copy it into a compact LLM input that shares it"""
+        pack_path = self._artifact_paths("llm_input", job_id)[1]
+        try:
+            pack = DocumentPack.open(pack_path)
+        except FileNotFoundError:
+            return
+        if pack.summary.get('text_source') != 'ai_results' or pack.summary.get('text_sha256') == new_text_sha256:
+            return
+        try:
+            llm_input = decode_artifact(pack, lambda: self._read_ai_results_text(job_id))
+        except DocumentPackError as e:
+            logger.warning(f"LLM input for job {job_id} was already unreadable: {e}")
+            return
+        atomic_write_bytes(pack_path, encode_artifact(llm_input, pack.summary['text_path']))
+
+    def _read_ai_results_summary(self, job_id: str) -> Dict[str, Any]:
+        json_path, pack_path = self._artifact_paths("ai_results", job_id)
+        if pack_path.exists():
+            pack = DocumentPack.open(pack_path)
+            summary = {**pack.summary.get('fields', {}), **pack.summary.get('counts', {})}
+            stored_path = pack_path
+        else:
+            ai_results = read_json(json_path)
+            summary = {key: value for key, value in ai_results.items() if _is_header_value(value)}
+            summary.update(artifact_counts(ai_results))
+            stored_path = json_path
+        summary['stored_bytes'] = stored_path.stat().st_size
+        return summary
+
+    async def store_document_ai_results(self, job_id: str, ai_results: Dict[str, Any]) -> None:
+        """Store Document AI processing results"""
+        try:
+            await self._run(self._write_artifact, "ai_results", job_id, ai_results, ("text_content", "raw_text"))
+            logger.info(f"Stored AI results for job {job_id}")
+        except Exception as e:
+            logger.error(f"Failed to store AI results for job {job_id}: {str(e)}")
+            raise
+
+    async def get_document_ai_results(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Retrieve Document AI processing results"""
+        try:
+            return await self._run(self._read_artifact, "ai_results", job_id)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.error(f"Failed to retrieve AI results for job {job_id}: {str(e)}")
+            return None
+
+    async def get_document_ai_summary(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Short fields of the Document AI results (confidence_score, processing_time, ...)
+        plus table/text block counts and the stored size, without the text and tables.
+        A compact artifact answers this from its header alone.
+        """
+        try:
+            return await self._run(self._read_ai_results_summary, job_id)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.error(f"Failed to read AI results summary for job {job_id}: {str(e)}")
+            return None
+
+    async def store_job_data(self, job_id: str, job_data: Dict[Any, Any]) -> None:
+        """Store job processing data"""
+        try:
+            serializable_data = self._make_serializable({**job_data, "job_id": job_id})
+            await self._run(self.job_store.put, serializable_data)
+            logger.info(f"Stored job data for {job_id}")
+        except Exception as e:
+            logger.error(f"Failed to store job data for {job_id}: {e}")
+            raise
+
+    async def get_job_data(self, job_id: str) -> Optional[Dict[Any, Any]]:
+        """Retrieve job processing data"""
+        try:
+            return await self._run(self.job_store.get, job_id)
+        except Exception as e:
+            logger.error(f"Failed to retrieve job data for {job_id}: {e}")
+            return None
+
+    async def update_job_status(self, job_id: str, status: ProcessingStatus, error_message: Optional[str] = None) -> None:
+        """Update job status"""
+        try:
+            completed_at = datetime.now().isoformat() if status == ProcessingStatus.COMPLETED else None
+            updated = await self._run(
+                self.job_store.update_status, job_id, status.value, error_message, completed_at
+            )
+            if not updated:
+                logger.warning(f"Job {job_id} not found for status update")
+
+        except Exception as e:
+            logger.error(f"Failed to update job status for {job_id}: {e}")
+            raise
+
+    async def list_jobs(self, user_id: Optional[str] = None, status: Optional[ProcessingStatus] = None,
+                        created_before: Optional[str] = None, before_job_id: Optional[str] = None,
+                        limit: int = 100) -> List[Dict[str, Any]]:
+        """List job summaries, newest first; to page, pass the last job's created_at and job_id as the cursor"""
+        return await self._run(
+            self.job_store.list_jobs,
+            user_id=user_id,
+            status=status.value if status else None,
+            created_before=created_before,
+            before_job_id=before_job_id,
+            limit=limit
+        )
+
+    async def store_llm_input(self, job_id: str, llm_input: Dict[str, Any]) -> None:
+        """Store prepared input data for LLM processing"""
+        try:
+            llm_input["prepared_at"] = datetime.now().isoformat()
+            await self._run(self._write_artifact, "llm_input", job_id, llm_input, ("text",))
+            logger.info(f"Stored LLM input for job {job_id}")
+        except Exception as e:
+            logger.error(f"Failed to store LLM input for job {job_id}: {str(e)}")
+            raise
+
+    async def get_llm_input(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Retrieve prepared LLM input; DocumentPackError if it exists but its shared text is gone or changed"""
+        try:
+            return await self._run(self._read_artifact, "llm_input", job_id)
+        except FileNotFoundError:
+            return None
+        except DocumentPackError as e:
+            logger.error(f"LLM input for job {job_id} is unreadable: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Failed to retrieve LLM input for job {job_id}: {str(e)}")
+            return None
+
+    def _checkpoint_path(self, job_id: str, stage: str) -> Path:
+        return self.base_path / "checkpoints" / job_id / f"{stage}{PACK_SUFFIX}"
+
+    def _write_checkpoint(self, job_id: str, stage: str, header: Dict[str, Any], output: Any) -> None:
+        path = self._checkpoint_path(job_id, stage)
+        path.parent.mkdir(exist_ok=True)
+        atomic_write_bytes(path, pack_document(header, {"output": output}))
+
+    def _read_checkpoint_header(self, job_id: str, stage: str) -> Optional[Dict[str, Any]]:
+        try:
+            return DocumentPack.open(self._checkpoint_path(job_id, stage)).summary
+        except (FileNotFoundError, DocumentPackError):
+            return None
+
+    def _read_checkpoint_output(self, job_id: str, stage: str) -> Any:
+        return DocumentPack.open(self._checkpoint_path(job_id, stage)).read_section("output")
+
+    def _remove_old_checkpoints(self, cutoff_timestamp: float) -> None:
+        for checkpoint_dir in (self.base_path / "checkpoints").iterdir():
+            if checkpoint_dir.is_dir():
+                remove_files_older_than(checkpoint_dir, cutoff_timestamp)
+                if not any(checkpoint_dir.iterdir()):
+                    checkpoint_dir.rmdir()
+
+    async def store_checkpoint(self, job_id: str, stage: str, header: Dict[str, Any], output: Any) -> None:
+        """Save a pipeline stage's output with its header (input hash, output digest) as a document pack"""
+        await self._run(self._write_checkpoint, job_id, stage, header, output)
+
+    async def get_checkpoint_header(self, job_id: str, stage: str) -> Optional[Dict[str, Any]]:
+        """Header of a stage checkpoint without decoding its output; None if there is none"""
+        return await self._run(self._read_checkpoint_header, job_id, stage)
+
+    async def get_checkpoint_output(self, job_id: str, stage: str) -> Any:
+        """Decoded output of a stage checkpoint"""
+        return await self._run(self._read_checkpoint_output, job_id, stage)
+
+    async def clear_checkpoints(self, job_id: str) -> None:
+        """Drop every stage checkpoint of a job, so the next run starts from the first stage"""
+        await self._run(shutil.rmtree, self.base_path / "checkpoints" / job_id, True)
+
+    async def cleanup_old_files(self, retention_days: int = 7) -> None:
+        """Clean up old files and job data"""
+        try:
+            cutoff_date = datetime.now() - timedelta(days=retention_days)
+
+            # Cleanup uploads
+            removed_files = await self._run(
+                remove_files_older_than, self.base_path / "uploads", cutoff_date.timestamp()
+            )
+            for file_path in removed_files:
+                logger.info(f"Cleaned up old file: {file_path}")
+
+            # Cleanup pipeline checkpoints
+            await self._run(self._remove_old_checkpoints, cutoff_date.timestamp())
+
+            # Cleanup temp files of interrupted writes in every storage directory
+            await self.remove_stale_temp_files()
+
+            # Cleanup job data
+            removed = await self._run(self.job_store.delete_created_before, cutoff_date.isoformat())
+            if removed:
+                logger.info(f"Cleaned up {removed} old jobs")
+
+        except Exception as e:
+            logger.error(f"Failed to cleanup old files: {e}")
+
+    def _make_serializable(self, obj):
+        """Convert non-serializable objects to serializable format"""
+        if isinstance(obj, dict):
+            return {k: self._make_serializable(v) for k, v in obj.items()}
+        elif isinstance(obj, list):
+            return [self._make_serializable(item) for item in obj]
+        elif isinstance(obj, datetime):
+            return obj.isoformat()
+        elif isinstance(obj, uuid.UUID):
+            return str(obj)
+        elif hasattr(obj, '__dict__'):
+            return self._make_serializable(obj.__dict__)
+        else:
+            return obj
@@ -0,0 +1,126 @@
+import asyncio
+import json
+
+from backend.config.llm_config import LLMConfig
+from backend.services.batch_normalizer import BatchTradelineNormalizer
+from backend.services.prompt_templates import ProcessingContext
+
+CONTEXT = ProcessingContext(job_id="job-1", document_type="credit_report")
+
+def raw_tradelines(count):
+    return [(idx, {"creditor_name": f"BANK {idx}", "balance": f"${idx}00"}) for idx in range(count)]
+
+class FakeGeminiClient:
+    """Answers batch prompts by echoing each tradeline's index; can drop indexes or fail whole batches"""
+
+    def __init__(self, dropped=(), failing_batches=(), reverse=False):
+        self.dropped = set(dropped)
+        self.failing_batches = set(failing_batches)
+        self.reverse = reverse
+        self.operations = []
+
+    async def request(self, prompt, context, operation, max_tokens):
+        self.operations.append(operation)
+        if int(operation.rsplit("_", 1)[1]) in self.failing_batches:
+            raise RuntimeError("model unavailable")
+        indexed = json.loads(prompt.split("(each with its input index):", 1)[1].split("TASK:", 1)[0])
+        entries = [
+            {"index": item["index"], "creditor_name": item["tradeline"]["creditor_name"].title()}
+            for item in indexed if item["index"] not in self.dropped
+        ]
+        if self.reverse:
+            entries.reverse()
+        return "```json\n" + json.dumps({"tradelines": entries}) + "\n```"
+
+def normalizer_for(client, **config):
+    return BatchTradelineNormalizer(LLMConfig(openai_api_key="test", **config), client.request)
+
+def run(normalizer, items, create=None):
+    singles = []
+
+    async def normalize_single(idx, raw_tradeline, context):
+        singles.append(idx)
+        return {"creditor_name": raw_tradeline["creditor_name"], "single": True}
+
+    def create_result(normalized, raw_tradeline):
+        return normalized
+
+    results, requests = asyncio.run(normalizer.normalize(items, CONTEXT, create or create_result, normalize_single))
+    return results, requests, singles
+
+class TestBatchTradelineNormalizer:
+
+    def test_batches_are_bounded_by_count(self):
+        """Test that no batch holds more than max_tradelines_per_request tradelines"""
+
+        normalizer = normalizer_for(FakeGeminiClient(), max_tradelines_per_request=3)
+        batches = normalizer.build_batches(raw_tradelines(7), CONTEXT)
+
+        assert [[idx for idx, _ in batch] for batch in batches] == [[0, 1, 2], [3, 4, 5], [6]]
+
+    def test_batches_are_bounded_by_token_budget(self):
+        """Test that a batch is closed before its prompt plus expected output would exceed max_tokens"""
+
+        normalizer = normalizer_for(FakeGeminiClient(), max_tokens=2000, normalization_output_tokens_per_tradeline=250)
+        base_tokens = normalizer.token_counter.count_tokens(
+            normalizer.prompt_templates.get_batch_tradeline_normalization_prompt([], CONTEXT)
+        )
+        batches = normalizer.build_batches(raw_tradelines(20), CONTEXT)
+
+        assert len(batches) > 1
+        assert sum(len(batch) for batch in batches) == 20
+        for batch in batches:
+            prompt_tokens = normalizer.token_counter.count_tokens(
+                normalizer.prompt_templates.get_batch_tradeline_normalization_prompt(batch, CONTEXT)
+            )
+            assert prompt_tokens - base_tokens + 250 * len(batch) <= 2000 or len(batch) == 1
+
+    def test_results_map_back_to_input_indexes(self):
+        """Test that response entries are matched by echoed index, not by their position in the response"""
+
+        client = FakeGeminiClient(reverse=True)
+        results, requests, singles = run(normalizer_for(client, max_tradelines_per_request=4), raw_tradelines(6))
+
+        assert {idx: result["creditor_name"] for idx, result in results.items()} == {
+            idx: f"Bank {idx}" for idx in range(6)
+        }
+        assert requests == 2
+        assert not singles
+
+    def test_missing_and_failed_items_are_reasked(self):
+        """Test that items left out of a response, and every item of a failed batch, get their own request"""
+
+        client = FakeGeminiClient(dropped={1}, failing_batches={1})
+        results, requests, singles = run(normalizer_for(client, max_tradelines_per_request=3), raw_tradelines(6))
+
+        assert sorted(singles) == [1, 3, 4, 5]
+        assert sorted(results) == list(range(6))
+        assert all(results[idx].get("single") for idx in singles)
+        assert requests == 2 + 4
+
+    def test_unusable_entries_are_reasked(self):
+        """Test that an entry the caller cannot turn into a result is re-asked individually"""
+
+        def create(normalized, raw_tradeline):
+            if normalized["creditor_name"] == "Bank 2":
+                raise ValueError("invalid entry")
+            return normalized
+
+        results, requests, singles = run(normalizer_for(FakeGeminiClient()), raw_tradelines(4), create)
+
+        assert singles == [2]
+        assert results[2]["single"]
+        assert requests == 2
+
+    def test_unknown_and_duplicate_indexes_are_dropped(self):
+        """Test that response entries for indexes not in the batch, or repeated ones, are ignored"""
+
+        response = json.dumps({"tradelines": [
+            {"index": 0, "creditor_name": "First"},
+            {"index": 0, "creditor_name": "Duplicate"},
+            {"index": 9, "creditor_name": "Unknown"},
+            {"index": "1", "creditor_name": "Not an int"},
+            "not an object"
+        ]})
+
+        assert BatchTradelineNormalizer.parse_response(response, [0, 1]) == {0: {"creditor_name": "First"}}
@@ -0,0 +1,69 @@
+import json
+
+from backend.utils.creditor_registry import CreditorRegistry, get_creditor_registry
+from backend.utils.llm_helpers import DataNormalizer
+
+class TestCreditorRegistry:
+
+    def setup_method(self):
+        self.registry = get_creditor_registry()
+
+    def test_priority_beats_position(self):
+        """Test that the earlier registry entry wins even when it appears later in the line"""
+
+        name, entry = self.registry.find_in_text("VISA card issued by CHASE")
+        assert name == "CHASE"
+        assert entry.canonical_name == "Chase Bank"
+
+    def test_overlapping_aliases(self):
+        """Test that an alias hidden inside a longer match is still found"""
+
+        # "Ally Bank" is listed before "Ally Auto", as in the original pattern list
+        name, entry = self.registry.find_in_text("Ally Auto Finance")
+        assert (name, entry.account_type) == ("Ally", "Credit Card")
+        assert self.registry.find_in_text("PURCHASE HISTORY")[0] == "CHASE"
+
+    def test_account_type_and_original_casing(self):
+        """Test that the matched text keeps its casing and carries the default account type"""
+
+        name, entry = self.registry.find_in_text("rocket mortgage llc")
+        assert (name, entry.account_type) == ("rocket mortgage", "Mortgage")
+        assert self.registry.find_in_text("Date Opened: 01/15/2020") is None
+
+    def test_exact_lookup(self):
+        """Test that aliases and canonical names resolve ignoring case and spacing"""
+
+        assert self.registry.lookup("amex").canonical_name == "American Express"
+        assert self.registry.lookup("  Bank   of america ").canonical_name == "Bank of America"
+        assert self.registry.lookup("Test Bank") is None
+
+    def test_load_custom_file(self, tmp_path):
+        """Test that a registry file can add creditors without code changes"""
+
+        path = tmp_path / "creditors.json"
+        path.write_text(json.dumps({"creditors": [
+            {"canonical_name": "Mission Lane", "aliases": ["MISSION LANE"], "account_type": "Credit Card"},
+            {"canonical_name": "Upstart", "account_type": "Personal Loan"}
+        ]}))
+        registry = CreditorRegistry.load(str(path))
+
+        assert len(registry) == 2
+        assert registry.find_in_text("UPSTART NETWORK")[1].account_type == "Personal Loan"
+        assert registry.lookup("mission lane").canonical_name == "Mission Lane"
+
+class TestAccountTypeNormalization:
+
+    def test_keywords_and_creditors_match_whole_words(self):
+        """Test that keywords and creditor names spelled inside other words do not set the account type"""
+
+        assert DataNormalizer.normalize_account_type("purchase") == "Purchase"
+        assert DataNormalizer.normalize_account_type("Totally") == "Totally"
+        assert DataNormalizer.normalize_account_type("Locker") == "Locker"
+
+    def test_keywords_and_creditor_defaults(self):
+        """Test that keyword matches and named creditors still resolve to their account types"""
+
+        assert DataNormalizer.normalize_account_type("CC") == "Credit Card"
+        assert DataNormalizer.normalize_account_type("Collections") == "Collection"
+        assert DataNormalizer.normalize_account_type("AMEX") == "Credit Card"
+        assert DataNormalizer.normalize_account_type("Navient loan") == "Student Loan"
@@ -0,0 +1,91 @@
+import asyncio
+import pytest # type: ignore
+
+from backend.benchmarks.synthetic_reports import build_text_pdf
+from backend.services.document_ai_batching import (
+    DocumentAIBatcher, DocumentAIPageLimitError, LocalDocumentAIProcessor, TransientDocumentAIError
+)
+
+def make_pdf(page_count: int) -> bytes:
+    return build_text_pdf([f"PAGE MARKER {number}\nBalance: ${number * 100}" for number in range(1, page_count + 1)])
+
+class TestDocumentAIBatcher:
+
+    def test_splits_and_stitches_in_page_order(self):
+        """Test that a long PDF is sent in page-limited batches and reassembled with page offsets"""
+
+        processor = LocalDocumentAIProcessor(max_pages=15)
+        batcher = DocumentAIBatcher(processor, max_pages_per_request=15)
+        document = asyncio.run(batcher.process(make_pdf(40)))
+
+        assert sorted(processor.calls) == [10, 15, 15]
+        assert document.batch_count == 3
+        assert [page.page_number for page in document.pages] == list(range(1, 41))
+        assert all(text.startswith(f"PAGE MARKER {number}\n") for number, text in enumerate(document.page_texts, 1))
+        assert "".join(document.page_texts) == document.text
+
+    def test_concurrency_cap(self):
+        """Test that no more than max_concurrency requests are in flight"""
+
+        processor = LocalDocumentAIProcessor(max_pages=2, latency_seconds=0.02)
+        batcher = DocumentAIBatcher(processor, max_pages_per_request=2, max_concurrency=3)
+        asyncio.run(batcher.process(make_pdf(16)))
+
+        assert len(processor.calls) == 8
+        assert processor.max_in_flight == 3
+
+    def test_transient_failures_are_retried(self):
+        """Test that transient errors are retried with backoff and give up after max_retries"""
+
+        processor = LocalDocumentAIProcessor(transient_failures=2)
+        batcher = DocumentAIBatcher(processor, max_retries=2, retry_backoff_seconds=0)
+        document = asyncio.run(batcher.process(make_pdf(3)))
+        assert len(document.pages) == 3
+        assert batcher.get_stats()["retries"] == 2
+
+        processor = LocalDocumentAIProcessor(transient_failures=3)
+        batcher = DocumentAIBatcher(processor, max_retries=2, retry_backoff_seconds=0)
+        with pytest.raises(TransientDocumentAIError):
+            asyncio.run(batcher.process(make_pdf(3)))
+        assert batcher.get_stats()["failed_requests"] == 1
+
+    def test_permanent_errors_are_not_retried(self):
+        """Test that a request over the page limit fails immediately"""
+
+        processor = LocalDocumentAIProcessor(max_pages=15)
+        batcher = DocumentAIBatcher(processor, max_pages_per_request=20, retry_backoff_seconds=0)
+        with pytest.raises(DocumentAIPageLimitError):
+            asyncio.run(batcher.process(make_pdf(20)))
+        assert (len(processor.calls), batcher.get_stats()["retries"]) == (1, 0)
+
+    def test_failed_batch_cancels_the_others(self):
+        """Test that a permanent failure cancels the batches in flight and those still queued"""
+
+        class FirstBatchFails(LocalDocumentAIProcessor):
+
+            def __init__(self):
+                super().__init__(max_pages=2)
+                self.cancelled = 0
+
+            async def process(self, pdf_content):
+                self.calls.append(pdf_content)
+                if len(self.calls) == 1:
+                    await asyncio.sleep(0.01)
+                    raise ValueError("invalid document")
+                try:
+                    await asyncio.sleep(30)
+                except asyncio.CancelledError:
+                    self.cancelled += 1
+                    raise
+
+        async def run():
+            with pytest.raises(ValueError):
+                await asyncio.wait_for(batcher.process(make_pdf(8)), timeout=5)
+            assert not [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+        processor = FirstBatchFails()
+        batcher = DocumentAIBatcher(processor, max_pages_per_request=2, max_concurrency=2, retry_backoff_seconds=0)
+        asyncio.run(run())
+
+        assert len(processor.calls) < 4
+        assert processor.cancelled == len(processor.calls) - 1
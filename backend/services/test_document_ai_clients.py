@@ -0,0 +1,82 @@
+import asyncio
+
+from backend.services.document_ai_clients import DocumentAIClientManager
+
+class FakeChannel:
+
+    def __init__(self):
+        self.ready = False
+
+    async def channel_ready(self):
+        self.ready = True
+
+class FakeTransport:
+
+    def __init__(self):
+        self.grpc_channel = FakeChannel()
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+class FakeAsyncTransport(FakeTransport):
+
+    async def close(self):
+        self.closed = True
+
+class FakeClient:
+
+    def __init__(self, transport):
+        self.transport = transport
+
+def make_manager(**kwargs) -> DocumentAIClientManager:
+    return DocumentAIClientManager(
+        "proj", "us", "proc123",
+        sync_client_factory=lambda location, credentials: FakeClient(FakeTransport()),
+        async_client_factory=lambda location, credentials: FakeClient(FakeAsyncTransport()),
+        **kwargs
+    )
+
+class TestDocumentAIClientManager:
+
+    def test_clients_are_shared(self):
+        """Test that repeated requests reuse one sync client and round-robin the async pool"""
+
+        manager = make_manager(async_pool_size=2)
+        assert manager.get_client() is manager.get_client()
+
+        async_clients = [manager.get_async_client() for _ in range(4)]
+        assert async_clients[0] is async_clients[2] and async_clients[1] is async_clients[3]
+        assert async_clients[0] is not async_clients[1]
+
+        metrics = manager.get_metrics()
+        assert metrics["clients_created"] == 3
+        assert (metrics["requests"], metrics["cold_requests"]) == (6, 2)
+        assert manager.processor_name == "projects/proj/locations/us/processors/proc123"
+
+    def test_startup_warms_channels_and_shutdown_closes_them(self):
+        """Test the lifecycle: channels connect at startup, requests are warm, close releases everything"""
+
+        manager = make_manager(async_pool_size=2)
+
+        async def lifecycle():
+            await manager.start()
+            clients = [manager.get_async_client() for _ in range(2)]
+            sync_client = manager.get_client()
+            await manager.close()
+            return clients, sync_client
+
+        clients, sync_client = asyncio.run(lifecycle())
+        assert all(client.transport.grpc_channel.ready for client in clients)
+        assert all(client.transport.closed for client in clients) and sync_client.transport.closed
+
+        metrics = manager.get_metrics()
+        assert metrics["cold_requests"] == 1  # only the lazily created sync client
+        assert (metrics["async_clients"], metrics["sync_client"]) == (0, False)
+
+    def test_unconfigured_manager_does_not_start(self):
+        """Test that startup is a no-op without a project and processor"""
+
+        manager = DocumentAIClientManager(None, "us", None, async_client_factory=lambda *args: FakeClient(FakeAsyncTransport()))
+        asyncio.run(manager.start())
+        assert manager.get_metrics()["clients_created"] == 0
@@ -0,0 +1,62 @@
+import pytest # type: ignore
+
+import backend.utils.document_pack as document_pack
+from backend.utils.document_pack import (
+    DocumentPack, DocumentPackError, pack_document, reference_text_spans, resolve_text_spans
+)
+
+class TestDocumentPack:
+
+    def test_sections_round_trip_and_read_lazily(self, tmp_path):
+        """Test that the header is read alone and sections are decoded one at a time"""
+
+        path = tmp_path / "doc.dpk"
+        path.write_bytes(pack_document({"confidence_score": 0.85}, {
+            "tables": [{"rows": [["CHASE", "$1,234"]]}],
+            "text": "page one\npage two\n"
+        }))
+
+        pack = DocumentPack.open(path)
+        assert pack.summary == {"confidence_score": 0.85}
+        assert "tables" in pack and "missing" not in pack
+        assert pack.read_section("text") == "page one\npage two\n"
+        assert pack.read_sections() == {"tables": [{"rows": [["CHASE", "$1,234"]]}], "text": "page one\npage two\n"}
+
+    def test_fallback_codecs_are_recorded(self, tmp_path, monkeypatch):
+        """Test that a pack written with JSON + zlib says so and reads back"""
+
+        monkeypatch.setattr(document_pack, "DEFAULT_SERIALIZER", "json")
+        monkeypatch.setattr(document_pack, "DEFAULT_COMPRESSION", "zlib")
+        path = tmp_path / "doc.dpk"
+        path.write_bytes(pack_document({}, {"text": "ünïcode"}))
+
+        pack = DocumentPack.open(path)
+        assert (pack.serializer, pack.compression) == ("json", "zlib")
+        assert pack.read_section("text") == "ünïcode"
+
+    def test_rejects_other_files(self, tmp_path):
+        """Test that a JSON file is not mistaken for a pack"""
+
+        path = tmp_path / "doc.json"
+        path.write_text('{"text": "hello"}')
+        with pytest.raises(DocumentPackError):
+            DocumentPack.open(path)
+
+class TestTextSpans:
+
+    def test_blocks_reference_canonical_text(self):
+        """Test that page blocks become spans and resolve back to the same content"""
+
+        text = "page one\nrepeated\nrepeated\n"
+        blocks = [
+            {"content": "page one", "page_number": 1},
+            {"content": "repeated", "page_number": 2},
+            {"content": "repeated", "page_number": 3},
+            {"content": "not in the text", "page_number": 4}
+        ]
+
+        referenced = reference_text_spans(text, blocks)
+        assert [block.get("text_span") for block in referenced] == [[0, 8], [9, 17], [18, 26], None]
+        assert referenced[3]["content"] == "not in the text"
+        assert "content" not in referenced[0]
+        assert resolve_text_spans(text, referenced) == blocks
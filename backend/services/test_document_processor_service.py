@@ -0,0 +1,106 @@
+import asyncio
+import pytest # type: ignore
+
+from backend.models.llm_models import ConsumerInfo, NormalizationResult, Tradeline
+from backend.models.tradeline_models import DocumentAIResult, DocumentType, ExtractedTable, ExtractedText
+from backend.services.document_processor_service import DocumentProcessorService
+from backend.services.job_service import JobService
+from backend.services.job_store import SQLiteJobStore
+from backend.services.storage_service import StorageService
+
+def make_tradeline(creditor_name, account_status, account_type="credit_card"):
+    return Tradeline(
+        creditor_name=creditor_name, account_number="1234", account_type=account_type, balance=1200.0,
+        credit_limit=5000.0, payment_status="Current", date_opened="2020-06-01", date_closed=None,
+        account_status=account_status, confidence_score=0.9, normalization_notes=None
+    )
+
+class FakeDocumentAI:
+
+    def __init__(self):
+        self.calls = 0
+
+    async def process_document(self, file_path, file_name):
+        self.calls += 1
+        return DocumentAIResult(
+            job_id="", document_type=DocumentType.PDF, total_pages=1,
+            tables=[ExtractedTable("t1", ["Creditor", "Balance"], [["CHASE", "$1,200"]], 0.9, 1)],
+            text_blocks=[ExtractedText("CHASE CARD $1,200", 1, 0.95)],
+            raw_text="CHASE CARD $1,200", metadata={"file_name": file_name}, processing_time=0.1,
+            confidence_score=0.9
+        )
+
+class FakeLLMParser:
+    """Returns the given tradelines; the first `failures` calls raise"""
+
+    def __init__(self, tradelines, failures=0):
+        self.tradelines = tradelines
+        self.failures = failures
+        self.calls = 0
+
+    async def normalize_tradeline_data(self, text, tables, context):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise RuntimeError("LLM unavailable")
+        return NormalizationResult(
+            job_id=context.job_id,
+            consumer_info=ConsumerInfo(name="JANE DOE", ssn=None, date_of_birth=None, confidence_score=0.8),
+            tradelines=self.tradelines, validation_results=None, confidence_score=0.9, processing_metadata={}
+        )
+
+class TestDocumentProcessorService:
+
+    @pytest.fixture
+    def storage(self, tmp_path):
+        storage = StorageService(str(tmp_path), job_store=SQLiteJobStore(str(tmp_path / "jobs.sqlite3")))
+        yield storage
+        storage.close()
+
+    def create_job(self, storage):
+        async def create():
+            job_id = await JobService(storage).create_processing_job(None, "report.pdf", 9)
+            await storage.store_uploaded_file(job_id, b"%PDF-1.4\n", {"file_name": "report.pdf"})
+            return job_id
+        return asyncio.run(create())
+
+    def make_service(self, storage, llm_parser):
+        return DocumentProcessorService(storage, JobService(storage), document_ai_service=FakeDocumentAI(),
+                                        llm_parser=llm_parser)
+
+    def test_valid_and_rejected_tradelines(self, storage):
+        """Test that LLM statuses like "Current", "Open" or none pass validation and incomplete tradelines are set aside"""
+
+        job_id = self.create_job(storage)
+        llm_parser = FakeLLMParser([
+            make_tradeline("CHASE", "Current"),
+            make_tradeline("AMEX", "Open"),
+            make_tradeline("CITI", None),
+            make_tradeline("UNKNOWN BANK", "Closed", account_type=None)
+        ])
+
+        assert asyncio.run(self.make_service(storage, llm_parser).document_ai_workflow(job_id))
+
+        job = asyncio.run(storage.get_job_data(job_id))
+        assert job['status'] == "completed"
+        assert [tradeline['creditor_name'] for tradeline in job['final_tradelines']] == ["CHASE", "AMEX", "CITI"]
+        rejected = job['llm_result']['rejected_tradelines']
+        assert [(entry['index'], entry['reason']) for entry in rejected] == [
+            (3, "Missing required field: account_type")
+        ]
+
+    def test_retry_resumes_at_normalize(self, storage):
+        """Test that a retry after an LLM failure reuses the extraction instead of calling Document AI again"""
+
+        job_id = self.create_job(storage)
+        llm_parser = FakeLLMParser([make_tradeline("CHASE", "Current")], failures=1)
+        service = self.make_service(storage, llm_parser)
+
+        assert not asyncio.run(service.document_ai_workflow(job_id, final_attempt=False))
+        job = asyncio.run(storage.get_job_data(job_id))
+        assert job['status'] == "pending" and "LLM unavailable" in job['error_message']
+
+        assert asyncio.run(service.document_ai_workflow(job_id))
+        assert (service.document_ai.calls, llm_parser.calls) == (1, 2)
+        job = asyncio.run(storage.get_job_data(job_id))
+        assert job['status'] == "completed"
+        assert [tradeline['creditor_name'] for tradeline in job['final_tradelines']] == ["CHASE"]
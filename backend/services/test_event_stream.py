@@ -0,0 +1,80 @@
+import asyncio
+import json
+
+from backend.utils.event_stream import (
+    NDJSON_MEDIA_TYPE, SSE_MEDIA_TYPE, choose_media_type, format_sse, stream_events
+)
+
+async def collect(stream):
+    return [frame async for frame in stream]
+
+class TestStreamEvents:
+
+    def test_events_then_summary(self):
+        """Test that emitted events arrive in order, followed by the summary"""
+
+        async def work(emit):
+            await emit("started", {"file": "a.pdf"})
+            for index in range(3):
+                await emit("tradeline", {"index": index})
+            return {"tradelines_found": 3}
+
+        frames = asyncio.run(collect(stream_events(work, NDJSON_MEDIA_TYPE)))
+        records = [json.loads(frame) for frame in frames]
+        assert [record["event"] for record in records] == ["started", "tradeline", "tradeline", "tradeline", "summary"]
+        assert records[-1]["data"] == {"tradelines_found": 3}
+
+    def test_sse_framing_and_heartbeats(self):
+        """Test SSE frames and that idle periods produce keep-alive comments"""
+
+        async def work(emit):
+            await asyncio.sleep(0.25)
+            await emit("tradeline", {"creditor_name": "CHASE"})
+            return {}
+
+        frames = asyncio.run(collect(stream_events(work, SSE_MEDIA_TYPE, heartbeat_seconds=0.05)))
+        assert frames[0] == ": keep-alive\n\n"
+        assert format_sse("tradeline", {"creditor_name": "CHASE"}) in frames
+        assert frames[-1].startswith("event: summary\n")
+
+    def test_failure_becomes_error_event(self):
+        """Test that an exception in the work is reported as the last event"""
+
+        async def work(emit):
+            await emit("started", {})
+            raise RuntimeError("boom")
+
+        frames = asyncio.run(collect(stream_events(
+            work, NDJSON_MEDIA_TYPE, on_error=lambda e: {"status_code": 500, "detail": str(e)}
+        )))
+        assert json.loads(frames[-1]) == {"event": "error", "data": {"status_code": 500, "detail": "boom"}}
+
+    def test_closing_stream_cancels_work(self):
+        """Test that a consumer going away cancels the background work"""
+
+        cancelled = asyncio.Event()
+
+        async def work(emit):
+            await emit("started", {})
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return {}
+
+        async def run():
+            stream = stream_events(work, NDJSON_MEDIA_TYPE)
+            assert json.loads(await stream.__anext__())["event"] == "started"
+            await stream.aclose()
+            return cancelled.is_set()
+
+        assert asyncio.run(run())
+
+    def test_choose_media_type(self):
+        """Test that an explicit format wins over the Accept header"""
+
+        assert choose_media_type(None, None) == SSE_MEDIA_TYPE
+        assert choose_media_type("ndjson", None) == NDJSON_MEDIA_TYPE
+        assert choose_media_type("sse", NDJSON_MEDIA_TYPE) == SSE_MEDIA_TYPE
+        assert choose_media_type(None, "application/x-ndjson, */*") == NDJSON_MEDIA_TYPE
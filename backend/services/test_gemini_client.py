@@ -0,0 +1,103 @@
+import asyncio
+import json
+import pytest # type: ignore
+
+from backend.services.gemini_client import AsyncGeminiClient, FakeGeminiBackend
+from backend.utils.request_cancellation import ClientDisconnectedError, cancel_on_disconnect
+
+class FakeRequest:
+    """Request whose client disconnects after a number of checks"""
+
+    def __init__(self, disconnect_after: int):
+        self.checks = 0
+        self.disconnect_after = disconnect_after
+
+    async def is_disconnected(self) -> bool:
+        self.checks += 1
+        return self.checks >= self.disconnect_after
+
+class TestAsyncGeminiClient:
+
+    def test_fake_backend_answers_tradeline_prompts(self):
+        """Test that the fake backend returns a fenced JSON array for the analyzed text"""
+
+        client = AsyncGeminiClient(FakeGeminiBackend(latency_seconds=0))
+        prompt = "Extract tradelines.\nText to analyze:\nCAPITAL ONE\nAccount Number: ****1234\nBalance: $500.00"
+        text = asyncio.run(client.generate(prompt))
+
+        assert text.startswith("```json")
+        tradelines = json.loads(text.strip("`").removeprefix("json"))
+        assert tradelines[0]["creditor_name"] == "CAPITAL ONE"
+        assert client.get_metrics()["completed"] == 1
+
+    def test_in_flight_requests_are_capped(self):
+        """Test that concurrent callers share the semaphore and never exceed max_in_flight"""
+
+        backend = FakeGeminiBackend(latency_seconds=0.02)
+        client = AsyncGeminiClient(backend, max_in_flight=3)
+
+        async def burst():
+            await asyncio.gather(*(client.generate("Text to analyze:\n") for _ in range(10)))
+
+        asyncio.run(burst())
+        assert backend.calls == 10
+        assert backend.max_in_flight == 3
+        assert client.get_metrics()["max_in_flight_seen"] == 3
+
+    def test_timeout_and_cancellation(self):
+        """Test that slow calls time out and cancelled callers cancel the backend request"""
+
+        backend = FakeGeminiBackend(latency_seconds=1.0)
+        client = AsyncGeminiClient(backend, timeout_seconds=0.05)
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(client.generate("Text to analyze:\n"))
+        assert client.get_metrics()["timeouts"] == 1
+
+        client = AsyncGeminiClient(backend, timeout_seconds=5)
+        request = FakeRequest(disconnect_after=2)
+        with pytest.raises(ClientDisconnectedError):
+            asyncio.run(cancel_on_disconnect(request, client.generate("Text to analyze:\n"), poll_interval=0.01))
+        assert backend.cancelled == 2  # the timed-out call and the disconnected one
+        assert client.get_metrics()["cancelled"] == 1
+        assert client.get_metrics()["in_flight"] == 0
+
+    def test_explicit_zero_timeout_is_not_the_default(self):
+        """Test that timeout_seconds=0 is honoured instead of falling back to the client default"""
+
+        client = AsyncGeminiClient(FakeGeminiBackend(latency_seconds=0.05), timeout_seconds=5)
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(client.generate("Text to analyze:\n", timeout_seconds=0))
+
+        async def consume():
+            return [chunk async for chunk in client.stream("Text to analyze:\n", timeout_seconds=0)]
+
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(consume())
+
+    def test_stream_yields_chunks_within_the_cap(self):
+        """Test that streaming returns the whole response in pieces and releases its slot"""
+
+        backend = FakeGeminiBackend(latency_seconds=0.05, first_chunk_seconds=0.01, stream_chunk_chars=10,
+                                    respond=lambda prompt: '[{"creditor_name": "CHASE"}, {"creditor_name": "AMEX"}]')
+        client = AsyncGeminiClient(backend, max_in_flight=2)
+
+        async def consume():
+            return await asyncio.gather(*(
+                collect(client.stream("x")) for _ in range(4)
+            ))
+
+        async def collect(stream):
+            return [chunk async for chunk in stream]
+
+        results = asyncio.run(consume())
+        assert all("".join(chunks).startswith('[{"creditor_name"') and len(chunks) > 1 for chunks in results)
+        assert backend.max_in_flight == 2
+        metrics = client.get_metrics()
+        assert (metrics["completed"], metrics["in_flight"]) == (4, 0)
+
+    def test_connected_client_gets_result(self):
+        """Test that work finishes normally while the client stays connected"""
+
+        client = AsyncGeminiClient(FakeGeminiBackend(latency_seconds=0.03, respond=lambda prompt: "[]"))
+        result = asyncio.run(cancel_on_disconnect(FakeRequest(disconnect_after=1000), client.generate("x"), poll_interval=0.01))
+        assert result == "[]"
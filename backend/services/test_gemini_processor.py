@@ -0,0 +1,282 @@
+import asyncio
+import json
+import pytest # type: ignore
+from fastapi import HTTPException # type: ignore
+
+from backend import main
+from backend.main import GeminiProcessor, PartialResultsError
+from backend.services.report_cache import ReportCache
+from backend.services.worker_pools import WorkerPoolSaturatedError
+from backend.utils.pdf_text import PdfPage
+
+def report_text(creditors) -> str:
+    """Report text long enough to be chunked, one tradeline block per creditor"""
+    blocks = []
+    for index, creditor in enumerate(creditors):
+        filler = "\n".join(f"Payment history line {line}: OK OK OK OK OK OK" for line in range(40))
+        blocks.append(f"{creditor}\nAccount Number: ****{index:04d}\nBalance: $100.00\n{filler}\n")
+    return "\n".join(blocks)
+
+class FakeGeminiClient:
+    """Answers with one tradeline per creditor line in the prompt; fails prompts naming a failing creditor"""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+
+    def _tradelines(self, prompt: str):
+        text = prompt.split("Text to analyze:", 1)[1]
+        for creditor in self.failing:
+            if creditor in text:
+                raise RuntimeError(f"{creditor} chunk failed")
+        return [{'creditor_name': line.strip(), 'account_number': ""}
+                for line in text.split("\n") if line.strip().startswith("BANK")]
+
+    async def generate(self, prompt: str, timeout_seconds=None) -> str:
+        return json.dumps(self._tradelines(prompt))
+
+    async def stream(self, prompt: str, timeout_seconds=None):
+        yield json.dumps(self._tradelines(prompt))
+
+class BreakingStreamClient(FakeGeminiClient):
+    """Streams every tradeline of a prompt naming a breaking creditor, then fails before the array closes"""
+
+    def __init__(self, breaking):
+        super().__init__()
+        self.breaking = breaking
+
+    async def stream(self, prompt: str, timeout_seconds=None):
+        text = json.dumps(self._tradelines(prompt))
+        if self.breaking not in prompt:
+            yield text
+            return
+        yield text[:-1] + ","
+        raise RuntimeError("stream reset")
+
+class TestGeminiProcessor:
+
+    @pytest.fixture(autouse=True)
+    def buffered(self, monkeypatch):
+        monkeypatch.setattr(main, "GEMINI_STREAMING", False)
+
+    def test_strict_mode_raises_on_failed_chunk(self):
+        """Test that with partial results disabled a failed chunk reaches the caller instead of an empty list"""
+
+        text = report_text([f"BANK {i}" for i in range(40)] + ["BANK FAIL"])
+        processor = GeminiProcessor(client=FakeGeminiClient(failing={"BANK FAIL"}), allow_partial=False)
+
+        with pytest.raises(PartialResultsError) as excinfo:
+            asyncio.run(processor.extract_tradelines(text))
+        assert excinfo.value.failed_chunks == 1 and excinfo.value.total_chunks > 1
+
+    def test_partial_mode_keeps_other_chunks(self):
+        """Test that with partial results allowed the successful chunks are returned"""
+
+        text = report_text([f"BANK {i}" for i in range(40)] + ["BANK FAIL"])
+        processor = GeminiProcessor(client=FakeGeminiClient(failing={"BANK FAIL"}), allow_partial=True)
+
+        tradelines = asyncio.run(processor.extract_tradelines(text))
+        assert processor.last_chunk_stats["partial"]
+        assert 0 < len(tradelines) < 41
+
+    def test_streamed_rows_of_failed_chunk_are_kept(self, monkeypatch):
+        """Test that tradelines a chunk streamed before failing are returned as well as handed off"""
+
+        monkeypatch.setattr(main, "GEMINI_STREAMING", True)
+        text = report_text([f"BANK {i}" for i in range(40)] + ["BANK BREAK"])
+        processor = GeminiProcessor(client=BreakingStreamClient("BANK BREAK"), allow_partial=True)
+        handed_off = []
+
+        async def on_tradeline(tradeline):
+            handed_off.append(tradeline)
+
+        tradelines = asyncio.run(processor.extract_tradelines(text, on_tradeline))
+        assert processor.last_chunk_stats["failed_chunks"]
+        assert {"creditor_name": "BANK BREAK", "account_number": ""} in tradelines
+        assert sorted(map(json.dumps, tradelines)) == sorted(map(json.dumps, handed_off))
+
+    def test_tradelines_without_identity_are_not_merged(self):
+        """Test that tradelines with neither creditor name nor account number are all kept"""
+
+        class BlankClient(FakeGeminiClient):
+            async def generate(self, prompt, timeout_seconds=None):
+                return json.dumps([{"creditor_name": "", "account_number": "", "account_balance": f"${n}"}
+                                   for n in range(2)])
+
+        text = report_text([f"BANK {i}" for i in range(40)])
+        processor = GeminiProcessor(client=BlankClient())
+        tradelines = asyncio.run(processor.extract_tradelines(text))
+
+        assert len(tradelines) == 2 * processor.last_chunk_stats["chunks"]
+
+class FakePageExtractor:
+
+    def __init__(self, texts):
+        self.texts = texts
+
+    async def extract_pages(self, content):
+        return [PdfPage(page_number=index + 1, text=text) for index, text in enumerate(self.texts)]
+
+class FakeDocumentAI:
+
+    def __init__(self, ocr_texts):
+        self.ocr_texts = ocr_texts
+
+    async def extract_page_texts(self, content):
+        return self.ocr_texts
+
+class TestTextTriage:
+
+    def test_short_ocr_result_keeps_embedded_text(self, monkeypatch):
+        """Test that pages Document AI returns no text for keep their embedded text and are reported"""
+
+        monkeypatch.setattr(main, "pdf_extractor", FakePageExtractor(["", "Page 3 of 12"]))
+        monkeypatch.setattr(main, "document_ai", FakeDocumentAI(["OCR page one"]))
+        monkeypatch.setattr(main, "document_ai_configured", lambda: True)
+
+        pages, text_source, triage = asyncio.run(main.extract_text_with_triage(b"%PDF"))
+
+        assert [page.text for page in pages] == ["OCR page one", "Page 3 of 12"]
+        assert text_source == "native_text + document_ai"
+        assert triage["ocr_missing_pages"] == [2]
+
+class DisconnectedRequest:
+
+    async def is_disconnected(self) -> bool:
+        return True
+
+class FakeUploadFile:
+
+    async def read(self) -> bytes:
+        return b"%PDF"
+
+class FakeTextExtractor:
+
+    async def extract_pages(self, content):
+        return [PdfPage(page_number=1, text=report_text(["BANK 1"]))]
+
+class SlowGeminiProcessor:
+
+    async def extract_tradelines_from_pages(self, pages):
+        await asyncio.sleep(30)
+
+class TestDebugParsing:
+
+    def test_disconnect_is_not_reported_as_gemini_error(self, monkeypatch):
+        """Test that a client disconnect during Gemini extraction ends the request with 499"""
+
+        monkeypatch.setattr(main, "pdf_extractor", FakeTextExtractor())
+        monkeypatch.setattr(main, "GeminiProcessor", SlowGeminiProcessor)
+
+        with pytest.raises(HTTPException) as excinfo:
+            asyncio.run(main.debug_parsing(DisconnectedRequest(), FakeUploadFile(), method="gemini"))
+        assert excinfo.value.status_code == 499
+
+class FakeSpooledUpload:
+    sha256 = "0" * 64
+    size = 4
+    path = "report.pdf"
+
+class BlockingWriter:
+    """Saves never finish on their own; records whether they were cancelled"""
+    batch_size = 1
+
+    def __init__(self):
+        self.cancelled = 0
+
+    async def save(self, rows, user_id):
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+
+class TestProcessReportContent:
+
+    def test_failed_extraction_cancels_started_saves(self, monkeypatch):
+        """Test that batch saves started while streaming are cancelled, not left running, when extraction fails"""
+
+        writer = BlockingWriter()
+
+        async def failing_extraction(content, on_tradeline, on_progress):
+            await on_tradeline({"creditor_name": "BANK 1", "account_number": "1"})
+            await asyncio.sleep(0)
+            raise RuntimeError("OCR failed")
+
+        async def run():
+            with pytest.raises(RuntimeError):
+                await main.process_report_content(FakeSpooledUpload(), "report.pdf", "user-1")
+            assert not [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+        monkeypatch.setattr(main, "tradeline_writer", writer)
+        monkeypatch.setattr(main, "report_cache", None)
+        monkeypatch.setattr(main, "GEMINI_STREAMING", True)
+        monkeypatch.setattr(main, "extract_tradelines_from_pdf", failing_extraction)
+        asyncio.run(run())
+
+        assert writer.cancelled == 1
+
+    @pytest.mark.parametrize("processing_method, cached", [
+        ("pypdf2 + gemini", True),
+        ("pypdf2 + gemini (partial)", False),
+        ("pypdf2 + basic", False),
+    ])
+    def test_only_complete_results_are_cached(self, monkeypatch, tmp_path, processing_method, cached):
+        """Test that partial and basic-parser results are not served again from the report cache"""
+
+        async def extraction(content, on_tradeline, on_progress):
+            return [{"creditor_name": "BANK 1", "account_number": "1"}], processing_method, [PdfPage(1, "text")], None
+
+        cache = ReportCache(cache_dir=str(tmp_path))
+        monkeypatch.setattr(main, "tradeline_writer", None)
+        monkeypatch.setattr(main, "report_cache", cache)
+        monkeypatch.setattr(main, "extract_tradelines_from_pdf", extraction)
+        asyncio.run(main.process_report_content(FakeSpooledUpload(), "report.pdf", "user-1"))
+
+        assert (cache.get(FakeSpooledUpload.sha256) is not None) == cached
+
+class TestExtractTradelinesFromPdf:
+
+    def test_failed_chunks_mark_the_method_partial(self, monkeypatch):
+        """Test that results missing a failed chunk are labelled partial, not as a full Gemini extraction"""
+
+        async def extract_text(content):
+            return [PdfPage(1, report_text([f"BANK {i}" for i in range(20)])),
+                    PdfPage(2, report_text([f"BANK {i}" for i in range(20, 40)]))], "pypdf2"
+
+        monkeypatch.setattr(main, "GEMINI_STREAMING", False)
+        monkeypatch.setattr(main, "triage_config", type("TriageConfig", (), {"enabled": False})())
+        monkeypatch.setattr(main, "extract_text_whole_document", extract_text)
+        monkeypatch.setattr(main, "gemini_client", FakeGeminiClient(failing=["BANK 20"]))
+        monkeypatch.setattr(main, "GeminiProcessor", lambda: GeminiProcessor(allow_partial=True))
+        tradelines, processing_method, _, _ = asyncio.run(main.extract_tradelines_from_pdf("report.pdf"))
+
+        assert tradelines
+        assert processing_method == "pypdf2 + gemini (partial)"
+
+    def test_pages_are_chunked_like_the_joined_text(self):
+        """Test that extracting from pages finds the same tradelines as extracting from their joined text"""
+
+        pages = [PdfPage(page_number, report_text([f"BANK {i}" for i in range(start, start + 10)]))
+                 for page_number, start in enumerate(range(0, 40, 10), 1)]
+        processor = GeminiProcessor(client=FakeGeminiClient())
+
+        from_pages = asyncio.run(processor.extract_tradelines_from_pages(pages))
+        from_text = asyncio.run(processor.extract_tradelines("\n".join(page.text for page in pages)))
+
+        assert len(from_pages) == 40
+        assert from_pages == from_text
+
+class TestProcessCreditReportStream:
+
+    def test_saturated_upload_spool_is_a_503(self, monkeypatch):
+        """Test that a full I/O pool while spooling the upload answers 503, as the JSON endpoint does"""
+
+        async def saturated_upload(file):
+            raise WorkerPoolSaturatedError("io", 7)
+
+        monkeypatch.setattr(main, "receive_pdf_upload", saturated_upload)
+
+        with pytest.raises(HTTPException) as excinfo:
+            asyncio.run(main.process_credit_report_stream(DisconnectedRequest(), FakeUploadFile(), "user-1", None))
+        assert excinfo.value.status_code == 503
+        assert excinfo.value.headers["Retry-After"] == "7"
@@ -0,0 +1,278 @@
+import asyncio
+import threading
+import pytest # type: ignore
+
+from backend.config.worker_config import JobWorkerConfig
+from backend.services.job_queue import JobQueue, LeaseLostError, SQLiteJobQueue, create_job_queue
+from backend.services.job_worker import JobFailedError, JobWorker
+
+class FakeClock:
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+class TestJobQueueInterface:
+
+    def test_incomplete_queue_cannot_be_created(self):
+        """Test that a queue missing part of the interface fails when created, not when first reserved from"""
+
+        class EnqueueOnlyQueue(JobQueue):
+
+            def enqueue(self, job_id, payload=None, delay_seconds=0.0, max_attempts=None):
+                return "task-1"
+
+        with pytest.raises(TypeError):
+            EnqueueOnlyQueue()
+
+class TestSQLiteJobQueue:
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    @pytest.fixture
+    def queue(self, tmp_path, clock):
+        queue = SQLiteJobQueue(str(tmp_path / "queue.sqlite3"), max_attempts=2, clock=clock)
+        yield queue
+        queue.close()
+
+    def test_reserve_ack(self, queue):
+        """Test that tasks come out oldest first, each to one reserver, and ack finishes them"""
+
+        first = queue.enqueue("job-1", {'source': 'upload'})
+        queue.enqueue("job-2")
+        task = queue.reserve(60)
+
+        assert (task.task_id, task.job_id, task.payload, task.attempts) == (first, "job-1", {'source': 'upload'}, 1)
+        assert queue.reserve(60).job_id == "job-2"
+        assert queue.reserve(60) is None
+
+        queue.ack(task)
+        assert queue.counts() == {'queued': 0, 'running': 1, 'done': 1, 'dead': 0}
+
+    def test_delayed_enqueue(self, queue, clock):
+        """Test that a delayed task is not handed out before its time"""
+
+        queue.enqueue("job-1", delay_seconds=30)
+        assert queue.reserve(60) is None
+        clock.now += 30
+        assert queue.reserve(60).job_id == "job-1"
+
+    def test_expired_lease_is_redelivered(self, queue, clock):
+        """Test that a task whose worker stopped extending goes to the next reserver, and the old lease is dead"""
+
+        queue.enqueue("job-1")
+        stale = queue.reserve(60)
+        clock.now += 30
+        queue.extend(stale, 60)
+        clock.now += 59
+        assert queue.reserve(60) is None
+
+        clock.now += 1
+        fresh = queue.reserve(60)
+        assert (fresh.task_id, fresh.attempts) == (stale.task_id, 2)
+        with pytest.raises(LeaseLostError):
+            queue.ack(stale)
+        queue.ack(fresh)
+        assert queue.get_task(fresh.task_id)['status'] == "done"
+
+    def test_expired_lease_on_last_attempt_is_dead(self, queue, clock):
+        """Test that a task is dead-lettered when its last attempt times out"""
+
+        task_id = queue.enqueue("job-1")
+        queue.reserve(60)
+        clock.now += 60
+        queue.reserve(60)
+        clock.now += 60
+
+        assert queue.take_dead_lettered() == []
+        assert queue.reserve(60) is None
+        row = queue.get_task(task_id)
+        assert (row['status'], row['attempts'], row['last_error']) == ("dead", 2, "visibility timeout expired")
+        assert queue.take_dead_lettered() == ["job-1"]
+        assert queue.take_dead_lettered() == []
+
+    def test_retry_until_dead(self, queue, clock):
+        """Test that retry delays the task and dead-letters it once attempts run out"""
+
+        task_id = queue.enqueue("job-1")
+        assert queue.retry(queue.reserve(60), 10, "boom")
+        assert queue.reserve(60) is None
+
+        clock.now += 10
+        assert not queue.retry(queue.reserve(60), 10, "boom again")
+        row = queue.get_task(task_id)
+        assert (row['status'], row['last_error']) == ("dead", "boom again")
+
+    def test_release_keeps_attempt(self, queue):
+        """Test that a released task is ready at once and the attempt is not counted"""
+
+        queue.enqueue("job-1")
+        queue.release(queue.reserve(60))
+        assert queue.reserve(60).attempts == 1
+
+    def test_concurrent_reservers(self, queue):
+        """Test that threads reserving at once never get the same task"""
+
+        for i in range(50):
+            queue.enqueue(f"job-{i}")
+        reserved = []
+        lock = threading.Lock()
+
+        def drain():
+            while (task := queue.reserve(60)) is not None:
+                with lock:
+                    reserved.append(task.job_id)
+
+        threads = [threading.Thread(target=drain) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(reserved) == sorted(f"job-{i}" for i in range(50))
+
+    def test_shared_between_instances(self, tmp_path):
+        """Test that a second instance on the same file (another process) sees the queue"""
+
+        producer = create_job_queue("sqlite", str(tmp_path))
+        consumer = create_job_queue("sqlite", str(tmp_path))
+        producer.enqueue("job-1")
+
+        assert consumer.reserve(60).job_id == "job-1"
+        producer.close()
+        consumer.close()
+
+class TestJobWorker:
+
+    def make_config(self, **overrides):
+        values = dict(concurrency=2, visibility_timeout_seconds=5, poll_interval_seconds=0.01,
+                      retry_backoff_seconds=0, max_backoff_seconds=0, drain_timeout_seconds=1)
+        values.update(overrides)
+        return JobWorkerConfig(**values)
+
+    async def run_until(self, worker: JobWorker, condition, timeout: float = 5):
+        runner = asyncio.create_task(worker.run())
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while not condition() and loop.time() < deadline:
+            await asyncio.sleep(0.01)
+        worker.stop()
+        await runner
+
+    def test_processes_jobs_concurrently(self, tmp_path):
+        """Test end to end that every job runs once, at most concurrency at a time"""
+
+        queue = SQLiteJobQueue(str(tmp_path / "queue.sqlite3"))
+        for i in range(6):
+            queue.enqueue(f"job-{i}")
+        processed = []
+        running = [0, 0]
+
+        async def handler(task):
+            running[0] += 1
+            running[1] = max(running[1], running[0])
+            await asyncio.sleep(0.02)
+            running[0] -= 1
+            processed.append(task.job_id)
+
+        worker = JobWorker(queue, handler, self.make_config())
+        asyncio.run(self.run_until(worker, lambda: len(processed) == 6))
+
+        assert sorted(processed) == [f"job-{i}" for i in range(6)]
+        assert running[1] == 2
+        assert queue.counts()['done'] == 6
+        queue.close()
+
+    def test_failed_job_is_retried_then_dead(self, tmp_path):
+        """Test that a failing handler is retried with backoff until max_attempts, then dead-lettered"""
+
+        queue = SQLiteJobQueue(str(tmp_path / "queue.sqlite3"), max_attempts=3)
+        task_id = queue.enqueue("job-1")
+        queue.enqueue("job-2")
+        attempts = []
+
+        async def handler(task):
+            attempts.append(task.job_id)
+            if task.job_id == "job-1":
+                raise JobFailedError("Document AI workflow failed")
+
+        worker = JobWorker(queue, handler, self.make_config())
+        assert worker.backoff_seconds(3) == 0
+        asyncio.run(self.run_until(worker, lambda: worker.stats['dead'] == 1))
+
+        assert attempts.count("job-1") == 3 and attempts.count("job-2") == 1
+        assert (worker.stats['retried'], worker.stats['completed']) == (2, 1)
+        assert queue.get_task(task_id)['last_error'] == "JobFailedError: Document AI workflow failed"
+
+    def test_expired_last_lease_fails_job(self, tmp_path):
+        """Test that a job whose final attempt timed out is handed to on_dead_letter, not to the handler"""
+
+        clock = FakeClock()
+        queue = SQLiteJobQueue(str(tmp_path / "queue.sqlite3"), max_attempts=1, clock=clock)
+        queue.enqueue("job-1")
+        queue.reserve(60)
+        clock.now += 60
+        handled = []
+        failed = []
+
+        async def handler(task):
+            handled.append(task.job_id)
+
+        async def on_dead_letter(job_id, error):
+            failed.append((job_id, error))
+
+        worker = JobWorker(queue, handler, self.make_config(), on_dead_letter=on_dead_letter)
+        asyncio.run(self.run_until(worker, lambda: failed))
+
+        assert failed == [("job-1", "visibility timeout expired")]
+        assert not handled and worker.stats['dead'] == 1
+        assert queue.counts()['dead'] == 1
+        queue.close()
+
+    def test_backoff(self):
+        """Test that the retry delay doubles per attempt up to the cap"""
+
+        worker = JobWorker(SQLiteJobQueue(":memory:"), None,
+                           self.make_config(retry_backoff_seconds=30, max_backoff_seconds=100))
+        assert [worker.backoff_seconds(n) for n in (1, 2, 3, 4)] == [30, 60, 100, 100]
+
+    def test_heartbeat_keeps_long_job(self, tmp_path):
+        """Test that a job running past the visibility timeout keeps its lease"""
+
+        queue = SQLiteJobQueue(str(tmp_path / "queue.sqlite3"))
+        queue.enqueue("job-1")
+        done = []
+
+        async def handler(task):
+            await asyncio.sleep(1.5)
+            done.append(task.job_id)
+
+        worker = JobWorker(queue, handler, self.make_config(visibility_timeout_seconds=0.6))
+        asyncio.run(self.run_until(worker, lambda: done))
+
+        assert (worker.stats['reserved'], worker.stats['completed'], worker.stats['lease_lost']) == (1, 1, 0)
+        assert queue.counts()['done'] == 1
+
+    def test_drain_waits_then_releases(self, tmp_path):
+        """Test that stopping lets short jobs finish and hands back jobs that outlive the drain timeout"""
+
+        queue = SQLiteJobQueue(str(tmp_path / "queue.sqlite3"))
+        quick = queue.enqueue("quick")
+        slow = queue.enqueue("slow")
+        started = []
+
+        async def handler(task):
+            started.append(task.job_id)
+            await asyncio.sleep(0.1 if task.job_id == "quick" else 30)
+
+        worker = JobWorker(queue, handler, self.make_config(drain_timeout_seconds=0.3))
+        asyncio.run(self.run_until(worker, lambda: len(started) == 2))
+
+        assert queue.get_task(quick)['status'] == "done"
+        row = queue.get_task(slow)
+        assert (row['status'], row['attempts']) == ("queued", 0)
+        assert worker.stats['released'] == 1 and worker.in_flight == 0
@@ -0,0 +1,164 @@
+import asyncio
+import threading
+import pytest # type: ignore
+
+from backend.models.tradeline_models import ProcessingJob, ProcessingStatus
+from backend.services.job_service import JobService
+from backend.services.job_store import JobStore, JsonFileJobStore, SQLiteJobStore
+from backend.services.job_store_migration import migrate_json_jobs
+from backend.services.storage_service import StorageService
+
+def make_job(index: int, user_id: str = "user-1", status: str = "pending"):
+    return {
+        'job_id': f"job-{index}",
+        'user_id': user_id,
+        'status': status,
+        'filename': f"report-{index}.pdf",
+        'file_size': 1000 + index,
+        'created_at': f"2025-01-01T00:00:{index:02d}",
+        'completed_at': None,
+        'error_message': None,
+        'document_ai_result': {'pages': index},
+        'llm_result': None,
+        'final_tradelines': [{'creditor_name': 'CHASE'}]
+    }
+
+class TestJobStores:
+
+    @pytest.fixture(params=["sqlite", "json"])
+    def store(self, request, tmp_path):
+        if request.param == "sqlite":
+            store = SQLiteJobStore(str(tmp_path / "jobs.sqlite3"))
+        else:
+            store = JsonFileJobStore(str(tmp_path / "jobs"))
+        yield store
+        store.close()
+
+    def test_round_trip(self, store):
+        """Test that a stored job comes back with every field, payload included"""
+
+        store.put(make_job(1))
+        assert store.get("job-1") == make_job(1)
+        assert store.get("missing") is None
+
+    def test_update_status(self, store):
+        """Test that a status update keeps the payload and reports missing jobs"""
+
+        store.put(make_job(1))
+        assert store.update_status("job-1", "failed", error_message="boom")
+        assert store.update_status("job-1", "completed", completed_at="2025-01-02T00:00:00")
+        job = store.get("job-1")
+
+        assert (job['status'], job['error_message'], job['completed_at']) == ("completed", "boom", "2025-01-02T00:00:00")
+        assert job['final_tradelines'] == [{'creditor_name': 'CHASE'}]
+        assert not store.update_status("missing", "failed")
+
+    def test_list_and_delete(self, store):
+        """Test filtering by user and status, newest first, and age-based deletion"""
+
+        store.put_many(make_job(i, user_id=f"user-{i % 2}", status="completed" if i < 4 else "pending") for i in range(10))
+
+        assert [job['job_id'] for job in store.list_jobs(user_id="user-0", limit=3)] == ["job-8", "job-6", "job-4"]
+        assert [job['job_id'] for job in store.list_jobs(user_id="user-0", status="completed")] == ["job-2", "job-0"]
+        assert [job['job_id'] for job in store.list_jobs(created_before="2025-01-01T00:00:02")] == ["job-1", "job-0"]
+        assert 'final_tradelines' not in store.list_jobs(limit=1)[0]
+
+        assert store.delete_created_before("2025-01-01T00:00:05") == 5
+        assert store.count() == 5
+
+    def test_paging_through_equal_timestamps(self, store):
+        """Test that paging on (created_at, job_id) returns every job once when timestamps tie"""
+
+        jobs = [make_job(i) for i in range(7)]
+        for job in jobs:
+            job['created_at'] = "2025-01-01T00:00:00" if job['job_id'] != "job-6" else "2025-01-01T00:00:01"
+        store.put_many(jobs)
+
+        pages = []
+        cursor = {}
+        while page := store.list_jobs(limit=3, **cursor):
+            pages.append([job['job_id'] for job in page])
+            cursor = {'created_before': page[-1]['created_at'], 'before_job_id': page[-1]['job_id']}
+
+        assert pages == [["job-6", "job-5", "job-4"], ["job-3", "job-2", "job-1"], ["job-0"]]
+
+    def test_incomplete_store_cannot_be_created(self):
+        """Test that a store missing part of the interface fails when created, not when first called"""
+
+        class PutOnlyStore(JobStore):
+
+            def put(self, job):
+                pass
+
+        with pytest.raises(TypeError):
+            PutOnlyStore()
+
+class TestSQLiteJobStore:
+
+    def test_wal_and_indexes(self, tmp_path):
+        """Test that the database runs in WAL mode with the listing indexes"""
+
+        store = SQLiteJobStore(str(tmp_path / "jobs.sqlite3"))
+        conn = store._connection()
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(jobs)")}
+        assert {"idx_jobs_user_created", "idx_jobs_status_created", "idx_jobs_created"} <= indexes
+
+        plan = " ".join(row[-1] for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT job_id FROM jobs WHERE user_id = ? ORDER BY created_at DESC LIMIT 5", ("u",)
+        ))
+        assert "idx_jobs_user_created" in plan
+        store.close()
+
+    def test_concurrent_status_updates(self, tmp_path):
+        """Test that updates from many threads are all applied"""
+
+        store = SQLiteJobStore(str(tmp_path / "jobs.sqlite3"))
+        store.put_many(make_job(i) for i in range(40))
+
+        def worker(offset):
+            for i in range(offset, 40, 4):
+                assert store.update_status(f"job-{i}", "completed")
+
+        threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(store.list_jobs(status="completed")) == 40
+        store.close()
+
+    def test_migrate_json_jobs(self, tmp_path):
+        """Test that JSON job files are imported and unreadable files are skipped"""
+
+        source = JsonFileJobStore(str(tmp_path / "jobs"))
+        source.put_many(make_job(i) for i in range(5))
+        (tmp_path / "jobs" / "broken.json").write_text("{not json")
+        target = SQLiteJobStore(str(tmp_path / "jobs.sqlite3"))
+
+        result = migrate_json_jobs(source, target, batch_size=2)
+
+        assert (result['imported'], result['skipped'], result['total']) == (5, 1, 5)
+        assert target.get("job-3") == make_job(3)
+        # Re-running replaces rows instead of duplicating them
+        assert migrate_json_jobs(source, target)['total'] == 5
+        target.close()
+
+class TestStorageServiceJobs:
+
+    def test_job_lifecycle(self, tmp_path):
+        """Test creating, updating and listing jobs through the services"""
+
+        storage = StorageService(str(tmp_path), job_store=SQLiteJobStore(str(tmp_path / "jobs.sqlite3")))
+        jobs = JobService(storage)
+
+        async def run():
+            job_id = await jobs.create_processing_job(None, "report.pdf", 1234)
+            await jobs.update_job_status(job_id, ProcessingStatus.COMPLETED)
+            return await jobs.get_job_status(job_id), await storage.list_jobs(status=ProcessingStatus.COMPLETED)
+
+        job, listed = asyncio.run(run())
+        assert isinstance(job, ProcessingJob)
+        assert job.status == ProcessingStatus.COMPLETED.value and job.completed_at
+        assert [entry['job_id'] for entry in listed] == [job.job_id]
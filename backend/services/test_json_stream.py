@@ -0,0 +1,59 @@
+import json
+
+from backend.utils.json_stream import IncrementalJSONArrayParser, extract_json_value, iter_json_array_items
+from backend.utils.llm_helpers import ResponseValidator
+
+TRADELINES = [
+    {"creditor_name": "CHASE", "account_number": "****1234", "remarks": "Paid [in full] {closed}"},
+    {"creditor_name": "AMEX \"Gold\"", "account_number": "****9", "history": [["OK", "30"], []]},
+    {"creditor_name": "C:\\PATH", "account_balance": "$1,000"},
+]
+
+def split_every(text: str, size: int):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+class TestIncrementalJSONArrayParser:
+
+    def test_elements_emitted_as_they_close(self):
+        """Test that each object is returned by the chunk that closes it, for any chunk size"""
+
+        text = "Here are the tradelines:\n```json\n" + json.dumps(TRADELINES) + "\n```\nDone."
+        for size in (1, 2, 7, 64, len(text)):
+            assert list(iter_json_array_items(split_every(text, size))) == TRADELINES, size
+
+        parser = IncrementalJSONArrayParser()
+        first_end = text.index("}\"}") + 3
+        assert parser.feed(text[:first_end - 1]) == []
+        assert parser.feed(text[first_end - 1:first_end]) == [TRADELINES[0]]
+
+    def test_wrapped_array_and_end_of_array(self):
+        """Test that the first array inside an object is used and later text is ignored"""
+
+        text = json.dumps({"note": "[not this]", "tradelines": [{"index": 0}, 5, {"index": 1}]}) + ' [{"index": 9}]'
+        parser = IncrementalJSONArrayParser()
+        assert [item for chunk in split_every(text, 3) for item in parser.feed(chunk)] == [{"index": 0}, {"index": 1}]
+        assert parser.finished
+
+    def test_buffer_is_released(self):
+        """Test that emitted elements do not stay buffered"""
+
+        parser = IncrementalJSONArrayParser()
+        parser.feed("[" + ", ".join(json.dumps(t) for t in TRADELINES * 50))
+        assert parser.items_emitted == 150
+        assert len(parser._buffer) < 5
+
+class TestExtractJsonValue:
+
+    def test_extract_first_value(self):
+        """Test that fences, prose and brackets inside strings do not confuse extraction"""
+
+        text = 'Sure! ```json\n[{"name": "A ] B"}]\n``` Let me know [if] you need more.'
+        assert json.loads(extract_json_value(text)) == [{"name": "A ] B"}]
+        assert extract_json_value("no json here") is None
+        assert extract_json_value('{"a": ') is None
+
+    def test_response_validator_clean(self):
+        """Test that the validator keeps a closing brace inside a string"""
+
+        cleaned = ResponseValidator.clean_json_response('```json\n{"remarks": "closed }", "ok": true}\n```\nThanks')
+        assert json.loads(cleaned) == {"remarks": "closed }", "ok": True}
@@ -0,0 +1,105 @@
+import asyncio
+import threading
+import pytest # type: ignore
+
+from backend.services.llm_response_cache import (
+    CacheBackend,
+    LLMResponseCache,
+    MemoryLRUBackend,
+    SQLiteBackend
+)
+
+def make_key(prompt: str = "normalize this", temperature: float = 0.1) -> str:
+    return LLMResponseCache.compute_key("system", prompt, "gpt-4", temperature, 0.9, 4000)
+
+class TestLLMResponseCache:
+
+    @pytest.fixture(params=["memory", "sqlite"])
+    def backend(self, request, tmp_path):
+        if request.param == "memory":
+            return MemoryLRUBackend(max_entries=2)
+        return SQLiteBackend(db_path=str(tmp_path / "llm_cache.db"), max_entries=2)
+
+    def test_hit_after_set(self, backend):
+        """Test that an identical request is served from the cache"""
+
+        cache = LLMResponseCache(backend, ttl_seconds=60)
+        assert cache.get(make_key()) is None
+
+        cache.set(make_key(), '{"ok": true}')
+
+        assert cache.get(make_key()) == '{"ok": true}'
+        assert cache.get_stats()["hits"] == 1
+        assert cache.get_stats()["misses"] == 1
+
+    def test_key_covers_model_parameters(self):
+        """Test that changing any request parameter changes the key"""
+
+        assert make_key() == make_key()
+        assert make_key() != make_key(prompt="other prompt")
+        assert make_key() != make_key(temperature=0.2)
+
+    def test_ttl_expiry(self, backend):
+        """Test that expired responses are misses and are removed"""
+
+        cache = LLMResponseCache(backend, ttl_seconds=0)
+        cache.set(make_key(), "stale")
+
+        assert cache.get(make_key()) is None
+        assert cache.get_stats()["hits"] == 0
+        assert backend.size() == 0
+
+    def test_lru_eviction(self, backend):
+        """Test that the least recently used response is evicted first"""
+
+        cache = LLMResponseCache(backend, ttl_seconds=60)
+        cache.set("a", "A")
+        cache.set("b", "B")
+        assert cache.get("a") == "A"
+        cache.set("c", "C")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "A"
+        assert cache.get("c") == "C"
+
+    def test_sqlite_survives_restart(self, tmp_path):
+        """Test that SQLite entries are visible to a new cache instance"""
+
+        db_path = str(tmp_path / "llm_cache.db")
+        LLMResponseCache(SQLiteBackend(db_path=db_path)).set(make_key(), "persisted")
+
+        assert LLMResponseCache(SQLiteBackend(db_path=db_path)).get(make_key()) == "persisted"
+
+    def test_async_access_runs_off_the_event_loop(self, backend):
+        """Test that get_async/set_async reach the backend from a pool thread, not the event loop thread"""
+
+        threads = []
+        backend_get = backend.get
+
+        def recording_get(key):
+            threads.append(threading.current_thread())
+            return backend_get(key)
+
+        backend.get = recording_get
+        cache = LLMResponseCache(backend, ttl_seconds=60)
+
+        async def run():
+            await cache.set_async(make_key(), "answer")
+            return await cache.get_async(make_key())
+
+        try:
+            assert asyncio.run(run()) == "answer"
+        finally:
+            cache.close()
+        assert threads and threading.main_thread() not in threads
+
+    def test_incomplete_backend_cannot_be_created(self):
+        """Test that a backend missing part of the interface fails when created, not when first called"""
+
+        class GetOnlyBackend(CacheBackend):
+
+            def get(self, key):
+                return None
+
+        with pytest.raises(TypeError):
+            GetOnlyBackend()
@@ -0,0 +1,46 @@
+import asyncio
+
+from backend.benchmarks.synthetic_reports import generate_report_pdf
+from backend.config.worker_config import WorkerPoolConfig
+from backend.services.pdf_extraction_service import PdfExtractionService
+from backend.services.worker_pools import WorkerPools
+from backend.utils.pdf_text import iter_pdf_pages, plan_page_shards
+
+class TestPdfExtractionService:
+
+    def setup_method(self):
+        self.pdf, _ = generate_report_pdf(num_tradelines=60)
+        self.expected = [page.text for page in iter_pdf_pages(self.pdf)]
+
+    def test_plan_page_shards(self):
+        """Test that shards are contiguous, cover every page and differ in size by at most one"""
+
+        assert plan_page_shards(10, 3) == [(0, 4), (4, 7), (7, 10)]
+        assert plan_page_shards(2, 4) == [(0, 1), (1, 2)]
+        assert plan_page_shards(0, 4) == [(0, 0)]
+
+    def test_small_documents_and_thread_pools_stay_serial(self):
+        """Test that sharding only applies above the threshold on a multi-worker process pool"""
+
+        process_pools = WorkerPools(WorkerPoolConfig(cpu_max_workers=4, pdf_parallel_page_threshold=16))
+        thread_pools = WorkerPools(WorkerPoolConfig(cpu_pool_kind="thread", cpu_max_workers=4))
+
+        assert PdfExtractionService(process_pools).plan_shards(15) == [(0, 15)]
+        assert len(PdfExtractionService(process_pools).plan_shards(40)) == 4
+        assert PdfExtractionService(process_pools, min_pages_per_shard=20).plan_shards(40) == [(0, 20), (20, 40)]
+        assert PdfExtractionService(thread_pools).plan_shards(200) == [(0, 200)]
+
+    def test_parallel_extraction_keeps_page_order(self):
+        """Test that sharded extraction on a process pool reassembles pages in order"""
+
+        pools = WorkerPools(WorkerPoolConfig(cpu_max_workers=2, pdf_parallel_page_threshold=4, pdf_min_pages_per_shard=2))
+        extractor = PdfExtractionService(pools)
+        try:
+            pages = asyncio.run(extractor.extract_pages(self.pdf))
+        finally:
+            pools.shutdown()
+
+        assert [page.text for page in pages] == self.expected
+        assert [page.page_number for page in pages] == list(range(1, len(self.expected) + 1))
+        stats = extractor.get_stats()
+        assert (stats["parallel_documents"], stats["shards"]) == (1, 2)
@@ -0,0 +1,90 @@
+import asyncio
+import threading
+
+from backend.benchmarks.synthetic_reports import build_text_pdf, generate_report_pdf
+from backend.services.document_ai_service import DocumentAIService
+from backend.utils.basic_parser import parse_tradeline_lines, parse_tradelines_basic
+from backend.utils.pdf_text import (
+    PdfPage, count_pdf_pages, extract_pdf_text, iter_page_lines, iter_pdf_pages, iter_text_lines, join_pages,
+    joined_length, text_preview
+)
+from backend.utils.report_chunker import ReportChunker
+from backend.services.test_report_chunker import CharTokenCounter
+
+class TestPdfText:
+
+    def setup_method(self):
+        self.pdf, self.blocks = generate_report_pdf(num_tradelines=30)
+
+    def test_pages_from_memory(self):
+        """Test that pages are read from bytes and yielded in order with 1-based numbers"""
+
+        pages = iter_pdf_pages(self.pdf)
+        first = next(pages)
+        assert first.page_number == 1
+        assert "CONSUMER CREDIT REPORT" in first.text
+        assert [page.page_number for page in pages] == list(range(2, count_pdf_pages(self.pdf) + 1))
+
+    def test_pages_from_stored_file(self, tmp_path):
+        """Test that a path is memory-mapped and gives the same pages as the bytes"""
+
+        path = tmp_path / "report.pdf"
+        path.write_bytes(self.pdf)
+        assert count_pdf_pages(str(path)) == count_pdf_pages(self.pdf)
+        assert extract_pdf_text(path) == extract_pdf_text(self.pdf)
+
+    def test_streamed_consumers_match_full_text(self):
+        """Test that parsing and chunking a page stream gives the same result as the joined text"""
+
+        text = extract_pdf_text(self.pdf)
+        streamed = parse_tradeline_lines(iter_page_lines(iter_pdf_pages(self.pdf)))
+        assert streamed == parse_tradelines_basic(text)
+        assert len(streamed) > 0
+
+        chunker = ReportChunker(token_counter=CharTokenCounter(), max_chunk_tokens=800)
+        chunks = list(chunker.iter_chunks(iter_page_lines(iter_pdf_pages(self.pdf))))
+        assert [chunk.text for chunk in chunks] == [chunk.text for chunk in chunker.chunk(text)]
+
+    def test_document_ai_tables_keep_page_numbers(self):
+        """Test that table detection runs per page and numbers tables across the document"""
+
+        table_page = "Creditor  Balance  Status\nCHASE    $1,200   Current\nAMEX    $300   Closed\n"
+        pdf = build_text_pdf(["Cover page", table_page, table_page])
+
+        result = asyncio.run(DocumentAIService()._process_pdf(pdf, "report.pdf"))
+        assert result.total_pages == 3
+        assert [(table.table_id, table.page_number) for table in result.tables] == [("table_1", 2), ("table_2", 3)]
+        assert [block.page_number for block in result.text_blocks] == [1, 2, 3]
+
+    def test_inline_extraction_runs_off_the_event_loop(self):
+        """Test that without an extractor the PyPDF2 pages are extracted and consumed on the I/O pool"""
+
+        service = DocumentAIService()
+        threads = []
+        extract_tables = service._extract_tables_from_text
+
+        def recording_extract_tables(*args, **kwargs):
+            threads.append(threading.current_thread())
+            return extract_tables(*args, **kwargs)
+
+        service._extract_tables_from_text = recording_extract_tables
+        try:
+            result = asyncio.run(service._process_pdf(self.pdf, "report.pdf"))
+        finally:
+            service.close()
+
+        assert result.total_pages == count_pdf_pages(self.pdf)
+        assert threads and threading.main_thread() not in threads
+
+    def test_line_and_join_helpers_match_the_joined_text(self):
+        """Test that the page helpers give what splitting and slicing the joined text would"""
+
+        pages = [PdfPage(1, "first\n\nline"), PdfPage(2, ""), PdfPage(3, "x" * 600 + "\nlast")]
+        text = "\n".join(page.text for page in pages)
+
+        assert join_pages(pages) == text
+        assert joined_length(pages) == len(text)
+        assert list(iter_page_lines(pages)) == text.split("\n")
+        assert list(iter_text_lines("a\n")) == ["a", ""]
+        assert text_preview(pages, 500) == text[:500]
+        assert text_preview(pages[:1], 500) == pages[0].text
@@ -0,0 +1,51 @@
+from backend.benchmarks.synthetic_reports import build_text_pdf, generate_report
+from backend.config.triage_config import PageTriageConfig
+from backend.utils.pdf_text import PdfPage, build_page_subset_pdf, iter_pdf_pages
+from backend.utils.pdf_triage import assess_page, summarize_triage, triage_pages
+
+class TestPageTriage:
+
+    def setup_method(self):
+        text, _ = generate_report(num_tradelines=6)
+        self.native_page = "\n".join(text.split("\n")[:40])
+
+    def test_native_text_is_kept(self):
+        """Test that a page with a clean text layer skips OCR"""
+
+        decision = assess_page(PdfPage(page_number=1, text=self.native_page))
+        assert (decision.needs_ocr, decision.reason) == (False, "native_text")
+        assert decision.glyph_density > 0.8
+        assert decision.garbage_ratio == 0.0
+
+    def test_unusable_pages_need_ocr(self):
+        """Test that empty, near-empty, garbled and symbol-only pages are routed to OCR"""
+
+        cases = {
+            "": "no_text_layer",
+            "Page 3 of 12": "too_little_text",
+            "(cid:12)(cid:7)(cid:44) " * 20 + self.native_page[:200]: "garbled_text",
+            "\ufffd\x07" * 40 + self.native_page[:200]: "garbled_text",
+            "-- ** // .. || ## " * 10: "low_glyph_density",
+        }
+        for text, reason in cases.items():
+            decision = assess_page(PdfPage(page_number=2, text=text))
+            assert (decision.needs_ocr, decision.reason) == (True, reason), text[:30]
+
+    def test_thresholds_are_configurable(self):
+        """Test that a lower character floor keeps short native pages"""
+
+        decision = assess_page(PdfPage(page_number=1, text="Page 3 of 12"), PageTriageConfig(min_chars=5))
+        assert decision.needs_ocr is False
+
+    def test_image_only_pages_in_a_pdf(self):
+        """Test triage over a real PDF and that only the flagged pages are copied for OCR"""
+
+        pdf = build_text_pdf([self.native_page, "", self.native_page, ""])
+        summary = summarize_triage(triage_pages(iter_pdf_pages(pdf)))
+
+        assert summary["native_pages"] == [1, 3]
+        assert summary["ocr_pages"] == [2, 4]
+        assert [d["reason"] for d in summary["decisions"]] == ["native_text", "no_text_layer"] * 2
+
+        subset = build_page_subset_pdf(pdf, summary["ocr_pages"])
+        assert [page.text for page in iter_pdf_pages(subset)] == ["", ""]
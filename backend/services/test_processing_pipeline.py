@@ -0,0 +1,182 @@
+import asyncio
+import pytest # type: ignore
+
+from backend.models.tradeline_models import DocumentAIResult, DocumentType, ExtractedTable, ExtractedText
+from backend.services.job_store import SQLiteJobStore
+from backend.services.processing_pipeline import CheckpointedPipeline, PipelineStage, StageFailedError
+from backend.services.storage_service import StorageService
+
+class RecordingStages:
+    """Stages that count their runs; a stage named in fail_in raises"""
+
+    def __init__(self):
+        self.calls = []
+        self.fail_in = set()
+        self.suffix = ""
+
+    def stage(self, name: str, **kwargs) -> PipelineStage:
+        async def run(previous):
+            self.calls.append(name)
+            if name in self.fail_in:
+                raise RuntimeError(f"{name} is down")
+            return f"{previous}>{name}{self.suffix}"
+        return PipelineStage(name, run, **kwargs)
+
+    def pipeline(self, storage, names=("fetch", "extract", "normalize", "persist")) -> CheckpointedPipeline:
+        return CheckpointedPipeline([self.stage(name) for name in names], storage)
+
+def make_ai_result() -> DocumentAIResult:
+    return DocumentAIResult(
+        job_id="job-1",
+        document_type=DocumentType.PDF,
+        total_pages=2,
+        tables=[ExtractedTable("t1", ["Creditor", "Balance"], [["CHASE", "$1,200"]], 0.9, 1, {"x": 0.1})],
+        text_blocks=[ExtractedText("CONSUMER CREDIT REPORT", 1, 0.95)],
+        raw_text="CONSUMER CREDIT REPORT",
+        metadata={"file_name": "report.pdf", "processing_method": "pypdf2_extraction"},
+        processing_time=1.5,
+        confidence_score=0.85
+    )
+
+class TestCheckpointedPipeline:
+
+    @pytest.fixture
+    def storage(self, tmp_path):
+        return StorageService(str(tmp_path), job_store=SQLiteJobStore(":memory:"))
+
+    def test_retry_resumes_at_failed_stage(self, storage):
+        """Test that after a late stage fails, a retry runs only that stage onwards"""
+
+        stages = RecordingStages()
+        stages.fail_in = {"normalize"}
+        with pytest.raises(StageFailedError) as excinfo:
+            asyncio.run(stages.pipeline(storage).run("job-1", "upload-hash", initial="upload"))
+        assert excinfo.value.stage == "normalize"
+        assert stages.calls == ["fetch", "extract", "normalize"]
+
+        stages.fail_in = set()
+        stages.calls = []
+        run = asyncio.run(stages.pipeline(storage).run("job-1", "upload-hash", initial="upload"))
+
+        assert stages.calls == ["normalize", "persist"]
+        assert (run.stages_skipped, run.resumed_from) == (["fetch", "extract"], "normalize")
+        assert run.output == "upload>fetch>extract>normalize>persist"
+
+    def test_completed_pipeline_is_not_rerun(self, storage):
+        """Test that a rerun of a finished job returns the last checkpoint without running anything"""
+
+        stages = RecordingStages()
+        asyncio.run(stages.pipeline(storage).run("job-1", "upload-hash", initial="upload"))
+        stages.calls = []
+        run = asyncio.run(stages.pipeline(storage).run("job-1", "upload-hash", initial="upload"))
+
+        assert stages.calls == [] and run.stages_run == []
+        assert run.output == "upload>fetch>extract>normalize>persist"
+
+    def test_new_input_hash_starts_over(self, storage):
+        """Test that checkpoints from a different upload are not reused"""
+
+        stages = RecordingStages()
+        asyncio.run(stages.pipeline(storage).run("job-1", "upload-hash", initial="upload"))
+        stages.calls = []
+        asyncio.run(stages.pipeline(storage).run("job-1", "other-hash", initial="upload"))
+
+        assert stages.calls == ["fetch", "extract", "normalize", "persist"]
+
+    def test_changed_output_invalidates_later_stages(self, storage):
+        """Test that a rerun stage with a new output reruns everything after it, and an unchanged one does not"""
+
+        stages = RecordingStages()
+        asyncio.run(stages.pipeline(storage).run("job-1", "upload-hash", initial="upload"))
+
+        # Same extract output: later checkpoints still apply
+        asyncio.run(storage.store_checkpoint("job-1", "extract", {}, None))
+        stages.calls = []
+        asyncio.run(stages.pipeline(storage).run("job-1", "upload-hash", initial="upload"))
+        assert stages.calls == ["extract"]
+
+        # Different extract output: everything downstream reruns
+        asyncio.run(storage.store_checkpoint("job-1", "extract", {}, None))
+        stages.calls = []
+        stages.suffix = "-v2"
+        run = asyncio.run(stages.pipeline(storage).run("job-1", "upload-hash", initial="upload"))
+        assert stages.calls == ["extract", "normalize", "persist"]
+        assert run.output == "upload>fetch>extract-v2>normalize-v2>persist-v2"
+
+    def test_clear_checkpoints(self, storage):
+        """Test that clearing a job's checkpoints makes the next run start from the first stage"""
+
+        stages = RecordingStages()
+        asyncio.run(stages.pipeline(storage).run("job-1", "upload-hash", initial="upload"))
+        asyncio.run(storage.clear_checkpoints("job-1"))
+        asyncio.run(storage.clear_checkpoints("job-1"))
+        stages.calls = []
+        asyncio.run(stages.pipeline(storage).run("job-1", "upload-hash", initial="upload"))
+
+        assert stages.calls == ["fetch", "extract", "normalize", "persist"]
+
+    def test_encoded_checkpoint_round_trip(self, storage):
+        """Test that a stage output is checkpointed through its encoder and restored through its decoder"""
+
+        calls = []
+
+        async def extract(_):
+            calls.append("extract")
+            return make_ai_result()
+
+        async def count_tables(ai_result):
+            calls.append("store")
+            assert isinstance(ai_result, DocumentAIResult)
+            if len(calls) == 2:
+                raise RuntimeError("storage unavailable")
+            return {'table_count': len(ai_result.tables)}
+
+        pipeline = CheckpointedPipeline([
+            PipelineStage("extract", extract, encode=DocumentAIResult.to_dict, decode=DocumentAIResult.from_dict),
+            PipelineStage("store", count_tables)
+        ], storage)
+        with pytest.raises(StageFailedError):
+            asyncio.run(pipeline.run("job-1", "upload-hash"))
+        run = asyncio.run(pipeline.run("job-1", "upload-hash"))
+
+        assert calls == ["extract", "store", "store"]
+        assert run.output == {'table_count': 1}
+        assert DocumentAIResult.from_dict(asyncio.run(storage.get_checkpoint_output("job-1", "extract"))) == make_ai_result()
+
+    def test_stage_reruns_when_its_stored_output_is_gone(self, storage):
+        """Test that a checkpoint whose still_valid check fails reruns that stage, and only that stage"""
+
+        stages = RecordingStages()
+        artifacts = {}
+
+        async def store(previous):
+            stages.calls.append("store")
+            artifacts["job-1"] = f"{previous}>stored"
+            return {"artifact": artifacts["job-1"]}
+
+        async def still_stored(output):
+            return artifacts.get("job-1") == output["artifact"]
+
+        pipeline = CheckpointedPipeline([
+            stages.stage("extract"),
+            PipelineStage("store", store, still_valid=still_stored),
+            stages.stage("normalize")
+        ], storage)
+        asyncio.run(pipeline.run("job-1", "upload-hash", initial="upload"))
+
+        stages.calls = []
+        asyncio.run(pipeline.run("job-1", "upload-hash", initial="upload"))
+        assert stages.calls == []
+
+        del artifacts["job-1"]
+        run = asyncio.run(pipeline.run("job-1", "upload-hash", initial="upload"))
+        assert stages.calls == ["store"]
+        assert run.stages_skipped == ["extract", "normalize"]
+        assert run.output == "{'artifact': 'upload>extract>stored'}>normalize"
+
+    def test_duplicate_stage_names_rejected(self, storage):
+        """Test that stage names must be unique, since they key the checkpoints"""
+
+        stages = RecordingStages()
+        with pytest.raises(ValueError):
+            stages.pipeline(storage, names=("fetch", "fetch"))
@@ -0,0 +1,72 @@
+import time
+import pytest # type: ignore
+
+from backend.services.report_cache import ReportCache
+
+SAMPLE_TRADELINES = [
+    {"creditor_name": "Chase", "account_number": "****1234", "account_balance": "$500"}
+]
+
+class TestReportCache:
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        return ReportCache(cache_dir=str(tmp_path), max_entries=3, ttl_seconds=60)
+
+    def test_hit_after_set(self, cache):
+        """Test that a stored report is returned for the same content hash"""
+
+        file_hash = ReportCache.compute_hash(b"%PDF-1.4 report")
+        assert cache.get(file_hash) is None
+
+        cache.set(file_hash, "raw text", SAMPLE_TRADELINES, "document_ai + gemini")
+        entry = cache.get(file_hash)
+
+        assert entry["tradelines"] == SAMPLE_TRADELINES
+        assert entry["extracted_text"] == "raw text"
+        assert entry["processing_method"] == "document_ai + gemini"
+        assert cache.get_stats()["hits"] == 1
+        assert cache.get_stats()["misses"] == 1
+
+    def test_lru_eviction(self, cache):
+        """Test that the least recently used entry is evicted first"""
+
+        for name in ["a", "b", "c"]:
+            cache.set(name, name, [], "basic")
+
+        # Touch "a" so "b" becomes the oldest
+        assert cache.get("a") is not None
+        cache.set("d", "d", [], "basic")
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_ttl_expiry(self, tmp_path):
+        """Test that expired entries are treated as misses"""
+
+        cache = ReportCache(cache_dir=str(tmp_path), ttl_seconds=0)
+        cache.set("a", "text", [], "basic")
+
+        assert cache.get("a") is None
+        assert cache.get_stats()["expired"] == 1
+
+    def test_survives_restart(self, tmp_path):
+        """Test that entries written to disk are loaded by a new instance"""
+
+        ReportCache(cache_dir=str(tmp_path)).set("a", "text", SAMPLE_TRADELINES, "basic")
+        reloaded = ReportCache(cache_dir=str(tmp_path))
+
+        assert reloaded.get("a")["tradelines"] == SAMPLE_TRADELINES
+
+    def test_mark_saved_keeps_expiry(self, cache):
+        """Test that recording a saved user does not extend the TTL"""
+
+        cache.set("a", "text", SAMPLE_TRADELINES, "basic")
+        expires_at = cache.get("a")["expires_at"]
+        time.sleep(0.01)
+        cache.mark_saved("a", "user-1")
+
+        entry = cache.get("a")
+        assert entry["saved_for_users"] == ["user-1"]
+        assert entry["expires_at"] == expires_at
@@ -0,0 +1,68 @@
+from backend.utils.report_chunker import ReportChunker
+
+class CharTokenCounter:
+    """Deterministic stand-in for TokenCounter (about 4 characters per token)"""
+
+    def count_tokens(self, text: str) -> int:
+        return len(text) // 4
+
+def make_tradeline(name: str, account: str) -> str:
+    return "\n".join([
+        name,
+        f"Account #: {account}",
+        "Balance: $1,250",
+        "Credit Limit: $5,000",
+        "Status: Open",
+        "Payment History: OK OK OK OK OK OK OK OK OK OK OK OK"
+    ])
+
+class TestReportChunker:
+
+    def test_tradelines_not_split_or_duplicated(self):
+        """Test that every tradeline lands whole in exactly one chunk"""
+
+        names = [f"CREDITOR BANK {chr(65 + i % 26)}{chr(65 + i // 26)}" for i in range(40)]
+        accounts = [f"****{1000 + i}" for i in range(40)]
+        text = "EXPERIAN\n" + "\n".join(make_tradeline(n, a) for n, a in zip(names, accounts))
+
+        chunker = ReportChunker(token_counter=CharTokenCounter(), max_chunk_tokens=300)
+        chunks = chunker.chunk(text)
+
+        assert len(chunks) > 1
+        for name, account in zip(names, accounts):
+            holding = [c for c in chunks if f"Account #: {account}" in c.text]
+            assert len(holding) == 1
+            assert name in holding[0].text
+        assert all(c.tokens <= 300 + 10 for c in chunks)
+
+    def test_continuation_header_carries_bureau(self):
+        """Test that chunks starting mid-section are labelled with their bureau"""
+
+        text = "TRANSUNION\n" + "\n".join(make_tradeline(f"LENDER {chr(65 + i)}", f"****{i}") for i in range(20))
+
+        chunker = ReportChunker(token_counter=CharTokenCounter(), max_chunk_tokens=200)
+        chunks = chunker.chunk(text)
+
+        assert chunks[0].text.startswith("TRANSUNION")
+        assert all(c.text.startswith("[TRANSUNION section continued]") for c in chunks[1:])
+
+    def test_page_break_between_tradelines_is_a_boundary(self):
+        """Test that a page break after a finished tradeline splits, and one inside a tradeline does not"""
+
+        first = make_tradeline("CREDITOR BANK A", "****1000")
+        second = make_tradeline("CREDITOR BANK B", "****2000").split("\n")
+        text = "\n".join(["EXPERIAN", first, "", "Page 1 of 2", *second[:3], "Page 2 of 2", *second[3:]])
+
+        blocks = ReportChunker(token_counter=CharTokenCounter()).split_blocks(text)
+
+        assert [block.lines[0] for block in blocks] == ["EXPERIAN", "CREDITOR BANK A", "Page 1 of 2", "CREDITOR BANK B"]
+        assert "Page 2 of 2" in blocks[-1].lines
+
+    def test_oversized_line_is_hard_split(self):
+        """Test that a single line over the budget is still split within limits"""
+
+        chunker = ReportChunker(token_counter=CharTokenCounter(), max_chunk_tokens=100, max_chunk_chars=500)
+        chunks = chunker.chunk("x" * 2000)
+
+        assert "".join(c.text for c in chunks) == "x" * 2000
+        assert all(len(c.text) <= 500 for c in chunks)
@@ -0,0 +1,75 @@
+import asyncio
+import pytest # type: ignore
+
+from backend.utils.stage_runner import run_stages
+
+class TestRunStages:
+
+    def test_stages_wait_for_dependencies(self):
+        """Test that a stage starts only after its dependencies and gets their results in order"""
+
+        events = []
+
+        def stage(name, delay, result):
+            async def run(*deps):
+                events.append(f"start {name} {list(deps)}")
+                await asyncio.sleep(delay)
+                events.append(f"end {name}")
+                return result
+            return run
+
+        results, timings = asyncio.run(run_stages({
+            "extraction": ([], stage("extraction", 0.02, "rows")),
+            "consumer_info": ([], stage("consumer_info", 0.01, "consumer")),
+            "normalization": (["extraction"], stage("normalization", 0, "tradelines")),
+            "validation": (["normalization", "consumer_info"], stage("validation", 0, "valid"))
+        }))
+
+        assert results == {'extraction': "rows", 'consumer_info': "consumer",
+                           'normalization': "tradelines", 'validation': "valid"}
+        # Independent stages overlap; dependent ones start after their inputs finish
+        assert events.index("start consumer_info []") < events.index("end extraction")
+        assert events.index("start normalization ['rows']") > events.index("end extraction")
+        assert events[-2:] == ["start validation ['tradelines', 'consumer']", "end validation"]
+        assert set(timings) == set(results)
+
+    def test_undeclared_dependency_starts_nothing(self):
+        """Test that a missing dependency is rejected before any stage runs"""
+
+        started = []
+
+        async def run(*deps):
+            started.append(deps)
+
+        with pytest.raises(ValueError):
+            asyncio.run(run_stages({
+                "extraction": ([], run),
+                "validation": (["normalization"], run)
+            }))
+        assert started == []
+
+    def test_failed_stage_cancels_the_rest(self):
+        """Test that one failing stage raises and the stages still running are cancelled"""
+
+        cancelled = []
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append("consumer_info")
+                raise
+
+        async def fail():
+            raise RuntimeError("LLM unavailable")
+
+        async def never(_):
+            raise AssertionError("dependent stage must not run")
+
+        with pytest.raises(RuntimeError, match="LLM unavailable"):
+            asyncio.run(run_stages({
+                "extraction": ([], fail),
+                "consumer_info": ([], slow),
+                "normalization": (["extraction"], never)
+            }))
+        assert cancelled == ["consumer_info"]
@@ -0,0 +1,228 @@
+import asyncio
+import json
+import os
+import time
+import pytest # type: ignore
+
+from backend.services.job_store import SQLiteJobStore
+from backend.services.storage_service import StorageService
+from backend.utils.atomic_files import atomic_write_json
+from backend.utils.document_pack import DocumentPack, DocumentPackError
+from backend.utils.loop_lag import EventLoopLagMonitor
+
+class TestAtomicFiles:
+
+    def test_failed_write_keeps_previous_content(self, tmp_path, monkeypatch):
+        """Test that a crash before the rename leaves the old file intact and no temp file"""
+
+        target = tmp_path / "result.json"
+        atomic_write_json(target, {"version": 1})
+
+        def crash(src, dst):
+            raise OSError("disk went away")
+
+        monkeypatch.setattr(os, "replace", crash)
+        with pytest.raises(OSError):
+            atomic_write_json(target, {"version": 2})
+
+        assert json.loads(target.read_text()) == {"version": 1}
+        assert [path.name for path in tmp_path.iterdir()] == ["result.json"]
+
+class TestStorageService:
+
+    @pytest.fixture
+    def storage(self, tmp_path):
+        return StorageService(str(tmp_path), job_store=SQLiteJobStore(str(tmp_path / "jobs.sqlite3")))
+
+    def test_file_round_trips_run_off_loop(self, storage):
+        """Test uploads and AI results round trip through the storage I/O pool"""
+
+        async def run():
+            await storage.store_uploaded_file("job-1", b"%PDF-1.4 data", {"file_name": "a.pdf"})
+            await storage.store_document_ai_results("job-1", {"text": "hello"})
+            return (await storage.get_file("job-1"), await storage.get_document_ai_results("job-1"),
+                    await storage.get_document_ai_results("missing"))
+
+        stored, results, missing = asyncio.run(run())
+        assert stored["content"] == b"%PDF-1.4 data"
+        assert stored["metadata"]["file_name"] == "a.pdf" and stored["metadata"]["file_size"] == 13
+        assert results == {"text": "hello"}
+        assert missing is None
+        assert storage.io.get_metrics()["completed"] >= 5
+
+    def test_received_upload_is_moved_into_place(self, storage, tmp_path):
+        """Test that a streamed upload becomes the job's file by rename, with hash and size in the metadata"""
+
+        class Upload:
+            def __init__(self):
+                self.chunks = [b"%PDF-1.4 ", b"streamed", b""]
+
+            async def read(self, size: int = -1) -> bytes:
+                return self.chunks.pop(0)
+
+        async def run():
+            spooled = await storage.receive_upload(Upload(), max_bytes=1024)
+            await storage.store_spooled_upload("job-1", spooled, {"file_name": "a.pdf"})
+            return await storage.get_file_metadata("job-1")
+
+        metadata = asyncio.run(run())
+        assert storage.get_file_path("job-1").read_bytes() == b"%PDF-1.4 streamed"
+        assert metadata["file_size"] == 17 and metadata["file_name"] == "a.pdf"
+        assert sorted(path.name for path in (tmp_path / "uploads").iterdir()) == ["job-1.bin", "job-1.json"]
+
+    def test_cleanup_removes_old_uploads(self, storage, tmp_path):
+        """Test that uploads older than the retention period are deleted"""
+
+        async def run():
+            await storage.store_uploaded_file("old", b"x", {})
+            old_time = time.time() - 10 * 24 * 3600
+            for path in (tmp_path / "uploads").iterdir():
+                os.utime(path, (old_time, old_time))
+            await storage.store_uploaded_file("new", b"y", {})
+            await storage.cleanup_old_files(retention_days=7)
+
+        asyncio.run(run())
+        assert sorted(path.name for path in (tmp_path / "uploads").iterdir()) == ["new.bin", "new.json"]
+
+    def test_stale_temp_files_removed_from_every_directory(self, storage, tmp_path):
+        """Test that temp files of interrupted writes are swept from all storage directories, recent ones kept"""
+
+        old_time = time.time() - 2 * 3600
+        stale = [tmp_path / "ai_results" / ".job-1.json.abc.tmp", tmp_path / "llm_input" / ".job-1.dpk.def.tmp",
+                 tmp_path / "jobs" / ".job-1.json.ghi.tmp", tmp_path / "checkpoints" / "job-1" / ".store.dpk.jkl.tmp",
+                 tmp_path / "uploads" / ".upload-mno.tmp"]
+        for path in stale:
+            path.parent.mkdir(exist_ok=True)
+            path.write_bytes(b"partial")
+            os.utime(path, (old_time, old_time))
+        in_progress = tmp_path / "llm_input" / ".job-2.dpk.pqr.tmp"
+        in_progress.write_bytes(b"partial")
+        kept = tmp_path / "ai_results" / "job-1.json"
+        kept.write_text("{}")
+        os.utime(kept, (old_time, old_time))
+
+        assert asyncio.run(storage.remove_stale_temp_files()) == len(stale)
+        assert not any(path.exists() for path in stale)
+        assert in_progress.exists() and kept.exists()
+
+    def test_close_stops_io_pool(self, storage):
+        """Test that close shuts down the storage I/O pool it created"""
+
+        asyncio.run(storage.store_document_ai_results("job-1", {"text": "hello"}))
+        storage.close()
+        assert storage.io._executor is None
+
+def ai_artifacts():
+    """AI results and LLM input shaped like DocumentProcessorService.store_ai_results writes them"""
+    pages = [f"CHASE BANK USA ACCOUNT ****{page:04d} BALANCE $1,234.00\n" * 20 for page in range(1, 4)]
+    raw_text = "".join(f"{text}\n" for text in pages)
+    text_blocks = [{"content": text, "page_number": page, "confidence": 0.85, "word_count": len(text.split())}
+                   for page, text in enumerate(pages, 1)]
+    tables = [{"table_id": "table_1", "headers": ["Creditor", "Balance"], "rows": [["CHASE", "$1,234"]] * 5}]
+    ai_results = {
+        "job_id": "job-1", "document_type": "pdf", "processing_time": 1.5, "confidence_score": 0.85,
+        "tables": tables, "metadata": {"file_name": "report.pdf"},
+        "text_content": {"raw_text": raw_text, "text_blocks": text_blocks, "total_confidence": 0.85, "page_count": 3}
+    }
+    llm_input = {"tables": tables, "text": raw_text, "text_blocks": text_blocks, "document_type": "pdf",
+                 "confidence_score": 0.85, "metadata": {"file_name": "report.pdf"}}
+    return ai_results, llm_input
+
+class TestCompactArtifacts:
+
+    @pytest.fixture
+    def storage(self, tmp_path):
+        return StorageService(str(tmp_path), job_store=SQLiteJobStore(":memory:"), storage_format="compact")
+
+    def test_artifacts_round_trip_with_one_copy_of_text(self, storage, tmp_path):
+        """Test that LLM input reuses the AI results' text and both read back unchanged"""
+
+        ai_results, llm_input = ai_artifacts()
+
+        async def run():
+            await storage.store_document_ai_results("job-1", ai_results)
+            await storage.store_llm_input("job-1", llm_input)
+            return await storage.get_document_ai_results("job-1"), await storage.get_llm_input("job-1")
+
+        stored_results, stored_input = asyncio.run(run())
+        assert stored_results == ai_results
+        assert stored_input == llm_input
+        assert "__text__" in DocumentPack.open(tmp_path / "ai_results" / "job-1.dpk")
+        llm_pack = DocumentPack.open(tmp_path / "llm_input" / "job-1.dpk")
+        assert "__text__" not in llm_pack and llm_pack.summary["text_source"] == "ai_results"
+        assert not (tmp_path / "ai_results" / "job-1.json").exists()
+
+    def test_llm_input_survives_ai_results_changes(self, storage, tmp_path):
+        """Test that LLM input sharing the AI results' text stays readable when they are rewritten as JSON or with new text"""
+
+        ai_results, llm_input = ai_artifacts()
+        asyncio.run(storage.store_document_ai_results("job-1", ai_results))
+        asyncio.run(storage.store_llm_input("job-1", llm_input))
+
+        json_storage = StorageService(str(tmp_path), job_store=SQLiteJobStore(":memory:"), storage_format="json")
+        asyncio.run(json_storage.store_document_ai_results("job-1", ai_results))
+        assert asyncio.run(storage.get_llm_input("job-1")) == llm_input
+
+        ai_results["text_content"]["raw_text"] = "RE-EXTRACTED TEXT"
+        ai_results["text_content"]["text_blocks"] = []
+        asyncio.run(storage.store_document_ai_results("job-1", ai_results))
+        assert asyncio.run(storage.get_llm_input("job-1")) == llm_input
+        assert "__text__" in DocumentPack.open(tmp_path / "llm_input" / "job-1.dpk")
+
+    def test_lost_shared_text_is_an_error(self, storage, tmp_path):
+        """Test that LLM input whose shared text is gone raises instead of reading as missing"""
+
+        ai_results, llm_input = ai_artifacts()
+        asyncio.run(storage.store_document_ai_results("job-1", ai_results))
+        asyncio.run(storage.store_llm_input("job-1", llm_input))
+        (tmp_path / "ai_results" / "job-1.dpk").unlink()
+
+        with pytest.raises(DocumentPackError):
+            asyncio.run(storage.get_llm_input("job-1"))
+        assert asyncio.run(storage.get_llm_input("missing")) is None
+
+    def test_summary_reads_header_only(self, storage, monkeypatch):
+        """Test that the status summary never decodes a section"""
+
+        ai_results, _ = ai_artifacts()
+        asyncio.run(storage.store_document_ai_results("job-1", ai_results))
+
+        def fail(*args, **kwargs):
+            raise AssertionError("section read for a summary")
+
+        monkeypatch.setattr(DocumentPack, "read_sections", fail)
+        summary = asyncio.run(storage.get_document_ai_summary("job-1"))
+        assert summary["confidence_score"] == 0.85 and summary["processing_time"] == 1.5
+        assert summary["table_count"] == 1 and summary["table_row_count"] == 5
+        assert summary["text_block_count"] == 3 and summary["page_count"] == 3
+        assert 0 < summary["stored_bytes"] < len(ai_results["text_content"]["raw_text"])
+
+    def test_json_artifacts_stay_readable(self, tmp_path):
+        """Test that results written as JSON still load and summarize after switching to compact"""
+
+        ai_results, _ = ai_artifacts()
+        json_storage = StorageService(str(tmp_path), job_store=SQLiteJobStore(":memory:"), storage_format="json")
+        asyncio.run(json_storage.store_document_ai_results("job-1", ai_results))
+
+        compact_storage = StorageService(str(tmp_path), job_store=SQLiteJobStore(":memory:"), storage_format="compact")
+        assert asyncio.run(compact_storage.get_document_ai_results("job-1")) == ai_results
+        assert asyncio.run(compact_storage.get_document_ai_summary("job-1"))["table_count"] == 1
+        assert asyncio.run(compact_storage.get_document_ai_summary("missing")) is None
+
+class TestEventLoopLagMonitor:
+
+    def test_blocking_call_shows_as_lag(self):
+        """Test that synchronous work on the loop is reported as lag"""
+
+        async def run():
+            monitor = EventLoopLagMonitor(interval_seconds=0.005)
+            monitor.start()
+            await asyncio.sleep(0.02)
+            time.sleep(0.1)
+            await asyncio.sleep(0.02)
+            await monitor.stop()
+            return monitor.get_metrics()
+
+        metrics = asyncio.run(run())
+        assert metrics["samples"] > 0
+        assert metrics["max_lag_ms"] >= 80
@@ -0,0 +1,76 @@
+from backend.config.llm_config import LLMConfig
+from backend.services.tiered_normalizer import RuleBasedTradelineNormalizer
+
+class TestRuleBasedTradelineNormalizer:
+
+    def setup_method(self):
+        self.normalizer = RuleBasedTradelineNormalizer()
+
+    def test_clean_tradeline_scores_high(self):
+        """Test that a tradeline the rules fully understand is normalized with high confidence"""
+
+        normalized, confidence = self.normalizer.normalize({
+            "creditor_name": "CHASE",
+            "account_number": "1234567890",
+            "account_type": "Credit Card",
+            "balance": "$1,234.56",
+            "credit_limit": "$5,000",
+            "payment_status": "OK",
+            "date_opened": "01/15/2020",
+            "account_status": "Open"
+        })
+
+        assert confidence >= 0.9
+        assert normalized["creditor_name"] == "Chase Bank"
+        assert normalized["account_number"] == "******7890"
+        assert normalized["balance"] == "1234.56"
+        assert normalized["credit_limit"] == "5000"
+        assert normalized["payment_status"] == "Current"
+        assert normalized["date_opened"] == "2020-01-15"
+        assert normalized["account_status"] == "Open"
+        assert normalized["confidence_score"] == confidence
+
+    def test_unresolved_fields_lower_confidence(self):
+        """Test that values the rules cannot map push the tradeline below the fast-path bar"""
+
+        _, confidence = self.normalizer.normalize({
+            "creditor_name": "CHASE",
+            "account_type": "Revolving",
+            "balance": "about a thousand",
+            "payment_status": "OK",
+            "date_opened": "sometime in 2020"
+        })
+
+        assert confidence < 0.7
+
+    def test_unmapped_payment_status_goes_to_llm(self):
+        """Test that a status the rules only echo back counts as unresolved and misses the rule tier's bar"""
+
+        tradeline = {
+            "creditor_name": "CHASE",
+            "account_number": "1234567890",
+            "account_type": "Credit Card",
+            "balance": "$1,234.56",
+            "credit_limit": "$5,000",
+            "payment_status": "pd as agreed w/ rmks 2x",
+            "date_opened": "01/15/2020"
+        }
+        normalized, confidence = self.normalizer.normalize(tradeline)
+
+        assert confidence < LLMConfig.rule_confidence_threshold
+        assert "payment_status" in normalized["normalization_notes"]
+
+        _, late_confidence = self.normalizer.normalize({**tradeline, "payment_status": "90"})
+        assert late_confidence >= LLMConfig.rule_confidence_threshold
+
+    def test_missing_fields_are_not_penalised_as_unresolved(self):
+        """Test that absent fields are not treated as rule failures"""
+
+        normalized, confidence = self.normalizer.normalize({
+            "creditor_name": "AMEX",
+            "account_type": "CC",
+            "balance": "0"
+        })
+
+        assert normalized["date_closed"] is None
+        assert confidence >= 0.9
@@ -0,0 +1,153 @@
+import asyncio
+import uuid
+from typing import Any, Dict
+
+from pydantic import BaseModel # type: ignore
+
+from backend.services.tradeline_writer import BulkSaveResult, RowSaveResult, TradelineBulkWriter
+
+class SampleTradeline(BaseModel):
+    """Same fields and defaults as the API's TradelineSchema"""
+    creditor_name: str = "NULL"
+    account_balance: str = ""
+    credit_limit: str = ""
+    monthly_payment: str = ""
+    account_number: str = ""
+    date_opened: str = "xx/xx/xxxxx"
+    account_type: str = ""
+    account_status: str = ""
+    credit_bureau: str = ""
+    is_negative: bool = False
+    dispute_count: int = 0
+
+class FakeRPCError(Exception):
+
+    def __init__(self, message: str, code: str = None):
+        super().__init__(message)
+        self.code = code
+
+class FakeResponse:
+
+    def __init__(self, data: Any):
+        self.data = data
+
+class FakeRPCCall:
+
+    def __init__(self, client: 'FakeSupabaseClient', name: str, params: Dict[str, Any]):
+        self.client = client
+        self.name = name
+        self.params = params
+
+    def execute(self) -> FakeResponse:
+        return self.client.execute(self.name, self.params)
+
+class FakeSupabaseClient:
+    """The two tradeline RPCs over a dict keyed like the table's conflict key; long account numbers are rejected"""
+
+    def __init__(self, bulk_rpc: bool = True):
+        self.bulk_rpc = bulk_rpc
+        self.requests = 0
+        self.calls = []
+        self.rows = {}
+
+    def rpc(self, name: str, params: Dict[str, Any]) -> FakeRPCCall:
+        return FakeRPCCall(self, name, params)
+
+    def count_rows(self, user_id: str = None) -> int:
+        return sum(1 for key in self.rows if user_id is None or key[0] == user_id)
+
+    def execute(self, name: str, params: Dict[str, Any]) -> FakeResponse:
+        self.requests += 1
+        self.calls.append((name, params))
+        if name == "upsert_tradeline":
+            row = {key[2:]: value for key, value in params.items() if key != "p_user_id"}
+            return FakeResponse(self.upsert(params["p_user_id"], row))
+        if name == "upsert_tradelines_bulk" and self.bulk_rpc:
+            results = []
+            for ordinal, row in enumerate(params["p_tradelines"]):
+                try:
+                    results.append({"ordinal": ordinal, "id": self.upsert(params["p_user_id"], row), "error": None})
+                except ValueError as e:
+                    results.append({"ordinal": ordinal, "id": None, "error": str(e)})
+            return FakeResponse(results)
+        raise FakeRPCError(f"Could not find the function public.{name}", code="PGRST202")
+
+    def upsert(self, user_id: str, row: Dict[str, Any]) -> str:
+        if len(row.get("account_number", "")) > 64:
+            raise ValueError("new row violates check constraint \"tradelines_account_number_check\"")
+        key = (user_id, row.get("creditor_name"), row.get("account_number"), row.get("account_type"))
+        tradeline_id = self.rows.get(key, (None,))[0] or str(uuid.uuid4())
+        self.rows[key] = (tradeline_id, row)
+        return tradeline_id
+
+def tradelines(count: int):
+    return [
+        {"creditor_name": f"CREDITOR {i}", "account_number": f"****{i:04d}", "account_type": "Credit Card"}
+        for i in range(count)
+    ]
+
+class TestTradelineBulkWriter:
+
+    def test_rows_saved_in_batches(self):
+        """Test that rows go out one request per batch and all land in the table"""
+
+        client = FakeSupabaseClient()
+        writer = TradelineBulkWriter(client, SampleTradeline, batch_size=10)
+        result = asyncio.run(writer.save(tradelines(25), "user-1"))
+
+        assert (result.saved_count, result.failed_count) == (25, 0)
+        assert (result.batches, result.requests, client.requests) == (3, 3, 3)
+        assert [row.index for row in result.results] == list(range(25))
+        assert all(row.tradeline_id for row in result.results)
+        assert client.count_rows("user-1") == 25
+
+    def test_per_row_failures(self):
+        """Test that invalid and rejected rows are reported without failing their batch"""
+
+        rows = tradelines(5)
+        rows[1]["is_negative"] = "not a boolean"
+        rows[3]["account_number"] = "9" * 100  # violates the column constraint
+        client = FakeSupabaseClient()
+        result = asyncio.run(TradelineBulkWriter(client, SampleTradeline).save(rows, "user-1"))
+
+        assert [row.saved for row in result.results] == [True, False, True, False, True]
+        assert result.results[1].error.startswith("validation")
+        assert "check constraint" in result.results[3].error
+        assert client.requests == 1
+        assert client.count_rows() == 3
+
+    def test_upsert_is_idempotent(self):
+        """Test that saving the same report twice updates rows instead of duplicating them"""
+
+        client = FakeSupabaseClient()
+        writer = TradelineBulkWriter(client, SampleTradeline)
+        first = asyncio.run(writer.save(tradelines(4), "user-1"))
+        second = asyncio.run(writer.save(tradelines(4), "user-1"))
+
+        assert [r.tradeline_id for r in first.results] == [r.tradeline_id for r in second.results]
+        assert client.count_rows() == 4
+
+    def test_falls_back_to_single_row_rpc(self):
+        """Test that a missing bulk function switches the writer to one RPC per row"""
+
+        client = FakeSupabaseClient(bulk_rpc=False)
+        writer = TradelineBulkWriter(client, SampleTradeline, batch_size=10)
+        result = asyncio.run(writer.save(tradelines(12), "user-1"))
+
+        assert result.saved_count == 12
+        assert not writer.get_stats()["bulk_available"]
+        assert client.count_rows() == 12
+
+        # The single-row call sends every field the bulk function passes through
+        name, params = client.calls[-1]
+        assert name == "upsert_tradeline"
+        assert (params["p_date_opened"], params["p_is_negative"]) == ("xx/xx/xxxxx", False)
+
+    def test_merge_shifts_indexes(self):
+        """Test that merged results keep input positions across saves"""
+
+        merged = BulkSaveResult(results=[RowSaveResult(index=0, saved=True)], batches=1, requests=1)
+        merged.merge(BulkSaveResult(results=[RowSaveResult(index=0, saved=False, error="x")], batches=1, requests=1))
+
+        assert [(row.index, row.saved) for row in merged.results] == [(0, True), (1, False)]
+        assert (merged.saved_count, merged.failed_count, merged.requests) == (1, 1, 2)
@@ -0,0 +1,57 @@
+import asyncio
+import hashlib
+import pytest # type: ignore
+
+from backend.utils.upload_stream import UploadTooLargeError, spool_upload
+
+class ChunkedUpload:
+    """Stands in for UploadFile: an async read(size) over fixed content"""
+
+    def __init__(self, content: bytes, size=None):
+        self.content = content
+        self.size = size
+        self.offset = 0
+        self.reads = []
+
+    async def read(self, size: int = -1) -> bytes:
+        chunk = self.content[self.offset:self.offset + size]
+        self.offset += len(chunk)
+        self.reads.append(len(chunk))
+        return chunk
+
+class TestSpoolUpload:
+
+    def test_copies_in_chunks_and_hashes(self, tmp_path):
+        """Test that the file, size and SHA-256 match the content and reads are chunk sized"""
+
+        content = bytes(range(256)) * 1000
+        upload = ChunkedUpload(content)
+        spooled = asyncio.run(spool_upload(upload, tmp_path, chunk_size=64 * 1024))
+
+        assert spooled.path.read_bytes() == content
+        assert spooled.size == len(content)
+        assert spooled.sha256 == hashlib.sha256(content).hexdigest()
+        assert max(upload.reads) == 64 * 1024
+        with spooled.view() as view:
+            assert view[:4] == content[:4] and len(view) == len(content)
+
+        spooled.move_to(tmp_path / "job-1.bin")
+        assert [path.name for path in tmp_path.iterdir()] == ["job-1.bin"]
+
+    def test_limit_stops_mid_stream(self, tmp_path):
+        """Test that an oversized upload is cut off after the limit and leaves no file"""
+
+        upload = ChunkedUpload(b"x" * 10_000)
+        with pytest.raises(UploadTooLargeError):
+            asyncio.run(spool_upload(upload, tmp_path, max_bytes=4_000, chunk_size=1_000))
+
+        assert upload.offset == 5_000
+        assert list(tmp_path.iterdir()) == []
+
+    def test_declared_size_rejected_before_copying(self, tmp_path):
+        """Test that a declared size over the limit is refused without reading"""
+
+        upload = ChunkedUpload(b"x" * 10, size=10_000)
+        with pytest.raises(UploadTooLargeError):
+            asyncio.run(spool_upload(upload, tmp_path, max_bytes=4_000))
+        assert upload.reads == []
@@ -0,0 +1,93 @@
+import asyncio
+import threading
+import pytest # type: ignore
+
+from backend.config.worker_config import WorkerPoolConfig
+from backend.services.worker_pools import BoundedExecutor, WorkerPools, WorkerPoolSaturatedError
+
+class TestBoundedExecutor:
+
+    def test_run_returns_result(self):
+        """Test that blocking work runs in the pool and returns its result"""
+
+        pool = BoundedExecutor("test", max_workers=2, max_queue=2)
+        try:
+            assert asyncio.run(pool.run(sum, [1, 2, 3])) == 6
+            metrics = pool.get_metrics()
+            assert metrics["completed"] == 1
+            assert metrics["in_flight"] == 0
+        finally:
+            pool.shutdown()
+
+    def test_rejects_when_queue_full(self):
+        """Test that work beyond workers + queue raises a saturation error"""
+
+        pool = BoundedExecutor("test", max_workers=1, max_queue=1, retry_after_seconds=7)
+        release = threading.Event()
+
+        async def scenario():
+            running = [asyncio.ensure_future(pool.run(release.wait)) for _ in range(2)]
+            await asyncio.sleep(0.05)
+
+            assert pool.get_metrics()["queue_depth"] == 1
+            with pytest.raises(WorkerPoolSaturatedError) as exc_info:
+                await pool.run(release.wait)
+
+            release.set()
+            await asyncio.gather(*running)
+            return exc_info.value
+
+        try:
+            error = asyncio.run(scenario())
+            assert error.retry_after == 7
+            assert pool.get_metrics()["rejected"] == 1
+            assert pool.get_metrics()["max_queue_depth"] == 1
+        finally:
+            pool.shutdown()
+
+    def test_failures_are_counted(self):
+        """Test that exceptions propagate and are recorded"""
+
+        pool = BoundedExecutor("test", max_workers=1, max_queue=0)
+        try:
+            with pytest.raises(ZeroDivisionError):
+                asyncio.run(pool.run(divmod, 1, 0))
+            assert pool.get_metrics()["failed"] == 1
+        finally:
+            pool.shutdown()
+
+    def test_timed_out_work_keeps_its_slot(self):
+        """Test that a caller giving up does not free the slot while the thread still runs"""
+
+        pool = BoundedExecutor("test", max_workers=1, max_queue=0)
+        release = threading.Event()
+
+        async def scenario():
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(pool.run(release.wait), timeout=0.05)
+            assert pool.get_metrics()["in_flight"] == 1
+            with pytest.raises(WorkerPoolSaturatedError):
+                await pool.run(sum, [1])
+
+        try:
+            asyncio.run(scenario())
+            release.set()
+            pool.shutdown()
+            assert pool.get_metrics()["in_flight"] == 0
+        finally:
+            release.set()
+            pool.shutdown()
+
+class TestWorkerPools:
+
+    def test_separate_pools(self):
+        """Test that io and cpu work are routed to independent pools"""
+
+        pools = WorkerPools(WorkerPoolConfig(cpu_pool_kind="thread", cpu_max_workers=1))
+        try:
+            asyncio.run(pools.run_io(len, "abc"))
+            metrics = pools.get_metrics()
+            assert metrics["io"]["completed"] == 1
+            assert metrics["cpu"]["completed"] == 0
+        finally:
+            pools.shutdown()
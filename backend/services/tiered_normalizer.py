@@ -0,0 +1,97 @@
+import re
+import logging
+from typing import Any, Dict, List, Tuple
+
+from ..utils.data_normalizers import ComprehensiveNormalizer, DateNormalizer, TextNormalizer
+from ..utils.llm_helpers import ConfidenceCalculator
+
+logger = logging.getLogger(__name__)
+
+# Fields the rule-based tier normalizes; anything else is passed through as-is
+RULE_FIELDS = [
+    "creditor_name", "account_number", "account_type", "balance",
+    "credit_limit", "payment_status", "date_opened", "date_closed"
+]
+
+# Values ComprehensiveNormalizer returns when it could not recognise the input
+UNRESOLVED_VALUES = (None, "", "Unknown Type")
+
+# normalize_payment_status falls back to the capitalised input, so a status
+# only counts as resolved if it is one of the mapped values or "N days late"
+RESOLVED_PAYMENT_STATUSES = frozenset(TextNormalizer.PAYMENT_STATUS_MAP.values())
+DAYS_LATE_PATTERN = re.compile(r"^\d+ days late$")
+
+class RuleBasedTradelineNormalizer:
+    """Deterministic first tier of tradeline normalization.
+
+    Runs ComprehensiveNormalizer and scores the result with ConfidenceCalculator.
+    Fields that had a raw value but could not be mapped by the rules count
+    against the score, so tradelines with unfamiliar formats fall through to
+    the LLM tier instead of being stored with placeholder values.
+    """
+
+    def __init__(self):
+        self.normalizer = ComprehensiveNormalizer()
+
+    def normalize(self, raw_tradeline: Dict[str, Any]) -> Tuple[Dict[str, Any], float]:
+        """
+        Normalize a raw tradeline with rules only
+
+        Args:
+            raw_tradeline: Tradeline as produced by the extraction stage
+
+        Returns:
+            Tuple of (normalized data in the LLM response shape, confidence 0-1)
+        """
+        normalized = self.normalizer.normalize_tradeline_data(raw_tradeline)
+        normalized.pop("_normalization_stats", None)
+        if "date_closed" in normalized:
+            normalized["date_closed"] = DateNormalizer.normalize(normalized["date_closed"])
+
+        populated = [field for field in RULE_FIELDS if self._has_value(raw_tradeline.get(field))]
+        unresolved = [field for field in populated if self._is_unresolved(field, normalized.get(field))]
+
+        # Score only what the rules actually resolved
+        scored = {
+            field: normalized[field] for field in populated if field not in unresolved
+        }
+        source_quality = (len(populated) - len(unresolved)) / len(populated) if populated else 0.0
+        confidence = ConfidenceCalculator.calculate_tradeline_confidence(scored, source_quality)
+
+        result = {
+            **{key: value for key, value in raw_tradeline.items() if key not in RULE_FIELDS},
+            **{field: self._serialize(normalized.get(field)) for field in RULE_FIELDS},
+            "payment_history": raw_tradeline.get("payment_history") or [],
+            "confidence_score": confidence,
+            "normalization_notes": self._notes(unresolved)
+        }
+        return result, confidence
+
+    @staticmethod
+    def _is_unresolved(field: str, value: Any) -> bool:
+        if value in UNRESOLVED_VALUES:
+            return True
+        if field == "payment_status":
+            return value not in RESOLVED_PAYMENT_STATUSES and not DAYS_LATE_PATTERN.match(str(value))
+        return False
+
+    @staticmethod
+    def _has_value(value: Any) -> bool:
+        return value is not None and str(value).strip().lower() not in {"", "null", "n/a", "--"}
+
+    @staticmethod
+    def _serialize(value: Any) -> Any:
+        """Match the string formats the LLM tier returns (decimals, YYYY-MM-DD)"""
+        if value is None:
+            return None
+        if hasattr(value, "isoformat"):
+            return value.isoformat()
+        if not isinstance(value, str):
+            return str(value)
+        return value
+
+    @staticmethod
+    def _notes(unresolved: List[str]) -> str:
+        if unresolved:
+            return f"Rule-based normalization could not resolve: {', '.join(unresolved)}"
+        return "Rule-based normalization"
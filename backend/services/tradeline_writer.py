@@ -0,0 +1,206 @@
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Type
+
+from pydantic import BaseModel, ValidationError # type: ignore
+
+from .worker_pools import WorkerPools
+
+logger = logging.getLogger(__name__)
+
+BULK_UPSERT_FUNCTION = "upsert_tradelines_bulk"
+SINGLE_UPSERT_FUNCTION = "upsert_tradeline"
+
+# PostgREST error code for an RPC function that does not exist (migration not applied yet)
+FUNCTION_NOT_FOUND_CODE = "PGRST202"
+
+@dataclass
+class RowSaveResult:
+    """Outcome for one input tradeline; index is its position in the input list"""
+    index: int
+    saved: bool
+    tradeline_id: Optional[str] = None
+    error: Optional[str] = None
+
+@dataclass
+class BulkSaveResult:
+    """Per-row outcomes of a bulk save, in input order"""
+    results: List[RowSaveResult] = field(default_factory=list)
+    batches: int = 0
+    requests: int = 0
+    duration_seconds: float = 0.0
+
+    @property
+    def saved_count(self) -> int:
+        return sum(1 for result in self.results if result.saved)
+
+    @property
+    def failed_count(self) -> int:
+        return len(self.results) - self.saved_count
+
+    @property
+    def failures(self) -> List[RowSaveResult]:
+        return [result for result in self.results if not result.saved]
+
+    def merge(self, other: 'BulkSaveResult') -> 'BulkSaveResult':
+        """Append another save's results, shifting its indexes past this one's rows"""
+        offset = len(self.results)
+        for result in other.results:
+            result.index += offset
+            self.results.append(result)
+        self.batches += other.batches
+        self.requests += other.requests
+        self.duration_seconds = max(self.duration_seconds, other.duration_seconds)
+        return self
+
+class TradelineBulkWriter:
+    """Validate tradelines up front and upsert them in batches, one RPC round trip per batch.
+
+    Rows are validated with the tradeline schema before anything is sent;
+    rows that fail validation are reported and skipped. The valid rows go to
+    the upsert_tradelines_bulk function in batches of batch_size, which runs
+    upsert_tradeline for each row inside its own savepoint and returns a
+    per-row id or error, so one bad row does not fail its batch. If the bulk
+    function is not deployed the writer falls back to one upsert_tradeline
+    call per row.
+    """
+
+    def __init__(self, client: Any, schema: Type[BaseModel], batch_size: int = 200,
+                 max_concurrent_batches: int = 2, worker_pools: Optional[WorkerPools] = None):
+        self.client = client
+        self.schema = schema
+        self.batch_size = max(1, batch_size)
+        self.max_concurrent_batches = max(1, max_concurrent_batches)
+        self.worker_pools = worker_pools
+        self.bulk_available = True
+        self._lock = threading.Lock()
+        self.stats = {
+            'saves': 0,
+            'rows': 0,
+            'rows_saved': 0,
+            'rows_failed': 0,
+            'invalid_rows': 0,
+            'requests': 0,
+            'single_row_fallbacks': 0
+        }
+
+    async def save(self, tradelines: List[Dict[str, Any]], user_id: str) -> BulkSaveResult:
+        """Save tradelines for a user and return one result per input row"""
+        start_time = time.perf_counter()
+        results: List[Optional[RowSaveResult]] = [None] * len(tradelines)
+        rows = []
+        for index, tradeline in enumerate(tradelines):
+            try:
+                rows.append((index, self.schema(**tradeline).model_dump()))
+            except ValidationError as e:
+                logger.error(f"❌ Validation error for tradeline {index}: {e}")
+                results[index] = RowSaveResult(index=index, saved=False, error=f"validation: {e.errors()[0]['msg']}")
+            except TypeError as e:
+                results[index] = RowSaveResult(index=index, saved=False, error=f"validation: {e}")
+
+        batches = [rows[i:i + self.batch_size] for i in range(0, len(rows), self.batch_size)]
+        semaphore = asyncio.Semaphore(self.max_concurrent_batches)
+
+        async def run_batch(batch):
+            async with semaphore:
+                return await self._run(self._write_batch, batch, user_id)
+
+        requests = 0
+        for batch_results, batch_requests in await asyncio.gather(*(run_batch(batch) for batch in batches)):
+            requests += batch_requests
+            for result in batch_results:
+                results[result.index] = result
+
+        bulk_result = BulkSaveResult(
+            results=results, batches=len(batches), requests=requests,
+            duration_seconds=time.perf_counter() - start_time
+        )
+        with self._lock:
+            self.stats['saves'] += 1
+            self.stats['rows'] += len(tradelines)
+            self.stats['rows_saved'] += bulk_result.saved_count
+            self.stats['rows_failed'] += bulk_result.failed_count
+            self.stats['invalid_rows'] += len(tradelines) - len(rows)
+            self.stats['requests'] += requests
+        logger.info(f"💾 Saved {bulk_result.saved_count}/{len(tradelines)} tradelines in "
+                    f"{requests} request(s), {bulk_result.duration_seconds:.2f}s")
+        return bulk_result
+
+    async def _run(self, func, *args):
+        """Blocking client calls go to the io pool when there is one"""
+        if self.worker_pools:
+            return await self.worker_pools.run_io(func, *args)
+        return func(*args)
+
+    def _write_batch(self, batch: List[tuple], user_id: str):
+        """Upsert one batch; returns (row results, requests made)"""
+        if self.bulk_available:
+            try:
+                response = self.client.rpc(BULK_UPSERT_FUNCTION, {
+                    'p_user_id': user_id,
+                    'p_tradelines': [row for _, row in batch]
+                }).execute()
+                return self._bulk_results(batch, response.data or []), 1
+            except Exception as e:
+                if not self._is_missing_function(e):
+                    logger.error(f"❌ Bulk tradeline upsert failed for {len(batch)} rows: {e}")
+                    return [RowSaveResult(index=index, saved=False, error=str(e)) for index, _ in batch], 1
+                logger.warning(f"⚠️ {BULK_UPSERT_FUNCTION} is not deployed, saving rows one at a time")
+                self.bulk_available = False
+
+        with self._lock:
+            self.stats['single_row_fallbacks'] += 1
+        return [self._write_row(index, row, user_id) for index, row in batch], len(batch)
+
+    def _bulk_results(self, batch: List[tuple], data: List[Dict[str, Any]]) -> List[RowSaveResult]:
+        """Map the function's per-row output (ordinal, id, error) back to input indexes"""
+        by_ordinal = {item.get('ordinal'): item for item in data if isinstance(item, dict)}
+        results = []
+        for ordinal, (index, _) in enumerate(batch):
+            item = by_ordinal.get(ordinal)
+            if item is None:
+                results.append(RowSaveResult(index=index, saved=False, error="no result returned for row"))
+            elif item.get('error'):
+                results.append(RowSaveResult(index=index, saved=False, error=item['error']))
+            else:
+                results.append(RowSaveResult(index=index, saved=True, tradeline_id=item.get('id')))
+        return results
+
+    def _write_row(self, index: int, row: Dict[str, Any], user_id: str) -> RowSaveResult:
+        """Fallback path: the original one-RPC-per-row upsert"""
+        try:
+            response = self.client.rpc(SINGLE_UPSERT_FUNCTION, {
+                'p_account_balance': row['account_balance'],
+                'p_account_number': row['account_number'],
+                'p_account_status': row['account_status'],
+                'p_account_type': row['account_type'],
+                'p_credit_bureau': row['credit_bureau'],
+                'p_credit_limit': row['credit_limit'],
+                'p_creditor_name': row['creditor_name'],
+                'p_date_opened': row['date_opened'],
+                'p_is_negative': row['is_negative'],
+                'p_monthly_payment': row['monthly_payment'],
+                'p_user_id': user_id
+            }).execute()
+        except Exception as e:
+            logger.error(f"❌ Database error while saving tradeline {index}: {e}")
+            return RowSaveResult(index=index, saved=False, error=str(e))
+        if not response.data:
+            return RowSaveResult(index=index, saved=False, error="no data returned")
+        return RowSaveResult(index=index, saved=True, tradeline_id=response.data if isinstance(response.data, str) else None)
+
+    @staticmethod
+    def _is_missing_function(error: Exception) -> bool:
+        return getattr(error, "code", None) == FUNCTION_NOT_FOUND_CODE or "Could not find the function" in str(error)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get row, request and fallback counters"""
+        with self._lock:
+            return {
+                **self.stats,
+                'batch_size': self.batch_size,
+                'bulk_available': self.bulk_available
+            }
@@ -0,0 +1,177 @@
+import asyncio
+import functools
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from ..config.worker_config import WorkerPoolConfig
+
+logger = logging.getLogger(__name__)
+
+class WorkerPoolSaturatedError(Exception):
+    """Raised when a pool's queue is full and new work must be rejected"""
+
+    def __init__(self, pool_name: str, retry_after: int):
+        super().__init__(f"Worker pool '{pool_name}' is saturated, retry after {retry_after}s")
+        self.pool_name = pool_name
+        self.retry_after = retry_after
+
+class BoundedExecutor:
+    """Executor wrapper that caps queued work and tracks queue depth"""
+
+    def __init__(self, name: str, max_workers: int, max_queue: int,
+                 kind: str = "thread", retry_after_seconds: int = 5):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.kind = kind
+        self.retry_after_seconds = retry_after_seconds
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.stats = {
+            'submitted': 0,
+            'completed': 0,
+            'failed': 0,
+            'rejected': 0,
+            'max_queue_depth': 0,
+            'total_run_seconds': 0.0
+        }
+
+    @property
+    def executor(self) -> Executor:
+        """Create the underlying executor on first use"""
+        if self._executor is None:
+            if self.kind == "process":
+                # spawn avoids forking a process that holds gRPC/HTTP client threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix=f"{self.name}-worker"
+                )
+            logger.info(f"Started {self.kind} pool '{self.name}' with {self.max_workers} workers")
+        return self._executor
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of submitted tasks waiting for a free worker"""
+        return max(self._in_flight - self.max_workers, 0)
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a blocking callable in the pool without blocking the event loop"""
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queue:
+                self.stats['rejected'] += 1
+                raise WorkerPoolSaturatedError(self.name, self.retry_after_seconds)
+            self._in_flight += 1
+            self.stats['submitted'] += 1
+            self.stats['max_queue_depth'] = max(self.stats['max_queue_depth'], self.queue_depth)
+
+        start_time = time.perf_counter()
+        try:
+            future = self.executor.submit(functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            self._finish(None, start_time)
+            raise
+        # The slot is freed when the work itself ends, not when the caller stops
+        # waiting: a cancelled await (timeout, disconnect) leaves a started job running
+        future.add_done_callback(lambda done: self._finish(done, start_time))
+        return await asyncio.wrap_future(future)
+
+    def _finish(self, future: Optional[Future], start_time: float) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self.stats['total_run_seconds'] += time.perf_counter() - start_time
+            if future is None or future.cancelled() or future.exception() is not None:
+                self.stats['failed'] += 1
+            else:
+                self.stats['completed'] += 1
+
+    def warm_up(self) -> None:
+        """Start workers ahead of the first request (process pools spawn lazily)"""
+        if self.kind == "process":
+            for _ in range(self.max_workers):
+                self.executor.submit(os.getpid)
+        else:
+            self.executor  # creates the thread pool
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get current pool metrics"""
+        with self._lock:
+            return {
+                **self.stats,
+                'kind': self.kind,
+                'max_workers': self.max_workers,
+                'max_queue': self.max_queue,
+                'in_flight': self._in_flight,
+                'active': min(self._in_flight, self.max_workers),
+                'queue_depth': self.queue_depth
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the underlying executor"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+            logger.info(f"Stopped pool '{self.name}'")
+
+class WorkerPools:
+    """Separate bounded pools for network-bound and CPU-bound blocking work"""
+
+    def __init__(self, config: WorkerPoolConfig):
+        self.config = config
+        self.io = BoundedExecutor(
+            "io",
+            max_workers=config.io_max_workers,
+            max_queue=config.io_max_queue,
+            kind="thread",
+            retry_after_seconds=config.retry_after_seconds
+        )
+        self.cpu = BoundedExecutor(
+            "cpu",
+            max_workers=config.cpu_max_workers,
+            max_queue=config.cpu_max_queue,
+            kind=config.cpu_pool_kind,
+            retry_after_seconds=config.retry_after_seconds
+        )
+
+    @classmethod
+    def from_env(cls) -> 'WorkerPools':
+        """Create pools from environment variables"""
+        return cls(WorkerPoolConfig.from_env())
+
+    async def run_io(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a blocking network call (Document AI, Gemini) off the event loop"""
+        return await self.io.run(fn, *args, **kwargs)
+
+    async def run_cpu(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run CPU-bound work (PDF parsing) off the event loop.
+
+        With a process pool, fn and its arguments must be picklable.
+        """
+        return await self.cpu.run(fn, *args, **kwargs)
+
+    def warm_up(self) -> None:
+        """Start all pools ahead of the first request"""
+        self.io.warm_up()
+        self.cpu.warm_up()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get metrics for all pools"""
+        return {
+            'io': self.io.get_metrics(),
+            'cpu': self.cpu.get_metrics()
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down all pools"""
+        self.io.shutdown(wait=wait)
+        self.cpu.shutdown(wait=wait)
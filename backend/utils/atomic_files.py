@@ -0,0 +1,81 @@
+import os
+import json
+import tempfile
+from pathlib import Path
+from typing import Any, List, Union
+
+PathLike = Union[str, Path]
+
+TEMP_SUFFIX = ".tmp"
+
+def atomic_write_bytes(path: PathLike, data: bytes, durable: bool = True) -> None:
+    """
+    Write a file so readers see either the old content or the complete new content
+
+    Data goes to a temp file in the same directory, is flushed (and fsynced
+    when durable), then renamed over the target; a crash part way leaves at
+    most a stray temp file, never a truncated target.
+    """
+    path = Path(path)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=TEMP_SUFFIX)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            if durable:
+                os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+    if durable:
+        fsync_directory(path.parent)
+
+def atomic_write_json(path: PathLike, obj: Any, indent: int = 2, durable: bool = True) -> None:
+    """Serialize and atomically write JSON"""
+    atomic_write_bytes(path, json.dumps(obj, indent=indent).encode('utf-8'), durable=durable)
+
+def read_bytes(path: PathLike) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+def read_json(path: PathLike) -> Any:
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def remove_files_older_than(directory: PathLike, cutoff_timestamp: float) -> List[Path]:
+    """Delete files (including stray temp files) last modified before the cutoff"""
+    removed = []
+    for file_path in Path(directory).iterdir():
+        if file_path.is_file() and file_path.stat().st_mtime < cutoff_timestamp:
+            file_path.unlink(missing_ok=True)
+            removed.append(file_path)
+    return removed
+
+def remove_stale_temp_files(directory: PathLike, cutoff_timestamp: float) -> List[Path]:
+    """Delete temp files left by interrupted atomic writes, anywhere under directory, last modified before the cutoff"""
+    removed = []
+    for file_path in Path(directory).rglob(f".*{TEMP_SUFFIX}"):
+        try:
+            if file_path.is_file() and file_path.stat().st_mtime < cutoff_timestamp:
+                file_path.unlink(missing_ok=True)
+                removed.append(file_path)
+        except FileNotFoundError:
+            continue
+    return removed
+
+def fsync_directory(directory: Path) -> None:
+    """Persist the rename itself (POSIX); not supported on Windows"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
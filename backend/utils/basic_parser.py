@@ -0,0 +1,153 @@
+import re
+import logging
+from typing import Iterable, List, Dict, Any
+
+from .creditor_registry import get_creditor_registry
+from .pdf_text import iter_text_lines
+
+logger = logging.getLogger(__name__)
+
+# Field patterns for basic parsing, compiled once; lists are checked in order
+ACCOUNT_NUMBER_PATTERNS = [
+    re.compile(r'\*{4,}\d{4}', re.IGNORECASE),  # ****1234
+    re.compile(r'x{4,}\d{4}', re.IGNORECASE),   # xxxx1234
+    re.compile(r'\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}', re.IGNORECASE),  # Full card numbers
+    re.compile(r'Account\s*#?\s*:?\s*(\d+)', re.IGNORECASE),  # Account #: 123456
+    re.compile(r'Acct\s*#?\s*:?\s*(\d+)', re.IGNORECASE)     # Acct #: 123456
+]
+DOLLAR_AMOUNT_PATTERN = re.compile(r'\$[\d,]+\.?\d*')
+DATE_PATTERNS = [
+    re.compile(r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}', re.IGNORECASE),  # MM/DD/YYYY or MM-DD-YYYY
+    re.compile(r'\d{2,4}[/-]\d{1,2}[/-]\d{1,2}', re.IGNORECASE),  # YYYY/MM/DD or YYYY-MM-DD
+    re.compile(r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{1,2},?\s+\d{4}', re.IGNORECASE),  # Month DD, YYYY
+    re.compile(r'\d{1,2}\s+(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{4}', re.IGNORECASE)  # DD Month YYYY
+]
+STATUS_PATTERNS = {
+    'Current': re.compile(r'current|open|active|good standing', re.IGNORECASE),
+    'Closed': re.compile(r'closed|terminated|paid off|satisfied', re.IGNORECASE),
+    'Late': re.compile(r'late|delinquent|past due|30 days|60 days|90 days', re.IGNORECASE),
+    'Charged Off': re.compile(r'charged off|charge off|written off', re.IGNORECASE),
+    'Collection': re.compile(r'collection|collections|assigned', re.IGNORECASE)
+}
+BUREAU_PATTERNS = {
+    'Experian': re.compile(r'experian|exp\b', re.IGNORECASE),
+    'Equifax': re.compile(r'equifax|eqf\b', re.IGNORECASE),
+    'TransUnion': re.compile(r'transunion|trans union|tru\b', re.IGNORECASE)
+}
+# Single-scan prefilters so lines without any account/status/bureau text skip the ordered checks
+ACCOUNT_NUMBER_ANY_PATTERN = re.compile('|'.join(p.pattern for p in ACCOUNT_NUMBER_PATTERNS), re.IGNORECASE)
+STATUS_ANY_PATTERN = re.compile('|'.join(p.pattern for p in STATUS_PATTERNS.values()), re.IGNORECASE)
+BUREAU_ANY_PATTERN = re.compile('|'.join(p.pattern for p in BUREAU_PATTERNS.values()), re.IGNORECASE)
+BALANCE_KEYWORDS = ['balance', 'amount', 'owed', 'debt']
+LIMIT_KEYWORDS = ['limit', 'credit limit', 'maximum']
+PAYMENT_KEYWORDS = ['payment', 'monthly', 'minimum']
+
+def parse_tradelines_basic(text: str) -> List[Dict[str, Any]]:
+    """Basic tradeline parsing as backup when Document AI and Gemini are unavailable"""
+    return parse_tradeline_lines(iter_text_lines(text))
+
+def parse_tradeline_lines(lines: Iterable[str]) -> List[Dict[str, Any]]:
+    """Basic tradeline parsing over a line stream.
+
+    Lines are consumed lazily, so a page stream from pdf_text.iter_page_lines
+    can be parsed without first joining the whole report into one string.
+    """
+    try:
+        logger.info("🔧 Using basic tradeline parsing as fallback")
+        tradelines = []
+        creditor_registry = get_creditor_registry()
+        
+        current_tradeline = {}
+        
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            
+            # Look for creditor names (one trie scan over the whole registry)
+            creditor_match = creditor_registry.find_in_text(line)
+            if creditor_match:
+                # Save previous tradeline if it exists
+                if current_tradeline and current_tradeline.get("creditor_name"):
+                    tradelines.append(current_tradeline)
+                
+                creditor_name, creditor = creditor_match
+                current_tradeline = {
+                    "creditor_name": creditor_name,
+                    "account_type": creditor.account_type,
+                    "account_status": "Open",
+                    "credit_bureau": "Unknown", 
+                    "is_negative": False,
+                    "account_balance": "",
+                    "credit_limit": "",
+                    "monthly_payment": "",
+                    "account_number": "",
+                    "date_opened": "",
+                    "dispute_count": 0
+                }
+            
+            # Enhance data extraction for current tradeline
+            if current_tradeline:
+                # Look for account numbers (various formats)
+                if ACCOUNT_NUMBER_ANY_PATTERN.search(line):
+                    for pattern in ACCOUNT_NUMBER_PATTERNS:
+                        account_match = pattern.search(line)
+                        if account_match:
+                            current_tradeline["account_number"] = account_match.group(0)
+                            break
+                
+                # Look for dollar amounts with better context
+                dollar_matches = DOLLAR_AMOUNT_PATTERN.findall(line)
+                line_lower = line.lower()
+                
+                for amount in dollar_matches:
+                    # Check context for balance
+                    if any(kw in line_lower for kw in BALANCE_KEYWORDS) and not current_tradeline["account_balance"]:
+                        current_tradeline["account_balance"] = amount
+                    # Check context for credit limit
+                    elif any(kw in line_lower for kw in LIMIT_KEYWORDS) and not current_tradeline["credit_limit"]:
+                        current_tradeline["credit_limit"] = amount
+                    # Check context for payment
+                    elif any(kw in line_lower for kw in PAYMENT_KEYWORDS) and not current_tradeline["monthly_payment"]:
+                        current_tradeline["monthly_payment"] = amount
+                    # Default assignment if no context
+                    elif not current_tradeline["account_balance"]:
+                        current_tradeline["account_balance"] = amount
+                    elif not current_tradeline["credit_limit"]:
+                        current_tradeline["credit_limit"] = amount
+                
+                # Look for dates (only the first one is kept)
+                if not current_tradeline["date_opened"]:
+                    for pattern in DATE_PATTERNS:
+                        date_match = pattern.search(line)
+                        if date_match:
+                            current_tradeline["date_opened"] = date_match.group(0)
+                            break
+                
+                # Look for status indicators
+                if STATUS_ANY_PATTERN.search(line):
+                    for status, pattern in STATUS_PATTERNS.items():
+                        if pattern.search(line):
+                            current_tradeline["account_status"] = status
+                            # Mark as negative if it's a bad status
+                            if status in ['Late', 'Charged Off', 'Collection']:
+                                current_tradeline["is_negative"] = True
+                            break
+                
+                # Look for credit bureau mentions
+                if BUREAU_ANY_PATTERN.search(line):
+                    for bureau, pattern in BUREAU_PATTERNS.items():
+                        if pattern.search(line):
+                            current_tradeline["credit_bureau"] = bureau
+                            break
+        
+        # Add the last tradeline if it exists
+        if current_tradeline and current_tradeline.get("creditor_name"):
+            tradelines.append(current_tradeline)
+        
+        logger.info(f"✅ Basic parsing extracted {len(tradelines)} tradelines")
+        return tradelines
+        
+    except Exception as e:
+        logger.error(f"❌ Basic parsing failed: {str(e)}")
+        return []
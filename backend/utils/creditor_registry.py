@@ -0,0 +1,162 @@
+import os
+import re
+import json
+import logging
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REGISTRY_PATH = Path(__file__).resolve().parent.parent / "data" / "creditors.json"
+
+# Trie key marking the end of an alias; never collides with a one-character key
+_END = ""
+
+@dataclass
+class CreditorEntry:
+    """One creditor with the names it appears under in reports"""
+    canonical_name: str
+    aliases: List[str]
+    account_type: str = "Credit Card"
+    priority: int = 0
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+def normalize_key(name: str) -> str:
+    """Case- and whitespace-insensitive key for exact name lookups"""
+    return " ".join(name.upper().split())
+
+def build_trie_pattern(words: List[str]) -> str:
+    """Build a regex from a prefix trie of words so shared prefixes are tested once"""
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[_END] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if _END in node else body
+
+    return build(trie)
+
+class CreditorRegistry:
+    """Creditor names, aliases and default account types loaded from a data file.
+
+    Two indexes are built once:
+      - a hash of normalized aliases and canonical names for exact lookups
+        (normalizers), O(length of the name);
+      - a character trie of aliases for finding creditors mentioned inside a
+        line (basic parser). A trie-shaped regex finds candidate start
+        positions in one C-level scan, and the trie walk from each candidate
+        costs O(alias length), independent of how many creditors are listed.
+
+    Entries are in priority order: when a line mentions several creditors the
+    earliest entry wins, and among its aliases the leftmost occurrence (then
+    the alias listed first) gives the matched text.
+    """
+
+    def __init__(self, entries: List[CreditorEntry]):
+        self.entries = entries
+        self._by_name: Dict[str, CreditorEntry] = {}
+        self._trie: Dict[str, Any] = {}
+
+        for priority, entry in enumerate(entries):
+            entry.priority = priority
+            for order, alias in enumerate(entry.aliases):
+                self._by_name.setdefault(normalize_key(alias), entry)
+                self._insert(alias.lower(), (priority, order, entry))
+            self._by_name.setdefault(normalize_key(entry.canonical_name), entry)
+
+        aliases = sorted({alias.lower() for entry in entries for alias in entry.aliases})
+        self._start_pattern = re.compile(f"(?={build_trie_pattern(aliases)})", re.IGNORECASE) if aliases else None
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> 'CreditorRegistry':
+        """Load a registry from a JSON file with a "creditors" list"""
+        registry_path = Path(path) if path else DEFAULT_REGISTRY_PATH
+        with open(registry_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        entries = [
+            CreditorEntry(
+                canonical_name=item["canonical_name"],
+                aliases=item.get("aliases") or [item["canonical_name"]],
+                account_type=item.get("account_type", "Credit Card"),
+                metadata={k: v for k, v in item.items() if k not in {"canonical_name", "aliases", "account_type"}}
+            )
+            for item in data["creditors"]
+        ]
+        logger.info(f"Loaded {len(entries)} creditors from {registry_path}")
+        return cls(entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def lookup(self, name: str) -> Optional[CreditorEntry]:
+        """Exact match of a creditor name or alias, ignoring case and spacing"""
+        if not name:
+            return None
+        return self._by_name.get(normalize_key(name))
+
+    def find_in_text(self, text: str) -> Optional[Tuple[str, CreditorEntry]]:
+        """
+        Find the highest-priority creditor mentioned anywhere in text
+
+        Args:
+            text: A line of report text
+
+        Returns:
+            (alias as written in the text, entry), or None
+        """
+        if not text or self._start_pattern is None:
+            return None
+
+        best: Optional[Tuple[int, int, int, int, CreditorEntry]] = None
+        length = len(text)
+        for match in self._start_pattern.finditer(text):
+            start = match.start()
+            node = self._trie
+            position = start
+            while position < length:
+                node = node.get(text[position].lower())
+                if node is None:
+                    break
+                position += 1
+                terminal = node.get(_END)
+                if terminal is not None:
+                    priority, order, entry = terminal
+                    candidate = (priority, start, order, position, entry)
+                    if best is None or candidate[:3] < best[:3]:
+                        best = candidate
+            if best is not None and best[0] == 0:
+                break
+
+        if best is None:
+            return None
+        _, start, _, end, entry = best
+        return text[start:end], entry
+
+    def _insert(self, alias: str, terminal: Tuple[int, int, CreditorEntry]) -> None:
+        node = self._trie
+        for ch in alias:
+            node = node.setdefault(ch, {})
+        # Keep the first (highest-priority) owner of a duplicated alias
+        node.setdefault(_END, terminal)
+
+_registry: Optional[CreditorRegistry] = None
+_registry_lock = threading.Lock()
+
+def get_creditor_registry() -> CreditorRegistry:
+    """Get the process-wide registry, loading it on first use"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = CreditorRegistry.load(os.getenv("CREDITOR_REGISTRY_PATH"))
+    return _registry
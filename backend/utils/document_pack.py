@@ -0,0 +1,172 @@
+"""
+Compact container for stored document artifacts
+
+Layout: magic, a 4-byte header length, a small plain-JSON header, then
+independently compressed sections. The header carries the summary fields
+and each section's offset and length, so a reader can answer "what is the
+confidence score / how many tables" by reading only the first few hundred
+bytes, and load one section without touching the others.
+
+Sections are serialized with msgpack and compressed with zstd when those
+packages are installed, otherwise with compact JSON and zlib; the codecs
+used are recorded in the header, so a file is always read back the way it
+was written.
+"""
+import json
+import zlib
+import struct
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+try:
+    import msgpack # type: ignore
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard # type: ignore
+except ImportError:
+    zstandard = None
+
+PathLike = Union[str, Path]
+
+PACK_MAGIC = b"DPK1"
+PACK_SUFFIX = ".dpk"
+_HEADER_LENGTH = struct.Struct(">I")
+
+DEFAULT_SERIALIZER = "msgpack" if msgpack else "json"
+DEFAULT_COMPRESSION = "zstd" if zstandard else "zlib"
+
+# Key that replaces a block's content with a [start, end) slice of the canonical text
+TEXT_SPAN_KEY = "text_span"
+
+class DocumentPackError(ValueError):
+    """Not a document pack, or written with a codec that is not installed"""
+
+def _serialize(obj: Any, serializer: str) -> bytes:
+    if serializer == "msgpack":
+        return msgpack.packb(obj, use_bin_type=True)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+def _deserialize(data: bytes, serializer: str) -> Any:
+    if serializer == "msgpack":
+        return msgpack.unpackb(data, raw=False)
+    return json.loads(data)
+
+def _compress(data: bytes, compression: str) -> bytes:
+    if compression == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return zlib.compress(data, 6)
+
+def _decompress(data: bytes, compression: str) -> bytes:
+    if compression == "zstd":
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+def _check_codecs(serializer: str, compression: str) -> None:
+    if serializer not in ("msgpack", "json") or (serializer == "msgpack" and msgpack is None):
+        raise DocumentPackError(f"Serializer not available: {serializer}")
+    if compression not in ("zstd", "zlib") or (compression == "zstd" and zstandard is None):
+        raise DocumentPackError(f"Compression not available: {compression}")
+
+def pack_document(summary: Dict[str, Any], sections: Dict[str, Any],
+                  serializer: Optional[str] = None, compression: Optional[str] = None) -> bytes:
+    """Encode a summary (kept uncompressed in the header) and named sections into one blob"""
+    serializer = serializer or DEFAULT_SERIALIZER
+    compression = compression or DEFAULT_COMPRESSION
+    _check_codecs(serializer, compression)
+
+    index = {}
+    chunks = []
+    offset = 0
+    for name, value in sections.items():
+        chunk = _compress(_serialize(value, serializer), compression)
+        index[name] = [offset, len(chunk)]
+        chunks.append(chunk)
+        offset += len(chunk)
+
+    header = json.dumps({
+        "serializer": serializer,
+        "compression": compression,
+        "summary": summary,
+        "sections": index
+    }, separators=(",", ":")).encode("utf-8")
+    return b"".join([PACK_MAGIC, _HEADER_LENGTH.pack(len(header)), header, *chunks])
+
+class DocumentPack:
+    """Lazy reader: opening parses the header only, sections are read on demand"""
+
+    def __init__(self, path: PathLike, header: Dict[str, Any], data_offset: int):
+        self.path = Path(path)
+        self.serializer = header["serializer"]
+        self.compression = header["compression"]
+        self.summary: Dict[str, Any] = header.get("summary", {})
+        self.sections: Dict[str, List[int]] = header.get("sections", {})
+        self.data_offset = data_offset
+
+    @classmethod
+    def open(cls, path: PathLike) -> 'DocumentPack':
+        with open(path, 'rb') as f:
+            prefix = f.read(len(PACK_MAGIC) + _HEADER_LENGTH.size)
+            if len(prefix) < len(PACK_MAGIC) + _HEADER_LENGTH.size or not prefix.startswith(PACK_MAGIC):
+                raise DocumentPackError(f"Not a document pack: {path}")
+            (header_length,) = _HEADER_LENGTH.unpack_from(prefix, len(PACK_MAGIC))
+            header = json.loads(f.read(header_length))
+        return cls(path, header, len(prefix) + header_length)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.sections
+
+    def read_section(self, name: str, default: Any = None) -> Any:
+        """Decode one section; only its bytes are read from disk"""
+        return self.read_sections([name]).get(name, default)
+
+    def read_sections(self, names: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Decode several sections (all by default) with a single open"""
+        names = list(self.sections) if names is None else [name for name in names if name in self.sections]
+        _check_codecs(self.serializer, self.compression)
+        result = {}
+        with open(self.path, 'rb') as f:
+            for name in names:
+                offset, length = self.sections[name]
+                f.seek(self.data_offset + offset)
+                result[name] = _deserialize(_decompress(f.read(length), self.compression), self.serializer)
+        return result
+
+def reference_text_spans(text: str, blocks: List[Dict[str, Any]], content_key: str = "content") -> List[Dict[str, Any]]:
+    """
+    Replace each block's content with its [start, end) span in text
+
+    Blocks are searched for in order from the end of the previous match, so
+    page blocks taken from the text they were joined into map back one to
+    one. A block whose content is not found in text keeps its content.
+    """
+    referenced = []
+    cursor = 0
+    for block in blocks:
+        content = block.get(content_key)
+        entry = {key: value for key, value in block.items() if key != content_key}
+        start = text.find(content, cursor) if isinstance(content, str) else -1
+        if start < 0 and isinstance(content, str):
+            start = text.find(content)
+        if start >= 0:
+            entry[TEXT_SPAN_KEY] = [start, start + len(content)]
+            cursor = start + len(content)
+        elif content_key in block:
+            entry[content_key] = content
+        referenced.append(entry)
+    return referenced
+
+def resolve_text_spans(text: str, blocks: List[Dict[str, Any]], content_key: str = "content") -> List[Dict[str, Any]]:
+    """Inverse of reference_text_spans: put each block's content back from the text"""
+    resolved = []
+    for block in blocks:
+        span = block.get(TEXT_SPAN_KEY)
+        if span is None:
+            resolved.append(block)
+            continue
+        start, end = span
+        entry = {content_key: text[start:end]}
+        entry.update((key, value) for key, value in block.items() if key != TEXT_SPAN_KEY)
+        resolved.append(entry)
+    return resolved
@@ -0,0 +1,95 @@
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+SSE_MEDIA_TYPE = "text/event-stream"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+EventCallback = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+# Headers that stop proxies (nginx, Cloud Run) from buffering the stream
+STREAM_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no"
+}
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    """One Server-Sent Events frame"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+def format_ndjson(event: str, data: Dict[str, Any]) -> str:
+    """One newline-delimited JSON record"""
+    return json.dumps({"event": event, "data": data}, default=str) + "\n"
+
+def heartbeat_frame(media_type: str) -> str:
+    """Keep-alive bytes for an idle stream; SSE clients ignore comment lines"""
+    if media_type == SSE_MEDIA_TYPE:
+        return ": keep-alive\n\n"
+    return format_ndjson("heartbeat", {})
+
+def choose_media_type(stream_format: Optional[str], accept: Optional[str]) -> str:
+    """Pick SSE or NDJSON from an explicit format, else the Accept header (SSE by default)"""
+    if stream_format:
+        return NDJSON_MEDIA_TYPE if stream_format.lower() in ("ndjson", "jsonl") else SSE_MEDIA_TYPE
+    if accept and NDJSON_MEDIA_TYPE in accept:
+        return NDJSON_MEDIA_TYPE
+    return SSE_MEDIA_TYPE
+
+async def stream_events(
+    work: Callable[[EventCallback], Awaitable[Dict[str, Any]]],
+    media_type: str = SSE_MEDIA_TYPE,
+    heartbeat_seconds: float = 15.0,
+    on_error: Optional[Callable[[BaseException], Dict[str, Any]]] = None
+) -> AsyncIterator[str]:
+    """
+    Run work in the background and yield its events as SSE or NDJSON frames
+
+    work receives an emit(event, data) callback and returns the final summary,
+    which is sent as a "summary" event. A failure is sent as an "error" event
+    (on_error turns the exception into its payload). While nothing happens a
+    heartbeat goes out every heartbeat_seconds so proxies do not drop the
+    connection. If the consumer stops reading (client disconnect), the work
+    is cancelled.
+    """
+    formatter = format_ndjson if media_type == NDJSON_MEDIA_TYPE else format_sse
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def emit(event: str, data: Dict[str, Any]) -> None:
+        queue.put_nowait(formatter(event, data))
+
+    task = asyncio.ensure_future(work(emit))
+    getter = None
+    try:
+        while True:
+            getter = asyncio.ensure_future(queue.get())
+            done, _ = await asyncio.wait({getter, task}, timeout=heartbeat_seconds,
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if getter in done:
+                yield getter.result()
+                continue
+            getter.cancel()
+            if task in done:
+                break
+            yield heartbeat_frame(media_type)
+
+        # Flush events queued just before the work finished
+        while not queue.empty():
+            yield queue.get_nowait()
+
+        error = task.exception()
+        if error is None:
+            yield formatter("summary", task.result())
+        else:
+            logger.error(f"❌ Streaming work failed: {error}")
+            payload = on_error(error) if on_error else {"detail": str(error)}
+            yield formatter("error", payload)
+    finally:
+        if getter is not None:
+            getter.cancel()
+        if not task.done():
+            logger.warning("🔌 Stream closed before processing finished, cancelling")
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
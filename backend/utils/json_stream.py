@@ -0,0 +1,116 @@
+import re
+import json
+from typing import Any, Iterable, Iterator, List, Optional
+
+# Characters that change nesting or string state; everything else is skipped in C
+_STRUCTURAL = re.compile(r'["\[\]{}]')
+_STRING_END = re.compile(r'["\\]')
+
+class IncrementalJSONArrayParser:
+    """
+    Parse the elements of a JSON array as the text arrives
+
+    Feed response chunks as they stream in; each object (or nested array)
+    element of the first array in the stream is returned as soon as its
+    closing bracket arrives. Text before the JSON (markdown fences, prose) is
+    skipped, and the first array may be wrapped in an object, e.g.
+    {"tradelines": [...]}. Scalar elements are ignored.
+
+    The scanner only stops at quotes, backslashes inside strings and
+    brackets, so the per-character work happens in the regex engine; each
+    finished element is decoded once with json.loads. Buffered text is
+    released after every emitted element.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._position = 0          # next unscanned character in _buffer
+        self._depth = 0             # nesting depth at _position
+        self._in_string = False
+        self._item_depth: Optional[int] = None  # depth of elements in the target array
+        self._item_start: Optional[int] = None  # buffer offset of the element being read
+        self.finished = False
+        self.items_emitted = 0
+
+    def feed(self, chunk: str) -> List[Any]:
+        """Add a chunk of text and return the elements it completed"""
+        if self.finished or not chunk:
+            return []
+        self._buffer += chunk
+        items = []
+
+        while not self.finished:
+            if self._in_string:
+                match = _STRING_END.search(self._buffer, self._position)
+                if match is None:
+                    self._position = len(self._buffer)
+                    break
+                if match.group() == "\\":
+                    if match.end() >= len(self._buffer):
+                        # The escaped character has not arrived yet
+                        self._position = match.start()
+                        break
+                    self._position = match.end() + 1
+                    continue
+                self._in_string = False
+                self._position = match.end()
+                continue
+
+            match = _STRUCTURAL.search(self._buffer, self._position)
+            if match is None:
+                self._position = len(self._buffer)
+                break
+            ch = match.group()
+            self._position = match.end()
+
+            if ch == '"':
+                # Strings only count inside the JSON; quotes in leading prose are ignored
+                self._in_string = self._depth > 0
+            elif ch in "[{":
+                if self._item_depth is not None and self._depth == self._item_depth:
+                    self._item_start = match.start()
+                self._depth += 1
+                if ch == "[" and self._item_depth is None:
+                    self._item_depth = self._depth
+            else:
+                self._depth = max(self._depth - 1, 0)
+                if self._item_depth is not None and self._depth == self._item_depth and self._item_start is not None:
+                    items.append(json.loads(self._buffer[self._item_start:self._position]))
+                    self.items_emitted += 1
+                    self._release()
+                elif self._item_depth is not None and self._depth < self._item_depth:
+                    self.finished = True
+
+        if self._item_start is None:
+            self._release()
+        return items
+
+    def _release(self) -> None:
+        """Drop text that belongs to elements already emitted"""
+        self._buffer = self._buffer[self._position:]
+        self._position = 0
+        self._item_start = None
+
+def iter_json_array_items(chunks: Iterable[str]) -> Iterator[Any]:
+    """Yield array elements from an iterable of text chunks as they complete"""
+    parser = IncrementalJSONArrayParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+
+def extract_json_value(text: str, start_chars: str = "[{") -> Optional[str]:
+    """
+    Return the JSON value starting at the first of start_chars in text, without fences or prose
+
+    The end of the value is found by the C decoder instead of a Python
+    bracket walk, so brackets inside strings are handled correctly.
+    Returns None if there is no decodable value there.
+    """
+    starts = [index for index in (text.find(ch) for ch in start_chars) if index >= 0]
+    if not starts:
+        return None
+    start = min(starts)
+    try:
+        _, end = json.JSONDecoder().raw_decode(text, start)
+    except json.JSONDecodeError:
+        return None
+    return text[start:end]
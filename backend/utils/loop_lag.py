@@ -0,0 +1,60 @@
+import asyncio
+import time
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+class EventLoopLagMonitor:
+    """
+    Measure how late the event loop wakes up a periodic timer
+
+    A task sleeps for interval_seconds in a loop; any extra delay before it
+    runs again is time the loop spent blocked by synchronous work. Keeps the
+    worst lag seen and a window of recent samples for percentiles.
+    """
+
+    def __init__(self, interval_seconds: float = 0.01, window: int = 5000):
+        self.interval_seconds = interval_seconds
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._task: Optional[asyncio.Task] = None
+        self._lock = threading.Lock()
+        self.max_lag_seconds = 0.0
+
+    def start(self) -> None:
+        """Start sampling on the running loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+            self.max_lag_seconds = 0.0
+
+    async def _run(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.interval_seconds
+            await asyncio.sleep(self.interval_seconds)
+            lag = max(time.perf_counter() - expected, 0.0)
+            with self._lock:
+                self._samples.append(lag)
+                self.max_lag_seconds = max(self.max_lag_seconds, lag)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Lag in milliseconds: worst ever, and p50/p99 over the recent window"""
+        with self._lock:
+            samples = sorted(self._samples)
+            max_lag = self.max_lag_seconds
+        if not samples:
+            return {'samples': 0, 'max_lag_ms': 0.0, 'p50_lag_ms': 0.0, 'p99_lag_ms': 0.0}
+        return {
+            'samples': len(samples),
+            'max_lag_ms': max_lag * 1000,
+            'p50_lag_ms': samples[len(samples) // 2] * 1000,
+            'p99_lag_ms': samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000
+        }
@@ -0,0 +1,158 @@
+import io
+import os
+import mmap
+from dataclasses import dataclass
+from typing import BinaryIO, Iterable, Iterator, List, Tuple, Union
+
+import PyPDF2 # type: ignore
+
+# In-memory content, an open binary file (or mmap), or the path of a stored PDF.
+# Paths are what to hand a process pool: each worker maps the file itself.
+PdfSource = Union[bytes, bytearray, memoryview, BinaryIO, mmap.mmap, str, os.PathLike]
+
+@dataclass
+class PdfPage:
+    """Text of a single PDF page (page_number is 1-based)"""
+    page_number: int
+    text: str
+
+def map_file(path: Union[str, os.PathLike]) -> mmap.mmap:
+    """Read-only memory map of a whole file; pages are loaded from the page cache on access"""
+    with open(path, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def open_pdf(source: PdfSource) -> PyPDF2.PdfReader:
+    """Open a PDF from an in-memory buffer, a binary file object or a mapped file, without a temp file"""
+    if isinstance(source, (str, os.PathLike)):
+        # The reader keeps the map alive; it is unmapped when the reader is collected
+        source = map_file(source)
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    return PyPDF2.PdfReader(source)
+
+def pdf_source_size(source: PdfSource) -> int:
+    """Size in bytes, without reading the content"""
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.getsize(source)
+    if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+        return len(source)
+    return os.fstat(source.fileno()).st_size
+
+def read_pdf_bytes(source: PdfSource) -> bytes:
+    """The whole PDF as bytes, for APIs that need the content in one request body"""
+    if isinstance(source, bytes):
+        return source
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            return f.read()
+    if isinstance(source, (bytearray, memoryview, mmap.mmap)):
+        return bytes(source)
+    source.seek(0)
+    return source.read()
+
+def iter_pdf_pages(source: PdfSource) -> Iterator[PdfPage]:
+    """
+    Yield pages one at a time as their text is extracted
+
+    Pages are parsed lazily by PyPDF2, so consumers that process each page and
+    drop it keep only one page of text alive at a time.
+    """
+    reader = open_pdf(source)
+    for page_number, page in enumerate(reader.pages, 1):
+        yield PdfPage(page_number=page_number, text=page.extract_text() or "")
+
+def iter_text_lines(text: str) -> Iterator[str]:
+    """The lines of text.split("\\n"), one at a time, without building the list"""
+    start = 0
+    while True:
+        end = text.find("\n", start)
+        if end < 0:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
+
+def iter_page_lines(pages: Iterable[PdfPage]) -> Iterator[str]:
+    """Flatten a page stream into lines for line-oriented parsers"""
+    for page in pages:
+        yield from iter_text_lines(page.text)
+
+def join_pages(pages: Iterable[PdfPage]) -> str:
+    """The text of all pages, joined by newlines"""
+    return "\n".join(page.text for page in pages)
+
+def joined_length(pages: List[PdfPage]) -> int:
+    """Length of join_pages(pages), without joining them"""
+    return sum(len(page.text) for page in pages) + max(len(pages) - 1, 0)
+
+def text_preview(pages: Iterable[PdfPage], limit: int) -> str:
+    """The first limit characters of join_pages(pages), joining only the pages they come from"""
+    needed = []
+    length = 0
+    for page in pages:
+        needed.append(page)
+        length += len(page.text) + 1
+        if length >= limit:
+            break
+    return join_pages(needed)[:limit]
+
+def count_pdf_pages(source: PdfSource) -> int:
+    """Number of pages, without extracting any text"""
+    return len(open_pdf(source).pages)
+
+def extract_pdf_text(source: PdfSource) -> str:
+    """Extract text from every page of a PDF with PyPDF2.
+
+    Module-level so it can be shipped to a process pool worker. Pages are
+    joined once at the end instead of by repeated concatenation.
+    """
+    return join_pages(iter_pdf_pages(source))
+
+def extract_page_range(source: PdfSource, start: int, stop: int) -> List[str]:
+    """Extract the text of pages [start, stop) (0-based).
+
+    Module-level so a process pool worker can open its own reader over the
+    same bytes and extract one shard of pages.
+    """
+    reader = open_pdf(source)
+    stop = min(stop, len(reader.pages))
+    return [reader.pages[index].extract_text() or "" for index in range(start, stop)]
+
+def plan_page_shards(page_count: int, shard_count: int) -> List[Tuple[int, int]]:
+    """Split pages into shard_count contiguous (start, stop) ranges of near-equal size"""
+    shard_count = max(1, min(shard_count, page_count))
+    base, extra = divmod(page_count, shard_count)
+    shards = []
+    start = 0
+    for index in range(shard_count):
+        stop = start + base + (1 if index < extra else 0)
+        shards.append((start, stop))
+        start = stop
+    return shards
+
+def build_page_subset_pdf(source: PdfSource, page_numbers: List[int]) -> bytes:
+    """Copy the given pages (1-based, in the order given) into a new PDF"""
+    reader = open_pdf(source)
+    writer = PyPDF2.PdfWriter()
+    for page_number in page_numbers:
+        writer.add_page(reader.pages[page_number - 1])
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+def split_pdf_pages(source: PdfSource, max_pages: int) -> List[Tuple[int, bytes]]:
+    """Split a PDF into sub-documents of at most max_pages pages.
+
+    Returns (first page number, 1-based; PDF bytes) for each sub-document, in page order.
+    """
+    reader = open_pdf(source)
+    page_count = len(reader.pages)
+    batches = []
+    for start in range(0, page_count, max_pages):
+        writer = PyPDF2.PdfWriter()
+        for index in range(start, min(start + max_pages, page_count)):
+            writer.add_page(reader.pages[index])
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        batches.append((start + 1, buffer.getvalue()))
+    return batches
@@ -0,0 +1,69 @@
+import re
+import unicodedata
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Iterable, List, Optional
+
+from .pdf_text import PdfPage
+from ..config.triage_config import PageTriageConfig
+
+# Glyphs PyPDF2 emits for fonts without a ToUnicode map
+CID_PLACEHOLDER_PATTERN = re.compile(r'\(cid:\d+\)')
+
+@dataclass
+class PageTriage:
+    """Triage decision for one page: use the embedded text layer or send the page to OCR"""
+    page_number: int
+    char_count: int
+    glyph_density: float
+    garbage_ratio: float
+    needs_ocr: bool
+    reason: str
+
+def _is_garbage(ch: str) -> bool:
+    if ch == "\ufffd":
+        return True
+    # Cc control, Co private use, Cs surrogate, Cn unassigned; newlines and tabs are layout
+    return unicodedata.category(ch).startswith("C") and ch not in "\n\r\t\f"
+
+def assess_page(page: PdfPage, config: Optional[PageTriageConfig] = None) -> PageTriage:
+    """Measure a page's extracted text and decide whether it needs OCR"""
+    config = config or PageTriageConfig()
+    cid_chars = sum(len(match) for match in CID_PLACEHOLDER_PATTERN.findall(page.text))
+    text = CID_PLACEHOLDER_PATTERN.sub("", page.text)
+
+    glyphs = [ch for ch in text if not ch.isspace()]
+    char_count = len(glyphs)
+    total = char_count + cid_chars
+    garbage_ratio = (sum(1 for ch in glyphs if _is_garbage(ch)) + cid_chars) / total if total else 0.0
+    glyph_density = sum(1 for ch in glyphs if ch.isalnum()) / char_count if char_count else 0.0
+
+    if char_count < config.min_chars:
+        reason = "no_text_layer" if char_count == 0 else "too_little_text"
+    elif garbage_ratio > config.max_garbage_ratio:
+        reason = "garbled_text"
+    elif glyph_density < config.min_glyph_density:
+        reason = "low_glyph_density"
+    else:
+        reason = "native_text"
+
+    return PageTriage(
+        page_number=page.page_number,
+        char_count=char_count,
+        glyph_density=round(glyph_density, 3),
+        garbage_ratio=round(garbage_ratio, 3),
+        needs_ocr=reason != "native_text",
+        reason=reason
+    )
+
+def triage_pages(pages: Iterable[PdfPage], config: Optional[PageTriageConfig] = None) -> List[PageTriage]:
+    """Assess every page, in page order"""
+    return [assess_page(page, config) for page in pages]
+
+def summarize_triage(decisions: List[PageTriage]) -> Dict[str, Any]:
+    """Compact triage report for API debug output"""
+    return {
+        "total_pages": len(decisions),
+        "native_pages": [d.page_number for d in decisions if not d.needs_ocr],
+        "ocr_pages": [d.page_number for d in decisions if d.needs_ocr],
+        "decisions": [asdict(d) for d in decisions]
+    }
@@ -0,0 +1,208 @@
+import re
+import logging
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, List, Optional
+
+from .llm_helpers import TokenCounter
+from .pdf_text import iter_text_lines
+
+logger = logging.getLogger(__name__)
+
+# Bureau section headers ("EXPERIAN", "TransUnion Credit Report", ...)
+BUREAU_HEADER_PATTERN = re.compile(r'^\s*(EXPERIAN|EQUIFAX|TRANS\s?UNION)\b', re.IGNORECASE)
+
+# Page breaks: form feeds from PDF extraction or "Page 3 of 12" footers
+PAGE_BREAK_PATTERN = re.compile(r'^\s*(\f|page\s+\d+(\s+of\s+\d+)?\s*$)', re.IGNORECASE)
+
+# Account number markers that open a tradeline block
+ACCOUNT_MARKER_PATTERN = re.compile(r'^\s*(account|acct)\s*(#|number|no\.?)', re.IGNORECASE)
+
+# Creditor header: a short line of capitalised words with no amounts or dates
+CREDITOR_HEADER_PATTERN = re.compile(r"^[A-Z][A-Z0-9&'.,/\- ]{2,59}$")
+
+# Labels that look like headers but are field names inside a block
+FIELD_LABEL_PATTERN = re.compile(
+    r'^(BALANCE|CREDIT LIMIT|HIGH CREDIT|STATUS|PAYMENT|DATE|ACCOUNT|ACCT|TYPE|TERMS|REMARKS|RESPONSIBILITY)\b'
+)
+
+@dataclass
+class ReportBlock:
+    """A run of lines that belongs together (a tradeline, a section header, ...)"""
+    lines: List[str]
+    section: Optional[str] = None
+    tokens: int = 0
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+@dataclass
+class ReportChunk:
+    """A token-budgeted group of whole blocks sent to the LLM in one request"""
+    text: str
+    tokens: int
+    block_count: int
+    sections: List[str] = field(default_factory=list)
+
+class ReportChunker:
+    """Split credit report text on tradeline boundaries into token-budgeted chunks.
+
+    Unlike fixed character windows, blocks (creditor header + its fields) are
+    never split across chunks unless a single block exceeds the budget, so no
+    overlap is needed and tradelines are not lost or duplicated at the seams.
+    """
+
+    def __init__(self, token_counter: Optional[TokenCounter] = None,
+                 max_chunk_tokens: int = 4500, max_chunk_chars: int = 15000):
+        self.token_counter = token_counter or TokenCounter()
+        self.max_chunk_tokens = max_chunk_tokens
+        self.max_chunk_chars = max_chunk_chars
+
+    def split_blocks(self, text: str) -> List[ReportBlock]:
+        """Group lines into blocks starting at creditor, account, bureau and page boundaries"""
+        return list(self.iter_blocks(iter_text_lines(text)))
+
+    def iter_blocks(self, lines: Iterable[str]) -> Iterator[ReportBlock]:
+        """Yield blocks as soon as the next boundary line is seen"""
+        current: List[str] = []
+        section: Optional[str] = None
+        current_section: Optional[str] = None
+        lines_since_header = None  # lines since the creditor header, None outside a tradeline
+
+        for line in lines:
+            stripped = line.strip()
+            boundary = False
+
+            if BUREAU_HEADER_PATTERN.match(stripped):
+                section = BUREAU_HEADER_PATTERN.match(stripped).group(1).upper().replace(" ", "")
+                boundary = True
+                lines_since_header = None
+            elif PAGE_BREAK_PATTERN.match(line):
+                # A page break inside a tradeline must not cut it in half
+                boundary = lines_since_header is None
+            elif self._is_creditor_header(stripped):
+                boundary = True
+                lines_since_header = 0
+            elif ACCOUNT_MARKER_PATTERN.match(stripped):
+                # The account line belongs to a creditor header just above it
+                boundary = lines_since_header is None or lines_since_header > 2
+                if boundary:
+                    lines_since_header = None
+            elif not stripped and lines_since_header:
+                # A blank line after the block's fields ends the tradeline, so a
+                # page break that follows is a split point again
+                lines_since_header = None
+
+            if boundary:
+                if any(existing.strip() for existing in current):
+                    yield ReportBlock(lines=current, section=current_section)
+                current = []
+                current_section = section
+            elif lines_since_header is not None and stripped:
+                lines_since_header += 1
+
+            current.append(line)
+
+        if any(existing.strip() for existing in current):
+            yield ReportBlock(lines=current, section=current_section)
+
+    def chunk(self, text: str) -> List[ReportChunk]:
+        """Pack whole blocks into chunks within the token and character budgets"""
+        chunks = list(self.iter_chunks(iter_text_lines(text)))
+        logger.info(f"Chunked {len(text)} characters into {len(chunks)} chunks "
+                    f"from {sum(chunk.block_count for chunk in chunks)} blocks")
+        return chunks
+
+    def iter_chunks(self, lines: Iterable[str]) -> Iterator[ReportChunk]:
+        """
+        Yield chunks incrementally from a line stream
+
+        Only the blocks of the chunk being filled are held in memory, so a page
+        stream (pdf_text.iter_page_lines) can be chunked while later pages are
+        still being extracted.
+        """
+        pending: List[ReportBlock] = []
+        pending_tokens = 0
+        pending_chars = 0
+
+        for block in self._iter_budgeted_blocks(lines):
+            block_chars = len(block.text) + 1
+            if pending and (pending_tokens + block.tokens > self.max_chunk_tokens
+                            or pending_chars + block_chars > self.max_chunk_chars):
+                yield self._build_chunk(pending)
+                pending = []
+            if not pending:
+                # Reserve room for the continuation header emitted with this chunk
+                header = self._continuation_header(block)
+                pending_tokens = self.token_counter.count_tokens(header) if header else 0
+                pending_chars = len(header) + 1 if header else 0
+            pending.append(block)
+            pending_tokens += block.tokens
+            pending_chars += block_chars
+
+        if pending:
+            yield self._build_chunk(pending)
+
+    def _iter_budgeted_blocks(self, lines: Iterable[str]) -> Iterator[ReportBlock]:
+        """Count block tokens and split blocks that alone exceed the budget"""
+        for block in self.iter_blocks(lines):
+            block.tokens = self.token_counter.count_tokens(block.text)
+            yield from self._split_oversized(block)
+
+    def _build_chunk(self, blocks: List[ReportBlock]) -> ReportChunk:
+        header = self._continuation_header(blocks[0])
+        chunk_lines = [header] if header else []
+        chunk_lines.extend(line for block in blocks for line in block.lines)
+        chunk_text = "\n".join(chunk_lines)
+        return ReportChunk(
+            text=chunk_text,
+            tokens=self.token_counter.count_tokens(chunk_text),
+            block_count=len(blocks),
+            sections=sorted({block.section for block in blocks if block.section})
+        )
+
+    def _continuation_header(self, block: ReportBlock) -> Optional[str]:
+        """Bureau label repeated when a chunk starts mid-section so the model can attribute it"""
+        if block.section and not BUREAU_HEADER_PATTERN.match(block.lines[0].strip()):
+            return f"[{block.section} section continued]"
+        return None
+
+    def _is_creditor_header(self, line: str) -> bool:
+        """Check whether a line looks like a creditor name heading a tradeline"""
+        if not CREDITOR_HEADER_PATTERN.match(line):
+            return False
+        if FIELD_LABEL_PATTERN.match(line) or any(ch.isdigit() for ch in line):
+            return False
+        return any(ch.isalpha() for ch in line)
+
+    def _split_oversized(self, block: ReportBlock) -> List[ReportBlock]:
+        """Split a block that alone exceeds the budget, by lines and then by characters"""
+        if block.tokens <= self.max_chunk_tokens and len(block.text) < self.max_chunk_chars:
+            return [block]
+
+        pieces: List[ReportBlock] = []
+        current: List[str] = []
+        current_tokens = 0
+        current_chars = 0
+        for line in block.lines:
+            line_tokens = self.token_counter.count_tokens(line)
+            if line_tokens > self.max_chunk_tokens or len(line) >= self.max_chunk_chars:
+                # A single line longer than the budget: hard split on characters
+                step = min(self.max_chunk_chars - 1, self.max_chunk_tokens * 4)
+                parts = [line[start:start + step] for start in range(0, len(line), step)]
+            else:
+                parts = [line]
+
+            for part in parts:
+                part_tokens = line_tokens if len(parts) == 1 else self.token_counter.count_tokens(part)
+                if current and (current_tokens + part_tokens > self.max_chunk_tokens
+                                or current_chars + len(part) + 1 > self.max_chunk_chars):
+                    pieces.append(ReportBlock(lines=current, section=block.section, tokens=current_tokens))
+                    current, current_tokens, current_chars = [], 0, 0
+                current.append(part)
+                current_tokens += part_tokens
+                current_chars += len(part) + 1
+
+        if current:
+            pieces.append(ReportBlock(lines=current, section=block.section, tokens=current_tokens))
+        return pieces
@@ -0,0 +1,35 @@
+import asyncio
+import logging
+from typing import Any, Awaitable
+
+logger = logging.getLogger(__name__)
+
+class ClientDisconnectedError(Exception):
+    """Raised when the HTTP client went away before the work finished"""
+
+async def cancel_on_disconnect(request: Any, awaitable: Awaitable[Any], poll_interval: float = 0.5) -> Any:
+    """
+    Await work while watching the HTTP connection, cancelling the work if the client disconnects
+
+    Args:
+        request: The Starlette/FastAPI request (anything with an async is_disconnected())
+        awaitable: The work to run
+        poll_interval: Seconds between disconnect checks
+
+    Returns:
+        The work's result
+    """
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                logger.warning("🔌 Client disconnected, cancelling in-flight work")
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                raise ClientDisconnectedError("Client disconnected before processing finished")
+    except asyncio.CancelledError:
+        task.cancel()
+        raise
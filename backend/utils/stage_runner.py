@@ -0,0 +1,49 @@
+import time
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+# Stage name -> (dependency names, coroutine function taking the dependency results in order)
+StageGraph = Dict[str, Tuple[List[str], Callable[..., Awaitable[Any]]]]
+
+async def run_stages(stages: StageGraph) -> Tuple[Dict[str, Any], Dict[str, float]]:
+    """
+    Run pipeline stages concurrently, each starting once its dependencies finish
+
+    Dependencies must be declared earlier; the graph is checked before any
+    stage starts. If a stage fails, the stages still running are cancelled
+    and awaited before the error is raised.
+
+    Returns:
+        Tuple of (results by stage name, seconds spent in each stage)
+    """
+    declared = set()
+    for name, (deps, _) in stages.items():
+        missing = [dep for dep in deps if dep not in declared]
+        if missing:
+            raise ValueError(f"Stage '{name}' depends on undeclared stages: {missing}")
+        declared.add(name)
+
+    tasks: Dict[str, asyncio.Task] = {}
+    timings: Dict[str, float] = {}
+
+    async def run_stage(name: str, deps: List[str], stage_fn: Callable[..., Awaitable[Any]]) -> Any:
+        dep_results = [await tasks[dep] for dep in deps]
+        start_time = time.perf_counter()
+        try:
+            return await stage_fn(*dep_results)
+        finally:
+            timings[name] = round(time.perf_counter() - start_time, 3)
+
+    for name, (deps, stage_fn) in stages.items():
+        tasks[name] = asyncio.create_task(run_stage(name, deps, stage_fn))
+
+    try:
+        results = await asyncio.gather(*tasks.values())
+    except BaseException:
+        # One failed stage fails the job; don't leave siblings running
+        for task in tasks.values():
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        raise
+
+    return dict(zip(tasks.keys(), results)), timings
@@ -0,0 +1,109 @@
+import os
+import mmap
+import hashlib
+import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterator, Optional, Union
+
+from .atomic_files import TEMP_SUFFIX, fsync_directory
+from .pdf_text import map_file
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Runs a blocking call off the event loop, e.g. WorkerPools.run_io or BoundedExecutor.run
+BlockingRunner = Callable[..., Awaitable[Any]]
+
+class UploadTooLargeError(ValueError):
+    """The upload passed max_bytes; raised as soon as the limit is crossed"""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(f"File exceeds the {max_bytes / 1024 / 1024:.0f} MB upload limit")
+        self.max_bytes = max_bytes
+
+@dataclass
+class SpooledUpload:
+    """An upload copied to disk, with its size and SHA-256 computed during the copy"""
+    path: Path
+    size: int
+    sha256: str
+
+    @contextmanager
+    def view(self) -> Iterator[mmap.mmap]:
+        """Read-only memory map of the stored file: a bytes-like, file-like view with no copy"""
+        mapped = map_file(self.path)
+        try:
+            yield mapped
+        finally:
+            mapped.close()
+
+    def move_to(self, destination: Union[str, Path], durable: bool = True) -> None:
+        """Rename into place (same filesystem), so readers never see a partial file"""
+        destination = Path(destination)
+        os.replace(self.path, destination)
+        self.path = destination
+        if durable:
+            fsync_directory(destination.parent)
+
+    def discard(self) -> None:
+        """Delete the file; safe to call more than once"""
+        self.path.unlink(missing_ok=True)
+
+def _open_spool_file(directory: Path):
+    fd, path = tempfile.mkstemp(dir=directory, prefix=".upload-", suffix=TEMP_SUFFIX)
+    return os.fdopen(fd, 'wb'), Path(path)
+
+def _write_chunk(f, hasher, chunk: bytes) -> None:
+    # hashlib releases the GIL for large buffers, so this overlaps with the event loop
+    hasher.update(chunk)
+    f.write(chunk)
+
+def _finish_spool_file(f, durable: bool) -> None:
+    f.flush()
+    if durable:
+        os.fsync(f.fileno())
+    f.close()
+
+async def _call(run: Optional[BlockingRunner], fn: Callable[..., Any], *args) -> Any:
+    if run:
+        return await run(fn, *args)
+    return fn(*args)
+
+async def spool_upload(upload: Any, directory: Union[str, Path], max_bytes: Optional[int] = None,
+                       chunk_size: int = UPLOAD_CHUNK_SIZE, run: Optional[BlockingRunner] = None,
+                       durable: bool = True) -> SpooledUpload:
+    """
+    Copy an upload (anything with an async read(size), like UploadFile) to a
+    temp file in directory, one chunk at a time
+
+    Only one chunk is held in memory. The SHA-256 and size are computed as
+    the chunks pass, and the copy stops with UploadTooLargeError (deleting
+    the partial file) as soon as more than max_bytes have arrived; a declared
+    size over the limit is rejected before anything is copied. Blocking
+    writes go through run when given. The caller moves the returned file
+    into place or discards it.
+    """
+    declared_size = getattr(upload, "size", None)
+    if max_bytes is not None and declared_size is not None and declared_size > max_bytes:
+        raise UploadTooLargeError(max_bytes)
+
+    directory = Path(directory)
+    f, path = await _call(run, _open_spool_file, directory)
+    hasher = hashlib.sha256()
+    size = 0
+    try:
+        while True:
+            chunk = await upload.read(chunk_size)
+            if not chunk:
+                break
+            size += len(chunk)
+            if max_bytes is not None and size > max_bytes:
+                raise UploadTooLargeError(max_bytes)
+            await _call(run, _write_chunk, f, hasher, chunk)
+        await _call(run, _finish_spool_file, f, durable)
+    except BaseException:
+        f.close()
+        path.unlink(missing_ok=True)
+        raise
+    return SpooledUpload(path=path, size=size, sha256=hasher.hexdigest())
@@ -730,6 +730,10 @@ export type Database = {
         }
         Returns: string
       }
+      upsert_tradelines_bulk: {
+        Args: { p_tradelines: Json; p_user_id: string }
+        Returns: Json
+      }
     }
     Enums: {
       app_permission: "channels.delete" | "messages.delete"
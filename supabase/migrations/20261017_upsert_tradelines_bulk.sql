@@ -0,0 +1,49 @@
+-- Batched tradeline upsert for the PDF processing backend
+-- Saves a whole report in one RPC round trip instead of one upsert_tradeline call per row.
+-- Each row runs through upsert_tradeline in its own savepoint (the BEGIN ... EXCEPTION
+-- block), so a failing row is reported in the result without rolling back the others.
+-- Returns one {ordinal, id, error} object per input element, ordinal being its 0-based position.
+-- p_user_id is text, like upsert_tradeline's: the API also saves for non-UUID ids such as "default-user".
+
+DROP FUNCTION IF EXISTS public.upsert_tradelines_bulk(uuid, jsonb);
+
+CREATE OR REPLACE FUNCTION public.upsert_tradelines_bulk(p_user_id text, p_tradelines jsonb)
+RETURNS jsonb
+LANGUAGE plpgsql
+SET search_path = ''
+AS $$
+DECLARE
+  v_row jsonb;
+  v_ordinal integer;
+  v_id text;
+  v_results jsonb[] := ARRAY[]::jsonb[];
+BEGIN
+  FOR v_row, v_ordinal IN
+    SELECT value, (ordinality - 1)::integer
+    FROM jsonb_array_elements(p_tradelines) WITH ORDINALITY
+  LOOP
+    BEGIN
+      v_id := public.upsert_tradeline(
+        p_account_balance => coalesce(v_row->>'account_balance', ''),
+        p_account_number => coalesce(v_row->>'account_number', ''),
+        p_account_status => coalesce(v_row->>'account_status', ''),
+        p_account_type => coalesce(v_row->>'account_type', ''),
+        p_credit_bureau => coalesce(v_row->>'credit_bureau', ''),
+        p_credit_limit => coalesce(v_row->>'credit_limit', ''),
+        p_creditor_name => coalesce(v_row->>'creditor_name', ''),
+        p_date_opened => coalesce(v_row->>'date_opened', ''),
+        p_is_negative => coalesce((v_row->>'is_negative')::boolean, false),
+        p_monthly_payment => coalesce(v_row->>'monthly_payment', ''),
+        p_user_id => p_user_id
+      );
+      v_results := v_results || jsonb_build_object('ordinal', v_ordinal, 'id', v_id, 'error', NULL);
+    EXCEPTION WHEN others THEN
+      v_results := v_results || jsonb_build_object('ordinal', v_ordinal, 'id', NULL, 'error', SQLERRM);
+    END;
+  END LOOP;
+
+  RETURN to_jsonb(v_results);
+END;
+$$;
+
+COMMENT ON FUNCTION public.upsert_tradelines_bulk(text, jsonb) IS 'Upsert many tradelines for one user in a single call; per-row id or error';